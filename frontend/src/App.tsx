@@ -6,6 +6,8 @@ import {
   CERTIFICATE_TYPES, 
   getCurrentNetwork, 
   NETWORKS,
+  OWNER_INDEX_MAX_LAG,
+  getOwnerIndexUrl,
   formatAddress,
   formatDate,
   getEtherscanNftUrl,
@@ -97,6 +99,31 @@ function App() {
     }
   };
 
+  // 從鏈下索引取得 token ID；索引無法使用、屬於別的合約或落後鏈上時退回合約的 getCertificatesByOwner
+  const fetchOwnedTokenIds = async (address: string, contractToUse: ethers.Contract): Promise<bigint[]> => {
+    const indexUrl = getOwnerIndexUrl(currentNetwork.contractAddress);
+    if (indexUrl) {
+      try {
+        const [response, head] = await Promise.all([
+          fetch(`${indexUrl}/owners/${address}`),
+          contractToUse.runner?.provider?.getBlockNumber()
+        ]);
+        if (response.ok) {
+          const data = await response.json();
+          const current = data.contract === currentNetwork.contractAddress.toLowerCase();
+          const synced = head !== undefined && data.lastBlock != null && data.lastBlock >= head - OWNER_INDEX_MAX_LAG;
+          if (current && synced) {
+            return data.tokenIds.map((id: number) => BigInt(id));
+          }
+          console.warn(`擁有者索引 (合約 ${data.contract}，至區塊 ${data.lastBlock}) 不是目前合約或落後最新區塊 ${head}，改用合約查詢`);
+        }
+      } catch (error) {
+        console.warn('擁有者索引無法使用，改用合約查詢:', error);
+      }
+    }
+    return contractToUse.getCertificatesByOwner(address);
+  };
+
   // 載入證書
   const loadCertificates = async (address: string, contractInstance?: ethers.Contract) => {
     try {
@@ -104,7 +131,7 @@ function App() {
       if (!contractToUse) return;
 
       // 獲取用戶的所有 token ID
-      const tokenIds = await contractToUse.getCertificatesByOwner(address);
+      const tokenIds = await fetchOwnedTokenIds(address, contractToUse);
       
       // 如果沒有證書，設置空數組
       if (tokenIds.length === 0) {
@@ -26,6 +26,20 @@ export const getCurrentNetwork = () => {
   return NETWORKS.localhost;
 };
 
+// 鏈下擁有者索引 API (scripts/owner_index.py serve)，未設定時直接呼叫合約
+export const OWNER_INDEX_URL = process.env.REACT_APP_OWNER_INDEX_URL || '';
+
+// 索引最多可以落後鏈上幾個區塊；超過就改呼叫合約。
+// 預設 2：event_ingest.py --follow 每 12 秒同步一次，約等於 Sepolia 一個區塊，
+// 同步中的索引通常落後 1~2 個區塊；設為 0 則必須已同步到最新區塊
+export const OWNER_INDEX_MAX_LAG = Number(process.env.REACT_APP_OWNER_INDEX_MAX_LAG || 2);
+
+// 索引 API 中屬於指定合約的路徑；索引是別的合約時伺服器回 404
+export const getOwnerIndexUrl = (contractAddress) => {
+  if (!OWNER_INDEX_URL || !contractAddress) return '';
+  return `${OWNER_INDEX_URL}/contracts/${contractAddress.toLowerCase()}`;
+};
+
 // 合約 ABI
 export const CONTRACT_ABI = [
   // 發行證書函數（實際簽名，無 imageURI 參數）
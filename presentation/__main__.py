@@ -0,0 +1,13 @@
+"""
+Entry point for ``python presentation build ...`` (run from the repository root).
+"""
+
+import time
+
+_STARTED = time.perf_counter()
+
+import sys
+
+from build import main
+
+sys.exit(main(started=_STARTED))
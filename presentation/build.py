@@ -0,0 +1,225 @@
+"""
+多格式簡報建置 - 以 process pool 平行產生 PPTX / PDF / HTML
+
+    python presentation build --formats pptx,pdf,html --langs zh,en
+    python presentation daemon --preload pptx,pdf,html     # 常駐服務，之後的 build 不必重新 import
+
+Backends are imported only for the formats a build asks for, and every result
+reports how long its backend import took (0 when a warm daemon already had it).
+``--trace FILE`` records every stage and slide of every worker into one Chrome
+trace file (see ``scripts/tracing.py``) and prints a per-stage summary.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import List, Optional
+
+from build_cache import DEFAULT_CACHE_DIR, SlideCache
+from deck import available_langs, load_deck
+
+# tracing.py 與證書產生器共用，放在 scripts/
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+
+BACKENDS = {
+    "pptx": "pptx_backend",
+    "pdf": "pdf_backend",
+    "html": "html_backend",
+}
+
+
+@dataclass
+class BuildResult:
+    fmt: str
+    lang: str
+    path: Optional[str]
+    seconds: float
+    error: Optional[str] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    import_seconds: float = 0.0
+    trace: Optional[List[dict]] = None
+
+
+def _tracing():
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.append(SCRIPTS_DIR)
+    import tracing
+    return tracing
+
+
+def _stage(tracer, name, **args):
+    return tracer.span(name, **args) if tracer else nullcontext(args)
+
+
+def build_one(fmt, lang, out_dir=".", cache_dir=None, trace=False):
+    """Render one (format, language) pair; runs inside a worker process.
+
+    When *cache_dir* is given only slides whose content hash changed are
+    re-rendered; the rest are spliced in from the fragment cache. With
+    *trace* the result carries the Chrome trace events of this build.
+    """
+    started = time.perf_counter()
+    imported = 0.0
+    tracer = _tracing().Tracer(f"{fmt} {lang}") if trace else None
+    try:
+        with _stage(tracer, "import", module=BACKENDS[fmt]):
+            backend = importlib.import_module(BACKENDS[fmt])
+        imported = time.perf_counter() - started
+        with _stage(tracer, "deck.load", lang=lang):
+            deck = load_deck(lang)
+        salt = getattr(backend, "CACHE_SALT", None)   # 沒有 CACHE_SALT 的後端不快取片段
+        cache = SlideCache(cache_dir, fmt, salt) if cache_dir and salt else None
+        path = os.path.join(out_dir, deck.outputs[fmt])
+        with _stage(tracer, "render", fmt=fmt, lang=lang, slides=len(deck.slides)):
+            path = backend.render(deck, path, cache=cache, tracer=tracer)
+        if cache:
+            with _stage(tracer, "cache.prune") as info:
+                info["removed"] = cache.prune()
+        stats = cache.stats() if cache else {"hits": 0, "misses": 0}
+        return BuildResult(
+            fmt, lang, path, time.perf_counter() - started,
+            cache_hits=stats["hits"], cache_misses=stats["misses"], import_seconds=imported,
+            trace=tracer.finish() if tracer else None,
+        )
+    except Exception as e:  # 缺少套件的後端以 ImportError 回報，只影響該格式
+        return BuildResult(fmt, lang, None, time.perf_counter() - started, f"{type(e).__name__}: {e}",
+                           import_seconds=imported, trace=tracer.finish() if tracer else None)
+
+
+def build(formats, langs, out_dir=".", jobs=None, cache_dir=None, executor=None, trace=False):
+    """Build every format/language combination and return the results in order.
+
+    *executor* lets a long-running caller (the build daemon) reuse warm workers.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    os.makedirs(out_dir, exist_ok=True)
+    langs = langs or available_langs()
+    tasks = [(fmt, lang) for lang in langs for fmt in formats]
+    if jobs == 1 or len(tasks) == 1:
+        return [build_one(fmt, lang, out_dir, cache_dir, trace) for fmt, lang in tasks]
+
+    results = {}
+    pool = executor or ProcessPoolExecutor(max_workers=jobs or min(len(tasks), os.cpu_count() or 1))
+    try:
+        futures = {
+            pool.submit(build_one, fmt, lang, out_dir, cache_dir, trace): (fmt, lang) for fmt, lang in tasks
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return [results[task] for task in tasks]
+
+
+def _csv(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="presentation", description="Build presentation decks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="render decks in parallel")
+    b.add_argument("--formats", type=_csv, default=list(BACKENDS), help="comma separated: pptx,pdf,html")
+    b.add_argument("--langs", type=_csv, default=None, help="comma separated, e.g. zh,en (default: all)")
+    b.add_argument("--out-dir", default=".", help="output directory (default: current directory)")
+    b.add_argument("--jobs", "-j", type=int, default=None, help="worker processes (default: one per task)")
+    b.add_argument("--cache-dir", default=None, help=f"slide fragment cache (default: <out-dir>/{DEFAULT_CACHE_DIR})")
+    b.add_argument("--no-cache", action="store_true", help="re-render every slide")
+    b.add_argument("--no-daemon", action="store_true", help="build in this process even if a daemon is running")
+    b.add_argument("--socket", default=None, help="daemon socket path or host:port")
+    b.add_argument("--trace", metavar="FILE", default=None,
+                   help="write a Chrome trace of every stage and slide and print a stage summary")
+
+    d = sub.add_parser("daemon", help="keep backends imported and serve builds over a local socket")
+    d.add_argument("--preload", type=_csv, default=list(BACKENDS), help="backends to import up front")
+    d.add_argument("--jobs", "-j", type=int, default=None, help="warm worker processes (default: CPU count)")
+    d.add_argument("--socket", default=None, help="socket path or host:port")
+    d.add_argument("--stop", action="store_true", help="stop a running daemon")
+    d.add_argument("--status", action="store_true", help="show whether a daemon is running")
+    return parser.parse_args(argv)
+
+
+def _via_daemon(args, cache_dir):
+    """Hand the build to a running daemon; returns ``(results, total)`` or ``None`` to build locally."""
+    from build_daemon import parse_address, request
+
+    reply = request({
+        "command": "build",
+        "formats": args.formats,
+        "langs": args.langs,
+        "out_dir": os.path.abspath(args.out_dir),
+        "cache_dir": os.path.abspath(cache_dir) if cache_dir else None,
+        "jobs": args.jobs,
+        "trace": bool(args.trace),
+    }, parse_address(args.socket))
+    if reply is None:
+        return None
+    if "error" in reply:
+        hint = " (restart the daemon to pick up code changes)" if reply["error"] == "stale" else ""
+        print(f"⚠️  Build daemon: {reply['error']} — building locally{hint}")
+        return None
+    return [BuildResult(**r) for r in reply["results"]], reply["total"]
+
+
+def main(argv=None, started=None):
+    """*started* is ``time.perf_counter()`` at interpreter start-up, for the import report."""
+    startup = time.perf_counter() - started if started else None
+    args = parse_args(argv)
+    if args.command == "daemon":
+        from build_daemon import run_daemon
+        return run_daemon(args)
+
+    unknown = [f for f in args.formats if f not in BACKENDS]
+    if unknown:
+        print(f"❌ Unknown format(s): {', '.join(unknown)} (choose from {', '.join(BACKENDS)})")
+        return 2
+
+    print(f"🎨 Building {', '.join(args.formats)} for {', '.join(args.langs or available_langs())}...")
+    started = time.perf_counter()
+    cache_dir = None if args.no_cache else (args.cache_dir or os.path.join(args.out_dir, DEFAULT_CACHE_DIR))
+    remote = None if args.no_daemon else _via_daemon(args, cache_dir)
+    if remote:
+        results, _ = remote
+        where = "daemon"
+    else:
+        results = build(args.formats, args.langs, args.out_dir, args.jobs, cache_dir, trace=bool(args.trace))
+        where = "local"
+    total = time.perf_counter() - started
+
+    for r in results:
+        if r.error:
+            print(f"❌ {r.lang:<4} {r.fmt:<5} {r.seconds:7.2f}s  {r.error}")
+        else:
+            cached = f"  ({r.cache_hits} cached, {r.cache_misses} rendered)" if cache_dir else ""
+            print(f"✅ {r.lang:<4} {r.fmt:<5} {r.seconds:7.2f}s  {r.path}{cached}")
+
+    imports = {}
+    for r in results:
+        imports[r.fmt] = max(imports.get(r.fmt, 0.0), r.import_seconds)
+    report = ", ".join(f"{BACKENDS[fmt]} {seconds:.2f}s" for fmt, seconds in imports.items())
+    startup_note = f", CLI start-up {startup:.2f}s" if startup is not None else ""
+    print(f"📦 Imports ({where}): {report}{startup_note}")
+    print(f"⏱️  Total: {total:.2f}s")
+    if args.trace:
+        _write_trace(args, results, where)
+    return 1 if any(r.error for r in results) else 0
+
+
+def _write_trace(args, results, where):
+    tracing = _tracing()
+    events = [event for r in results for event in (r.trace or ())]
+    tracing.write_chrome_trace(args.trace, events, {"formats": args.formats, "langs": args.langs, "where": where})
+    print(f"🔍 Trace written to {args.trace} (open in chrome://tracing or ui.perfetto.dev)")
+    tracing.print_summary(events)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
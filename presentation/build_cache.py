@@ -0,0 +1,115 @@
+"""
+投影片片段快取 - 依每張投影片的內容與樣式雜湊，只重新渲染有變動的投影片
+
+Fragments are stored as ``<root>/<format>/<sha256>.bin``: the slide XML part for
+PPTX and the ``<section class="slide">`` markup for HTML. PDF is always rebuilt
+from the deck.
+
+Every hit refreshes the fragment's mtime, and after each build :meth:`SlideCache.prune`
+deletes the least recently used fragments until the format's directory fits in
+``max_bytes``, so edits that keep changing slide content do not grow the cache forever.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+DEFAULT_CACHE_DIR = ".deck-cache"
+DEFAULT_MAX_BYTES = 64 * 2**20   # 每種格式
+STALE_TMP_SECONDS = 3600         # 建置中斷留下的暫存檔
+
+
+class SlideCache:
+    """On-disk fragment store for one output format."""
+
+    def __init__(self, root, fmt, salt="", max_bytes=None):
+        self.dir = os.path.join(root, fmt)
+        self.fmt = fmt
+        self.salt = salt
+        self.max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.pruned = 0
+        os.makedirs(self.dir, exist_ok=True)
+
+    def key(self, slide, options=None, extra=""):
+        """Hash of the slide content, the style inputs and the backend salt."""
+        h = hashlib.sha256()
+        for part in (
+            self.fmt,
+            self.salt,
+            json.dumps(options or {}, sort_keys=True, ensure_ascii=False),
+            extra,
+            repr(slide),
+        ):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.dir, f"{key}.bin")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)   # mtime 即最近使用時間，prune 依此淘汰
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        # 先寫暫存檔再改名，避免平行建置時讀到寫一半的片段
+        fd, tmp = tempfile.mkstemp(dir=self.dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def discard(self, key):
+        """Forget a fragment that turned out to be unusable."""
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+        self.hits -= 1
+        self.misses += 1
+
+    def prune(self):
+        """Delete least recently used fragments until the store fits in ``max_bytes``; returns how many."""
+        fragments = []
+        stale = time.time() - STALE_TMP_SECONDS
+        for entry in os.scandir(self.dir):
+            try:
+                st = entry.stat()
+                if entry.name.endswith(".bin"):
+                    fragments.append((st.st_mtime_ns, st.st_size, entry.path))
+                elif entry.name.endswith(".tmp") and st.st_mtime < stale:
+                    os.unlink(entry.path)
+            except FileNotFoundError:   # 平行建置同時在淘汰
+                continue
+        total = sum(size for _, size, _ in fragments)
+        removed = 0
+        for _, size, path in sorted(fragments):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self.pruned += removed
+        return removed
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "pruned": self.pruned}
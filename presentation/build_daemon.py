@@ -0,0 +1,254 @@
+"""
+常駐建置服務 - 預先載入渲染後端，省去每次建置的直譯器啟動與 import 時間
+
+    python presentation daemon --preload pptx,pdf,html &
+    python presentation build --formats pdf --langs zh     # 偵測到服務時自動交給它
+    python presentation daemon --stop
+
+The daemon listens on a local socket (a Unix socket in the temp directory, or
+127.0.0.1 where Unix sockets are unavailable), keeps the requested backends
+imported in itself and in a warm worker pool, and runs one build at a time.
+Deck content is re-read whenever ``content/*.json`` changes; if any of the
+presentation ``*.py`` files change the daemon answers ``stale`` and exits so
+the client falls back to a local build with the new code.
+
+Every request must carry the token the daemon writes to
+``~/.cache/deck-build/<address>.token`` (mode 0600), so other local users
+cannot reach it through the TCP fallback or make it write into arbitrary
+``out_dir`` paths.
+"""
+
+import glob
+import hashlib
+import hmac
+import importlib
+import json
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TCP_PORT = 47821
+
+
+def default_address():
+    if hasattr(socket, "AF_UNIX"):
+        user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+        return os.path.join(tempfile.gettempdir(), f"deck-build-{user}.sock")
+    return ("127.0.0.1", DEFAULT_TCP_PORT)
+
+
+def parse_address(spec):
+    """``host:port`` for TCP, anything else is a Unix socket path."""
+    if not spec:
+        return default_address()
+    host, sep, port = spec.rpartition(":")
+    if sep and port.isdigit() and os.sep not in host:
+        return (host or "127.0.0.1", int(port))
+    return spec
+
+
+def token_path(address):
+    """Per-user file holding the shared secret of the daemon on *address*."""
+    if isinstance(address, tuple):
+        name = f"{address[0]}-{address[1]}"
+    else:
+        name = hashlib.sha256(address.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(os.path.expanduser("~"), ".cache", "deck-build", f"{name}.token")
+
+
+def _write_token(address):
+    path = token_path(address)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid") and os.stat(directory).st_uid != os.getuid():
+        raise RuntimeError(f"{directory} is not owned by the current user")
+    token = secrets.token_hex(32)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")   # mkstemp 建立的檔案只有擁有者可讀寫
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    os.replace(tmp, path)
+    return token
+
+
+def _read_token(address):
+    try:
+        with open(token_path(address), encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _source_stamp():
+    return max(os.stat(path).st_mtime_ns for path in glob.glob(os.path.join(HERE, "*.py")))
+
+
+def request(message, address=None, timeout=None):
+    """Send one request to a running daemon; returns its reply, or ``None`` if none is listening.
+
+    The token is read from :func:`token_path`; without one there is no daemon of ours to talk to.
+    """
+    address = address or default_address()
+    token = _read_token(address)
+    if token is None:
+        return None
+    message = dict(message, token=token)
+    family = socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+    try:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(0.5)
+        sock.connect(address)
+    except OSError:
+        return None
+    with sock:
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    return json.loads(line) if line else None
+
+
+def _preload(formats):
+    from build import BACKENDS
+    for fmt in formats:
+        try:
+            importlib.import_module(BACKENDS[fmt])
+        except ImportError:
+            pass   # 缺少套件的格式由 build_one 在結果中回報，不讓整個 worker 啟動失敗
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            reply = self.server.daemon.handle(json.loads(line))
+        except Exception as e:
+            reply = {"error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class BuildDaemon:
+    """Warm build server: preloaded backends plus a persistent worker pool."""
+
+    def __init__(self, address=None, preload=(), jobs=None):
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.address = address or default_address()
+        self.preload = list(preload)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.stamp = _source_stamp()
+        self.builds = 0
+        self.started = time.time()
+        self.stopping = False
+        self.token = None
+
+        started = time.perf_counter()
+        _preload(self.preload)
+        self.pool = None
+        if self.jobs > 1:
+            self.pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_preload, initargs=(self.preload,))
+            # 先讓每個 worker 都啟動並載入後端
+            list(self.pool.map(time.sleep, [0.05] * self.jobs))
+        self.warmup_seconds = time.perf_counter() - started
+
+    def handle(self, message):
+        from build import build
+
+        if not self.token or not hmac.compare_digest(str(message.get("token", "")), self.token):
+            return {"error": "unauthorized"}
+        command = message.get("command")
+        if command == "ping":
+            return {"pid": os.getpid(), "builds": self.builds, "uptime": time.time() - self.started,
+                    "preload": self.preload, "jobs": self.jobs}
+        if command == "stop":
+            self.stopping = True
+            return {"stopped": True}
+        if command != "build":
+            return {"error": f"unknown command {command!r}"}
+        if _source_stamp() != self.stamp:
+            self.stopping = True
+            return {"error": "stale"}
+
+        started = time.perf_counter()
+        results = build(message["formats"], message["langs"], message["out_dir"], message.get("jobs"),
+                        message.get("cache_dir"), executor=self.pool, trace=message.get("trace", False))
+        self.builds += 1
+        return {"results": [asdict(r) for r in results], "total": time.perf_counter() - started}
+
+    def bind(self):
+        if isinstance(self.address, tuple):
+            server = socketserver.TCPServer(self.address, _Handler)
+        else:
+            if os.path.exists(self.address):
+                if request({"command": "ping"}, self.address) is not None:
+                    raise RuntimeError(f"a build daemon is already listening on {self.address}")
+                os.unlink(self.address)   # 上次沒有正常結束留下的 socket 檔
+            old_umask = os.umask(0o077)
+            try:
+                server = socketserver.UnixStreamServer(self.address, _Handler)
+            finally:
+                os.umask(old_umask)
+        server.daemon = self
+        server.timeout = 0.5
+        try:
+            # 綁定成功之後才寫入，避免覆蓋另一個仍在執行的服務的 token
+            self.token = _write_token(self.address)
+        except BaseException:
+            server.server_close()
+            raise
+        self.server = server
+
+    def serve_forever(self):
+        server = self.server
+        try:
+            while not self.stopping:
+                server.handle_request()
+        finally:
+            server.server_close()
+            if self.pool:
+                self.pool.shutdown()
+            if not isinstance(self.address, tuple) and os.path.exists(self.address):
+                os.unlink(self.address)
+            if self.token and _read_token(self.address) == self.token:
+                os.unlink(token_path(self.address))
+
+
+def run_daemon(args):
+    address = parse_address(args.socket)
+    if args.stop or args.status:
+        reply = request({"command": "stop" if args.stop else "ping"}, address, timeout=10)
+        if reply is None:
+            print(f"⚠️  No build daemon on {address}")
+            return 1
+        if args.stop:
+            print(f"🛑 Build daemon on {address} stopped")
+        else:
+            print(f"✅ pid {reply['pid']}, {reply['builds']} builds, up {reply['uptime']:.0f}s, "
+                  f"preloaded {', '.join(reply['preload']) or '-'}, {reply['jobs']} workers")
+        return 0
+
+    from build import BACKENDS
+    unknown = [f for f in args.preload if f not in BACKENDS]
+    if unknown:
+        print(f"❌ Unknown format(s): {', '.join(unknown)} (choose from {', '.join(BACKENDS)})")
+        return 2
+    try:
+        daemon = BuildDaemon(address, args.preload, args.jobs)
+        daemon.bind()
+        print(f"🔥 Build daemon warmed up in {daemon.warmup_seconds:.2f}s, listening on {address}")
+        sys.stdout.flush()
+        daemon.serve_forever()
+    except (OSError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    print("🛑 Build daemon stopped")
+    return 0
@@ -0,0 +1,190 @@
+"""
+簡報內容模型 - 所有 PPTX / PDF / HTML 生成腳本共用的投影片資料
+
+Deck content lives in ``content/<lang>.json`` and is parsed once per process
+into immutable objects that every backend renders from.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Tuple, Union
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content")
+
+# 簡報配色 (#764ba2 / #667eea)
+PURPLE_DARK = "#764ba2"
+PURPLE_LIGHT = "#667eea"
+
+
+@dataclass(frozen=True)
+class Text:
+    text: str
+
+
+@dataclass(frozen=True)
+class Code:
+    text: str
+
+
+@dataclass(frozen=True)
+class Bullets:
+    items: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class KeyValue:
+    pairs: Tuple[Tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class Table:
+    header: Tuple[str, ...]
+    rows: Tuple[Tuple[str, ...], ...]
+
+
+@dataclass(frozen=True)
+class Badges:
+    """Short tags (tech stack); HTML draws them as ``tech-badge`` chips."""
+    items: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Stats:
+    """Headline numbers as (value, label); *text* is the one-line form for PPTX / PDF."""
+    items: Tuple[Tuple[str, str], ...]
+    text: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Bars:
+    """Percentage bars as (label, percent, CSS colour)."""
+    items: Tuple[Tuple[str, int, str], ...]
+
+
+Block = Union[Text, Code, Bullets, KeyValue, Table, Badges, Stats, Bars]
+
+
+def plain_block(block):
+    """The list / key-value block that PPTX and PDF draw in place of an HTML-only widget."""
+    if isinstance(block, Badges):
+        return Bullets(block.items)
+    if isinstance(block, Stats):
+        return Bullets(block.text)
+    if isinstance(block, Bars):
+        return KeyValue(tuple((label, f"{percent}%") for label, percent, _ in block.items))
+    return block
+
+
+@dataclass(frozen=True)
+class Section:
+    title: str
+    blocks: Tuple[Block, ...]
+
+
+@dataclass(frozen=True)
+class Slide:
+    title: str
+    layout: str = "content"  # cover / content / closing
+    subtitle: str = ""
+    lines: Tuple[str, ...] = ()
+    sections: Tuple[Section, ...] = ()
+    style: str = ""  # HTML 容器 class
+
+
+@dataclass(frozen=True)
+class Deck:
+    lang: str
+    title: str
+    slides: Tuple[Slide, ...]
+    outputs: Dict[str, str] = field(default_factory=dict, hash=False, compare=False)
+    page: Dict[str, Dict[str, object]] = field(default_factory=dict, hash=False, compare=False)
+    labels: Dict[str, str] = field(default_factory=dict, hash=False, compare=False)
+
+    def content_slides(self):
+        """Return a copy of the deck without the cover and closing slides."""
+        return Deck(
+            lang=self.lang,
+            title=self.title,
+            slides=tuple(s for s in self.slides if s.layout == "content"),
+            outputs=self.outputs,
+            page=self.page,
+            labels=self.labels,
+        )
+
+    def page_options(self, fmt):
+        """Per-format layout options (slide size, font sizes, orientation)."""
+        return dict(self.page.get(fmt, {}))
+
+
+# JSON key -> block constructor, in the order blocks are emitted within a section
+_BLOCK_PARSERS = (
+    ("text", lambda v: Text(v)),
+    ("code", lambda v: Code(v)),
+    ("bullets", lambda v: Bullets(tuple(v))),
+    ("pairs", lambda v: KeyValue(tuple((k, val) for k, val in v))),
+    ("table", lambda v: Table(tuple(v["header"]), tuple(tuple(r) for r in v["rows"]))),
+    ("badges", lambda v: Badges(tuple(v))),
+    # [數值, 標籤] 或 [數值, 標籤, PPTX/PDF 用的整行文字]
+    ("stats", lambda v: Stats(tuple((s[0], s[1]) for s in v),
+                              tuple(s[2] if len(s) > 2 else f"{s[0]} {s[1]}" for s in v))),
+    ("bars", lambda v: Bars(tuple((label, int(percent), color) for label, percent, color in v))),
+)
+
+
+def _parse_blocks(data):
+    return tuple(parse(data[key]) for key, parse in _BLOCK_PARSERS if key in data)
+
+
+def _parse_slide(data):
+    sections = tuple(
+        Section(title=s.get("title", ""), blocks=_parse_blocks(s))
+        for s in data.get("sections", ())
+    )
+    # 沒有分段的投影片直接把內容放在第一段
+    loose = _parse_blocks(data)
+    if loose:
+        sections = (Section(title="", blocks=loose),) + sections
+    return Slide(
+        title=data["title"],
+        layout=data.get("layout", "content"),
+        subtitle=data.get("subtitle", ""),
+        lines=tuple(data.get("lines", ())),
+        sections=sections,
+        style=data.get("style", ""),
+    )
+
+
+def parse_deck(data):
+    """Build a :class:`Deck` from its JSON representation."""
+    return Deck(
+        lang=data["lang"],
+        title=data["title"],
+        slides=tuple(_parse_slide(s) for s in data["slides"]),
+        outputs=dict(data.get("outputs", {})),
+        page=dict(data.get("page", {})),
+        labels=dict(data.get("labels", {})),
+    )
+
+
+def load_deck(lang):
+    """Load and parse ``content/<lang>.json`` (cached per process until the file changes)."""
+    path = os.path.join(CONTENT_DIR, f"{lang}.json")
+    st = os.stat(path)
+    return _load_deck(path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=8)
+def _load_deck(path, mtime_ns, size):
+    # mtime / size 只用來當快取鍵：常駐建置服務在內容修改後會重新解析
+    with open(path, encoding="utf-8") as f:
+        return parse_deck(json.load(f))
+
+
+def available_langs():
+    return sorted(
+        os.path.splitext(name)[0]
+        for name in os.listdir(CONTENT_DIR)
+        if name.endswith(".json")
+    )
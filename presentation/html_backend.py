@@ -0,0 +1,223 @@
+"""
+HTML 簡報後端 - 將 deck 模型渲染為 index.html (搭配 styles.css / script.js)
+"""
+
+import os
+from html import escape
+
+import deck as model
+
+# 容器 class -> 卡片 class (對應 styles.css)
+CARD_CLASSES = {
+    "content-grid": "overview-box",
+    "architecture": "layer",
+    "contract-features": "feature-card",
+    "deployment-info": "info-box",
+    "demo-features": "demo-card",
+    "screenshot-section": "screenshot-placeholder",
+    "challenges": "challenge-item",
+    "timeline": "timeline-item",
+    "learnings-grid": "learning-card",
+    "future-grid": "future-card",
+    "stats-container": "stat-card",
+    "conclusion": "conclusion-box",
+}
+
+INDENT = "    "
+
+# 變更渲染輸出時遞增，讓舊的快取片段失效
+CACHE_SALT = "html-2"
+
+# 這些容器的卡片之間畫箭頭 (架構分層)
+ARROW_CONTAINERS = {"architecture": "⬇️"}
+
+
+def _block_html(block, depth):
+    pad = INDENT * depth
+    if isinstance(block, model.Text):
+        return [f"{pad}<p>{escape(block.text)}</p>"]
+    if isinstance(block, model.Code):
+        return [f"{pad}<code>{escape(block.text)}</code>"]
+    if isinstance(block, model.Bullets):
+        items = [f"{pad}{INDENT}<li>{escape(item)}</li>" for item in block.items]
+        return [f"{pad}<ul>", *items, f"{pad}</ul>"]
+    if isinstance(block, model.KeyValue):
+        return [
+            f"{pad}<p><strong>{escape(k)}:</strong> {escape(v)}</p>"
+            for k, v in block.pairs
+        ]
+    if isinstance(block, model.Badges):
+        badges = [f'{pad}{INDENT}<span class="tech-badge">{escape(item)}</span>' for item in block.items]
+        return [f'{pad}<div class="tech-stack">', *badges, f"{pad}</div>"]
+    if isinstance(block, model.Stats):
+        lines = []
+        for value, label in block.items:
+            lines += [f'{pad}<div class="stat-card">',
+                      f'{pad}{INDENT}<div class="stat-number">{escape(value)}</div>',
+                      f'{pad}{INDENT}<div class="stat-label">{escape(label)}</div>',
+                      f"{pad}</div>"]
+        return lines
+    if isinstance(block, model.Bars):
+        lines = []
+        for label, percent, color in block.items:
+            lines += [f'{pad}<div class="tech-bar">',
+                      f'{pad}{INDENT}<span class="bar-label">{escape(label)}</span>',
+                      f'{pad}{INDENT}<div class="bar" style="width: {percent}%; background: {escape(color)};">'
+                      f"{percent}%</div>",
+                      f"{pad}</div>"]
+        return lines
+    if isinstance(block, model.Table):
+        lines = [f"{pad}<table>"]
+        if any(block.header):
+            cells = "".join(f"<th>{escape(c)}</th>" for c in block.header)
+            lines.append(f"{pad}{INDENT}<tr>{cells}</tr>")
+        for row in block.rows:
+            cells = "".join(f"<td>{escape(c)}</td>" for c in row)
+            lines.append(f"{pad}{INDENT}<tr>{cells}</tr>")
+        lines.append(f"{pad}</table>")
+        return lines
+    raise TypeError(f"Unsupported block: {block!r}")
+
+
+def render_slide(slide, number):
+    """Return the ``<section class="slide">`` fragment for one slide."""
+    pad = INDENT * 2
+    lines = [f"{pad}<!-- Slide {number}: {escape(slide.title)} -->"]
+
+    if slide.layout in ("cover", "closing"):
+        css, info = ("title-slide", "author-info") if slide.layout == "cover" else ("thank-you-slide", "contact-info")
+        lines.append(f'{pad}<section class="slide {css}">')
+        lines.append(f"{pad}{INDENT}<h1>{escape(slide.title)}</h1>")
+        if slide.subtitle:
+            lines.append(f"{pad}{INDENT}<h2>{escape(slide.subtitle)}</h2>")
+        if slide.lines:
+            lines.append(f'{pad}{INDENT}<div class="{info}">')
+            lines += [f"{pad}{INDENT * 2}<p>{escape(line)}</p>" for line in slide.lines]
+            lines.append(f"{pad}{INDENT}</div>")
+        lines.append(f"{pad}</section>")
+        return "\n".join(lines)
+
+    container = slide.style or "content-grid"
+    card = CARD_CLASSES.get(container, "overview-box")
+    arrow = ARROW_CONTAINERS.get(container)
+    lines.append(f'{pad}<section class="slide">')
+    lines.append(f"{pad}{INDENT}<h2>{escape(slide.title)}</h2>")
+    lines.append(f'{pad}{INDENT}<div class="{container}">')
+    # 數據卡片直接放進容器；長條圖放在容器之後的 tech-count 區塊
+    bars = [s for s in slide.sections if any(isinstance(b, model.Bars) for b in s.blocks)]
+    cards = 0
+    for section in slide.sections:
+        if section in bars:
+            continue
+        if section.blocks and all(isinstance(b, model.Stats) for b in section.blocks):
+            for block in section.blocks:
+                lines += _block_html(block, 4)
+            continue
+        if arrow and cards:
+            lines.append(f'{pad}{INDENT * 2}<div class="arrow">{arrow}</div>')
+        cards += 1
+        lines.append(f'{pad}{INDENT * 2}<div class="{card}">')
+        if section.title:
+            lines.append(f"{pad}{INDENT * 3}<h3>{escape(section.title)}</h3>")
+        for block in section.blocks:
+            lines += _block_html(block, 5)
+        lines.append(f"{pad}{INDENT * 2}</div>")
+    lines.append(f"{pad}{INDENT}</div>")
+    for section in bars:
+        lines.append(f'{pad}{INDENT}<div class="tech-count">')
+        if section.title:
+            lines.append(f"{pad}{INDENT * 2}<h3>{escape(section.title)}</h3>")
+        lines.append(f'{pad}{INDENT * 2}<div class="tech-breakdown">')
+        for block in section.blocks:
+            lines += _block_html(block, 5)
+        lines.append(f"{pad}{INDENT * 2}</div>")
+        lines.append(f"{pad}{INDENT}</div>")
+    lines.append(f"{pad}</section>")
+    return "\n".join(lines)
+
+
+def render_document(deck, fragments):
+    """Wrap pre-rendered slide fragments in the full HTML page."""
+    html_lang = deck.page_options("html").get("html_lang", deck.lang)
+    prev_label = deck.labels.get("prev", "◀ Previous")
+    next_label = deck.labels.get("next", "Next ▶")
+    body = "\n\n".join(fragments)
+    return f'''<!DOCTYPE html>
+<html lang="{html_lang}">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{escape(deck.title)}</title>
+    <link rel="stylesheet" href="styles.css">
+</head>
+<body>
+    <div class="presentation">
+{body}
+    </div>
+
+    <!-- Navigation Controls -->
+    <div class="controls">
+        <button id="prevBtn" class="nav-btn">{prev_label}</button>
+        <span id="slideNumber" class="slide-counter">1 / {len(fragments)}</span>
+        <button id="nextBtn" class="nav-btn">{next_label}</button>
+    </div>
+
+    <script src="script.js"></script>
+</body>
+</html>
+'''
+
+
+def _cached_fragment(cache, slide, number):
+    key = cache.key(slide, extra=str(number))
+    data = cache.get(key)
+    if data is not None:
+        return data.decode("utf-8")
+    fragment = render_slide(slide, number)
+    cache.put(key, fragment.encode("utf-8"))
+    return fragment
+
+
+def _traced_fragment(tracer, cache, slide, number):
+    with tracer.span("html.slide", index=number, title=slide.title) as info:
+        if cache is None:
+            fragment = render_slide(slide, number)
+        else:
+            misses = cache.misses
+            fragment = _cached_fragment(cache, slide, number)
+            info["cached"] = cache.misses == misses
+        info["chars"] = len(fragment)
+    return fragment
+
+
+def build_html(deck, cache=None, tracer=None):
+    if tracer:
+        fragments = [_traced_fragment(tracer, cache, slide, i) for i, slide in enumerate(deck.slides, 1)]
+        with tracer.span("html.document"):
+            return render_document(deck, fragments)
+    if cache is None:
+        fragments = [render_slide(slide, i) for i, slide in enumerate(deck.slides, 1)]
+    else:
+        fragments = [_cached_fragment(cache, slide, i) for i, slide in enumerate(deck.slides, 1)]
+    return render_document(deck, fragments)
+
+
+def render(deck, output_path, cache=None, tracer=None):
+    """Render *deck* to an HTML file and return its path.
+
+    With a :class:`build_cache.SlideCache`, unchanged slides are spliced in
+    from their cached ``<section>`` markup. With a :class:`tracing.Tracer`,
+    every slide fragment and the file write are timed.
+    """
+    html = build_html(deck, cache, tracer)
+    if not tracer:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        return output_path
+
+    with tracer.span("write", path=output_path) as info:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+    info["bytes"] = os.path.getsize(output_path)
+    tracer.count("write.bytes", info["bytes"])
+    return output_path
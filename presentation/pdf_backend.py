@@ -0,0 +1,255 @@
+"""
+ReportLab 簡報後端 - 將 deck 模型渲染為 PDF
+"""
+
+try:
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab import Version as REPORTLAB_VERSION
+except ImportError as e:
+    raise ImportError(f"reportlab not installed ({e}); please run: pip install reportlab") from e
+
+import os
+import time
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+import deck as model
+from deck import PURPLE_DARK, PURPLE_LIGHT
+
+# 沒有 CACHE_SALT：建立整份 deck 的 flowables 只要十幾毫秒 (doc.build 約 100 ms)，
+# 不值得為了片段快取去反序列化 ReportLab 物件，PDF 每次都從 deck 重建。
+
+DEFAULT_OPTIONS = {
+    "orientation": "portrait",
+    "title_size": 36,
+    "heading_size": 24,
+    "subheading_size": 16,
+    "body_size": 12,
+    "center_size": 14,
+}
+
+
+@lru_cache(maxsize=None)
+def _styles(title_size, heading_size, subheading_size, body_size, center_size):
+    """Paragraph styles for one page configuration (built once, reused)."""
+    base = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            'CoverTitle',
+            parent=base['Heading1'],
+            fontSize=title_size + 6,
+            leading=title_size + 12,
+            textColor=colors.HexColor(PURPLE_DARK),
+            spaceAfter=20,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        "subtitle": ParagraphStyle(
+            'CoverSubtitle',
+            parent=base['Heading2'],
+            fontSize=center_size + 8,
+            leading=center_size + 12,
+            textColor=colors.HexColor(PURPLE_LIGHT),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        "heading": ParagraphStyle(
+            'SlideTitle',
+            parent=base['Heading1'],
+            fontSize=heading_size,
+            leading=heading_size + 6,
+            textColor=colors.HexColor(PURPLE_DARK),
+            spaceAfter=20,
+            fontName='Helvetica-Bold'
+        ),
+        "subheading": ParagraphStyle(
+            'SectionHeading',
+            parent=base['Heading3'],
+            fontSize=subheading_size,
+            leading=subheading_size + 4,
+            textColor=colors.HexColor(PURPLE_LIGHT),
+            spaceAfter=8,
+            spaceBefore=10,
+            fontName='Helvetica-Bold'
+        ),
+        "body": ParagraphStyle(
+            'SlideBody',
+            parent=base['BodyText'],
+            fontSize=body_size,
+            leading=body_size + 4,
+            spaceAfter=6,
+            fontName='Helvetica'
+        ),
+        "center": ParagraphStyle(
+            'CenterText',
+            parent=base['BodyText'],
+            fontSize=center_size,
+            leading=center_size + 4,
+            alignment=TA_CENTER,
+            spaceAfter=8,
+            fontName='Helvetica'
+        ),
+    }
+
+
+def get_styles(opts):
+    return _styles(
+        opts["title_size"], opts["heading_size"], opts["subheading_size"],
+        opts["body_size"], opts["center_size"],
+    )
+
+
+def page_options(deck):
+    opts = dict(DEFAULT_OPTIONS)
+    opts.update(deck.page_options("pdf"))
+    return opts
+
+
+def _table_flowable(block, styles):
+    rows = [list(block.header)] if any(block.header) else []
+    rows += [list(r) for r in block.rows]
+    cells = [[Paragraph(escape(c), styles["body"]) for c in row] for row in rows]
+    table = Table(cells, hAlign='LEFT')
+    commands = [
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.HexColor(PURPLE_LIGHT)),
+    ]
+    if any(block.header):
+        commands.append(('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(PURPLE_DARK)))
+        commands.append(('TEXTCOLOR', (0, 0), (-1, 0), colors.white))
+    table.setStyle(TableStyle(commands))
+    return table
+
+
+def block_flowables(block, styles):
+    body = styles["body"]
+    block = model.plain_block(block)
+    if isinstance(block, model.Text):
+        return [Paragraph(escape(block.text), body)]
+    if isinstance(block, model.Code):
+        return [Paragraph(f"<font name='Courier'>{escape(block.text)}</font>", body)]
+    if isinstance(block, model.Bullets):
+        return [Paragraph(f"• {escape(item)}", body) for item in block.items]
+    if isinstance(block, model.KeyValue):
+        return [Paragraph(f"<b>{escape(k)}:</b> {escape(v)}", body) for k, v in block.pairs]
+    if isinstance(block, model.Table):
+        return [_table_flowable(block, styles)]
+    raise TypeError(f"Unsupported block: {block!r}")
+
+
+def slide_flowables(slide, styles):
+    """Flowables for one slide, without the trailing page break."""
+    story = []
+    if slide.layout in ("cover", "closing"):
+        story.append(Spacer(1, 1.2*inch))
+        story.append(Paragraph(escape(slide.title), styles["title"]))
+        if slide.subtitle:
+            story.append(Paragraph(escape(slide.subtitle), styles["subtitle"]))
+        for line in slide.lines:
+            story.append(Paragraph(escape(line), styles["center"]))
+        return story
+
+    story.append(Paragraph(escape(slide.title), styles["heading"]))
+    for section in slide.sections:
+        if section.title:
+            story.append(Paragraph(escape(section.title), styles["subheading"]))
+        for block in section.blocks:
+            story.extend(block_flowables(block, styles))
+        story.append(Spacer(1, 0.05*inch))
+    return story
+
+
+def _traced_flowables(tracer, slide, styles, index):
+    with tracer.span("pdf.slide", index=index, title=slide.title) as info:
+        flowables = slide_flowables(slide, styles)
+        info["flowables"] = len(flowables)
+        info["paragraphs"] = sum(isinstance(f, Paragraph) for f in flowables)
+    tracer.count("pdf.flowables", info["flowables"])
+    tracer.count("pdf.paragraphs", info["paragraphs"])
+    if flowables:
+        # 讓 doc.build 的逐頁 span 知道每一頁排的是哪張投影片
+        flowables[0]._trace_slide = index
+    return flowables
+
+
+def build_story(deck, tracer=None):
+    opts = page_options(deck)
+    if tracer:
+        with tracer.span("pdf.styles"):
+            styles = get_styles(opts)
+    else:
+        styles = get_styles(opts)
+    story = []
+    for index, slide in enumerate(deck.slides):
+        if index:
+            story.append(PageBreak())
+        if tracer:
+            story.extend(_traced_flowables(tracer, slide, styles, index + 1))
+        else:
+            story.extend(slide_flowables(slide, styles))
+    return story
+
+
+def make_doc(deck, output_path):
+    opts = page_options(deck)
+    pagesize = landscape(A4) if opts["orientation"] == "landscape" else A4
+    return SimpleDocTemplate(
+        output_path,
+        pagesize=pagesize,
+        rightMargin=50,
+        leftMargin=50,
+        topMargin=50,
+        bottomMargin=50
+    )
+
+
+def render(deck, output_path, cache=None, tracer=None):
+    """Render *deck* to a PDF file and return its path.
+
+    *cache* is accepted for the common backend signature and ignored: the PDF
+    backend has no ``CACHE_SALT``, so the build never gives it one. With a
+    :class:`tracing.Tracer`, style creation, every slide's flowables, every
+    laid-out page and the final save are timed.
+    """
+    doc = make_doc(deck, output_path)
+    if not tracer:
+        doc.build(build_story(deck))
+        return output_path
+
+    story = build_story(deck, tracer)
+    with tracer.span("pdf.build", pages=0) as info:
+        _traced_build(doc, story, tracer, info)
+    size = os.path.getsize(output_path)
+    tracer.count("write.bytes", size)
+    info["bytes"] = size
+    return output_path
+
+
+def _traced_build(doc, story, tracer, info):
+    """``doc.build`` with one ``pdf.page`` span per laid-out page and a ``pdf.save`` span
+    for writing the file, using ReportLab's progress and afterFlowable hooks."""
+    state = {"mark": time.perf_counter_ns(), "slide": None}
+
+    def after_flowable(flowable):
+        state["slide"] = getattr(flowable, "_trace_slide", state["slide"])
+
+    def progress(kind, value):
+        if kind == "PAGE":
+            now = time.perf_counter_ns()
+            tracer.add_span("pdf.page", state["mark"], now - state["mark"], {"page": value, "slide": state["slide"]})
+            state["mark"] = now
+            info["pages"] = value
+        elif kind == "FINISHED":
+            # 最後一頁之後到 FINISHED 之間就是 canvas.save() 寫檔
+            now = time.perf_counter_ns()
+            tracer.add_span("pdf.save", state["mark"], now - state["mark"])
+
+    doc.afterFlowable = after_flowable
+    doc.setProgressCallBack(progress)
+    doc.build(story)
@@ -0,0 +1,212 @@
+"""
+python-pptx 簡報後端 - 將 deck 模型渲染為 PowerPoint
+"""
+
+try:
+    from pptx import Presentation
+    from pptx.util import Inches, Pt
+    from pptx.enum.text import PP_ALIGN
+    from pptx.dml.color import RGBColor
+    from pptx.oxml import parse_xml
+    from pptx import __version__ as PPTX_VERSION
+    from lxml import etree
+except ImportError as e:
+    raise ImportError(f"python-pptx not installed ({e}); please run: pip install python-pptx") from e
+
+import io
+
+from deck import PURPLE_DARK, PURPLE_LIGHT, Bullets, Code, KeyValue, Table, Text, plain_block
+
+BLANK_LAYOUT = 6
+TITLE_AND_CONTENT_LAYOUT = 1
+
+# 變更渲染輸出時遞增，讓舊的快取片段失效
+CACHE_SALT = "pptx-1"
+
+purple_dark = RGBColor.from_string(PURPLE_DARK.lstrip("#"))
+purple_light = RGBColor.from_string(PURPLE_LIGHT.lstrip("#"))
+white = RGBColor(255, 255, 255)
+
+
+def _paragraphs(tf):
+    """Yield fresh paragraphs, reusing the text frame's initial empty one."""
+    yield tf.paragraphs[0]
+    while True:
+        yield tf.add_paragraph()
+
+
+def _add_textbox(slide, left, top, width, height, text, size, bold=False):
+    box = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
+    frame = box.text_frame
+    frame.text = text
+    for para in frame.paragraphs:
+        para.font.size = Pt(size)
+        para.font.bold = bold
+        para.font.color.rgb = white
+        para.alignment = PP_ALIGN.CENTER
+    return box
+
+
+def _add_banner_slide(prs, slide_data, opts):
+    """封面 / 結尾頁：滿版背景加置中文字"""
+    slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+    width = opts["width"]
+
+    background = slide.shapes.add_shape(1, 0, 0, prs.slide_width, prs.slide_height)
+    background.fill.solid()
+    background.fill.fore_color.rgb = purple_light if slide_data.layout == "cover" else purple_dark
+    background.line.fill.background()
+
+    _add_textbox(slide, 1, 1.5, width - 2, 1.5, slide_data.title, 54, bold=True)
+    if slide_data.subtitle:
+        _add_textbox(slide, 1, 3, width - 2, 1, slide_data.subtitle, 30)
+    if slide_data.lines:
+        _add_textbox(slide, 1, 4.2, width - 2, 2.5, "\n".join(slide_data.lines), 18)
+    return slide
+
+
+def _add_block(new_para, block, level, opts):
+    body_size = Pt(opts["body_size"])
+
+    def line(text, **font):
+        p = new_para()
+        p.text = text
+        p.level = level
+        p.font.size = body_size
+        for attr, value in font.items():
+            setattr(p.font, attr, value)
+        return p
+
+    block = plain_block(block)
+    if isinstance(block, Text):
+        line(block.text)
+    elif isinstance(block, Code):
+        line(block.text, name="Courier New")
+    elif isinstance(block, Bullets):
+        for item in block.items:
+            line(item)
+    elif isinstance(block, KeyValue):
+        for key, value in block.pairs:
+            line(f"{key}: {value}")
+    elif isinstance(block, Table):
+        if any(block.header):
+            line("  |  ".join(block.header), bold=True)
+        for row in block.rows:
+            line("  |  ".join(row))
+
+
+def _add_content_slide(prs, slide_data, opts):
+    slide = prs.slides.add_slide(prs.slide_layouts[TITLE_AND_CONTENT_LAYOUT])
+
+    title = slide.shapes.title
+    title.text = slide_data.title
+    title.text_frame.paragraphs[0].font.size = Pt(opts["title_size"])
+    title.text_frame.paragraphs[0].font.color.rgb = purple_dark
+    title.text_frame.paragraphs[0].font.bold = True
+
+    new_para = _paragraphs(slide.placeholders[1].text_frame).__next__
+    for section in slide_data.sections:
+        level = 0
+        if section.title:
+            p = new_para()
+            p.text = section.title
+            p.font.size = Pt(opts["heading_size"])
+            p.font.bold = True
+            p.font.color.rgb = purple_light
+            level = 1
+        for block in section.blocks:
+            _add_block(new_para, block, level, opts)
+    return slide
+
+
+def add_slide(prs, slide_data, opts):
+    if slide_data.layout in ("cover", "closing"):
+        return _add_banner_slide(prs, slide_data, opts)
+    return _add_content_slide(prs, slide_data, opts)
+
+
+def _add_cached_slide(prs, slide_data, opts, cache):
+    """Splice the slide XML part from *cache*, rendering it on a miss."""
+    key = cache.key(slide_data, opts, extra=PPTX_VERSION)
+    data = cache.get(key)
+    if data is None:
+        slide = add_slide(prs, slide_data, opts)
+        cache.put(key, etree.tostring(slide.part._element))
+        return slide
+
+    # 版型關聯由 add_slide 建立；我們的投影片沒有圖片或超連結，只需替換 XML
+    layout = BLANK_LAYOUT if slide_data.layout in ("cover", "closing") else TITLE_AND_CONTENT_LAYOUT
+    part = prs.slides.add_slide(prs.slide_layouts[layout]).part
+    part._element = parse_xml(data)
+    # SlidePart.slide 是 lazyproperty，仍包著 add_slide 產生的舊 XML；清掉後重新包裝
+    part.__dict__.pop("slide", None)
+    return part.slide
+
+
+def _count_shapes(slide):
+    shapes = paragraphs = 0
+    for shape in slide.shapes:
+        shapes += 1
+        if shape.has_text_frame:
+            paragraphs += len(shape.text_frame.paragraphs)
+    return shapes, paragraphs
+
+
+def _add_traced_slide(prs, slide_data, opts, cache, tracer, index):
+    with tracer.span("pptx.slide", index=index, title=slide_data.title) as info:
+        if cache is None:
+            slide = add_slide(prs, slide_data, opts)
+        else:
+            misses = cache.misses
+            slide = _add_cached_slide(prs, slide_data, opts, cache)
+            info["cached"] = cache.misses == misses
+        info["shapes"], info["paragraphs"] = _count_shapes(slide)
+    tracer.count("pptx.shapes", info["shapes"])
+    tracer.count("pptx.paragraphs", info["paragraphs"])
+    return slide
+
+
+def build_presentation(deck, cache=None, tracer=None):
+    """Build a ``Presentation`` object for *deck*."""
+    opts = {"width": 10, "height": 7.5, "title_size": 40, "heading_size": 20, "body_size": 14}
+    opts.update(deck.page_options("pptx"))
+
+    if tracer:
+        with tracer.span("pptx.new"):
+            prs = Presentation()
+    else:
+        prs = Presentation()
+    prs.slide_width = Inches(opts["width"])
+    prs.slide_height = Inches(opts["height"])
+    for index, slide_data in enumerate(deck.slides, 1):
+        if tracer:
+            _add_traced_slide(prs, slide_data, opts, cache, tracer, index)
+        elif cache is None:
+            add_slide(prs, slide_data, opts)
+        else:
+            _add_cached_slide(prs, slide_data, opts, cache)
+    return prs
+
+
+def render(deck, output_path, cache=None, tracer=None):
+    """Render *deck* to a .pptx file and return its path.
+
+    With a :class:`build_cache.SlideCache`, unchanged slides are spliced in
+    from their cached slide XML instead of being rebuilt shape by shape.
+    With a :class:`tracing.Tracer`, every slide and the save are timed, and
+    the package is serialized in memory first so ``prs.save`` and the file
+    write show up as separate stages.
+    """
+    prs = build_presentation(deck, cache, tracer)
+    if not tracer:
+        prs.save(output_path)
+        return output_path
+
+    buffer = io.BytesIO()
+    with tracer.span("pptx.save"):
+        prs.save(buffer)
+    with tracer.span("write", path=output_path, bytes=buffer.tell()):
+        with open(output_path, "wb") as f:
+            f.write(buffer.getbuffer())
+    tracer.count("write.bytes", buffer.tell())
+    return output_path
@@ -0,0 +1,385 @@
+"""
+效能基準測試 - 簡報與證書產生器的牆鐘時間、峰值記憶體與各階段耗時
+
+    python scripts/benchmarks.py run -o bench-results.json                        # quick 組合
+    python scripts/benchmarks.py run --suite nightly --baseline bench-baseline.json --threshold 0.15
+    python scripts/benchmarks.py run --only deck.pdf --sizes 10 100 1000
+    python scripts/benchmarks.py compare bench-results.json bench-baseline.json
+    python scripts/benchmarks.py list
+
+每個 (案例, 規模) 在獨立的子程序中執行，所以峰值 RSS 與後端 import 時間
+(python-pptx / ReportLab 升級常見的變慢來源) 互不影響。簡報案例以
+content/<lang>.json 的投影片循環組成 10~1000 張的合成簡報；證書案例使用
+決定性的合成紀錄 (1~100k 張)。
+
+結果寫成 JSON；指定 --baseline 時，牆鐘時間、import 時間或峰值 RSS 比基準多出
+--threshold (預設 15%) 以上的項目會列出並以 exit code 1 結束，適合放在
+nightly CI。把某次的結果複製成 bench-baseline.json 即成為新的基準。
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PRESENTATION_DIR = os.path.join(HERE, "..", "presentation")
+FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.15
+# 低於這些差距的變動視為雜訊，不算退步
+MIN_SECONDS_DELTA = 0.05
+MIN_RSS_DELTA_MB = 8
+
+DECK_LANGS = ("zh", "en")
+SUITES = {
+    "quick": {"deck": (10, 100), "cert": (1, 1000)},
+    "nightly": {"deck": (10, 100, 1000), "cert": (1, 1000, 10_000, 100_000)},
+}
+# 逐檔輸出的 PDF 每張都要完整的 ReportLab canvas，nightly 只跑到 10k
+SIZE_LIMITS = {"cert.pdf.files": 10_000}
+
+
+class Stages:
+    """Accumulates named stage timings: ``with stages("render"): ...``."""
+
+    def __init__(self):
+        self.times = {}
+
+    @contextmanager
+    def __call__(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - started
+
+
+# -- 合成資料 -------------------------------------------------------------------
+
+def synthetic_deck(lang, slides):
+    """Cycle the content slides of ``content/<lang>.json`` into a deck of *slides* slides."""
+    from deck import CONTENT_DIR, parse_deck
+
+    with open(os.path.join(CONTENT_DIR, f"{lang}.json"), encoding="utf-8") as f:
+        data = json.load(f)
+    cover = [s for s in data["slides"] if s.get("layout") == "cover"]
+    closing = [s for s in data["slides"] if s.get("layout") == "closing"]
+    content = [s for s in data["slides"] if s.get("layout", "content") == "content"]
+    body = []
+    for i in range(max(slides - len(cover) - len(closing), 0)):
+        slide = dict(content[i % len(content)])
+        slide["title"] = f"{slide['title']} ({i + 1})"
+        body.append(slide)
+    data["slides"] = (cover + body + closing)[:slides]
+    return parse_deck(data)
+
+
+def synthetic_records(count):
+    from certificates import CERTIFICATE_TYPES, CertificateRecord
+
+    types = sorted(CERTIFICATE_TYPES)
+    return [
+        CertificateRecord(
+            cert_type=types[i % len(types)],
+            recipient_name=f"測試學生 {i:06d}",
+            issuer_name="國立臺灣大學 區塊鏈課程",
+            custom_message="感謝您在本學期的投入與貢獻",
+            issue_date=1733270400 + i,
+            token_id=i + 1,
+            recipient="0x%040x" % (i + 1),
+        )
+        for i in range(count)
+    ]
+
+
+# -- 案例 -----------------------------------------------------------------------
+# 每個案例: (imports, run)；imports 在子程序只執行一次並計入 "import" 階段，
+# run(size, workdir, stages) 可以重複執行
+
+def _deck_case(fmt, lang):
+    def imports():
+        __import__(f"{fmt}_backend")
+
+    def run(size, workdir, stages):
+        backend = sys.modules[f"{fmt}_backend"]
+        with stages("deck"):
+            deck = synthetic_deck(lang, size)
+        path = os.path.join(workdir, f"deck-{lang}.{fmt}")
+        if fmt == "pptx":
+            with stages("build"):
+                prs = backend.build_presentation(deck)
+            with stages("save"):
+                prs.save(path)
+        elif fmt == "pdf":
+            with stages("story"):
+                story = backend.build_story(deck)
+            with stages("layout"):
+                backend.make_doc(deck, path).build(story)
+        else:
+            with stages("render"):
+                html = backend.build_html(deck)
+            with stages("write"):
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(html)
+
+    return "deck", imports, run
+
+
+def _cert_case(kind):
+    modules = {"svg": "certificate_svg", "pdf.merged": "certificate_pdf", "pdf.files": "certificate_pdf",
+               "metadata": "token_metadata"}
+
+    def imports():
+        __import__(modules[kind])
+
+    def run(size, workdir, stages):
+        module = sys.modules[modules[kind]]
+        with stages("records"):
+            records = synthetic_records(size)
+        if kind == "svg":
+            with stages("render"):
+                module.render_to_dir(records, os.path.join(workdir, "svg"), workers=1)
+        elif kind == "pdf.merged":
+            path = os.path.join(workdir, "merged.pdf")
+            if os.path.exists(path):
+                os.unlink(path)
+            with stages("render"):
+                module.render_merged(records, path, resume=False)
+        elif kind == "pdf.files":
+            with stages("render"):
+                module.render_certificates(records, os.path.join(workdir, "pdf"), workers=1)
+        else:
+            with stages("encode"):
+                module.token_uris(records)
+
+    return "cert", imports, run
+
+
+CASES = {}
+for _fmt in ("pptx", "pdf", "html"):
+    for _lang in DECK_LANGS:
+        CASES[f"deck.{_fmt}.{_lang}"] = _deck_case(_fmt, _lang)
+for _kind in ("svg", "pdf.merged", "pdf.files", "metadata"):
+    CASES[f"cert.{_kind}"] = _cert_case(_kind)
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:   # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def run_case_here(name, size, repeat=1):
+    """Run one case in this process; returns its result dict."""
+    sys.path.insert(0, PRESENTATION_DIR)
+    _, imports, run = CASES[name]
+    stages = Stages()
+    with stages("import"):
+        imports()
+    import_seconds = stages.times["import"]
+
+    best = None
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        for _ in range(repeat):
+            attempt = Stages()
+            started = time.perf_counter()
+            run(size, workdir, attempt)
+            wall = time.perf_counter() - started
+            if best is None or wall < best[0]:
+                best = (wall, attempt.times)
+    peak = peak_rss_mb()
+    return {
+        "case": name,
+        "size": size,
+        "wall": round(best[0], 6),
+        "stages": {"import": round(import_seconds, 6), **{k: round(v, 6) for k, v in best[1].items()}},
+        "peakRssMb": round(peak, 1) if peak is not None else None,
+        "repeat": repeat,
+    }
+
+
+def run_case(name, size, repeat=1, timeout=None):
+    """Run one case in a fresh interpreter so RSS and import costs are isolated."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "_case", name, str(size), "--repeat", str(repeat)],
+        capture_output=True, text=True, encoding="utf-8", timeout=timeout,
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        error = (result.stderr.strip().splitlines() or ["exit code %d" % result.returncode])[-1]
+        return {"case": name, "size": size, "error": error}
+    return json.loads(lines[-1])   # 後端的安裝訊息會印在前面
+
+
+def plan(suite, only=None, sizes=None):
+    chosen = [name for name in CASES if not only or any(fnmatch.fnmatch(name, p + "*") for p in only)]
+    runs = []
+    for name in chosen:
+        group = CASES[name][0]
+        for size in sizes or SUITES[suite][group]:
+            if size <= SIZE_LIMITS.get(name, size):
+                runs.append((name, size))
+    return runs
+
+
+def environment():
+    from importlib import metadata
+
+    packages = {}
+    for package in ("python-pptx", "reportlab", "lxml", "Pillow", "numpy"):
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            pass
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=HERE).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "packages": packages,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return ``(rows, regressions)`` comparing two result documents by (case, size)."""
+    base = {(r["case"], r["size"]): r for r in baseline["results"] if "error" not in r}
+    rows, regressions = [], []
+    for r in current["results"]:
+        b = base.get((r["case"], r["size"]))
+        if b is None or "error" in r:
+            continue
+        problems = []
+        if r["wall"] > b["wall"] * (1 + threshold) and r["wall"] - b["wall"] > MIN_SECONDS_DELTA:
+            problems.append("wall")
+        new_import, old_import = r["stages"].get("import", 0), b["stages"].get("import", 0)
+        if new_import > old_import * (1 + threshold) and new_import - old_import > MIN_SECONDS_DELTA:
+            problems.append("import")
+        if r.get("peakRssMb") and b.get("peakRssMb") and r["peakRssMb"] > b["peakRssMb"] * (1 + threshold) \
+                and r["peakRssMb"] - b["peakRssMb"] > MIN_RSS_DELTA_MB:
+            problems.append("rss")
+        row = (r, b, problems)
+        rows.append(row)
+        if problems:
+            regressions.append(row)
+    return rows, regressions
+
+
+def _ratio(new, old):
+    return f"{(new / old - 1) * 100:+.0f}%" if old else "n/a"
+
+
+def print_comparison(rows, regressions, threshold):
+    for r, b, problems in rows:
+        mark = "❌" if problems else "✅"
+        print(f"{mark} {r['case']:<18} {r['size']:>7}  wall {r['wall']:8.3f}s ({_ratio(r['wall'], b['wall'])})"
+              f"  import {r['stages'].get('import', 0):.3f}s"
+              f"  rss {r.get('peakRssMb') or 0:7.1f}MB ({_ratio(r.get('peakRssMb') or 0, b.get('peakRssMb') or 0)})"
+              + (f"  ← {', '.join(problems)}" if problems else ""))
+    if regressions:
+        print(f"❌ {len(regressions)} 項比基準慢 / 用更多記憶體超過 {threshold:.0%}")
+    else:
+        print(f"✅ 沒有超過 {threshold:.0%} 的退步 ({len(rows)} 項可比較)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the deck and certificate generators")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    r = sub.add_parser("run", help="run the benchmark suite")
+    r.add_argument("--suite", choices=sorted(SUITES), default="quick")
+    r.add_argument("--only", nargs="+", metavar="PREFIX", help="case name prefixes, e.g. deck.pdf cert.svg")
+    r.add_argument("--sizes", type=int, nargs="+", help="override the suite sizes")
+    r.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is kept")
+    r.add_argument("--timeout", type=float, default=1800, help="seconds per case")
+    r.add_argument("-o", "--output", default="bench-results.json")
+    r.add_argument("--baseline", help="fail when results regress against this file")
+    r.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown (0.15 = 15%%)")
+
+    c = sub.add_parser("compare", help="compare two result files")
+    c.add_argument("current")
+    c.add_argument("baseline")
+    c.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    sub.add_parser("list", help="list cases")
+
+    case = sub.add_parser("_case")   # 子程序進入點
+    case.add_argument("name", choices=sorted(CASES))
+    case.add_argument("size", type=int)
+    case.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.command == "_case":
+        print(json.dumps(run_case_here(args.name, args.size, args.repeat)))
+        return 0
+
+    if args.command == "list":
+        for name, (group, _, _) in CASES.items():
+            sizes = ", ".join(str(s) for s in SUITES["nightly"][group] if s <= SIZE_LIMITS.get(name, s))
+            print(f"{name:<18} nightly sizes: {sizes}")
+        return 0
+
+    if args.command == "compare":
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows, regressions = compare(current, baseline, args.threshold)
+        print_comparison(rows, regressions, args.threshold)
+        return 1 if regressions else 0
+
+    runs = plan(args.suite, args.only, args.sizes)
+    if not runs:
+        print("❌ 沒有符合的案例 (python scripts/benchmarks.py list)")
+        return 2
+    print(f"⏱️  {len(runs)} 項 ({args.suite}, 每項 {args.repeat} 次取最快)")
+    results = []
+    for name, size in runs:
+        try:
+            result = run_case(name, size, args.repeat, args.timeout)
+        except subprocess.TimeoutExpired:
+            result = {"case": name, "size": size, "error": f"timeout after {args.timeout:.0f}s"}
+        results.append(result)
+        if "error" in result:
+            print(f"❌ {name:<18} {size:>7}  {result['error']}")
+        else:
+            stages = "  ".join(f"{k} {v:.3f}" for k, v in result["stages"].items())
+            print(f"✅ {name:<18} {size:>7}  {result['wall']:8.3f}s  {result['peakRssMb'] or 0:7.1f}MB  [{stages}]")
+
+    document = {
+        "version": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "suite": args.suite,
+        "env": environment(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    print(f"📄 {args.output}")
+
+    failed = any("error" in r for r in results)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows, regressions = compare(document, baseline, args.threshold)
+        print_comparison(rows, regressions, args.threshold)
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+批量證書 PDF 產生器 - 以 ReportLab 為每位接收者輸出可列印的證書
+
+    python scripts/certificate_pdf.py metadata/*.json --out-dir certificates-pdf
+    python scripts/certificate_pdf.py records.jsonl --merged print-shop.pdf
+    python scripts/certificate_pdf.py records.jsonl --merged print-shop.pdf --trace cert-trace.json
+
+字型、樣式與每種證書類型的靜態版面只建立一次，之後每張證書只需繪製
+接收者相關的文字，適合畢業典禮等一次發行上萬張證書的情境。
+--trace 會記錄每張證書的繪製與寫檔時間 (Chrome trace，見 tracing.py)。
+"""
+
+try:
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib import colors
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.pdfgen import canvas
+    print("✓ reportlab installed")
+except ImportError:
+    print("✗ reportlab not installed")
+    print("Please run: pip install reportlab")
+    import sys
+    sys.exit(1)
+
+import argparse
+import hashlib
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+
+from certificates import CERTIFICATE_TYPES, coerce_record, format_issue_date, iter_records, load_records
+from pdf_stream import PageOps, StreamingPdfWriter, bmp_text
+
+# 與簡報相同的配色 (#764ba2 / #667eea)
+PURPLE_DARK = colors.HexColor('#764ba2')
+PURPLE_LIGHT = colors.HexColor('#667eea')
+TEXT_DARK = colors.HexColor('#333333')
+PAPER = colors.HexColor('#fdfcff')
+
+CJK_FONT = 'MSung-Light'  # ReportLab 內建的繁體中文 CID 字型
+LATIN_FONT = 'Helvetica'
+LATIN_BOLD = 'Helvetica-Bold'
+
+
+@lru_cache(maxsize=None)
+def _register_fonts():
+    pdfmetrics.registerFont(UnicodeCIDFont(CJK_FONT))
+    return True
+
+
+class CertificateTemplate:
+    """Page geometry, fonts and pre-computed static artwork for every certificate type."""
+
+    def __init__(self, pagesize=landscape(A4), compress=False):
+        _register_fonts()
+        self.pagesize = pagesize
+        self.width, self.height = pagesize
+        self.compress = compress
+        self.message_width = self.width - 220
+        # 每種證書類型的靜態繪圖指令只計算一次
+        self.static_ops = {t: self._static_ops(CERTIFICATE_TYPES[t]) for t in CERTIFICATE_TYPES}
+
+    def _static_ops(self, cert_type):
+        w, h = self.width, self.height
+        accent = colors.HexColor(cert_type.color)
+        cx = w / 2
+        return (
+            ("setFillColor", (PAPER,)),
+            ("rect", (0, 0, w, h), {"stroke": 0, "fill": 1}),
+            ("setStrokeColor", (PURPLE_DARK,)),
+            ("setLineWidth", (4,)),
+            ("roundRect", (20, 20, w - 40, h - 40, 18), {"stroke": 1, "fill": 0}),
+            ("setStrokeColor", (PURPLE_LIGHT,)),
+            ("setLineWidth", (1.5,)),
+            ("roundRect", (34, 34, w - 68, h - 68, 12), {"stroke": 1, "fill": 0}),
+            ("setStrokeColor", (accent,)),
+            ("setLineWidth", (2,)),
+            ("line", (cx - 220, h - 170, cx + 220, h - 170)),
+            ("setFillColor", (PURPLE_DARK,)),
+            ("setFont", (CJK_FONT, 14)),
+            ("drawCentredString", (cx, h - 70, "永恆數位榮譽證書")),
+            ("setFont", (LATIN_FONT, 10)),
+            ("drawCentredString", (cx, h - 86, "Eternal Digital Honor Certificate")),
+            ("setFont", (CJK_FONT, 32)),
+            ("drawCentredString", (cx, h - 130, cert_type.title)),
+            ("setFillColor", (PURPLE_LIGHT,)),
+            ("setFont", (LATIN_BOLD, 16)),
+            ("drawCentredString", (cx, h - 155, cert_type.name_en)),
+            ("setFillColor", (TEXT_DARK,)),
+            ("setFont", (CJK_FONT, 18)),
+            ("drawCentredString", (cx, h - 215, "特此證明")),
+            ("setFillColor", (PURPLE_LIGHT,)),
+            ("setFont", (CJK_FONT, 9)),
+            ("drawCentredString", (cx, 52, "此證書已記錄於以太坊區塊鏈，可永久驗證真偽")),
+        )
+
+    def draw_static(self, c, cert_type):
+        for op in self.static_ops[cert_type]:
+            name, args = op[0], op[1]
+            kwargs = op[2] if len(op) > 2 else {}
+            getattr(c, name)(*args, **kwargs)
+
+    def draw_record(self, c, record):
+        """Draw the recipient-specific text on top of the static artwork."""
+        cx, h = self.width / 2, self.height
+
+        c.setFillColor(PURPLE_DARK)
+        c.setFont(CJK_FONT, 36)
+        # CJK 字型只涵蓋 BMP：逐張與合併輸出都把 emoji 等字元畫成 □
+        c.drawCentredString(cx, h - 270, bmp_text(record.recipient_name))
+
+        c.setFillColor(TEXT_DARK)
+        message = bmp_text(record.custom_message or "已獲得此項殊榮")
+        y = h - 310
+        c.setFont(CJK_FONT, 16)
+        for line in simpleSplit(message, CJK_FONT, 16, self.message_width)[:3]:
+            c.drawCentredString(cx, y, line)
+            y -= 22
+
+        c.setFont(CJK_FONT, 13)
+        c.drawCentredString(cx, 130, f"發行者: {bmp_text(record.issuer_name)}")
+        if record.issue_date:
+            c.drawCentredString(cx, 110, f"發行日期: {format_issue_date(record.issue_date)}")
+        if record.token_id is not None:
+            c.setFont(LATIN_FONT, 10)
+            c.drawCentredString(cx, 90, f"Token ID #{record.token_id}")
+
+    def draw_page(self, c, record):
+        self.draw_static(c, record.cert_type)
+        self.draw_record(c, record)
+
+    def new_canvas(self, target):
+        c = canvas.Canvas(target, pagesize=self.pagesize, pageCompression=int(self.compress), invariant=1)
+        c.setTitle("Eternal Digital Honor Certificate")
+        return c
+
+
+@lru_cache(maxsize=None)
+def default_template(compress=False):
+    return CertificateTemplate(compress=compress)
+
+
+def certificate_filename(record, index):
+    if record.token_id is not None:
+        return f"certificate-{record.token_id}.pdf"
+    return f"certificate-{index:06d}.pdf"
+
+
+def render_certificate(record, path, template=None):
+    """Write one single-page certificate PDF and return its path."""
+    template = template or default_template()
+    c = template.new_canvas(path)
+    template.draw_page(c, record)
+    c.showPage()
+    c.save()
+    return path
+
+
+def _traced_certificate(record, path, template, tracer, index):
+    with tracer.span("cert.draw", index=index, type=record.cert_type):
+        c = template.new_canvas(path)
+        template.draw_page(c, record)
+        c.showPage()
+    with tracer.span("cert.save", index=index) as info:
+        c.save()
+    info["bytes"] = os.path.getsize(path)
+    tracer.count("certificates")
+    tracer.count("write.bytes", info["bytes"])
+    return path
+
+
+def _render_chunk(chunk, out_dir, compress):
+    template = default_template(compress)
+    return [
+        render_certificate(record, os.path.join(out_dir, certificate_filename(record, index)), template)
+        for index, record in chunk
+    ]
+
+
+def render_certificates(records, out_dir, template=None, workers=1, chunk_size=500, tracer=None):
+    """Render one PDF per record into *out_dir* and return the written paths.
+
+    *records* may be CertificateRecord objects, metadata/*.json documents or
+    JS-style certData dicts. With ``workers > 1`` chunks of records are
+    rendered in a process pool, each worker building its template once.
+    A *tracer* times every certificate and always renders in this process.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    items = [(i, coerce_record(r)) for i, r in enumerate(records)]
+
+    if tracer:
+        with tracer.span("template"):
+            template = template or default_template()
+        return [
+            _traced_certificate(record, os.path.join(out_dir, certificate_filename(record, index)),
+                                template, tracer, index)
+            for index, record in items
+        ]
+    if workers <= 1:
+        template = template or default_template()
+        return [
+            render_certificate(record, os.path.join(out_dir, certificate_filename(record, index)), template)
+            for index, record in items
+        ]
+
+    compress = template.compress if template else False
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    paths = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_paths in pool.map(_render_chunk, chunks, [out_dir] * len(chunks), [compress] * len(chunks)):
+            paths.extend(chunk_paths)
+    return paths
+
+
+def _stage(tracer, name, **args):
+    return tracer.span(name, **args) if tracer else nullcontext(args)
+
+
+def files_digest(paths):
+    """SHA-256 over the contents of the record files, in order (the *input_digest* of a CLI run)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def render_merged(records, path, template=None, resume=True, group_size=1000, tracer=None, input_digest=None):
+    """Stream every record into one multi-page PDF at *path* and return the page count.
+
+    Pages are written to disk as they are produced, so memory stays flat no
+    matter how many records there are; *records* may be any iterable,
+    including a generator. After every *group_size* pages a checkpoint is
+    saved next to the output, and a rerun with ``resume=True`` and the same
+    *input_digest* (see :func:`files_digest`) skips the pages already on disk
+    instead of starting over; without a digest the run always starts over.
+    A *tracer* times the set-up, every page's drawing and write, and the
+    final close.
+    """
+    with _stage(tracer, "template"):
+        template = template or default_template()
+    writer = StreamingPdfWriter(path, template.pagesize, template.compress, group_size, input_digest)
+    with _stage(tracer, "merged.open") as info:
+        done = writer.open(resume)
+        info["resumed_pages"] = done
+
+    with _stage(tracer, "merged.resources"):
+        fonts = writer.register_fonts(cid_fonts=(CJK_FONT,), standard_fonts=(LATIN_FONT, LATIN_BOLD))
+        state = writer.resources
+        if "page" not in state:
+            # 每種證書類型的靜態版面只寫一次 (Form XObject)，每頁以 Do 引用
+            form_resources = writer.write_resources()
+            forms = {}
+            for t in CERTIFICATE_TYPES:
+                ops = PageOps(fonts)
+                template.draw_static(ops, t)
+                forms[f"T{t}"] = writer.write_form(ops.getvalue(), form_resources)
+            state["page"] = writer.write_resources(forms)
+
+    if tracer:
+        _traced_pages(writer, template, fonts, state["page"], itertools.islice(records, done, None), done, tracer)
+    else:
+        for value in itertools.islice(records, done, None):
+            record = coerce_record(value)
+            ops = PageOps(fonts)
+            template.draw_record(ops, record)
+            writer.add_page(b"q /T%d Do Q\n" % record.cert_type + ops.getvalue(), state["page"])
+
+    with _stage(tracer, "merged.close"):
+        pages = writer.close()
+    if tracer:
+        tracer.count("write.bytes", os.path.getsize(path))
+    return pages
+
+
+def _traced_pages(writer, template, fonts, resources, values, start, tracer):
+    for index, value in enumerate(values, start + 1):
+        with tracer.span("cert.draw", page=index) as info:
+            record = coerce_record(value)
+            ops = PageOps(fonts)
+            template.draw_record(ops, record)
+            content = b"q /T%d Do Q\n" % record.cert_type + ops.getvalue()
+            info["type"] = record.cert_type
+        with tracer.span("cert.write", page=index, bytes=len(content)):
+            writer.add_page(content, resources)
+        tracer.count("certificates")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render certificate PDFs in bulk")
+    parser.add_argument("inputs", nargs="+", help="metadata .json / records .jsonl files")
+    parser.add_argument("--out-dir", default="certificates-pdf")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--compress", action="store_true", help="deflate page streams (smaller, slower)")
+    parser.add_argument("--merged", metavar="PDF", help="stream all certificates into one multi-page PDF")
+    parser.add_argument("--no-resume", action="store_true", help="ignore an existing --merged checkpoint")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace of every certificate (single process)")
+    args = parser.parse_args(argv)
+
+    tracer = None
+    if args.trace:
+        from tracing import Tracer
+        tracer = Tracer("certificate_pdf")
+        if args.workers > 1 and not args.merged:
+            print("⚠️  --trace 以單一 process 產生，忽略 --workers")
+
+    if args.merged:
+        print(f"📄 串流產生合併 PDF {args.merged}...")
+        started = time.perf_counter()
+        pages = render_merged(iter_records(args.inputs), args.merged, default_template(args.compress),
+                              resume=not args.no_resume, tracer=tracer, input_digest=files_digest(args.inputs))
+        elapsed = time.perf_counter() - started
+        print(f"✅ 已輸出 {pages} 頁到 {args.merged} ({elapsed:.2f}s)")
+    else:
+        records = load_records(args.inputs)
+        print(f"📄 開始產生 {len(records)} 張證書 PDF...")
+        started = time.perf_counter()
+        paths = render_certificates(records, args.out_dir, default_template(args.compress), workers=args.workers,
+                                    tracer=tracer)
+        elapsed = time.perf_counter() - started
+        rate = len(paths) / elapsed if elapsed else float('inf')
+        print(f"✅ 已輸出 {len(paths)} 個檔案到 {args.out_dir} ({elapsed:.2f}s, {rate:.0f} 張/秒)")
+
+    if tracer:
+        from tracing import print_summary, write_chrome_trace
+        events = tracer.finish()
+        write_chrome_trace(args.trace, events)
+        print(f"🔍 Trace 已寫入 {args.trace} (可用 chrome://tracing 或 ui.perfetto.dev 開啟)")
+        print_summary(events)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
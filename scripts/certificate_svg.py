@@ -0,0 +1,266 @@
+"""
+證書 SVG 產生器 - 以 images/certificates/template.svg 預先編譯的模板批量產生證書圖片
+
+    python scripts/certificate_svg.py records.jsonl -o images/certificates/issued --workers 4
+    python scripts/certificate_svg.py records.jsonl --verify 200     # 與 JS createCertificateSVG 逐位元組比對
+    python scripts/certificate_svg.py records.jsonl -o out --trace svg-trace.json   # 每張證書的產生 / 寫檔耗時
+
+template.svg 是 generate-certificate-images.js 以類型 0 與佔位文字產生的母版。
+載入時只解析一次：把類型相關的顏色 / 標題 / emoji 與接收者、發行者、訊息、
+日期等欄位切成固定片段與插槽，並針對每種證書類型預先填好類型欄位，
+之後每張證書只需要一次 join。
+
+輸出與 createCertificateSVG 逐位元組相同；差別只在 escape=True (預設) 時，
+姓名與訊息中的 & < > 會轉成 XML entity (JS 版直接插入，遇到這些字元會產生
+無效的 SVG)。
+"""
+
+import argparse
+import functools
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from xml.sax.saxutils import escape as xml_escape
+
+from certificates import CERTIFICATE_TYPES, coerce_record, format_issue_date, iter_records
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "..", "images", "certificates", "template.svg")
+TEMPLATE_TYPE = 0
+DEFAULT_MESSAGE = "已獲得此項殊榮"
+
+# template.svg 中的佔位文字 → 插槽名稱
+PLACEHOLDERS = {
+    "[接收者姓名]": "recipient_name",
+    "[發行者姓名]": "issuer_name",
+    "[自定義訊息]": "custom_message",
+}
+RECORD_SLOTS = ("recipient_name", "issuer_name", "custom_message", "issue_date")
+_DATE_PATTERN = r"(?<=發行日期: )\d{4}/\d{1,2}/\d{1,2}"
+
+
+def _type_values(cert_type):
+    return {
+        "title": cert_type.title,
+        "title_en": cert_type.name_en,
+        "emoji": cert_type.emoji,
+        "color": cert_type.color,
+        "bg_color": cert_type.bg_color,
+        "accent_color": cert_type.accent_color,
+    }
+
+
+class CompiledTemplate:
+    """Template split into fixed fragments around named slots.
+
+    ``fragments[i]`` precedes ``slots[i]``; the last fragment follows the last slot.
+    """
+
+    def __init__(self, fragments, slots):
+        assert len(fragments) == len(slots) + 1
+        self.fragments = tuple(fragments)
+        self.slots = tuple(slots)
+
+    @classmethod
+    def parse(cls, text):
+        literals = {value: name for value, name in PLACEHOLDERS.items()}
+        for name, value in _type_values(CERTIFICATE_TYPES[TEMPLATE_TYPE]).items():
+            literals[value] = name
+        alternatives = [re.escape(v) for v in sorted(literals, key=len, reverse=True)]
+        pattern = re.compile(f"({_DATE_PATTERN}|{'|'.join(alternatives)})")
+
+        pieces = pattern.split(text)
+        slots = [literals.get(token, "issue_date") for token in pieces[1::2]]
+        missing = set(RECORD_SLOTS) - set(slots)
+        if missing:
+            raise ValueError(f"template is missing slots: {', '.join(sorted(missing))}")
+        return cls(pieces[0::2], slots)
+
+    def specialize(self, values):
+        """Fill the slots named in *values* and merge the fixed fragments around them."""
+        fragments, slots = [self.fragments[0]], []
+        for slot, fragment in zip(self.slots, self.fragments[1:]):
+            if slot in values:
+                fragments[-1] += values[slot] + fragment
+            else:
+                slots.append(slot)
+                fragments.append(fragment)
+        return CompiledTemplate(fragments, slots)
+
+    def render(self, values):
+        parts = [self.fragments[0]]
+        for slot, fragment in zip(self.slots, self.fragments[1:]):
+            parts.append(values[slot])
+            parts.append(fragment)
+        return "".join(parts)
+
+
+class SvgRenderer:
+    """Per-type specialized templates; ``render(record)`` returns the SVG text."""
+
+    def __init__(self, template_path=TEMPLATE_PATH, escape=True):
+        with open(template_path, encoding="utf-8") as f:
+            base = CompiledTemplate.parse(f.read())
+        self.escape = escape
+        self.templates = {
+            type_id: base.specialize(_type_values(cert_type))
+            for type_id, cert_type in CERTIFICATE_TYPES.items()
+        }
+
+    def render(self, value):
+        record = coerce_record(value)
+        text = xml_escape if self.escape else str
+        template = self.templates.get(record.cert_type, self.templates[TEMPLATE_TYPE])
+        return template.render({
+            "recipient_name": text(record.recipient_name),
+            "issuer_name": text(record.issuer_name),
+            "custom_message": text(record.custom_message or DEFAULT_MESSAGE),
+            "issue_date": format_issue_date(record.issue_date),
+        })
+
+
+@functools.lru_cache(maxsize=None)
+def _renderer(template_path, escape):
+    return SvgRenderer(template_path, escape)
+
+
+def render_svg(record, template_path=TEMPLATE_PATH, escape=True):
+    return _renderer(template_path, escape).render(record)
+
+
+def svg_filename(record, index):
+    if record.token_id is not None:
+        return f"certificate-{record.token_id}.svg"
+    return f"{record.type.slug}-{index}.svg"
+
+
+def _render_chunk(args):
+    start, values, out_dir, template_path, escape = args
+    renderer = _renderer(template_path, escape)
+    for i, value in enumerate(values, start):
+        record = coerce_record(value)
+        with open(os.path.join(out_dir, svg_filename(record, i)), "w", encoding="utf-8", newline="") as f:
+            f.write(renderer.render(record))
+    return len(values)
+
+
+def _render_traced(records, out_dir, template_path, escape, tracer):
+    with tracer.span("template", path=template_path):
+        renderer = _renderer(template_path, escape)
+    count = 0
+    for index, value in enumerate(records, 1):
+        with tracer.span("svg.render", index=index) as info:
+            record = coerce_record(value)
+            svg = renderer.render(record)
+            info["type"] = record.cert_type
+        with tracer.span("svg.write", index=index) as info:
+            with open(os.path.join(out_dir, svg_filename(record, index)), "w", encoding="utf-8", newline="") as f:
+                f.write(svg)
+                info["bytes"] = f.tell()
+        tracer.count("certificates")
+        tracer.count("write.bytes", info["bytes"])
+        count += 1
+    return count
+
+
+def render_to_dir(records, out_dir, workers=1, chunk_size=2000, template_path=TEMPLATE_PATH, escape=True,
+                  tracer=None):
+    """Write one SVG per record into *out_dir*; returns the number written.
+
+    A *tracer* times every certificate's render and write, in this process.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    if tracer:
+        return _render_traced(records, out_dir, template_path, escape, tracer)
+    records = iter(records)
+
+    def chunks():
+        start = 1
+        while True:
+            values = list(islice(records, chunk_size))
+            if not values:
+                return
+            yield start, values, out_dir, template_path, escape
+            start += len(values)
+
+    if workers <= 1:
+        return sum(map(_render_chunk, chunks()))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_render_chunk, chunks()))
+
+
+_JS_RENDER = """
+const { createCertificateSVG } = require(process.argv[1]);
+let input = '';
+process.stdin.setEncoding('utf8');
+process.stdin.on('data', (d) => input += d).on('end', () => {
+  const out = JSON.parse(input).map((r) =>
+    createCertificateSVG(r.certType, r.recipientName, r.issuerName, r.issueDate, r.customMessage));
+  process.stdout.write(JSON.stringify(out));
+});
+"""
+
+
+def verify_against_js(records, template_path=TEMPLATE_PATH):
+    """Render *records* with the JS generator (node) and return indices that differ."""
+    records = [coerce_record(r) for r in records]
+    payload = [{
+        "certType": r.cert_type, "recipientName": r.recipient_name, "issuerName": r.issuer_name,
+        "issueDate": r.issue_date, "customMessage": r.custom_message,
+    } for r in records]
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generate-certificate-images.js")
+    result = subprocess.run(
+        ["node", "-e", _JS_RENDER, script], input=json.dumps(payload, ensure_ascii=False),
+        capture_output=True, text=True, encoding="utf-8", check=True,
+    )
+    expected = json.loads(result.stdout)
+    renderer = SvgRenderer(template_path, escape=False)
+    return [i for i, (r, svg) in enumerate(zip(records, expected)) if renderer.render(r) != svg]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render certificate SVGs from the pre-compiled template")
+    parser.add_argument("inputs", nargs="+", help="records .json / .jsonl (metadata documents or certData objects)")
+    parser.add_argument("-o", "--out-dir", default=os.path.join("images", "certificates", "issued"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--template", default=TEMPLATE_PATH)
+    parser.add_argument("--no-escape", action="store_true", help="insert text unescaped, exactly like the JS generator")
+    parser.add_argument("--verify", type=int, metavar="N", help="compare the first N records with the JS generator (needs node)")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace of every certificate (single process)")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        records = list(islice(iter_records(args.inputs), args.verify))
+        bad = verify_against_js(records, args.template)
+        if bad:
+            print(f"❌ {len(bad)}/{len(records)} 張與 JS 版本不同 (第一筆: #{bad[0] + 1})")
+            return 1
+        print(f"✅ {len(records)} 張與 createCertificateSVG 逐位元組相同")
+        return 0
+
+    tracer = None
+    if args.trace:
+        from tracing import Tracer
+        tracer = Tracer("certificate_svg")
+
+    start = time.perf_counter()
+    count = render_to_dir(iter_records(args.inputs), args.out_dir, args.workers,
+                          template_path=args.template, escape=not args.no_escape, tracer=tracer)
+    elapsed = time.perf_counter() - start
+    print(f"✅ 已產生 {count} 張證書 SVG 到 {args.out_dir} ({elapsed:.1f}s)")
+
+    if tracer:
+        from tracing import print_summary, write_chrome_trace
+        events = tracer.finish()
+        write_chrome_trace(args.trace, events)
+        print(f"🔍 Trace 已寫入 {args.trace} (可用 chrome://tracing 或 ui.perfetto.dev 開啟)")
+        print_summary(events)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
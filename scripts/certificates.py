@@ -0,0 +1,188 @@
+"""
+證書資料模型 - 與 EternalDigitalHonorCertificate 合約及 JS 腳本共用的證書類型與紀錄格式
+
+Python 版的證書工具 (PDF、SVG、metadata、索引...) 都從這裡取得證書類型定義，
+並把 metadata/*.json 或 JS 腳本的 certData 物件統一轉成 CertificateRecord。
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class CertificateType:
+    id: int
+    key: str            # 合約 enum 名稱
+    name_en: str        # getCertificateTypeName
+    name_zh: str        # getCertificateTypeNameChinese
+    title: str          # 證書圖片上的中文標題 (generate-certificate-images.js)
+    slug: str
+    emoji: str
+    color: str
+    bg_color: str
+    accent_color: str
+
+
+# 順序必須與合約的 CertificateType enum 一致
+CERTIFICATE_TYPES = {
+    0: CertificateType(
+        0, "BLOCKCHAIN_PIONEER", "Blockchain Pioneer Certificate", "區塊鏈先驅者證書",
+        "區塊鏈先驅者證書", "blockchain-pioneer", "🚀", "#FFD700", "#1a1a2e", "#00d4aa",
+    ),
+    1: CertificateType(
+        1, "ETERNAL_FRIENDSHIP", "Eternal Friendship Certificate", "友情不滅證書",
+        "友情不滅證書", "eternal-friendship", "💝", "#FF69B4", "#2d1b69", "#ff9a9e",
+    ),
+    2: CertificateType(
+        2, "WEB3_CITIZEN", "Web3.0 Citizen Certificate", "Web3.0 公民證",
+        "Web3.0 公民證", "web3-citizen", "🌐", "#00BFFF", "#0f3460", "#667eea",
+    ),
+    3: CertificateType(
+        3, "COURSE_COMPLETION", "Course Completion Certificate", "區塊鏈課程完成證明",
+        "課程完成證明", "course-completion", "🎓", "#32CD32", "#1e3c72", "#a8edea",
+    ),
+}
+
+UNKNOWN_TYPE_NAME_EN = "Unknown Certificate"
+UNKNOWN_TYPE_NAME_ZH = "未知證書"
+
+_TYPES_BY_NAME = {}
+for _t in CERTIFICATE_TYPES.values():
+    for _name in (_t.key, _t.name_en, _t.name_zh, _t.title, _t.slug):
+        _TYPES_BY_NAME[_name.lower()] = _t.id
+
+
+def certificate_type(value):
+    """Resolve an enum id, enum key, English/Chinese name or slug to a type id."""
+    if isinstance(value, int):
+        if value not in CERTIFICATE_TYPES:
+            raise ValueError(f"Unknown certificate type: {value}")
+        return value
+    text = str(value).strip()
+    if text.isdigit():
+        return certificate_type(int(text))
+    try:
+        return _TYPES_BY_NAME[text.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown certificate type: {value!r}") from None
+
+
+def type_name(cert_type):
+    """English type name exactly as ``getCertificateTypeName`` returns it."""
+    t = CERTIFICATE_TYPES.get(cert_type)
+    return t.name_en if t else UNKNOWN_TYPE_NAME_EN
+
+
+def format_issue_date(issue_date):
+    """Format a unix timestamp like ``toLocaleDateString('zh-TW')`` (e.g. 2025/10/4)."""
+    if isinstance(issue_date, str):
+        return issue_date
+    d = datetime.fromtimestamp(int(issue_date))
+    return f"{d.year}/{d.month}/{d.day}"
+
+
+def unix_date(value):
+    """A unix timestamp from an int, digit string, ``YYYY-MM-DD`` or ``date`` (midnight UTC)."""
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.isdigit()):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            value = date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"issueDate {value!r} 不是 unix 秒數或 YYYY-MM-DD 日期") from None
+    return int(datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp())
+
+
+@dataclass(frozen=True)
+class CertificateRecord:
+    """One issued (or to-be-issued) certificate, mirroring the contract struct."""
+
+    cert_type: int
+    recipient_name: str
+    issuer_name: str
+    custom_message: str = ""
+    issue_date: object = 0        # unix timestamp (int) or a preformatted date string
+    image_uri: str = ""
+    token_id: Optional[int] = None
+    recipient: str = ""           # wallet address
+    extra: dict = field(default_factory=dict, compare=False, hash=False)
+
+    @property
+    def type(self):
+        return CERTIFICATE_TYPES[self.cert_type]
+
+    @classmethod
+    def from_metadata(cls, data):
+        """Parse an ERC-721 metadata document shaped like metadata/*.json."""
+        traits = {a.get("trait_type"): a.get("value") for a in data.get("attributes", [])}
+        name = data.get("name", "")
+        token_id = None
+        if "#" in name:
+            tail = name.rsplit("#", 1)[1].strip()
+            token_id = int(tail) if tail.isdigit() else None
+        issue_date = traits.get("Issue Date", 0)
+        if isinstance(issue_date, str) and issue_date.isdigit():
+            issue_date = int(issue_date)
+        return cls(
+            cert_type=certificate_type(traits.get("Certificate Type", 0)),
+            recipient_name=traits.get("Recipient", ""),
+            issuer_name=traits.get("Issuer", ""),
+            custom_message=traits.get("Custom Message", ""),
+            issue_date=issue_date,
+            image_uri=data.get("image", ""),
+            token_id=token_id,
+            extra={k: v for k, v in traits.items() if k not in _METADATA_TRAITS},
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Accept JS-style ``certData`` objects (camelCase) or snake_case keys."""
+        def pick(*keys, default=""):
+            for key in keys:
+                if key in data and data[key] is not None:
+                    return data[key]
+            return default
+
+        token_id = pick("tokenId", "token_id", default=None)
+        return cls(
+            cert_type=certificate_type(pick("certType", "cert_type", default=0)),
+            recipient_name=str(pick("recipientName", "recipient_name")),
+            issuer_name=str(pick("issuerName", "issuer_name")),
+            custom_message=str(pick("customMessage", "custom_message")),
+            issue_date=pick("issueDate", "issue_date", default=0),
+            image_uri=str(pick("imageURI", "image_uri", "image")),
+            token_id=int(token_id) if token_id is not None else None,
+            recipient=str(pick("recipient", "address", "to")),
+        )
+
+
+_METADATA_TRAITS = {"Certificate Type", "Recipient", "Issuer", "Custom Message", "Issue Date"}
+
+
+def coerce_record(value):
+    """Turn a CertificateRecord, metadata document or certData dict into a record."""
+    if isinstance(value, CertificateRecord):
+        return value
+    if "attributes" in value:
+        return CertificateRecord.from_metadata(value)
+    return CertificateRecord.from_dict(value)
+
+
+def iter_records(paths):
+    """Yield records from .json (one document or a list) and .jsonl files."""
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            if path.endswith('.jsonl'):
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+                continue
+            data = json.load(f)
+        yield from (data if isinstance(data, list) else [data])
+
+
+def load_records(paths):
+    """Read records from .json (one document or a list) and .jsonl files."""
+    return list(iter_records(paths))
@@ -0,0 +1,513 @@
+"""
+鏈上讀取工具 - 以 JSON-RPC 直接呼叫 EternalDigitalHonorCertificate 的 view 函數
+
+Python 工具不依賴 web3.py：函數選擇器預先算好，回傳值只需要解碼
+uint256 與 string 兩種 ABI 型別。大量讀取時 RpcClient 會把多個 eth_call
+打包成 JSON-RPC batch，並透過 keep-alive 連線池平行送出。
+
+    python scripts/chain.py read 1-10000 -o certificates.jsonl
+    python scripts/chain.py bench --count 10000     # 本地 hardhat：逐筆 eth_call 對照 batch
+
+    RPC_URL / SEPOLIA_RPC_URL   RPC 節點 (預設 hardhat localhost)
+    CONTRACT_ADDRESS            合約地址
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from certificates import CertificateRecord
+
+DEFAULT_RPC_URL = "http://127.0.0.1:8545"
+
+# keccak256(signature)[:4]
+SELECTORS = {
+    "tokenURI": "c87b56dd",                 # tokenURI(uint256)
+    "certificates": "663b3e22",             # certificates(uint256)
+    "ownerOf": "6352211e",                  # ownerOf(uint256)
+    "balanceOf": "70a08231",                # balanceOf(address)
+    "getTotalCertificates": "7843bb79",     # getTotalCertificates()
+    "getCertificatesByOwner": "1db73840",   # getCertificatesByOwner(address)
+    "certificateImages": "f536af96",        # certificateImages(uint8)
+    "updateCertificateImage": "39452346",   # updateCertificateImage(uint8,string)
+    "owner": "8da5cb5b",                    # owner()
+    "issueCertificate": "0f9ad5b3",         # issueCertificate(address,uint8,string,string,string)
+    "batchIssueCertificates": "2fe5ec63",   # batchIssueCertificates(address[],uint8,string[],string,string)
+}
+
+# keccak256(event signature)
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+CERTIFICATE_ISSUED_TOPIC = "0x39e490e40a39165131389ffbdacb14be9ba3168fcfc2b97555d3d12c4f100fa6"
+
+ZERO_ADDRESS = "0x" + "0" * 40
+
+
+class RpcError(Exception):
+    """A JSON-RPC error response (including reverted calls)."""
+
+
+def default_rpc_url():
+    return os.environ.get("RPC_URL") or os.environ.get("SEPOLIA_RPC_URL") or DEFAULT_RPC_URL
+
+
+def default_contract_address():
+    return os.environ.get("CONTRACT_ADDRESS")
+
+
+# JSON-RPC 錯誤碼中代表「請稍後再試」的 (各家節點服務不同)
+RATE_LIMIT_CODES = {429, -32005, -32029}
+
+
+class RpcClient:
+    """JSON-RPC over pooled keep-alive connections.
+
+    ``batch()`` packs calls into JSON-RPC batch arrays of *batch_size*
+    and sends up to *concurrency* of them at once. HTTP 429/503 responses and
+    rate-limit error codes are retried with jittered exponential backoff,
+    honouring ``Retry-After`` when the node sends it.
+    """
+
+    def __init__(self, url=None, batch_size=100, concurrency=4, retries=5, backoff=0.5, timeout=30):
+        self.url = url or default_rpc_url()
+        parts = urllib.parse.urlsplit(self.url)
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._netloc = parts.netloc
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.round_trips = 0
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+    def _post(self, payload):
+        """POST one JSON body, retrying throttled responses and dropped connections."""
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        for attempt in range(self.retries + 1):
+            with self._slots:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    conn = self._connection_class(self._netloc, timeout=self.timeout)
+                try:
+                    conn.request("POST", self._path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    if attempt == self.retries:
+                        raise
+                    continue
+                if response.will_close:
+                    conn.close()
+                else:
+                    self._idle.put(conn)
+            with self._lock:
+                self.round_trips += 1
+            if response.status in (429, 503):
+                if attempt < self.retries:
+                    time.sleep(self._delay(attempt, response.getheader("Retry-After")))
+                continue
+            if response.status >= 400:
+                raise RpcError(f"HTTP {response.status}: {data[:200].decode(errors='replace')}")
+            return json.loads(data)
+        raise RpcError(f"rate limited by {self._netloc} after {self.retries} retries")
+
+    def call(self, method, params):
+        reply = self._post({"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params})
+        if "error" in reply:
+            raise RpcError(reply["error"].get("message", reply["error"]))
+        return reply["result"]
+
+    def _send_batch(self, calls):
+        results = [None] * len(calls)
+        pending = list(range(len(calls)))
+        for attempt in range(self.retries + 1):
+            ids = {next(self._ids): i for i in pending}
+            replies = self._post([
+                {"jsonrpc": "2.0", "id": request_id, "method": calls[i][0], "params": calls[i][1]}
+                for request_id, i in ids.items()
+            ])
+            if isinstance(replies, dict):   # 部分節點對整批錯誤只回一個物件
+                replies = [dict(replies, id=request_id) for request_id in ids]
+            retry = []
+            for reply in replies if isinstance(replies, list) else ():
+                i = ids.pop(reply.get("id") if isinstance(reply, dict) else None, None)
+                if i is None:
+                    continue   # 不認得或重複的 id
+                error = reply.get("error")
+                if error is None:
+                    results[i] = reply.get("result")
+                elif error.get("code") in RATE_LIMIT_CODES and attempt < self.retries:
+                    retry.append(i)
+                else:
+                    results[i] = RpcError(error.get("message", error))
+            # 沒有回覆的項目重送；最後一次仍沒有回覆就標成錯誤，不留 None 冒充結果
+            for i in ids.values():
+                if attempt < self.retries:
+                    retry.append(i)
+                else:
+                    results[i] = RpcError(f"missing reply for {calls[i][0]}")
+            if not retry:
+                return results
+            pending = sorted(retry)
+            time.sleep(self._delay(attempt))
+        return results
+
+    def batch(self, calls, raise_errors=True):
+        """Run ``[(method, params), ...]`` and return the results in order.
+
+        With ``raise_errors=False`` failed calls come back as :class:`RpcError`
+        instances in their slot instead of raising.
+        """
+        chunks = [calls[i:i + self.batch_size] for i in range(0, len(calls), self.batch_size)]
+        if len(chunks) <= 1:
+            results = self._send_batch(calls) if calls else []
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                results = [r for chunk in pool.map(self._send_batch, chunks) for r in chunk]
+        if raise_errors:
+            for result in results:
+                if isinstance(result, RpcError):
+                    raise result
+        return results
+
+
+@lru_cache(maxsize=None)
+def shared_client(url):
+    """One pooled client per node URL, shared by the helpers below."""
+    return RpcClient(url)
+
+
+def rpc_call(url, method, params):
+    return shared_client(url).call(method, params)
+
+
+def block_number(url):
+    return int(rpc_call(url, "eth_blockNumber", []), 16)
+
+
+def get_logs(url, address, topics, from_block, to_block):
+    """``eth_getLogs`` for one block range (inclusive)."""
+    return rpc_call(url, "eth_getLogs", [{
+        "address": address,
+        "topics": topics,
+        "fromBlock": hex(from_block),
+        "toBlock": hex(to_block),
+    }])
+
+
+# -- ABI ------------------------------------------------------------------
+
+def encode_uint256(value):
+    return f"{int(value):064x}"
+
+
+def encode_address(address):
+    return address.lower().removeprefix("0x").rjust(64, "0")
+
+
+def _pad32(data):
+    return data + bytes(-len(data) % 32)
+
+
+def _abi_dynamic(abi_type):
+    return abi_type == "string" or abi_type.endswith("[]")
+
+
+def _abi_encode_value(abi_type, value):
+    if abi_type.endswith("[]"):
+        items = list(value)
+        return len(items).to_bytes(32, "big") + abi_encode([abi_type[:-2]] * len(items), items)
+    if abi_type == "string":
+        data = value.encode("utf-8")
+        return len(data).to_bytes(32, "big") + _pad32(data)
+    if abi_type == "address":
+        return bytes.fromhex(encode_address(value))
+    if abi_type.startswith("uint"):
+        return int(value).to_bytes(32, "big")
+    raise ValueError(f"unsupported ABI type {abi_type}")
+
+
+def abi_encode(types, values):
+    """ABI-encode arguments (uint*, address, string and their dynamic arrays)."""
+    heads, tails = [], []
+    offset = 32 * len(types)
+    for abi_type, value in zip(types, values):
+        encoded = _abi_encode_value(abi_type, value)
+        if _abi_dynamic(abi_type):
+            heads.append(offset.to_bytes(32, "big"))
+            tails.append(encoded)
+            offset += len(encoded)
+        else:
+            heads.append(encoded)
+    return b"".join(heads) + b"".join(tails)
+
+
+def encode_issue_certificate(to, cert_type, recipient_name, issuer_name, custom_message):
+    """Calldata for ``issueCertificate``."""
+    args = abi_encode(["address", "uint8", "string", "string", "string"],
+                      [to, cert_type, recipient_name, issuer_name, custom_message])
+    return "0x" + SELECTORS["issueCertificate"] + args.hex()
+
+
+def encode_batch_issue(recipients, cert_type, recipient_names, issuer_name, custom_message):
+    """Calldata for ``batchIssueCertificates``."""
+    args = abi_encode(["address[]", "uint8", "string[]", "string", "string"],
+                      [recipients, cert_type, recipient_names, issuer_name, custom_message])
+    return "0x" + SELECTORS["batchIssueCertificates"] + args.hex()
+
+
+def word(data, index):
+    return int.from_bytes(data[index * 32:(index + 1) * 32], "big")
+
+
+def decode_string(data, offset=None):
+    """Decode a dynamic ``string`` whose head offset is *offset* (default: first word)."""
+    start = word(data, 0) if offset is None else offset
+    length = int.from_bytes(data[start:start + 32], "big")
+    return data[start + 32:start + 32 + length].decode("utf-8")
+
+
+def decode_uint_array(data):
+    start = word(data, 0)
+    length = int.from_bytes(data[start:start + 32], "big")
+    return [int.from_bytes(data[start + 32 * (i + 1):start + 32 * (i + 2)], "big") for i in range(length)]
+
+
+def decode_certificate(data, token_id=None):
+    """Decode the ``certificates(tokenId)`` getter tuple into a CertificateRecord."""
+    return CertificateRecord(
+        cert_type=word(data, 0),
+        recipient_name=decode_string(data, word(data, 1)),
+        issuer_name=decode_string(data, word(data, 2)),
+        issue_date=word(data, 3),
+        custom_message=decode_string(data, word(data, 4)),
+        image_uri=decode_string(data, word(data, 5)),
+        token_id=token_id,
+    )
+
+
+def parse_token_ids(spec):
+    """Parse ``"1-100"``, ``"3,5,8"`` or a mix such as ``"1-10,42"``."""
+    ids = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            ids.extend(range(int(first), int(last) + 1))
+        else:
+            ids.append(int(part))
+    return ids
+
+
+class CertificateContract:
+    """Read-only view of a deployed EternalDigitalHonorCertificate."""
+
+    def __init__(self, address, rpc_url=None, client=None):
+        if not address:
+            raise ValueError("請先設定 CONTRACT_ADDRESS 環境變數或指定 --contract")
+        self.address = address
+        self.client = client or shared_client(rpc_url or default_rpc_url())
+        self.rpc_url = self.client.url
+
+    def _eth_call(self, function, args, block="latest"):
+        tag = hex(block) if isinstance(block, int) else block
+        return ("eth_call", [{"to": self.address, "data": "0x" + SELECTORS[function] + "".join(args)}, tag])
+
+    def call(self, function, *args):
+        result = self.client.call(*self._eth_call(function, args))
+        return bytes.fromhex(result[2:])
+
+    def call_many(self, function, args_list, raise_errors=True):
+        """Batch the same view function over many argument tuples."""
+        results = self.client.batch([self._eth_call(function, args) for args in args_list], raise_errors)
+        return [r if isinstance(r, RpcError) else bytes.fromhex(r[2:]) for r in results]
+
+    def call_mixed(self, calls, block="latest", raise_errors=True):
+        """Different view functions ``[(function, args), ...]`` at one block, batched together."""
+        results = self.client.batch([self._eth_call(f, args, block) for f, args in calls], raise_errors)
+        return [r if isinstance(r, RpcError) else bytes.fromhex(r[2:]) for r in results]
+
+    def call_mixed_at_head(self, calls):
+        """:meth:`call_mixed` at latest with ``eth_blockNumber`` in front of the same batch.
+
+        Returns ``(head, results)``; the calls saw block *head* or a later one.
+        """
+        head, *results = self.client.batch(
+            [("eth_blockNumber", []), *(self._eth_call(f, args) for f, args in calls)]
+        )
+        return int(head, 16), [bytes.fromhex(r[2:]) for r in results]
+
+    def token_uri(self, token_id):
+        return decode_string(self.call("tokenURI", encode_uint256(token_id)))
+
+    def token_uris(self, token_ids):
+        return [decode_string(d) for d in self.call_many("tokenURI", [(encode_uint256(t),) for t in token_ids])]
+
+    def certificate(self, token_id):
+        return decode_certificate(self.call("certificates", encode_uint256(token_id)), token_id)
+
+    def certificates(self, token_ids):
+        """``certificates(tokenId)`` for many ids in a handful of batched round trips."""
+        data = self.call_many("certificates", [(encode_uint256(t),) for t in token_ids])
+        return [decode_certificate(d, t) for d, t in zip(data, token_ids)]
+
+    def owner_of(self, token_id):
+        return "0x" + self.call("ownerOf", encode_uint256(token_id))[12:32].hex()
+
+    def total_certificates(self):
+        return word(self.call("getTotalCertificates"), 0)
+
+    def certificates_by_owner(self, owner):
+        return decode_uint_array(self.call("getCertificatesByOwner", encode_address(owner)))
+
+    def certificate_image(self, cert_type):
+        """Default ``imageURI`` the contract stores for *cert_type*."""
+        return decode_string(self.call("certificateImages", encode_uint256(cert_type)))
+
+    def balances(self, owners):
+        """``balanceOf`` for many addresses in batched round trips."""
+        return [word(d, 0) for d in self.call_many("balanceOf", [(encode_address(a),) for a in owners])]
+
+
+def record_to_json(record):
+    """A CertificateRecord as a JS-style ``certData`` dict."""
+    return {
+        "tokenId": record.token_id,
+        "certType": record.cert_type,
+        "recipientName": record.recipient_name,
+        "issuerName": record.issuer_name,
+        "issueDate": record.issue_date,
+        "customMessage": record.custom_message,
+        "imageURI": record.image_uri,
+    }
+
+
+HARDHAT_CHAIN_ID = 31337
+BENCH_MINT_BATCH = 50   # 每筆 batchIssueCertificates 發行的張數，遠低於 hardhat 的區塊 gas 上限
+
+
+def mint_for_benchmark(contract, count):
+    """Top the contract up to *count* certificates from the node's first unlocked account (hardhat only)."""
+    client = contract.client
+    if int(client.call("eth_chainId", []), 16) != HARDHAT_CHAIN_ID:
+        raise RpcError("只在本地 hardhat 節點上補發基準測試用的證書")
+    sender = client.call("eth_accounts", [])[0]
+    total = contract.total_certificates()
+    while total < count:
+        n = min(BENCH_MINT_BATCH, count - total)
+        data = encode_batch_issue([sender] * n, 0, [f"Bench {total + i + 1}" for i in range(n)], "Benchmark", "")
+        tx_hash = client.call("eth_sendTransaction", [{"from": sender, "to": contract.address, "data": data,
+                                                        "gas": hex(15_000_000)}])
+        while (receipt := client.call("eth_getTransactionReceipt", [tx_hash])) is None:
+            time.sleep(0.05)
+        if int(receipt["status"], 16) != 1:
+            raise RpcError(f"batchIssueCertificates reverted ({tx_hash}); is {sender} the contract owner?")
+        total += n
+    return total
+
+
+def run_benchmark(contract, count, batch_size=100, concurrency=4):
+    """``certificates(tokenId)`` for 1..*count*: one eth_call per round trip vs :meth:`RpcClient.batch`."""
+    token_ids = list(range(1, count + 1))
+    results = {}
+    for name, client in (("sequential", RpcClient(contract.rpc_url, batch_size=1, concurrency=1)),
+                         ("batched", RpcClient(contract.rpc_url, batch_size=batch_size, concurrency=concurrency))):
+        reader = CertificateContract(contract.address, client=client)
+        started = time.perf_counter()
+        if name == "sequential":
+            records = [reader.certificate(t) for t in token_ids]
+        else:
+            records = reader.certificates(token_ids)
+        results[name] = {"seconds": time.perf_counter() - started, "roundTrips": client.round_trips,
+                         "records": records}
+        client.close()
+    if results["sequential"]["records"] != results["batched"]["records"]:
+        raise AssertionError("batched reads differ from one-by-one reads")
+    for result in results.values():
+        del result["records"]
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batched certificate reads over JSON-RPC")
+    parser.add_argument("--contract", help="contract address (default: $CONTRACT_ADDRESS)")
+    parser.add_argument("--rpc", help="JSON-RPC URL (default: $RPC_URL, $SEPOLIA_RPC_URL or localhost)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    r = sub.add_parser("read", help="read certificates(tokenId) structs")
+    r.add_argument("ids", nargs="?", help="token ids, e.g. 1-10000 (default: all)")
+    r.add_argument("--batch-size", type=int, default=100, help="eth_calls per JSON-RPC batch")
+    r.add_argument("--concurrency", type=int, default=4, help="batches in flight")
+    r.add_argument("-o", "--output", help="write JSON lines here (default: stdout)")
+    b = sub.add_parser("bench", help="one eth_call per token vs JSON-RPC batches on a local hardhat node")
+    b.add_argument("--count", type=int, default=10000, help="certificates to read (minted first if missing)")
+    b.add_argument("--batch-size", type=int, default=100, help="eth_calls per JSON-RPC batch")
+    b.add_argument("--concurrency", type=int, default=4, help="batches in flight")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        contract = CertificateContract(args.contract or default_contract_address(), args.rpc)
+        try:
+            minted = mint_for_benchmark(contract, args.count)
+            results = run_benchmark(contract, args.count, args.batch_size, args.concurrency)
+        except (RpcError, OSError) as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"🧾 合約上共 {minted} 張證書，讀取 {args.count} 張")
+        for name, result in results.items():
+            print(f"⏱️  {name:<10} {result['seconds']:7.2f}s  {result['roundTrips']:>6} 次 round trip  "
+                  f"({args.count / result['seconds']:,.0f} 張/s)")
+        return 0
+
+    client = RpcClient(args.rpc, batch_size=args.batch_size, concurrency=args.concurrency)
+    contract = CertificateContract(args.contract or default_contract_address(), client=client)
+    token_ids = parse_token_ids(args.ids) if args.ids else list(range(1, contract.total_certificates() + 1))
+
+    started = time.perf_counter()
+    records = contract.certificates(token_ids)
+    elapsed = time.perf_counter() - started
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in records:
+            out.write(json.dumps(record_to_json(record), ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"✅ 讀取 {len(records)} 張證書: {client.round_trips} 次 round trip, {elapsed:.2f}s", file=sys.stderr)
+    client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
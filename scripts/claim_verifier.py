@@ -0,0 +1,428 @@
+"""
+批量證書驗證 - 一次比對數萬筆 (地址, tokenId, 姓名, 類型) 聲明
+
+    python scripts/claim_verifier.py verify claims.csv --snapshot snapshot -o verdicts.csv
+    python scripts/claim_verifier.py verify claims.xlsx.csv --index events-state.json
+    python scripts/claim_verifier.py verify claims.jsonl --contract 0x... -o verdicts.jsonl
+    python scripts/claim_verifier.py bench --claims 50000
+
+雇主寄來的名單原本要逐列手動查 ownerOf 與 certificates(tokenId)。這裡把整份
+名單讀成欄位，去重後的 tokenId 一次向資料來源查詢：
+
+* --snapshot  snapshot_store.py 的欄式快照 (searchsorted，完全不連網)
+* --index     owner_index.py / event_ingest.py 的索引檔
+* 其他情況    以 JSON-RPC batch 讀 certificates 與 ownerOf
+
+擁有者、證書類型與姓名 (NFC 正規化、不分大小寫) 以 NumPy 欄位一次比對，
+每一列得到一個結論：valid、not_found、wrong_owner、name_mismatch、
+type_mismatch、bad_address 或 bad_token_id。
+"""
+
+try:
+    import numpy as np
+    print("✓ numpy installed")
+except ImportError:
+    print("✗ numpy not installed")
+    print("Please run: pip install numpy")
+    import sys
+    sys.exit(1)
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+from certificates import CERTIFICATE_TYPES, certificate_type
+from recipient_ingest import (
+    ADDRESS_BAD_CHECKSUM,
+    ADDRESS_MALFORMED,
+    DEFAULT_CHUNK_SIZE,
+    check_addresses,
+    normalize_name,
+    read_chunks,
+)
+
+CLAIM_FIELDS = ("address", "tokenId", "recipientName", "certType")
+VERDICTS = ("valid", "not_found", "wrong_owner", "name_mismatch", "type_mismatch", "bad_address", "bad_token_id")
+OUTPUT_COLUMNS = (
+    "row", "tokenId", "address", "verdict", "ownerMatch", "nameMatch", "typeMatch",
+    "actualOwner", "actualName", "actualType",
+)
+
+NOT_CLAIMED = -1    # 名單沒有填類型：不比對
+BAD_TYPE = -2       # 填了但無法辨識：視為不符
+
+
+# -- 資料來源 -------------------------------------------------------------------
+#
+# lookup(token_ids) 收到去重後的 uint64 陣列，回傳同長度的
+# (found bool, owner S20, cert_type int64, name object) 四個欄位。
+
+def _empty_lookup(n):
+    return np.zeros(n, bool), np.zeros(n, "S20"), np.full(n, -1, np.int64), np.full(n, "", object)
+
+
+def _owner_bytes(address):
+    return bytes.fromhex(address.removeprefix("0x").rjust(40, "0"))
+
+
+class SnapshotSource:
+    """A :class:`snapshot_store.CertificateSnapshot`; *owners* (token id → address) overrides its owner column."""
+
+    name = "snapshot"
+
+    def __init__(self, snapshot, owners=None):
+        self.snapshot = snapshot
+        self.owners = owners
+        if snapshot.meta["sorted"]:
+            self._order, self._keys = None, snapshot.token_id
+        else:
+            self._order = np.argsort(snapshot.token_id, kind="stable")
+            self._keys = snapshot.token_id[self._order]
+
+    def lookup(self, token_ids):
+        found, owner, cert_type, name = _empty_lookup(len(token_ids))
+        if not len(self._keys):
+            return found, owner, cert_type, name
+        pos = np.minimum(np.searchsorted(self._keys, token_ids), len(self._keys) - 1)
+        found = self._keys[pos] == token_ids
+        if self.owners is not None:
+            # 索引裡沒有擁有者的 token 已燒毀 (或快照之後才回滾)：視為不存在
+            found &= np.fromiter((t in self.owners for t in token_ids.tolist()), bool, len(token_ids))
+        rows = (pos if self._order is None else self._order[pos])[found]
+        cert_type[found] = self.snapshot.cert_type[rows]
+        if self.owners is None:
+            owner[found] = self.snapshot.owner[rows]
+        else:
+            owner[found] = [_owner_bytes(self.owners[t]) for t in token_ids[found].tolist()]
+        name[found] = self.snapshot.strings["recipient_name"].take(rows)
+        return found, owner, cert_type, name
+
+
+class IndexSource:
+    """An :class:`owner_index.OwnerIndex` (owners plus CertificateIssued type / name)."""
+
+    name = "index"
+
+    def __init__(self, index):
+        self.index = index
+
+    def lookup(self, token_ids):
+        found, owner, cert_type, name = _empty_lookup(len(token_ids))
+        owners, issued = self.index.owners, self.index.issued
+        for i, token_id in enumerate(token_ids.tolist()):
+            address = owners.get(token_id)
+            if address is None:   # 未發行或已燒毀
+                continue
+            found[i] = True
+            owner[i] = _owner_bytes(address)
+            event = issued.get(token_id)
+            if event:
+                cert_type[i] = event["certType"]
+                name[i] = event["recipientName"]
+        return found, owner, cert_type, name
+
+
+class ChainSource:
+    """``certificates`` and ``ownerOf`` over batched JSON-RPC (a :class:`chain.CertificateContract`)."""
+
+    name = "chain"
+
+    def __init__(self, contract):
+        self.contract = contract
+
+    def lookup(self, token_ids):
+        from chain import RpcError, decode_certificate, encode_uint256
+
+        found, owner, cert_type, name = _empty_lookup(len(token_ids))
+        args = [(encode_uint256(t),) for t in token_ids.tolist()]
+        # ownerOf 對不存在 (或已燒毀) 的 token 會 revert；certificates 則回傳空結構
+        owners = self.contract.call_many("ownerOf", args, raise_errors=False)
+        structs = self.contract.call_many("certificates", args, raise_errors=False)
+        for i, (data, struct) in enumerate(zip(owners, structs)):
+            if isinstance(data, RpcError) or isinstance(struct, RpcError):
+                continue
+            record = decode_certificate(struct)
+            found[i] = True
+            owner[i] = data[12:32]
+            cert_type[i] = record.cert_type
+            name[i] = record.recipient_name
+        return found, owner, cert_type, name
+
+
+# -- 比對 -----------------------------------------------------------------------
+
+def _token_id(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip() if value is not None else ""
+    return int(text) if text.isdigit() else -1
+
+
+_type_cache = {}
+
+
+def _claimed_type(value):
+    if value is None or value == "":
+        return NOT_CLAIMED
+    cached = _type_cache.get(value)
+    if cached is None:
+        try:
+            cached = certificate_type(int(value) if isinstance(value, float) and value.is_integer() else value)
+        except (TypeError, ValueError):
+            cached = BAD_TYPE
+        _type_cache[value] = cached
+    return cached
+
+
+def _name_key(value):
+    return normalize_name(value).casefold() if value else ""
+
+
+def claims_to_columns(claims):
+    """Column dict from mappings (``address``, ``tokenId``, ``recipientName``, ``certType``) or 4-tuples."""
+    columns = {field: [] for field in CLAIM_FIELDS + ("row",)}
+    for row, claim in enumerate(claims, 1):
+        values = [claim.get(f, "") for f in CLAIM_FIELDS] if isinstance(claim, dict) else list(claim)
+        for field, value in zip(CLAIM_FIELDS, values):
+            columns[field].append(value)
+        columns["row"].append(row)
+    return columns
+
+
+class VerdictTable:
+    """Per-claim verdicts as parallel columns (see ``OUTPUT_COLUMNS``)."""
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns["verdict"])
+
+    def counts(self):
+        values, counts = np.unique(self.columns["verdict"], return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+
+    def rows(self):
+        columns = [self.columns[name] for name in OUTPUT_COLUMNS]
+        for values in zip(*(c.tolist() if isinstance(c, np.ndarray) else c for c in columns)):
+            yield dict(zip(OUTPUT_COLUMNS, values))
+
+    def write(self, path):
+        """CSV, or JSON lines when *path* ends with ``.jsonl``."""
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if path.endswith(".jsonl"):
+                for row in self.rows():
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                return
+            writer = csv.writer(f)
+            writer.writerow(OUTPUT_COLUMNS)
+            for row in self.rows():
+                writer.writerow(row.values())
+
+
+def verify_many(claims, source):
+    """Check every claim against *source* with one lookup per distinct token id.
+
+    *claims* is a column dict (as read by :func:`read_claims`) or an iterable of
+    mappings / ``(address, tokenId, recipientName, certType)`` tuples. Blank
+    names or types are not checked. Returns a :class:`VerdictTable`.
+    """
+    if not isinstance(claims, dict):
+        claims = claims_to_columns(claims)
+    n = len(claims["address"])
+    addresses = ["" if a is None else str(a).strip() for a in claims["address"]]
+    check = check_addresses(addresses)
+    claimed_owner = np.ascontiguousarray(check.raw).view("S20").ravel()
+    bad_address = (check.status == ADDRESS_MALFORMED) | (check.status == ADDRESS_BAD_CHECKSUM)
+
+    token_ids = np.fromiter(map(_token_id, claims["tokenId"]), np.int64, n)
+    bad_token = token_ids < 0
+    unique_ids, inverse = np.unique(np.where(bad_token, 0, token_ids).astype(np.uint64), return_inverse=True)
+    found, owner, cert_type, name = (column[inverse] for column in source.lookup(unique_ids))
+    found &= ~bad_token
+
+    claimed_types = np.fromiter(map(_claimed_type, claims["certType"]), np.int64, n)
+    claimed_names = np.array([_name_key(v) for v in claims["recipientName"]], object)
+    actual_names = np.array([_name_key(v) for v in name.tolist()], object)
+
+    owner_match = found & (owner == claimed_owner)
+    name_match = found & ((claimed_names == "") | (claimed_names == actual_names))
+    type_match = found & ((claimed_types == NOT_CLAIMED) | (claimed_types == cert_type))
+    verdict = np.select(
+        [bad_address, bad_token, ~found, ~owner_match, ~name_match, ~type_match],
+        ["bad_address", "bad_token_id", "not_found", "wrong_owner", "name_mismatch", "type_mismatch"],
+        "valid",
+    )
+
+    # S20 轉回 bytes 時會去掉結尾的 0x00，補回 20 bytes
+    actual_owner = ["0x" + o.ljust(20, b"\0").hex() if f else "" for o, f in zip(owner.tolist(), found.tolist())]
+    return VerdictTable({
+        "row": claims["row"],
+        "tokenId": np.where(bad_token, None, token_ids.astype(object)),
+        "address": addresses,
+        "verdict": verdict,
+        "ownerMatch": owner_match,
+        "nameMatch": name_match,
+        "typeMatch": type_match,
+        "actualOwner": actual_owner,
+        "actualName": np.where(found, name, ""),
+        "actualType": np.where(found, cert_type, -1),
+    })
+
+
+def read_claims(paths, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Read claim files (.csv / .tsv / .jsonl / .parquet) into one column dict.
+
+    Headers use the recipient_ingest aliases plus ``tokenId`` / ``token`` /
+    ``certificateId``; ``row`` is the line (or row) number in its own file.
+    """
+    columns = {field: [] for field in CLAIM_FIELDS + ("row",)}
+    for path in paths:
+        for chunk in read_chunks(path, chunk_size, CLAIM_FIELDS):
+            for field, values in columns.items():
+                values.extend(chunk[field])
+    return columns
+
+
+def open_source(args):
+    """The lookup source chosen on the command line."""
+    if args.snapshot:
+        from snapshot_store import CertificateSnapshot
+
+        owners = None
+        if args.index:
+            from owner_index import OwnerIndex
+            owners = OwnerIndex.load(args.index).owners
+        return SnapshotSource(CertificateSnapshot(args.snapshot), owners)
+    if args.index:
+        from owner_index import OwnerIndex
+        return IndexSource(OwnerIndex.load(args.index))
+
+    from chain import CertificateContract, RpcClient, default_contract_address
+    client = RpcClient(args.rpc, batch_size=args.batch_size, concurrency=args.concurrency)
+    return ChainSource(CertificateContract(args.contract or default_contract_address(), client=client))
+
+
+def print_summary(table, elapsed):
+    counts = table.counts()
+    print(f"✅ {counts.get('valid', 0)} / {len(table)} 筆聲明成立 ({elapsed:.2f}s, {len(table) / max(elapsed, 1e-9):,.0f} 筆/秒)")
+    for verdict in VERDICTS[1:]:
+        if counts.get(verdict):
+            print(f"   ⚠️  {verdict:<14} {counts[verdict]}")
+
+
+# -- 效能測試 -------------------------------------------------------------------
+
+def write_sample(directory, certificates, claims, seed=11):
+    """A snapshot + owner index of *certificates* tokens and a claims CSV with ~10% bad rows."""
+    from certificates import CertificateRecord
+    from owner_index import OwnerIndex
+    from snapshot_store import write_snapshot
+
+    rng = np.random.default_rng(seed)
+    owners = ["0x" + bytes(row).hex() for row in rng.integers(0, 256, (certificates, 20), np.uint8)]
+    types = rng.integers(0, len(CERTIFICATE_TYPES), certificates)
+    index = OwnerIndex()
+    records = []
+    for token_id in range(1, certificates + 1):
+        name = f"Recipient {token_id}"
+        records.append(CertificateRecord(int(types[token_id - 1]), name, "Benchmark University",
+                                         issue_date=1759536000, token_id=token_id))
+        index.move(token_id, owners[token_id - 1])
+        index.issued[token_id] = {"certType": int(types[token_id - 1]), "recipientName": name}
+    snapshot = os.path.join(directory, "snapshot")
+    write_snapshot(records, snapshot, index.owners)
+    index_path = os.path.join(directory, "owner-index.json")
+    index.save(index_path)
+
+    claims_path = os.path.join(directory, "claims.csv")
+    picks = rng.integers(1, certificates + 1, claims)
+    faults = rng.integers(0, 50, claims)   # 0-4: 各種錯誤，其餘成立
+    with open(claims_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Wallet Address", "Token ID", "Name", "Certificate Type"])
+        for token_id, fault in zip(picks.tolist(), faults.tolist()):
+            address, name, cert_type = owners[token_id - 1], f"recipient {token_id}", int(types[token_id - 1])
+            if fault == 0:
+                token_id += certificates
+            elif fault == 1:
+                address = owners[token_id % certificates]
+            elif fault == 2:
+                name += " Jr."
+            elif fault == 3:
+                cert_type = (cert_type + 1) % len(CERTIFICATE_TYPES)
+            elif fault == 4:
+                address = address[:-1]
+            writer.writerow([address, token_id, name, CERTIFICATE_TYPES[cert_type].name_en])
+    return snapshot, index_path, claims_path
+
+
+def run_benchmark(certificates, claims, keep_dir=None):
+    from owner_index import OwnerIndex
+    from snapshot_store import CertificateSnapshot
+
+    directory = keep_dir or tempfile.mkdtemp(prefix="claim-verifier-")
+    started = time.perf_counter()
+    snapshot, index_path, claims_path = write_sample(directory, certificates, claims)
+    print(f"📄 {certificates} 張證書的快照 / 索引與 {claims} 筆聲明 ({time.perf_counter() - started:.1f}s)")
+
+    started = time.perf_counter()
+    columns = read_claims([claims_path])
+    print(f"📥 讀取聲明 {time.perf_counter() - started:.2f}s")
+    for source in (SnapshotSource(CertificateSnapshot(snapshot)), IndexSource(OwnerIndex.load(index_path))):
+        started = time.perf_counter()
+        table = verify_many(columns, source)
+        elapsed = time.perf_counter() - started
+        print(f"🔎 {source.name}:")
+        print_summary(table, elapsed)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify (address, tokenId, name, type) claims in bulk")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    v = sub.add_parser("verify", help="check claim files and write a verdict table")
+    v.add_argument("inputs", nargs="+", help=".csv / .tsv / .jsonl / .parquet claim files")
+    v.add_argument("-o", "--output", help="verdicts .csv or .jsonl (default: summary only)")
+    v.add_argument("--snapshot", help="snapshot_store.py directory to verify against (offline)")
+    v.add_argument("--index", help="owner_index / event_ingest state file (owners for --snapshot)")
+    v.add_argument("--contract", help="contract address (default: $CONTRACT_ADDRESS)")
+    v.add_argument("--rpc", help="JSON-RPC URL (default: $RPC_URL, $SEPOLIA_RPC_URL or localhost)")
+    v.add_argument("--batch-size", type=int, default=200, help="eth_calls per JSON-RPC batch")
+    v.add_argument("--concurrency", type=int, default=4, help="batches in flight")
+
+    b = sub.add_parser("bench", help="verify synthetic claims against a synthetic snapshot and index")
+    b.add_argument("--certificates", type=int, default=100_000)
+    b.add_argument("--claims", type=int, default=50_000)
+    b.add_argument("--keep", metavar="DIR", help="write the sample files here instead of a temp dir")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        if args.keep:
+            os.makedirs(args.keep, exist_ok=True)
+        run_benchmark(args.certificates, args.claims, args.keep)
+        return 0
+
+    try:
+        columns = read_claims(args.inputs)
+        source = open_source(args)
+        started = time.perf_counter()
+        table = verify_many(columns, source)
+        elapsed = time.perf_counter() - started
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    print_summary(table, elapsed)
+    if args.output:
+        table.write(args.output)
+        print(f"📄 {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+增量事件匯入 - 從上次處理到的區塊繼續抓取證書事件，並處理鏈重組 (reorg)
+
+    python scripts/event_ingest.py --from-block <部署區塊> --state events-state.json
+    python scripts/event_ingest.py --state events-state.json --follow
+
+狀態檔就是 owner_index 的索引檔再加上最近區塊的 hash 與還原紀錄，
+可直接給 ``owner_index.py serve -i events-state.json`` 使用。
+
+* 區塊範圍自動調整：RPC 拒絕 (範圍或結果過大) 時減半，順利時加倍
+* 每個範圍的起訖區塊與結尾 hash 都會記下；重新啟動或下一輪同步時若最近的 hash
+  不一致，就逐段還原到最後一個仍相符的區塊 (或該段起點的前一個區塊) 再重新抓取
+* 超過 reorg_depth 的範圍視為確定，只留下最後一個的結尾 hash 作為基準；
+  連基準都不一致時才是 DeepReorgError
+* 索引與游標一起原子寫入，中斷後不會漏抓或重複套用事件
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from chain import RpcError, block_number, default_contract_address, default_rpc_url, get_logs, rpc_call
+from owner_index import LOG_TOPICS, OwnerIndex
+
+DEFAULT_STATE_PATH = "events-state.json"
+
+
+class DeepReorgError(Exception):
+    """The chain reorganised further back than the retained block hashes."""
+
+
+class EventIngestor:
+    """Resumable CertificateIssued / Transfer ingestion into an :class:`OwnerIndex`."""
+
+    def __init__(self, address, state_path=DEFAULT_STATE_PATH, rpc_url=None, start_block=0,
+                 reorg_depth=12, chunk_size=2000, max_chunk_size=50000, checkpoint_interval=5.0):
+        self.address = address
+        self.state_path = state_path
+        self.rpc_url = rpc_url or default_rpc_url()
+        self.reorg_depth = reorg_depth
+        self.chunk_size = chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.checkpoint_interval = checkpoint_interval
+
+        self.index = OwnerIndex()
+        self.index.last_block = start_block - 1
+        self.index.contract = address.lower()
+        self.recent = []   # [start block, end block, end block hash, [undo records]] per range, oldest first
+        self.base = None   # [block, hash] 保留範圍之前最後一個已確定的區塊
+        self._saved_at = 0.0
+        if os.path.exists(state_path):
+            self.load()
+
+    # -- 狀態 -------------------------------------------------------------
+
+    def load(self):
+        with open(self.state_path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.index = OwnerIndex.from_dict(data)
+        self.index.contract = self.index.contract or self.address.lower()
+        self.recent = data.get("recentBlocks", [])
+        self.base = data.get("baseBlock")
+        if self.recent and len(self.recent[0]) == 3:
+            # 舊格式 [end, hash, undo] 沒有起點：第一段改當基準，其餘的起點是前一段結尾 + 1
+            first_end, first_hash, _ = self.recent[0]
+            self.base = [first_end, first_hash]
+            self.recent = [[prev[0] + 1, *entry] for prev, entry in zip(self.recent, self.recent[1:])]
+
+    def save(self):
+        data = self.index.to_dict()
+        data["recentBlocks"] = self.recent
+        data["baseBlock"] = self.base
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.state_path)
+        self._saved_at = time.monotonic()
+
+    # -- reorg ------------------------------------------------------------
+
+    def block_hash(self, number):
+        block = rpc_call(self.rpc_url, "eth_getBlockByNumber", [hex(number), False])
+        return block["hash"] if block else None
+
+    def rollback(self):
+        """Undo ranges whose end block is no longer canonical; returns blocks rolled back.
+
+        Raises :class:`DeepReorgError` only when every retained range was undone
+        and the final block before them changed as well.
+        """
+        rolled_from = self.index.last_block
+        while self.recent:
+            start, end, block_hash, changes = self.recent[-1]
+            if self.block_hash(end) == block_hash:
+                return rolled_from - self.index.last_block
+            for change in reversed(changes):
+                self.index.undo(change)
+            self.recent.pop()
+            self.index.last_block = start - 1
+        if self.base and rolled_from != self.index.last_block and self.block_hash(self.base[0]) != self.base[1]:
+            raise DeepReorgError(f"block {self.base[0]} is no longer canonical; rebuild from the deployment block")
+        return rolled_from - self.index.last_block
+
+    def _prune(self, head):
+        # 比 reorg_depth 更舊的區段視為已確定，最後一段的結尾留作比對基準
+        while self.recent and self.recent[0][1] <= head - self.reorg_depth:
+            _, end, block_hash, _ = self.recent.pop(0)
+            self.base = [end, block_hash]
+
+    # -- 同步 -------------------------------------------------------------
+
+    def _fetch(self, start, end):
+        """Logs for ``start..end`` plus the end block hash, retried if the chain moves mid-fetch."""
+        while True:
+            before = self.block_hash(end)
+            logs = get_logs(self.rpc_url, self.address, LOG_TOPICS, start, end)
+            if self.block_hash(end) == before:
+                return logs, before
+
+    def sync(self, to_block=None):
+        """Ingest everything up to *to_block* (default: chain head); returns logs applied."""
+        if self.rollback():
+            self.save()
+        head = block_number(self.rpc_url) if to_block is None else to_block
+        applied = 0
+        while self.index.last_block < head:
+            start = self.index.last_block + 1
+            end = min(start + self.chunk_size - 1, head)
+            try:
+                logs, end_hash = self._fetch(start, end)
+            except RpcError:
+                if self.chunk_size == 1:
+                    raise
+                self.chunk_size = max(1, self.chunk_size // 2)
+                continue
+
+            logs = [log for log in logs if not log.get("removed")]
+            logs.sort(key=lambda log: (int(log["blockNumber"], 16), int(log["logIndex"], 16)))
+            changes = [change for change in map(self.index.apply_log, logs) if change]
+            self.index.last_block = end
+            self.recent.append([start, end, end_hash, changes])
+            self._prune(head)
+            applied += len(logs)
+            if end == head or time.monotonic() - self._saved_at >= self.checkpoint_interval:
+                self.save()
+            if end - start + 1 == self.chunk_size:
+                self.chunk_size = min(self.max_chunk_size, self.chunk_size * 2)
+        return applied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental certificate event ingestion")
+    parser.add_argument("--contract", help="contract address (default: $CONTRACT_ADDRESS)")
+    parser.add_argument("--rpc", help="JSON-RPC URL (default: $RPC_URL, $SEPOLIA_RPC_URL or localhost)")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="checkpoint / index file")
+    parser.add_argument("--from-block", type=int, default=0, help="deployment block (first run only)")
+    parser.add_argument("--reorg-depth", type=int, default=12, help="blocks kept for reorg rollback")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="initial blocks per eth_getLogs call")
+    parser.add_argument("--follow", action="store_true", help="keep polling for new blocks")
+    parser.add_argument("--interval", type=float, default=12.0, help="poll interval in seconds with --follow")
+    args = parser.parse_args(argv)
+
+    address = args.contract or default_contract_address()
+    if not address:
+        parser.error("請先設定 CONTRACT_ADDRESS 環境變數或指定 --contract")
+    ingestor = EventIngestor(address, args.state, args.rpc, args.from_block, args.reorg_depth, args.chunk_size)
+    print(f"📥 從區塊 {ingestor.index.last_block + 1} 繼續匯入事件...")
+
+    while True:
+        started = time.perf_counter()
+        try:
+            applied = ingestor.sync()
+        except DeepReorgError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"✅ 至區塊 {ingestor.index.last_block}: 套用 {applied} 筆事件，"
+              f"共 {len(ingestor.index.owners)} 張證書 ({time.perf_counter() - started:.2f}s)")
+        if not args.follow:
+            return 0
+        try:
+            time.sleep(args.interval)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,458 @@
+"""
+batchIssueCertificates Gas 模型與批次規劃
+
+    python scripts/gas_model.py collect -o gas-samples.jsonl      # 對本地 hardhat node 發行並收集 receipt
+    python scripts/gas_model.py fit gas-samples.jsonl -o gas-model.json
+    python scripts/gas_model.py plan recipients.jsonl --model gas-model.json --gas-limit 30000000 \\
+        --gas-price 20 --max-batch-cost 0.05 -o issuance-plan.json
+
+batchIssueCertificates 對每位接收者呼叫 issueCertificate：寫入 struct 的
+certType / issueDate 與四個字串、_safeMint、計數器與事件。Gas 因此主要取決於
+批次大小、各字串佔用的 storage slot 數、是否為第一次持有證書的地址，以及
+迴圈中不斷成長的 memory (二次方成本)。模型為
+
+    gasUsed = 21000 + calldata gas + Σ 係數 × 特徵
+
+calldata gas 依 EIP-2028 從實際編碼的 calldata 精確計算，其餘係數以最小平方法
+從 hardhat receipt 擬合；未擬合時使用依 EVM gas 表估算的預設值。
+
+規劃器依序把接收者切成批次 (證書類型、發行者、訊息相同的連續紀錄才能同批)，
+每批不超過 區塊 gas 上限 × 安全係數 與 --max-batch-cost，也不超過讓平均每張
+成本最低的批次大小 (固定成本與 memory 二次方成本的平衡點)，最後把各批平均
+分配以免最後一批過小。
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+from collections import namedtuple
+
+from certificates import coerce_record, iter_records
+from chain import (
+    CertificateContract, RpcError, default_contract_address, default_rpc_url,
+    encode_batch_issue, rpc_call,
+)
+
+TX_BASE_GAS = 21000
+CALLDATA_ZERO_GAS = 4
+CALLDATA_NONZERO_GAS = 16
+DEFAULT_GAS_LIMIT = 30_000_000
+DEFAULT_SAFETY = 0.9
+DEFAULT_IMAGE_URI = "https://ipfs.io/ipfs/QmYourImageHash1"   # 合約建構子設定的預設圖片
+
+FEATURES = ("base", "items", "new_holders", "string_slots", "string_bytes", "items_squared")
+
+# 依 EVM gas 表估算 (尚未以 receipt 擬合時使用)
+DEFAULT_COEFFICIENTS = {
+    "base": 8000,            # onlyOwner、函數分派、迴圈與 cold storage 存取
+    "items": 87000,          # certType / issueDate / _owners 三個新 slot、balance、計數器、兩個事件
+    "new_holders": 19200,    # _balances[to] 從 0 變成非 0 (22100 而非 2900)
+    "string_slots": 22100,   # 每個新寫入的字串 slot
+    "string_bytes": 10,      # 字串複製到 memory、事件 data
+    "items_squared": 0.44,   # 迴圈中未釋放的 memory (每張約 15 個 word)
+}
+
+Batch = namedtuple("Batch", "cert_type issuer_name custom_message recipients recipient_names image_uri new_holders")
+
+
+def calldata_gas(data):
+    """Intrinsic calldata cost (EIP-2028) of hex or raw *data*."""
+    if isinstance(data, str):
+        data = bytes.fromhex(data.removeprefix("0x"))
+    zeros = data.count(0)
+    return zeros * CALLDATA_ZERO_GAS + (len(data) - zeros) * CALLDATA_NONZERO_GAS
+
+
+def string_slots(text):
+    """Storage slots a ``string`` occupies once written (0 for an empty string)."""
+    length = len(text.encode("utf-8"))
+    if length == 0:
+        return 0
+    if length <= 31:
+        return 1                            # 短字串與長度存在同一個 slot
+    return 1 + math.ceil(length / 32)
+
+
+def batch_calldata(batch):
+    return encode_batch_issue(batch.recipients, batch.cert_type, batch.recipient_names,
+                              batch.issuer_name, batch.custom_message)
+
+
+def batch_features(batch):
+    n = len(batch.recipients)
+    shared = (batch.issuer_name, batch.custom_message, batch.image_uri)
+    shared_slots = sum(string_slots(s) for s in shared)
+    shared_bytes = sum(len(s.encode("utf-8")) for s in shared)
+    return {
+        "base": 1,
+        "items": n,
+        "new_holders": batch.new_holders,
+        "string_slots": sum(string_slots(name) for name in batch.recipient_names) + n * shared_slots,
+        "string_bytes": sum(len(name.encode("utf-8")) for name in batch.recipient_names) + n * shared_bytes,
+        "items_squared": n * n,
+    }
+
+
+def _solve(matrix, vector):
+    """Gaussian elimination with partial pivoting (small dense systems)."""
+    size = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(size)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(rows[r][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        if rows[col][col] == 0:
+            raise ValueError("singular system")
+        for r in range(size):
+            if r != col:
+                factor = rows[r][col] / rows[col][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[col])]
+    return [rows[i][size] / rows[i][i] for i in range(size)]
+
+
+class GasModel:
+    """Linear gas model on top of the exact intrinsic cost of the transaction."""
+
+    def __init__(self, coefficients=None, source="default", stats=None):
+        self.coefficients = dict(DEFAULT_COEFFICIENTS, **(coefficients or {}))
+        self.source = source
+        self.stats = stats or {}
+
+    def execution_gas(self, batch):
+        features = batch_features(batch)
+        return sum(self.coefficients[name] * features[name] for name in FEATURES)
+
+    def predict(self, batch, calldata=None):
+        calldata = calldata or batch_calldata(batch)
+        return round(TX_BASE_GAS + calldata_gas(calldata) + self.execution_gas(batch))
+
+    @classmethod
+    def fit(cls, samples, ridge=1e-6):
+        """Least-squares fit on ``(batch, gas_used)`` samples; features with no spread keep their default."""
+        rows, targets = [], []
+        for batch, gas_used in samples:
+            features = batch_features(batch)
+            rows.append([features[name] for name in FEATURES])
+            targets.append(gas_used - TX_BASE_GAS - calldata_gas(batch_calldata(batch)))
+        if not rows:
+            raise ValueError("no samples to fit")
+
+        # 沒有變化的特徵無法辨識 (例如全部都是新地址)，固定為預設值
+        free = [i for i, name in enumerate(FEATURES)
+                if name == "base" or len({round(r[i], 9) for r in rows}) > 1]
+        fixed = [i for i in range(len(FEATURES)) if i not in free]
+        adjusted = [t - sum(DEFAULT_COEFFICIENTS[FEATURES[i]] * r[i] for i in fixed) for r, t in zip(rows, targets)]
+
+        # 以欄位尺度正規化後加一點 ridge，避免接近共線時數值爆掉
+        scale = [max(abs(r[i]) for r in rows) or 1 for i in free]
+        x = [[r[i] / s for i, s in zip(free, scale)] for r in rows]
+        xtx = [[sum(row[a] * row[b] for row in x) + (ridge if a == b else 0) for b in range(len(free))]
+               for a in range(len(free))]
+        xty = [sum(row[a] * y for row, y in zip(x, adjusted)) for a in range(len(free))]
+        solution = _solve(xtx, xty)
+
+        coefficients = dict(DEFAULT_COEFFICIENTS)
+        for i, s, value in zip(free, scale, solution):
+            coefficients[FEATURES[i]] = value / s
+        model = cls(coefficients, source="fitted")
+
+        actual = [gas for _, gas in samples]
+        predicted = [model.predict(batch) for batch, _ in samples]
+        mean = sum(actual) / len(actual)
+        total = sum((a - mean) ** 2 for a in actual) or 1
+        model.stats = {
+            "samples": len(samples),
+            "r2": 1 - sum((a - p) ** 2 for a, p in zip(actual, predicted)) / total,
+            "maxRelativeError": max(abs(a - p) / a for a, p in zip(actual, predicted)),
+            "fixed": [FEATURES[i] for i in fixed],
+        }
+        return model
+
+    def optimal_batch_size(self):
+        """Batch size minimising gas per certificate, ``sqrt(fixed / quadratic)``; None if unbounded."""
+        quadratic = self.coefficients["items_squared"]
+        if quadratic <= 0:
+            return None
+        return max(1, math.floor(math.sqrt((TX_BASE_GAS + self.coefficients["base"]) / quadratic)))
+
+    def to_dict(self):
+        return {"source": self.source, "coefficients": self.coefficients, "stats": self.stats}
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["coefficients"], data.get("source", "fitted"), data.get("stats"))
+
+
+# -- 樣本 -----------------------------------------------------------------
+
+def sample_to_json(batch, gas_used):
+    return {
+        "certType": batch.cert_type,
+        "issuerName": batch.issuer_name,
+        "customMessage": batch.custom_message,
+        "recipients": list(batch.recipients),
+        "recipientNames": list(batch.recipient_names),
+        "imageURI": batch.image_uri,
+        "newHolders": batch.new_holders,
+        "gasUsed": gas_used,
+    }
+
+
+def sample_from_json(data):
+    batch = Batch(data["certType"], data["issuerName"], data["customMessage"], data["recipients"],
+                  data["recipientNames"], data.get("imageURI", DEFAULT_IMAGE_URI), data["newHolders"])
+    return batch, int(data["gasUsed"])
+
+
+def load_samples(paths):
+    return [sample_from_json(d) for d in iter_records(paths)]
+
+
+def _random_address(rnd):
+    return "0x" + "".join(rnd.choice("0123456789abcdef") for _ in range(40))
+
+
+def _text(rnd, length):
+    # 一半中文 (每字 3 bytes)、一半 ASCII，讓 byte 長度與 slot 數都有變化
+    if rnd.random() < 0.5:
+        return "".join(rnd.choice("證書區塊鏈永恆榮譽友情") for _ in range(max(1, length // 3)))
+    return "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(length))
+
+
+def collect_samples(contract, sizes, name_lengths, rounds=1, seed=0, gas=DEFAULT_GAS_LIMIT):
+    """Issue real batches through ``eth_sendTransaction`` (hardhat unlocked account) and yield samples.
+
+    Only meant for a local node: it mints test certificates to random addresses.
+    """
+    rnd = random.Random(seed)
+    sender = rpc_call(contract.rpc_url, "eth_accounts", [])[0]
+    images = {t: contract.certificate_image(t) for t in range(4)}
+    holders = []
+    for _ in range(rounds):
+        for size in sizes:
+            for name_length in name_lengths:
+                cert_type = rnd.randrange(4)
+                reuse = holders and rnd.random() < 0.4
+                recipients = [rnd.choice(holders) if reuse else _random_address(rnd) for _ in range(size)]
+                new = len({r for r in recipients if r not in holders})
+                batch = Batch(cert_type, _text(rnd, rnd.choice((4, 20, 40))), _text(rnd, rnd.choice((0, 12, 80))),
+                              recipients, [_text(rnd, name_length) for _ in range(size)], images[cert_type], new)
+                tx_hash = rpc_call(contract.rpc_url, "eth_sendTransaction", [{
+                    "from": sender, "to": contract.address, "data": batch_calldata(batch), "gas": hex(gas),
+                }])
+                receipt = rpc_call(contract.rpc_url, "eth_getTransactionReceipt", [tx_hash])
+                if receipt is None or int(receipt["status"], 16) != 1:
+                    raise RpcError(f"batch of {size} failed: {tx_hash}")
+                holders.extend(r for r in recipients if r not in holders)
+                yield batch, int(receipt["gasUsed"], 16)
+
+
+# -- 規劃 -----------------------------------------------------------------
+
+class BatchPlanner:
+    """Splits an ordered recipient list into batches under a gas cap."""
+
+    def __init__(self, model, gas_limit=DEFAULT_GAS_LIMIT, safety=DEFAULT_SAFETY, max_batch_gas=None,
+                 gas_price_gwei=None, max_batch_cost_eth=None, image_uris=None):
+        caps = [gas_limit * safety]
+        if max_batch_gas:
+            caps.append(max_batch_gas)
+        if max_batch_cost_eth and gas_price_gwei:
+            caps.append(max_batch_cost_eth * 1e18 / (gas_price_gwei * 1e9))
+        self.model = model
+        self.cap = min(caps)
+        self.gas_price_gwei = gas_price_gwei
+        self.image_uris = image_uris or {}
+
+    def _batch(self, records, holders):
+        seen, new = set(), 0
+        for r in records:
+            if r.recipient not in holders and r.recipient not in seen:
+                new += 1
+            seen.add(r.recipient)
+        first = records[0]
+        return Batch(first.cert_type, first.issuer_name, first.custom_message,
+                     [r.recipient for r in records], [r.recipient_name for r in records],
+                     self.image_uris.get(first.cert_type, DEFAULT_IMAGE_URI), new)
+
+    def _greedy(self, records, holders, max_items=None):
+        """Batches for one (type, issuer, message) run; each as (start, end, gas)."""
+        batches, start = [], 0
+        while start < len(records):
+            end, gas = start + 1, self.model.predict(self._batch(records[start:start + 1], holders))
+            if gas > self.cap:
+                raise ValueError(f"第 {start + 1} 位接收者單獨一筆就需要 {gas} gas，超過上限 {self.cap:.0f}")
+            while end < len(records) and (max_items is None or end - start < max_items):
+                next_gas = self.model.predict(self._batch(records[start:end + 1], holders))
+                if next_gas > self.cap:
+                    break
+                end, gas = end + 1, next_gas
+            batches.append((start, end, gas))
+            start = end
+        return batches
+
+    def plan(self, records, holders=()):
+        """Plan batches for *records* (in issuance order); *holders* already own a certificate."""
+        records = [coerce_record(r) for r in records]
+        for i, r in enumerate(records):
+            if not r.recipient:
+                raise ValueError(f"第 {i + 1} 筆紀錄沒有接收者地址")
+
+        holders = set(holders)
+        runs, start = [], 0
+        for i in range(1, len(records) + 1):
+            if i == len(records) or _group_key(records[i]) != _group_key(records[start]):
+                runs.append((start, i))
+                start = i
+
+        # 超過這個大小後 memory 的二次方成本會讓平均每張 gas 上升
+        best = self.model.optimal_batch_size()
+        plan = []
+        for run_start, run_end in runs:
+            run = records[run_start:run_end]
+            batches = self._greedy(run, holders, best)
+            if len(batches) > 1:
+                # 平均分配：同樣的批數下讓每批大小接近
+                even = self._greedy(run, holders, math.ceil(len(run) / len(batches)))
+                if len(even) == len(batches):
+                    batches = even
+            for start, end, gas in batches:
+                batch = self._batch(run[start:end], holders)
+                holders.update(batch.recipients)
+                plan.append(self._describe(batch, run_start + start, gas))
+        return plan
+
+    def _describe(self, batch, start, gas):
+        entry = {
+            "start": start,
+            "certType": batch.cert_type,
+            "issuerName": batch.issuer_name,
+            "customMessage": batch.custom_message,
+            "recipients": list(batch.recipients),
+            "recipientNames": list(batch.recipient_names),
+            "estimatedGas": gas,
+        }
+        if self.gas_price_gwei:
+            entry["estimatedCostEth"] = gas * self.gas_price_gwei * 1e-9
+        return entry
+
+
+def _group_key(record):
+    return record.cert_type, record.issuer_name, record.custom_message
+
+
+def fixed_size_report(model, records, size, cap, image_uris=None):
+    """``(batches, over_cap, gas_per_certificate)`` when splitting every *size* records."""
+    planner = BatchPlanner(model, image_uris=image_uris)
+    records = [coerce_record(r) for r in records]
+    holders, total, over, count = set(), 0, 0, 0
+    for i in range(0, len(records), size):
+        chunk = records[i:i + size]
+        groups = {}
+        for r in chunk:
+            groups.setdefault(_group_key(r), []).append(r)
+        for group in groups.values():
+            batch = planner._batch(group, holders)
+            holders.update(batch.recipients)
+            gas = model.predict(batch)
+            total += gas
+            count += 1
+            over += gas > cap
+    return count, over, total / max(len(records), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gas model and batch planner for batchIssueCertificates")
+    parser.add_argument("--contract", help="contract address (default: $CONTRACT_ADDRESS)")
+    parser.add_argument("--rpc", help="JSON-RPC URL (default: $RPC_URL, $SEPOLIA_RPC_URL or localhost)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    c = sub.add_parser("collect", help="issue sample batches on a local hardhat node and record gasUsed")
+    c.add_argument("-o", "--output", default="gas-samples.jsonl")
+    c.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 5, 10, 25, 50, 100])
+    c.add_argument("--name-lengths", type=int, nargs="+", default=[6, 31, 32, 64, 120])
+    c.add_argument("--rounds", type=int, default=2)
+
+    f = sub.add_parser("fit", help="fit model coefficients from collected samples")
+    f.add_argument("samples", nargs="+")
+    f.add_argument("-o", "--output", default="gas-model.json")
+
+    p = sub.add_parser("plan", help="split recipients into batches under the gas / cost caps")
+    p.add_argument("inputs", nargs="+", help="recipient records (.json / .jsonl) with recipient addresses")
+    p.add_argument("--model", help="gas-model.json from `fit` (default: built-in estimates)")
+    p.add_argument("--gas-limit", type=int, default=DEFAULT_GAS_LIMIT, help="block gas limit")
+    p.add_argument("--safety", type=float, default=DEFAULT_SAFETY, help="fraction of the block a batch may use")
+    p.add_argument("--max-batch-gas", type=int)
+    p.add_argument("--gas-price", type=float, help="gas price in gwei (for costs)")
+    p.add_argument("--max-batch-cost", type=float, help="max ETH per batch transaction (needs --gas-price)")
+    p.add_argument("--check-balances", action="store_true", help="ask the contract which recipients already hold one")
+    p.add_argument("-o", "--output", help="write the plan as JSON")
+    args = parser.parse_args(argv)
+    rpc_url = args.rpc or default_rpc_url()
+
+    if args.command == "collect":
+        contract = CertificateContract(args.contract or default_contract_address(), rpc_url)
+        count = 0
+        with open(args.output, "a", encoding="utf-8") as out:
+            for batch, gas_used in collect_samples(contract, args.sizes, args.name_lengths, args.rounds):
+                out.write(json.dumps(sample_to_json(batch, gas_used), ensure_ascii=False) + "\n")
+                count += 1
+                print(f"   {len(batch.recipients):>4} 張: {gas_used:,} gas")
+        print(f"✅ 已收集 {count} 筆樣本到 {args.output}")
+        return 0
+
+    if args.command == "fit":
+        model = GasModel.fit(load_samples(args.samples))
+        model.save(args.output)
+        print(f"✅ 以 {model.stats['samples']} 筆樣本擬合 (R² = {model.stats['r2']:.5f}, "
+              f"最大誤差 {model.stats['maxRelativeError']:.2%})")
+        for name in FEATURES:
+            print(f"   {name:<14} {model.coefficients[name]:>12.2f}")
+        print(f"📄 {args.output}")
+        return 0
+
+    model = GasModel.load(args.model) if args.model else GasModel()
+    records = [coerce_record(r) for r in iter_records(args.inputs)]
+    image_uris, holders = {}, set()
+    if args.contract or default_contract_address():
+        contract = CertificateContract(args.contract or default_contract_address(), rpc_url)
+        try:
+            image_uris = {t: contract.certificate_image(t) for t in range(4)}
+            if args.check_balances:
+                addresses = sorted({r.recipient for r in records})
+                holders = {a for a, balance in zip(addresses, contract.balances(addresses)) if balance}
+        except (RpcError, OSError) as e:
+            print(f"⚠️  無法讀取合約 ({e})，使用預設圖片 URI 並假設全部為新地址")
+
+    planner = BatchPlanner(model, args.gas_limit, args.safety, args.max_batch_gas,
+                           args.gas_price, args.max_batch_cost, image_uris)
+    plan = planner.plan(records, holders)
+    total_gas = sum(b["estimatedGas"] for b in plan)
+    sizes = [len(b["recipients"]) for b in plan]
+
+    print(f"📦 {len(records)} 位接收者 → {len(plan)} 批 (每批 {min(sizes)}–{max(sizes)} 張，上限 {planner.cap:,.0f} gas)")
+    print(f"⛽ 總計 {total_gas:,} gas，平均每張 {total_gas / len(records):,.0f} gas (模型: {model.source})")
+    if args.gas_price:
+        print(f"💵 約 {total_gas * args.gas_price * 1e-9:.6f} ETH ({args.gas_price:g} gwei)")
+    for size in (1, 10, 50, 200):
+        count, over, per_cert = fixed_size_report(model, records, size, planner.cap, image_uris)
+        note = f"，{over} 批超過上限" if over else ""
+        print(f"   固定每批 {size:>3} 張: {count} 批，平均每張 {per_cert:,.0f} gas{note}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"gasLimit": args.gas_limit, "cap": planner.cap, "model": model.to_dict(), "batches": plan},
+                      f, ensure_ascii=False, indent=2)
+        print(f"📄 {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
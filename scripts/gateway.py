@@ -0,0 +1,575 @@
+"""
+本地 metadata / 圖片閘道 - 直接從磁碟提供證書 metadata、SVG 與縮圖，不必等公共 IPFS 閘道
+
+    python scripts/gateway.py serve --metadata metadata/issued --images images/certificates \
+        --thumbnails images/thumbnails --ipfs images/certificates metadata/issued
+    python scripts/gateway.py load --tokens 1-10000 --connections 64 --requests 50000
+    python scripts/gateway.py bench --count 10000          # 產生測試資料、啟動閘道並壓測
+
+路徑：
+
+    /metadata/<tokenId>        metadata_builder.py 的分層輸出 (依 manifest.json 的 shardDepth)
+    /images/<檔名>             證書 SVG
+    /thumbnails/<hash>/...     thumbnails.py 的內容定址縮圖 (immutable)
+    /ipfs/<cid>                --ipfs 目錄中 CID 相同的檔案 (immutable)
+
+以 asyncio 處理 keep-alive 連線；大於 64 KiB 的檔案以 loop.sendfile (底層為
+os.sendfile) 零拷貝送出，小檔案 (metadata、SVG) 則和回應標頭合併成一次寫入，
+省下 sendfile 的額外系統呼叫與等待寫入緩衝清空的往返；ETag 是檔案內容的 SHA-256 (依 inode / 大小 / mtime 快取)，支援
+If-None-Match (304)、單一 Range / If-Range (206 / 416) 與 HEAD。CID 與縮圖路徑
+的內容永遠不變，回 Cache-Control: immutable；其他路徑用較短的 max-age。
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from email.utils import formatdate
+
+from ipfs_cid import file_cid
+from metadata_builder import DEFAULT_SHARD_DEPTH, MANIFEST_NAME, shard_path
+
+DEFAULT_PORT = 8660
+DEFAULT_MAX_AGE = 300
+IMMUTABLE = "public, max-age=31536000, immutable"
+CID_INDEX_NAME = ".gateway-cids.jsonl"
+KEEP_ALIVE_TIMEOUT = 15
+MAX_HEADER_BYTES = 16384
+SENDFILE_MIN_BYTES = 64 * 1024
+
+CONTENT_TYPES = {
+    ".json": "application/json; charset=utf-8",
+    ".svg": "image/svg+xml; charset=utf-8",
+    ".webp": "image/webp",
+    ".png": "image/png",
+    ".pdf": "application/pdf",
+}
+
+REASONS = {
+    200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 416: "Range Not Satisfiable", 500: "Internal Server Error",
+}
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def content_type(path):
+    ext = os.path.splitext(path)[1].lower()
+    return CONTENT_TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def parse_range(header, size):
+    """``(start, end)`` inclusive for a single byte range, ``None`` to send the whole file,
+    or ``"unsatisfiable"``. Multiple ranges are answered with the full file."""
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:                      # bytes=-N：最後 N 個位元組
+        length = int(last)
+        if length == 0:
+            return "unsatisfiable"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return "unsatisfiable"
+    return start, end
+
+
+def _safe_join(root, relative):
+    """*relative* resolved under *root*, or ``None`` if it escapes it."""
+    parts = [p for p in relative.split("/") if p]
+    if any(p in (".", "..") or "\\" in p or "\0" in p for p in parts):
+        return None
+    return os.path.join(root, *parts) if parts else None
+
+
+class CidIndex:
+    """CID → local file for every file under some directories.
+
+    CIDs are computed with ipfs_cid.file_cid and remembered in a JSONL cache
+    next to the first directory, keyed by path, size and mtime, so restarts
+    only hash new or changed files.
+    """
+
+    def __init__(self, directories, cid_version=0, cache_path=None):
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.cid_version = cid_version
+        self.cache_path = cache_path or (os.path.join(self.directories[0], CID_INDEX_NAME) if directories else None)
+        self.paths = {}
+        self.hashed = 0
+
+    def build(self):
+        known = {}
+        if self.cache_path and os.path.exists(self.cache_path):
+            with open(self.cache_path, encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry.get("v") == self.cid_version:
+                        known[entry["path"]] = entry
+
+        entries = []
+        for directory in self.directories:
+            for base, _, names in os.walk(directory):
+                for name in sorted(names):
+                    if name == CID_INDEX_NAME:
+                        continue
+                    path = os.path.join(base, name)
+                    st = os.stat(path)
+                    entry = known.get(path)
+                    if not entry or entry["size"] != st.st_size or entry["mtime"] != st.st_mtime_ns:
+                        entry = {"path": path, "size": st.st_size, "mtime": st.st_mtime_ns,
+                                 "v": self.cid_version, "cid": file_cid(path, self.cid_version)}
+                        self.hashed += 1
+                    entries.append(entry)
+                    self.paths[entry["cid"]] = path
+
+        if self.cache_path and self.hashed:
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.cache_path)
+        return self
+
+    def get(self, cid):
+        return self.paths.get(cid)
+
+
+class _FileInfo:
+    __slots__ = ("key", "etag", "last_modified")
+
+    def __init__(self, key, etag, last_modified):
+        self.key = key
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+def _sha256_etag(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return f'"{h.hexdigest()[:40]}"'
+
+
+class Gateway:
+    """Serves metadata, images, thumbnails and CID paths from local directories."""
+
+    def __init__(self, metadata_dir=None, images_dir=None, thumbnails_dir=None, cid_index=None,
+                 max_age=DEFAULT_MAX_AGE, use_sendfile=True):
+        self.metadata_dir = metadata_dir
+        self.images_dir = images_dir
+        self.thumbnails_dir = thumbnails_dir
+        self.cid_index = cid_index
+        self.max_age = max_age
+        self.use_sendfile = use_sendfile
+        self.shard_depth = DEFAULT_SHARD_DEPTH
+        if metadata_dir and os.path.exists(os.path.join(metadata_dir, MANIFEST_NAME)):
+            with open(os.path.join(metadata_dir, MANIFEST_NAME), encoding="utf-8") as f:
+                self.shard_depth = json.load(f).get("shardDepth", DEFAULT_SHARD_DEPTH)
+        self._files = {}
+        self.stats = {"connections": 0, "requests": 0, "bytes": 0}
+
+    # ---- 路徑對應 ----
+
+    def resolve(self, path):
+        """``(file path, cache-control, fixed etag or None)`` for a request path, or ``None``."""
+        head, _, rest = path.lstrip("/").partition("/")
+        if head == "metadata" and self.metadata_dir:
+            token = rest[:-5] if rest.endswith(".json") else rest
+            if token.isdigit():
+                return (os.path.join(self.metadata_dir, shard_path(int(token), self.shard_depth)),
+                        f"public, max-age={self.max_age}", None)
+        elif head == "images" and self.images_dir:
+            local = _safe_join(self.images_dir, rest)
+            if local:
+                return local, f"public, max-age={self.max_age}", None
+        elif head == "thumbnails" and self.thumbnails_dir:
+            # <hash[:2]>/<hash>/<size>.<fmt> 是內容定址的，內容不會改變
+            local = _safe_join(self.thumbnails_dir, rest)
+            if local:
+                return local, IMMUTABLE, None
+        elif head == "ipfs" and self.cid_index and rest and "/" not in rest:
+            local = self.cid_index.get(rest)
+            if local:
+                return local, IMMUTABLE, f'"{rest}"'
+        return None
+
+    async def file_info(self, path, st, fixed_etag=None):
+        key = (st.st_ino, st.st_size, st.st_mtime_ns)
+        info = self._files.get(path)
+        if info is None or info.key != key:
+            etag = fixed_etag or await asyncio.to_thread(_sha256_etag, path)
+            info = self._files[path] = _FileInfo(key, etag, formatdate(st.st_mtime, usegmt=True))
+        return info
+
+    # ---- HTTP ----
+
+    @staticmethod
+    def _head(status, headers):
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}"]
+        lines += [f"{name}: {value}" for name, value in headers]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send_error(self, writer, status, keep_alive, extra=(), head_only=False):
+        """JSON error reply; *head_only* (HEAD requests) keeps Content-Length but sends no body."""
+        body = json.dumps({"error": REASONS[status]}).encode()
+        headers = [("Content-Type", "application/json"), ("Content-Length", len(body)),
+                   ("Access-Control-Allow-Origin", "*"), *extra,
+                   ("Connection", "keep-alive" if keep_alive else "close")]
+        writer.write(self._head(status, headers) + (b"" if head_only else body))
+        await writer.drain()
+
+    async def respond(self, method, target, headers, writer, keep_alive):
+        self.stats["requests"] += 1
+        head_only = method == "HEAD"
+        if method not in ("GET", "HEAD"):
+            return await self._send_error(writer, 405, keep_alive, [("Allow", "GET, HEAD")])
+        resolved = self.resolve(target.split("?", 1)[0])
+        if resolved is None:
+            return await self._send_error(writer, 404, keep_alive, head_only=head_only)
+        path, cache_control, fixed_etag = resolved
+        try:
+            f = open(path, "rb")
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return await self._send_error(writer, 404, keep_alive, head_only=head_only)
+
+        with f:
+            st = os.fstat(f.fileno())
+            info = await self.file_info(path, st, fixed_etag)
+            size = st.st_size
+            common = [
+                ("ETag", info.etag), ("Last-Modified", info.last_modified), ("Cache-Control", cache_control),
+                ("Accept-Ranges", "bytes"), ("Access-Control-Allow-Origin", "*"),
+                ("Connection", "keep-alive" if keep_alive else "close"),
+            ]
+
+            if_none_match = headers.get("if-none-match")
+            if if_none_match and (if_none_match.strip() == "*" or info.etag in
+                                  [t.strip().removeprefix("W/") for t in if_none_match.split(",")]):
+                writer.write(self._head(304, common))
+                return await writer.drain()
+
+            status, start, length = 200, 0, size
+            range_header = headers.get("range")
+            if range_header and headers.get("if-range", info.etag) == info.etag:
+                byte_range = parse_range(range_header, size)
+                if byte_range == "unsatisfiable":
+                    return await self._send_error(writer, 416, keep_alive, [("Content-Range", f"bytes */{size}")],
+                                                  head_only)
+                if byte_range:
+                    status, start, length = 206, byte_range[0], byte_range[1] - byte_range[0] + 1
+                    common.append(("Content-Range", f"bytes {start}-{byte_range[1]}/{size}"))
+
+            head = self._head(status, [("Content-Type", content_type(path)), ("Content-Length", length), *common])
+            if head_only or length == 0:
+                writer.write(head)
+                return await writer.drain()
+            if self.use_sendfile and length >= SENDFILE_MIN_BYTES:
+                writer.write(head)
+                await writer.drain()
+                # 非 TLS 的 socket transport 會用 os.sendfile；其他情況 asyncio 自動退回讀寫
+                await asyncio.get_running_loop().sendfile(writer.transport, f, start, length)
+            else:
+                f.seek(start)
+                writer.write(head + f.read(length))
+                await writer.drain()
+            self.stats["bytes"] += length
+
+    async def handle(self, reader, writer):
+        self.stats["connections"] += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    return await self._send_error(writer, 400, False)
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    return await self._send_error(writer, 400, False)
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                try:
+                    await self.respond(method, target, headers, writer, keep_alive)
+                except ConnectionError:
+                    return
+                except Exception as e:
+                    print(f"⚠️  {method} {target}: {type(e).__name__}: {e}")
+                    return await self._send_error(writer, 500, False, head_only=method == "HEAD")
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES, backlog=1024)
+        try:
+            # SIGTERM 也正常結束 (印出統計)；Windows 沒有 add_signal_handler
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, server.close)
+        except (NotImplementedError, AttributeError):
+            pass
+        if ready:
+            ready(server)
+        async with server:
+            try:
+                await server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+
+# ---- 壓測 ----
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+async def _load_worker(host, port, paths, counter, total, latencies, statuses, revalidate, etags):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < total:
+            index = counter[0]
+            counter[0] += 1
+            path = paths[index % len(paths)]
+            extra = f"If-None-Match: {etags[path]}\r\n" if revalidate and path in etags else ""
+            started = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{extra}\r\n".encode())
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+            status = int(head[0].split(" ")[1])
+            length = 0
+            for line in head[1:]:
+                name, _, value = line.partition(":")
+                name = name.lower()
+                if name == "content-length":
+                    length = int(value)
+                elif name == "etag":
+                    etags[path] = value.strip()
+            if status != 304:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+            statuses["bytes"] = statuses.get("bytes", 0) + (length if status != 304 else 0)
+    finally:
+        writer.close()
+
+
+def run_load(host, port, paths, requests, connections, revalidate=False):
+    """Fire *requests* GETs over *connections* keep-alive connections; returns a summary dict.
+
+    With *revalidate* every path is fetched once before the clock starts, so the
+    timed requests all carry If-None-Match; the ETags are shared by all connections.
+    """
+    async def run(total, latencies, statuses, etags):
+        counter = [0]
+        await asyncio.gather(*(
+            _load_worker(host, port, paths, counter, total, latencies, statuses, revalidate, etags)
+            for _ in range(connections)
+        ))
+
+    async def main():
+        latencies, statuses, etags = [], {}, {}
+        if revalidate:
+            await run(len(paths), [], {}, etags)   # 暖機：每個路徑取一次 ETag，不計入結果
+        started = time.perf_counter()
+        await run(requests, latencies, statuses, etags)
+        return time.perf_counter() - started, sorted(latencies), statuses
+
+    elapsed, latencies, statuses = asyncio.run(main())
+    total_bytes = statuses.pop("bytes", 0)
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mbps": total_bytes / elapsed / 1e6 if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "statuses": statuses,
+    }
+
+
+def print_load(summary):
+    statuses = ", ".join(f"{k}×{v}" for k, v in sorted(summary["statuses"].items()))
+    print(f"⏱️  {summary['requests']} requests in {summary['seconds']:.2f}s: {summary['rps']:,.0f} req/s, "
+          f"{summary['mbps']:.1f} MB/s, p50 {summary['p50_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms ({statuses})")
+
+
+def _token_range(spec):
+    first, _, last = spec.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+
+def _load_paths(args):
+    paths = []
+    if args.tokens:
+        paths += [f"/metadata/{t}" for t in _token_range(args.tokens)]
+    if args.paths_file:
+        with open(args.paths_file, encoding="utf-8") as f:
+            paths += [line.strip() for line in f if line.strip()]
+    paths += args.paths or []
+    return paths
+
+
+def _wait_for_port(host, port, timeout=30):
+    import socket
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def run_benchmark(count, requests, connections, port):
+    """Generate *count* metadata files and SVGs, serve them in a child process and load-test it."""
+    from certificate_svg import render_to_dir
+    from metadata_builder import BatchContext, build, synthetic_records
+
+    root = tempfile.mkdtemp(prefix="gateway-bench-")
+    metadata_dir, images_dir = os.path.join(root, "metadata"), os.path.join(root, "images")
+    print(f"📦 產生 {count} 個 metadata 與 SVG 到 {root}...")
+    records = [dict(r, tokenId=i) for i, r in enumerate(synthetic_records(count), 1)]
+    render_to_dir(records, images_dir)
+    # JSONL bundle 當作大檔案 (數 MB)，測 sendfile 零拷貝
+    build(records, metadata_dir, BatchContext.create("2025-10-04"), bundle_path=os.path.join(images_dir, "bundle.jsonl"))
+    bundle_mb = os.path.getsize(os.path.join(images_dir, "bundle.jsonl")) / 1e6
+
+    paths = []
+    for token_id in range(1, count + 1):
+        paths.append(f"/metadata/{token_id}")
+        if token_id % 4 == 0:
+            paths.append(f"/images/certificate-{token_id}.svg")
+
+    results = {}
+    for mode in ("sendfile", "read"):
+        cmd = [sys.executable, os.path.abspath(__file__), "serve", "--port", str(port),
+               "--metadata", metadata_dir, "--images", images_dir, "--ipfs", images_dir]
+        if mode == "read":
+            cmd.append("--no-sendfile")
+        server = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+        try:
+            if not _wait_for_port("127.0.0.1", port):
+                print("❌ 閘道沒有啟動")
+                return 1
+            run_load("127.0.0.1", port, paths[:2000], 2000, connections)    # 暖機：算好 ETag
+            print(f"🔁 {mode}:")
+            print("   metadata + SVG:", end=" ")
+            results[mode] = run_load("127.0.0.1", port, paths, requests, connections)
+            print_load(results[mode])
+            print("   with If-None-Match:", end=" ")
+            revalidated = run_load("127.0.0.1", port, paths[:1000], requests, connections, revalidate=True)
+            print_load(revalidated)
+            if not revalidated["statuses"].get(304):
+                print("❌ If-None-Match 沒有得到任何 304，重新驗證沒有生效")
+                return 1
+            print(f"   bundle.jsonl ({bundle_mb:.1f} MB):", end=" ")
+            print_load(run_load("127.0.0.1", port, ["/images/bundle.jsonl"], 200, min(connections, 8)))
+        finally:
+            server.terminate()
+            server.wait()
+    import shutil
+    shutil.rmtree(root)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Static gateway for certificate metadata, SVGs and thumbnails")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("serve", help="serve local files over HTTP")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=DEFAULT_PORT)
+    s.add_argument("--metadata", help="metadata_builder.py output directory")
+    s.add_argument("--images", help="certificate SVG directory")
+    s.add_argument("--thumbnails", help="thumbnails.py cache directory")
+    s.add_argument("--ipfs", nargs="+", default=[], metavar="DIR", help="directories served by CID at /ipfs/<cid>")
+    s.add_argument("--cid-version", type=int, choices=(0, 1), default=0)
+    s.add_argument("--max-age", type=int, default=DEFAULT_MAX_AGE, help="Cache-Control max-age for mutable paths")
+    s.add_argument("--no-sendfile", action="store_true", help="never use os.sendfile, even for large files (for comparison)")
+
+    ld = sub.add_parser("load", help="load-test a running gateway")
+    ld.add_argument("--host", default="127.0.0.1")
+    ld.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ld.add_argument("--tokens", help="request /metadata/<id> for a range, e.g. 1-10000")
+    ld.add_argument("--paths-file", help="file with one request path per line")
+    ld.add_argument("paths", nargs="*", help="request paths")
+    ld.add_argument("--requests", type=int, default=20000)
+    ld.add_argument("--connections", type=int, default=64)
+    ld.add_argument("--revalidate", action="store_true", help="send If-None-Match with known ETags")
+
+    b = sub.add_parser("bench", help="generate data, start a gateway and load-test it")
+    b.add_argument("--count", type=int, default=10000)
+    b.add_argument("--requests", type=int, default=20000)
+    b.add_argument("--connections", type=int, default=64)
+    b.add_argument("--port", type=int, default=DEFAULT_PORT + 1)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        return run_benchmark(args.count, args.requests, args.connections, args.port)
+    if args.command == "load":
+        paths = _load_paths(args)
+        if not paths:
+            print("❌ 需要 --tokens、--paths-file 或路徑")
+            return 2
+        summary = run_load(args.host, args.port, paths, args.requests, args.connections, args.revalidate)
+        print_load(summary)
+        if args.revalidate and not summary["statuses"].get(304):
+            print("❌ If-None-Match 沒有得到任何 304")
+            return 1
+        return 0
+
+    if not (args.metadata or args.images or args.thumbnails or args.ipfs):
+        print("❌ 至少需要 --metadata、--images、--thumbnails 或 --ipfs 其中之一")
+        return 2
+    cid_index = None
+    if args.ipfs:
+        started = time.perf_counter()
+        cid_index = CidIndex(args.ipfs, args.cid_version).build()
+        print(f"🔑 CID 索引: {len(cid_index.paths)} 個檔案 ({cid_index.hashed} 個重新計算, "
+              f"{time.perf_counter() - started:.1f}s)")
+    gateway = Gateway(args.metadata, args.images, args.thumbnails, cid_index, args.max_age,
+                      use_sendfile=not args.no_sendfile)
+
+    def ready(server):
+        print(f"🌐 閘道已啟動: http://{args.host}:{args.port}/  (sendfile {'off' if args.no_sendfile else 'on'})")
+        sys.stdout.flush()
+
+    try:
+        asyncio.run(gateway.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"❌ {e}")
+        return 1
+    stats = gateway.stats
+    print(f"🛑 閘道已停止: {stats['connections']} 個連線, {stats['requests']} 個請求, {stats['bytes'] / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+本地 IPFS CID 計算 - 不上傳就算出 Pinata / ipfs add 會回傳的 CID
+
+    python scripts/ipfs_cid.py images/certificates/*.svg
+    python scripts/ipfs_cid.py --cid-version 1 metadata/token-1.json
+
+與 ``ipfs add`` 預設相同的 UnixFS 匯入方式：
+
+* 每 256 KiB 切一塊 (size-262144)，balanced 樹狀排列，每個節點最多 174 個連結
+* CIDv0：葉節點是包著 UnixFS File 的 dag-pb 節點，以 base58btc 表示 (Qm...)
+* CIDv1：葉節點是 raw block (與 ``--cid-version=1`` 相同)，以 base32 表示 (bafy... / bafkrei...)
+
+pinJSONToIPFS 的 CID 則是 ``JSON.stringify(pinataContent)`` 的位元組，
+用 :func:`json_bytes` 取得相同的序列化結果。
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from base64 import b32encode
+
+CHUNK_SIZE = 262144
+MAX_LINKS = 174
+
+DAG_PB = 0x70
+RAW = 0x55
+SHA2_256 = 0x12
+UNIXFS_FILE = 2
+
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def _varint(n):
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _bytes_field(number, data):
+    return _varint(number << 3 | 2) + _varint(len(data)) + data
+
+
+def _varint_field(number, value):
+    return _varint(number << 3) + _varint(value)
+
+
+def _unixfs_file(data=b"", filesize=0, blocksizes=()):
+    out = _varint_field(1, UNIXFS_FILE)
+    if data:
+        out += _bytes_field(2, data)
+    out += _varint_field(3, filesize)
+    for size in blocksizes:
+        out += _varint_field(4, size)
+    return out
+
+
+def _dag_pb(links, data):
+    # dag-pb 標準序列化：先 Links (欄位 2) 再 Data (欄位 1)
+    return b"".join(_bytes_field(2, link) for link in links) + _bytes_field(1, data)
+
+
+def _multihash(block):
+    return bytes((SHA2_256, 32)) + hashlib.sha256(block).digest()
+
+
+def b58encode(data):
+    n = int.from_bytes(data, "big")
+    out = ""
+    while n:
+        n, rem = divmod(n, 58)
+        out = _B58_ALPHABET[rem] + out
+    return "1" * (len(data) - len(data.lstrip(b"\0"))) + out
+
+
+def cid_to_string(cid):
+    """Binary CID → ``Qm...`` (v0) or base32 ``b...`` (v1)."""
+    if cid[0] == SHA2_256:
+        return b58encode(cid)
+    return "b" + b32encode(cid).decode("ascii").lower().rstrip("=")
+
+
+class _Node:
+    __slots__ = ("cid", "tsize", "filesize")
+
+    def __init__(self, cid, tsize, filesize):
+        self.cid = cid            # binary CID used inside parent links
+        self.tsize = tsize        # serialized size of the whole sub-DAG
+        self.filesize = filesize  # file bytes below this node
+
+
+class FileHasher:
+    """Incremental UnixFS importer; feed bytes with :meth:`update`, then call :meth:`cid`."""
+
+    def __init__(self, cid_version=0, chunk_size=CHUNK_SIZE):
+        if cid_version not in (0, 1):
+            raise ValueError("cid_version must be 0 or 1")
+        self.cid_version = cid_version
+        self.chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._levels = [[]]   # pending nodes per tree level, leaves first
+        self._leaves = 0
+
+    def update(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_size:
+            self._add_leaf(bytes(self._buffer[:self.chunk_size]))
+            del self._buffer[:self.chunk_size]
+
+    def _block_cid(self, codec, block):
+        if self.cid_version == 0:
+            return _multihash(block)
+        return _varint(1) + _varint(codec) + _multihash(block)
+
+    def _add_leaf(self, chunk):
+        if self.cid_version == 1:
+            node = _Node(self._block_cid(RAW, chunk), len(chunk), len(chunk))
+        else:
+            block = _dag_pb((), _unixfs_file(chunk, len(chunk)))
+            node = _Node(self._block_cid(DAG_PB, block), len(block), len(chunk))
+        self._leaves += 1
+        self._push(0, node)
+
+    def _push(self, level, node):
+        if level == len(self._levels):
+            self._levels.append([])
+        self._levels[level].append(node)
+        if len(self._levels[level]) == MAX_LINKS:
+            self._push(level + 1, self._parent(self._levels[level]))
+            self._levels[level] = []
+
+    def _parent(self, children):
+        links = [_bytes_field(1, c.cid) + _bytes_field(2, b"") + _varint_field(3, c.tsize) for c in children]
+        filesize = sum(c.filesize for c in children)
+        block = _dag_pb(links, _unixfs_file(filesize=filesize, blocksizes=[c.filesize for c in children]))
+        return _Node(self._block_cid(DAG_PB, block), len(block) + sum(c.tsize for c in children), filesize)
+
+    def digest(self):
+        """Binary CID of everything fed so far."""
+        if self._buffer or not self._leaves:
+            self._add_leaf(bytes(self._buffer))
+            self._buffer.clear()
+        levels = [list(level) for level in self._levels]
+        for i, nodes in enumerate(levels):
+            higher = any(levels[i + 1:])
+            if len(nodes) == 1 and not higher:
+                return nodes[0].cid
+            if nodes:
+                if i + 1 == len(levels):
+                    levels.append([])
+                levels[i + 1].append(self._parent(nodes))
+        raise AssertionError("unreachable")
+
+    def cid(self):
+        return cid_to_string(self.digest())
+
+
+def bytes_cid(data, cid_version=0):
+    hasher = FileHasher(cid_version)
+    hasher.update(data)
+    return hasher.cid()
+
+
+def file_cid(path, cid_version=0):
+    """CID of a file on disk, read in chunks."""
+    hasher = FileHasher(cid_version)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(block)
+    return hasher.cid()
+
+
+def json_bytes(data):
+    """Serialize like ``JSON.stringify`` (compact, non-ASCII kept as UTF-8)."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_cid(data, cid_version=0):
+    return bytes_cid(json_bytes(data), cid_version)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute IPFS CIDs locally")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--cid-version", type=int, choices=(0, 1), default=0)
+    args = parser.parse_args(argv)
+    for path in args.files:
+        print(f"{file_cid(path, args.cid_version)}  {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,694 @@
+"""
+可續傳的平行發行引擎 - 本地管理 nonce，同時保持多筆交易在途
+
+    python scripts/issuance_engine.py run recipients.jsonl --journal issuance.journal
+    python scripts/issuance_engine.py run --plan issuance-plan.json --window 64   # gas_model.py plan 的批次
+    python scripts/issuance_engine.py status --journal issuance.journal
+
+    SEPOLIA_PRIVATE_KEY / PRIVATE_KEY   發行者私鑰 (hardhat 本地鏈 chainId 31337 預設使用帳號 #0)
+    RPC_URL / SEPOLIA_RPC_URL           RPC 節點
+    CONTRACT_ADDRESS                    合約地址
+
+與 certificate-issuer.js 每筆 tx.wait() 完才送下一筆不同，引擎在本地依序分配
+nonce、簽名後一次送出整個視窗 (--window) 的交易，再以 batch 查詢 receipt：
+
+* 每筆工作 (一位接收者或一個批次) 的狀態寫入 append-only journal：
+  pending → sent (nonce、簽好的交易、所有 hash) → mined / failed
+* 交易在廣播「之前」就先寫入 journal 並 fsync；當機重啟時重播 journal、
+  查 receipt、重送尚未上鏈的原始交易。交易送進節點後工作就綁定該 nonce
+  (加價重送也沿用)，同一個 nonce 只能上鏈一次，所以不會重複鑄造
+* 超過 --stuck-after 秒未上鏈的交易以相同 nonce 提高手續費 (預設 +12.5%) 重送
+* 若 nonce 已被其他交易用掉而我們的交易都沒有 receipt，工作會重新排入佇列；
+  必須連續 3 次輪詢、且持續 --stuck-after 秒都如此 (receipt 查詢都回傳 null
+  而不是錯誤)，並在
+  最後再查一次 journal 中這個 nonce 的每一個 hash (含加價重送)，避免負載平衡
+  後面落後的節點造成重複鑄造
+* 只有明確的拒收 (手續費過低、餘額不足、交易無效) 才會釋放 nonce 並重新排入
+  佇列，連續失敗 3 次則標記為 failed；逾時、5xx、連線中斷等結果不明的錯誤
+  保留 nonce，先以 eth_getTransactionByHash 確認節點是否收到，沒有才重送
+  同一筆簽好的交易
+* 空出來的 nonce 優先給下一筆工作，佇列已空時以 0 ETH 轉給自己的交易補上，
+  避免後面的交易永遠卡住；重啟時依 journal 與鏈上 nonce 重建空出來的 nonce
+* eth_estimateGas 只有 revert 才標記為 failed，連線或限流錯誤以指數退避重試
+"""
+
+try:
+    from eth_account import Account
+    from eth_utils import to_checksum_address
+    print("✓ eth-account installed")
+except ImportError:
+    print("✗ eth-account not installed")
+    print("Please run: pip install eth-account")
+    import sys
+    sys.exit(1)
+
+import argparse
+import hashlib
+import heapq
+import http.client
+import json
+import os
+import sys
+import time
+from collections import Counter, namedtuple
+
+from certificates import coerce_record, iter_records
+from chain import (
+    TRANSFER_TOPIC, ZERO_ADDRESS, CertificateContract, RpcClient, RpcError,
+    default_contract_address, encode_batch_issue, encode_issue_certificate,
+)
+
+HARDHAT_CHAIN_ID = 31337
+HARDHAT_DEFAULT_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"  # hardhat 公開測試帳號 #0
+DEFAULT_JOURNAL = "issuance.journal"
+DEFAULT_PRIORITY_FEE = 1_500_000_000   # 節點不支援 eth_maxPriorityFeePerGas 時使用 (1.5 gwei)
+
+MAX_SEND_ATTEMPTS = 3                   # 節點拒收幾次後標記為 failed
+NONCE_REUSE_POLLS = 3                   # 連續幾次輪詢看到 nonce 已用掉卻沒有 receipt 才重新排入
+ESTIMATE_BACKOFF = 1.0                  # eth_estimateGas 連線 / 限流錯誤的第一次退避秒數
+MAX_BACKOFF = 30.0
+GAP_PREFIX = "gap-"                     # 補 nonce 空洞的自轉交易在 journal 裡的工作 id
+GAP_GAS = 21000
+
+PENDING, SENT, MINED, FAILED = "pending", "sent", "mined", "failed"
+
+# 節點明確拒收、交易確定沒有進入 mempool 的錯誤；其他錯誤一律當作結果不明
+REJECTIONS = (
+    "underpriced", "insufficient funds", "intrinsic gas too low", "exceeds block gas limit",
+    "less than block base fee", "fee cap", "exceeds the configured cap",
+    "invalid sender", "invalid signature", "invalid chain id", "invalid transaction",
+)
+TRANSPORT_ERRORS = (RpcError, OSError, http.client.HTTPException)
+
+Job = namedtuple("Job", "id calldata recipients names to", defaults=(None,))
+
+
+def record_jobs(records):
+    """One ``issueCertificate`` job per recipient record."""
+    jobs = []
+    for i, value in enumerate(records):
+        r = coerce_record(value)
+        if not r.recipient:
+            raise ValueError(f"第 {i + 1} 筆紀錄沒有接收者地址")
+        calldata = encode_issue_certificate(r.recipient, r.cert_type, r.recipient_name, r.issuer_name, r.custom_message)
+        jobs.append(Job(f"r{i}", calldata, [r.recipient], [r.recipient_name]))
+    return jobs
+
+
+def plan_jobs(plan):
+    """One ``batchIssueCertificates`` job per batch of a gas_model.py plan."""
+    return [
+        Job(f"b{i}", encode_batch_issue(b["recipients"], b["certType"], b["recipientNames"],
+                                        b["issuerName"], b["customMessage"]),
+            b["recipients"], b["recipientNames"])
+        for i, b in enumerate(plan["batches"])
+    ]
+
+
+def jobs_fingerprint(jobs):
+    h = hashlib.sha256()
+    for job in jobs:
+        h.update(job.id.encode() + b"\0" + job.calldata.encode() + b"\n")
+    return h.hexdigest()
+
+
+class Journal:
+    """Append-only, fsynced JSON lines; the last entry of each job is its state."""
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.jobs = {}
+        self.nonce_hashes = {}   # nonce -> {hash: job id}，包含被取代與被拒收的交易
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break   # 當機時寫到一半的最後一行
+                    if entry.get("type") == "header":
+                        self.header = entry
+                    else:
+                        self._apply(entry)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _apply(self, entry):
+        state = self.jobs.setdefault(entry["job"], {"hashes": []})
+        hashes = state["hashes"]
+        state.update(entry)
+        if "hash" in entry and entry["hash"] not in hashes:
+            hashes.append(entry["hash"])
+        if "hash" in entry and "nonce" in entry:
+            self.nonce_hashes.setdefault(entry["nonce"], {})[entry["hash"]] = entry["job"]
+        if entry["state"] == PENDING:
+            hashes.clear()   # 重新排入佇列：舊 nonce 已被其他交易用掉
+        state["hashes"] = hashes
+
+    def write(self, entry):
+        entry = dict(entry, at=round(time.time(), 3))
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if entry.get("type") == "header":
+            self.header = entry
+        else:
+            self._apply(entry)
+
+    def state(self, job_id):
+        return self.jobs.get(job_id, {}).get("state", PENDING)
+
+    def close(self):
+        self._file.close()
+
+
+def _signed_fields(signed):
+    raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
+    return "0x" + bytes(signed.hash).hex(), "0x" + bytes(raw).hex()
+
+
+def _is_nonce_too_low(error):
+    text = str(error).lower()
+    return "nonce too low" in text or "nonce has already been used" in text
+
+
+def _is_rejected(error):
+    text = str(error).lower()
+    return any(reason in text for reason in REJECTIONS)
+
+
+def _is_revert(error):
+    return "revert" in str(error).lower()
+
+
+def _is_known(error):
+    text = str(error).lower()
+    return "already known" in text or "known transaction" in text or "already imported" in text
+
+
+class IssuanceEngine:
+    """Signs with local nonces, keeps *window* transactions in flight and journals every job."""
+
+    def __init__(self, contract_address, jobs, journal_path=DEFAULT_JOURNAL, rpc_url=None, private_key=None,
+                 window=32, stuck_after=30.0, bump=1.125, poll_interval=1.0, gas_margin=1.2,
+                 max_fee_gwei=None, retry_failed=False, log=print):
+        self.client = RpcClient(rpc_url, batch_size=200)
+        self.contract = CertificateContract(contract_address, client=self.client)
+        self.address = to_checksum_address(contract_address)
+        self.jobs = list(jobs)
+        self.window = window
+        self.stuck_after = stuck_after
+        self.bump = bump
+        self.poll_interval = poll_interval
+        self.gas_margin = gas_margin
+        self.max_fee = int(max_fee_gwei * 1e9) if max_fee_gwei else None
+        self.log = log
+
+        self.chain_id = int(self.client.call("eth_chainId", []), 16)
+        key = private_key or os.environ.get("PRIVATE_KEY") or os.environ.get("SEPOLIA_PRIVATE_KEY")
+        if not key and self.chain_id == HARDHAT_CHAIN_ID:
+            key = HARDHAT_DEFAULT_KEY
+        if not key:
+            raise ValueError("請設定 SEPOLIA_PRIVATE_KEY 或 PRIVATE_KEY")
+        self.account = Account.from_key(key)
+
+        self.journal = Journal(journal_path)
+        fingerprint = jobs_fingerprint(self.jobs)
+        if self.journal.header is None:
+            self.journal.write({"type": "header", "inputHash": fingerprint, "contract": self.address,
+                                "sender": self.account.address, "chainId": self.chain_id, "jobs": len(self.jobs)})
+        elif self.journal.header["inputHash"] != fingerprint:
+            raise ValueError(f"{journal_path} 屬於另一份發行名單；請改用新的 --journal")
+        elif self.journal.header["chainId"] != self.chain_id or self.journal.header["contract"] != self.address:
+            raise ValueError(f"{journal_path} 屬於另一條鏈或另一個合約")
+
+        self.by_id = {job.id: job for job in self.jobs}
+        for job_id in self.journal.jobs:
+            if job_id.startswith(GAP_PREFIX):
+                self.by_id[job_id] = self._gap_job(int(job_id[len(GAP_PREFIX):]))
+        self.queue = [job.id for job in self.jobs if self._runnable(job.id, retry_failed)]
+        self.queue.reverse()   # pop() 從名單開頭取
+        self.inflight = {job_id: dict(state) for job_id, state in self.journal.jobs.items() if state["state"] == SENT}
+        self.next_nonce = None
+        self.free_nonces = []   # 節點拒收後釋放的 nonce (heap)，優先重用
+        self.fees = None
+        self.suspect = {}        # job id -> [連續幾次輪詢看到 nonce 已用掉卻沒有 receipt, 第一次看到的時間]
+        self.unconfirmed = {}    # job id -> 結果不明的廣播錯誤，等 eth_getTransactionByHash 確認
+        self.send_failures = Counter()
+        self.estimate_failures = 0
+        self.retry_at = 0.0
+        self.stats = Counter()
+
+    def _runnable(self, job_id, retry_failed):
+        state = self.journal.state(job_id)
+        return state == PENDING or (retry_failed and state == FAILED)
+
+    def _gap_job(self, nonce):
+        return Job(f"{GAP_PREFIX}{nonce}", "0x", [], [], self.account.address)
+
+    def _take_nonce(self):
+        if self.free_nonces:
+            return heapq.heappop(self.free_nonces)
+        nonce = self.next_nonce
+        self.next_nonce += 1
+        return nonce
+
+    # -- RPC ------------------------------------------------------------------
+
+    def _nonce(self, block="pending"):
+        return int(self.client.call("eth_getTransactionCount", [self.account.address, block]), 16)
+
+    def _refresh_fees(self):
+        latest, tip = self.client.batch([
+            ("eth_getBlockByNumber", ["latest", False]),
+            ("eth_maxPriorityFeePerGas", []),
+        ], raise_errors=False)
+        if isinstance(latest, RpcError) or not latest:
+            if self.fees is None:
+                raise RpcError(f"無法取得最新區塊的 base fee: {latest}")
+            self.log(f"⚠️  查詢最新區塊失敗，沿用上次的手續費: {latest}")
+            return
+        base = int(latest.get("baseFeePerGas", "0x0"), 16)
+        tip = DEFAULT_PRIORITY_FEE if isinstance(tip, RpcError) else int(tip, 16)
+        max_fee = 2 * base + tip
+        if self.max_fee:
+            max_fee = min(max_fee, self.max_fee)
+            tip = min(tip, max_fee)
+        self.fees = (max_fee, tip)
+
+    def _sign(self, job, nonce, gas, max_fee, tip):
+        signed = Account.sign_transaction({
+            "type": 2, "chainId": self.chain_id, "nonce": nonce, "to": job.to or self.address, "value": 0,
+            "data": job.calldata, "gas": gas, "maxFeePerGas": max_fee, "maxPriorityFeePerGas": tip,
+        }, self.account.key)
+        return _signed_fields(signed)
+
+    def _broadcast(self, raws):
+        """Send raw transactions in one batch; returns ``{job_id: error or None}``."""
+        if not raws:
+            return {}
+        try:
+            results = self.client.batch([("eth_sendRawTransaction", [raw]) for _, raw in raws], raise_errors=False)
+        except TRANSPORT_ERRORS as e:
+            results = [RpcError(f"broadcast failed: {e}")] * len(raws)   # 節點可能已經收到，交給 _send_error 判斷
+        errors = {}
+        for (job_id, _), result in zip(raws, results):
+            errors[job_id] = result if isinstance(result, RpcError) and not _is_known(result) else None
+        return errors
+
+    # -- 主迴圈 ----------------------------------------------------------------
+
+    def _fill(self):
+        """Estimate, sign, journal and broadcast jobs until the window is full."""
+        room = self.window - len(self.inflight)
+        if room <= 0 or not self.queue or time.time() < self.retry_at:
+            return
+        batch = [self.by_id[self.queue.pop()] for _ in range(min(room, len(self.queue)))]
+        try:
+            estimates = self.client.batch([
+                ("eth_estimateGas", [{"from": self.account.address, "to": self.address, "data": job.calldata}])
+                for job in batch
+            ], raise_errors=False)
+        except TRANSPORT_ERRORS as e:
+            estimates = [RpcError(str(e))] * len(batch)
+
+        max_fee, tip = self.fees
+        raws, retry = [], []
+        for job, estimate in zip(batch, estimates):
+            if isinstance(estimate, RpcError):
+                if not _is_revert(estimate):
+                    retry.append((job.id, estimate))
+                    continue
+                # 估算時就 revert (例如不是合約擁有者)：不分配 nonce
+                self.journal.write({"job": job.id, "state": FAILED, "error": str(estimate)})
+                self.stats["failed"] += 1
+                self.log(f"❌ {job.id}: {estimate}")
+                continue
+            gas = int(int(estimate, 16) * self.gas_margin)
+            raws.append(self._send_new(job, self._take_nonce(), gas, max_fee, tip))
+        if len(retry) < len(batch):
+            self.estimate_failures = 0   # 節點還能回應，只有整批都失敗時退避才加倍
+        if retry:
+            self._retry_estimates(retry)
+        for job_id, error in self._broadcast(raws).items():
+            if error:
+                self._send_error(job_id, error)
+
+    def _retry_estimates(self, failures):
+        """Put jobs whose estimate hit a transport or rate-limit error back at the head of the queue and back off."""
+        self.queue.extend(job_id for job_id, _ in reversed(failures))   # pop() 從尾端取，維持原本順序
+        self.estimate_failures += 1
+        delay = min(ESTIMATE_BACKOFF * 2 ** (self.estimate_failures - 1), MAX_BACKOFF)
+        self.retry_at = time.time() + delay
+        self.stats["estimateRetries"] += len(failures)
+        self.log(f"⚠️  {len(failures)} 筆估算 gas 失敗，{delay:.1f}s 後重試: {failures[0][1]}")
+
+    def _send_new(self, job, nonce, gas, max_fee, tip):
+        tx_hash, raw = self._sign(job, nonce, gas, max_fee, tip)
+        entry = {"job": job.id, "state": SENT, "nonce": nonce, "gas": gas, "hash": tx_hash, "raw": raw,
+                 "maxFeePerGas": max_fee, "maxPriorityFeePerGas": tip, "sentAt": time.time()}
+        self.journal.write(entry)   # 先寫 journal 再廣播
+        self.inflight[job.id] = dict(self.journal.jobs[job.id])
+        return job.id, raw
+
+    def _fill_gaps(self):
+        """Occupy freed nonces below in-flight ones with 0-value self transfers once the queue is empty."""
+        if self.queue or not self.free_nonces or not self.inflight:
+            return
+        highest = max(state["nonce"] for state in self.inflight.values())
+        max_fee, tip = self.fees
+        raws = []
+        while self.free_nonces and self.free_nonces[0] < highest:
+            nonce = heapq.heappop(self.free_nonces)
+            job = self._gap_job(nonce)
+            self.by_id[job.id] = job
+            raws.append(self._send_new(job, nonce, GAP_GAS, max_fee, tip))
+            self.log(f"🩹 以自轉交易補上 nonce {nonce}")
+        for job_id, error in self._broadcast(raws).items():
+            if error:
+                self._send_error(job_id, error)
+
+    def _send_error(self, job_id, error):
+        """Handle a failed first broadcast.
+
+        Only a definite rejection frees the nonce; after a timeout, 5xx or dropped
+        connection the node may hold the transaction, so the job keeps its nonce
+        until :meth:`_check_unconfirmed` has looked the hash up.
+        """
+        if _is_nonce_too_low(error):
+            self.suspect.setdefault(job_id, [0, time.time()])   # 交給 _poll 確認是我們的交易上鏈了，還是被別的交易佔用
+            return
+        if not _is_rejected(error):
+            self.unconfirmed[job_id] = str(error)
+            self.stats["unconfirmedSends"] += 1
+            self.log(f"⚠️  {job_id} 廣播結果不明，保留 nonce {self.inflight[job_id]['nonce']} 待確認: {error}")
+            return
+        self.unconfirmed.pop(job_id, None)
+        self.stats["sendErrors"] += 1
+        state = self.inflight.pop(job_id)
+        self.suspect.pop(job_id, None)
+        heapq.heappush(self.free_nonces, state["nonce"])
+        if job_id.startswith(GAP_PREFIX):
+            self.journal.write({"job": job_id, "state": FAILED, "error": str(error)})
+            self.log(f"⚠️  補 nonce {state['nonce']} 的交易被拒收，稍後重試: {error}")
+            return
+        self.send_failures[job_id] += 1
+        if self.send_failures[job_id] >= MAX_SEND_ATTEMPTS:
+            self.journal.write({"job": job_id, "state": FAILED, "error": str(error)})
+            self.stats["failed"] += 1
+            self.log(f"❌ {job_id}: 廣播失敗 {MAX_SEND_ATTEMPTS} 次，nonce {state['nonce']} 釋放: {error}")
+        else:
+            self.journal.write({"job": job_id, "state": PENDING, "error": str(error)})
+            self.queue.append(job_id)
+            self.stats["requeued"] += 1
+            self.log(f"⚠️  {job_id} 廣播失敗，釋放 nonce {state['nonce']} 並重新排入: {error}")
+
+    def _replace_error(self, job_id, previous, error):
+        """A rejected fee bump: the earlier transaction is still pending, so keep it and wait again."""
+        if _is_nonce_too_low(error):
+            self.suspect.setdefault(job_id, [0, time.time()])
+            return
+        self.stats["sendErrors"] += 1
+        self.journal.write({"job": job_id, "state": SENT, "nonce": previous["nonce"], "gas": previous["gas"],
+                            "hash": previous["hash"], "raw": previous["raw"],
+                            "maxFeePerGas": previous["maxFeePerGas"],
+                            "maxPriorityFeePerGas": previous["maxPriorityFeePerGas"], "sentAt": time.time()})
+        self.inflight[job_id] = dict(self.journal.jobs[job_id])
+        self.log(f"⚠️  {job_id} 加價重送被拒，保留原交易: {error}")
+
+    def _check_unconfirmed(self):
+        """Look up transactions whose broadcast failed ambiguously; resend the same signed bytes if the node lacks them."""
+        for job_id in [j for j in self.unconfirmed if j not in self.inflight]:
+            del self.unconfirmed[job_id]
+        job_ids = list(self.unconfirmed)
+        if not job_ids:
+            return
+        try:
+            results = self.client.batch([("eth_getTransactionByHash", [self.inflight[j]["hash"]]) for j in job_ids],
+                                        raise_errors=False)
+        except TRANSPORT_ERRORS:
+            return
+        raws = []
+        for job_id, tx in zip(job_ids, results):
+            if isinstance(tx, RpcError):
+                continue
+            if tx:
+                del self.unconfirmed[job_id]   # 節點已經收到，照常等 receipt
+            else:
+                raws.append((job_id, self.inflight[job_id]["raw"]))   # 同一筆簽好的交易，重送不會重複鑄造
+        for job_id, error in self._broadcast(raws).items():
+            if error:
+                self._send_error(job_id, error)
+            else:
+                self.unconfirmed.pop(job_id, None)
+
+    def _mined(self, job_id, receipt):
+        self.inflight.pop(job_id)
+        self.suspect.pop(job_id, None)
+        self.unconfirmed.pop(job_id, None)
+        block = int(receipt["blockNumber"], 16)
+        if job_id.startswith(GAP_PREFIX):
+            self.journal.write({"job": job_id, "state": MINED, "hash": receipt["transactionHash"], "block": block})
+            self.stats["gapsFilled"] += 1
+        elif int(receipt["status"], 16) == 1:
+            token_ids = [
+                int(log["topics"][3], 16) for log in receipt.get("logs", [])
+                if log["topics"] and log["topics"][0] == TRANSFER_TOPIC
+                and int(log["topics"][1], 16) == int(ZERO_ADDRESS, 16)
+            ]
+            self.journal.write({"job": job_id, "state": MINED, "hash": receipt["transactionHash"],
+                                "block": block, "gasUsed": int(receipt["gasUsed"], 16), "tokenIds": token_ids})
+            self.stats["mined"] += 1
+        else:
+            self.journal.write({"job": job_id, "state": FAILED, "hash": receipt["transactionHash"],
+                                "block": block, "error": "transaction reverted"})
+            self.stats["failed"] += 1
+            self.log(f"❌ {job_id}: 交易 revert ({receipt['transactionHash']})")
+
+    def _poll(self):
+        """Batch receipt lookups for every hash of every in-flight job."""
+        self._check_unconfirmed()
+        lookups = [(job_id, h) for job_id, state in self.inflight.items() for h in state["hashes"]]
+        calls = [("eth_getTransactionReceipt", [h]) for _, h in lookups]
+        calls.append(("eth_getTransactionCount", [self.account.address, "latest"]))
+        try:
+            results = self.client.batch(calls, raise_errors=False)
+        except TRANSPORT_ERRORS as e:
+            self.log(f"⚠️  查詢 receipt 失敗，下次再試: {e}")
+            return
+        mined_nonce = int(results[-1], 16) if not isinstance(results[-1], RpcError) else None
+
+        receipts = {}
+        lookup_failed = False
+        for (job_id, _), receipt in zip(lookups, results):
+            if isinstance(receipt, RpcError):
+                lookup_failed = True
+            elif receipt:
+                receipts[job_id] = receipt
+        for job_id, receipt in receipts.items():
+            self._mined(job_id, receipt)
+
+        if mined_nonce is None or lookup_failed:
+            return   # 查詢出錯時不能把「沒有 receipt」當成 nonce 被佔用
+        reused, now = [], time.time()
+        for job_id, state in self.inflight.items():
+            if state["nonce"] >= mined_nonce:
+                self.suspect.pop(job_id, None)
+                continue
+            seen = self.suspect.setdefault(job_id, [0, now])
+            seen[0] += 1
+            if seen[0] >= NONCE_REUSE_POLLS and now - seen[1] >= self.stuck_after:
+                reused.append(job_id)
+        if reused:
+            self._requeue_reused(reused)
+
+    def _requeue_reused(self, job_ids):
+        """Requeue jobs whose nonce is used by another transaction.
+
+        A lagging node behind a load balancer can report the nonce as used while
+        still returning null receipts, so every hash ever journaled for the nonce
+        (including fee bumps and rejected sends) is looked up once more first.
+        """
+        lookups = [(job_id, h, owner) for job_id in job_ids
+                   for h, owner in self.journal.nonce_hashes.get(self.inflight[job_id]["nonce"], {}).items()]
+        try:
+            results = self.client.batch([("eth_getTransactionReceipt", [h]) for _, h, _ in lookups],
+                                        raise_errors=False)
+        except TRANSPORT_ERRORS:
+            return
+        failed, found = set(), {}
+        for (job_id, h, owner), receipt in zip(lookups, results):
+            if isinstance(receipt, RpcError):
+                failed.add(job_id)
+            elif receipt:
+                found.setdefault(job_id, []).append((owner, receipt))
+        for job_id in job_ids:
+            if job_id in failed:
+                continue
+            state = self.inflight[job_id]
+            own = [receipt for owner, receipt in found.get(job_id, ()) if owner == job_id]
+            if own:
+                self._mined(job_id, own[0])
+                continue
+            self.inflight.pop(job_id)
+            self.suspect.pop(job_id, None)
+            self.unconfirmed.pop(job_id, None)
+            error = f"nonce {state['nonce']} used elsewhere"
+            for owner, receipt in found.get(job_id, ()):
+                error = f"nonce {state['nonce']} used by {owner} ({receipt['transactionHash']})"
+                self.log(f"⚠️  {job_id}: {error}")
+            if job_id.startswith(GAP_PREFIX):
+                self.journal.write({"job": job_id, "state": MINED, "error": error})   # 空洞已被填上
+                continue
+            self.journal.write({"job": job_id, "state": PENDING, "error": error})
+            self.queue.append(job_id)
+            self.stats["requeued"] += 1
+
+    def _bump_stuck(self):
+        now = time.time()
+        stuck = [(job_id, s) for job_id, s in self.inflight.items()
+                 if now - s["sentAt"] > self.stuck_after and job_id not in self.suspect
+                 and job_id not in self.unconfirmed]
+        if not stuck:
+            return
+        max_fee, tip = self.fees
+        raws, previous = [], {}
+        for job_id, state in stuck:
+            new_fee = max(int(state["maxFeePerGas"] * self.bump) + 1, max_fee)
+            new_tip = max(int(state["maxPriorityFeePerGas"] * self.bump) + 1, tip)
+            if self.max_fee and new_fee > self.max_fee:
+                continue   # 已達手續費上限，只能等
+            tx_hash, raw = self._sign(self.by_id[job_id], state["nonce"], state["gas"], new_fee, new_tip)
+            previous[job_id] = state
+            self.journal.write({"job": job_id, "state": SENT, "nonce": state["nonce"], "gas": state["gas"],
+                                "hash": tx_hash, "raw": raw, "maxFeePerGas": new_fee,
+                                "maxPriorityFeePerGas": new_tip, "sentAt": now})
+            self.inflight[job_id] = dict(self.journal.jobs[job_id])
+            raws.append((job_id, raw))
+            self.stats["bumped"] += 1
+        for job_id, error in self._broadcast(raws).items():
+            if error:
+                self._replace_error(job_id, previous[job_id], error)
+
+    def _resume(self):
+        """Reconcile journaled in-flight transactions after a restart."""
+        if self.inflight:
+            self.log(f"🔁 從 journal 恢復 {len(self.inflight)} 筆在途交易")
+            self._poll()
+            pending = self._nonce("latest")
+            raws = [(job_id, s["raw"]) for job_id, s in sorted(self.inflight.items(), key=lambda i: i[1]["nonce"])
+                    if s["nonce"] >= pending]
+            for job_id, error in self._broadcast(raws).items():
+                if error:
+                    self._send_error(job_id, error)
+            for state in self.inflight.values():
+                state["sentAt"] = time.time()
+        # 釋放的 nonce 不寫入 journal：鏈上已確認的 nonce 到最高在途 nonce 之間，
+        # 沒有任何在途工作佔用的就是空洞，交給 _fill / _fill_gaps 補上
+        held = {s["nonce"] for s in self.inflight.values()}
+        latest = self._nonce("latest")
+        top = max(held, default=latest - 1)
+        self.next_nonce = max(self._nonce("pending"), top + 1)
+        self.free_nonces = [n for n in range(latest, top) if n not in held]
+        heapq.heapify(self.free_nonces)
+        if self.free_nonces:
+            self.log(f"🩹 nonce {', '.join(map(str, self.free_nonces))} 空著，會優先使用或補上")
+
+    def run(self):
+        """Issue every runnable job; returns the final state counts."""
+        owner = self.contract.call("owner")[12:32].hex()
+        if int(owner, 16) != int(self.account.address, 16):
+            raise ValueError(f"發行者 {self.account.address} 不是合約擁有者 0x{owner}")
+        self._refresh_fees()
+        self._resume()
+
+        total = len(self.queue) + len(self.inflight)
+        started, last_report = time.time(), 0.0
+        self.log(f"🚀 {total} 筆工作，視窗 {self.window}，從 nonce {self.next_nonce} 開始")
+        while self.queue or self.inflight:
+            self._refresh_fees()
+            self._fill()
+            self._fill_gaps()
+            if self.inflight:
+                time.sleep(self.poll_interval)
+                self._poll()
+                self._bump_stuck()
+            elif self.queue:
+                time.sleep(max(0.0, min(self.retry_at - time.time(), self.poll_interval)))
+            if time.time() - last_report > 5:
+                last_report = time.time()
+                self.log(f"   已上鏈 {self.stats['mined']}/{total}，在途 {len(self.inflight)}，"
+                         f"加價 {self.stats['bumped']}，{self.stats['mined'] / max(time.time() - started, 1e-9):.1f} 筆/秒")
+        self.journal.close()
+        return summarize(self.journal.jobs, self.jobs)
+
+
+def summarize(states, jobs):
+    counts = Counter(states.get(job.id, {}).get("state", PENDING) for job in jobs)
+    return {state: counts.get(state, 0) for state in (PENDING, SENT, MINED, FAILED)}
+
+
+def load_jobs(inputs, plan_path):
+    if plan_path:
+        with open(plan_path, encoding="utf-8") as f:
+            return plan_jobs(json.load(f))
+    return record_jobs(iter_records(inputs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumable, pipelined certificate issuance")
+    parser.add_argument("--contract", help="contract address (default: $CONTRACT_ADDRESS)")
+    parser.add_argument("--rpc", help="JSON-RPC URL (default: $RPC_URL, $SEPOLIA_RPC_URL or localhost)")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    r = sub.add_parser("run", help="issue (or resume issuing) certificates")
+    r.add_argument("inputs", nargs="*", help="recipient records (.json / .jsonl), one issueCertificate each")
+    r.add_argument("--plan", help="issuance-plan.json from gas_model.py plan (batchIssueCertificates)")
+    r.add_argument("--window", type=int, default=32, help="transactions in flight")
+    r.add_argument("--stuck-after", type=float, default=30.0, help="seconds before bumping the fee")
+    r.add_argument("--bump", type=float, default=1.125, help="fee multiplier for replacements")
+    r.add_argument("--poll-interval", type=float, default=1.0)
+    r.add_argument("--max-fee", type=float, help="never pay more than this maxFeePerGas (gwei)")
+    r.add_argument("--retry-failed", action="store_true", help="queue failed jobs again")
+
+    s = sub.add_parser("status", help="summarize a journal")
+    s.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        if not os.path.exists(args.journal):
+            print(f"❌ 找不到 {args.journal}")
+            return 1
+        journal = Journal(args.journal)
+        counts = Counter(state["state"] for job_id, state in journal.jobs.items()
+                         if not job_id.startswith(GAP_PREFIX))
+        total = journal.header["jobs"] if journal.header else len(journal.jobs)
+        counts[PENDING] += total - len(journal.jobs)
+        if args.json:
+            print(json.dumps(dict(counts)))
+        else:
+            print(f"📒 {args.journal}: {total} 筆工作")
+            for state in (PENDING, SENT, MINED, FAILED):
+                print(f"   {state:<8} {counts.get(state, 0)}")
+        return 0
+
+    if not args.inputs and not args.plan:
+        parser.error("give recipient records or --plan")
+    jobs = load_jobs(args.inputs, args.plan)
+    engine = IssuanceEngine(args.contract or default_contract_address(), jobs, args.journal, args.rpc,
+                            window=args.window, stuck_after=args.stuck_after, bump=args.bump,
+                            poll_interval=args.poll_interval, max_fee_gwei=args.max_fee,
+                            retry_failed=args.retry_failed)
+    started = time.time()
+    summary = engine.run()
+    elapsed = time.time() - started
+    print(f"✅ 已上鏈 {summary[MINED]}，失敗 {summary[FAILED]}，未完成 {summary[PENDING] + summary[SENT]}"
+          f" ({elapsed:.1f}s，加價重送 {engine.stats['bumped']} 次)")
+    return 0 if summary[FAILED] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
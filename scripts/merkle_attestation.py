@@ -0,0 +1,325 @@
+"""
+Merkle 批次證明 - 一個批次的證書只在鏈上存一個 root，每位接收者拿到離線可驗證的 proof
+
+    python scripts/merkle_attestation.py build recipients.jsonl -o attestation --issue-date 2025-10-04
+    python scripts/merkle_attestation.py verify attestation/proofs.jsonl --root 0x<鏈上的 root>
+    python scripts/merkle_attestation.py verify alice-proof.json --root 0x...
+    python scripts/merkle_attestation.py bench --count 100000
+
+每張證書先正規化成固定欄位 (地址小寫、字串 NFC、issueDate 為 unix 秒)，
+再以 abi.encode(address, uint8, string, string, uint256, string, string)
+編碼、做兩次 keccak256 當作葉節點；內部節點為排序後兩個子節點串接的
+keccak256。葉節點編碼、樹的排列 (葉節點排序後由陣列尾端往前放) 與節點雜湊都
+和 OpenZeppelin StandardMerkleTree 相同，任何筆數的 root 與 proof 都與
+StandardMerkleTree.of(values, types) 一致；合約端只需要存 bytes32 root，
+鏈上驗證時呼叫 MerkleProof.verify(proof, root, leaf)。
+
+驗證 proof 只需 log2(n) 次雜湊，完全不需要連上鏈 (root 需與鏈上或發行者
+公布的值比對)。
+"""
+
+try:
+    from Crypto.Hash import keccak
+    print("✓ pycryptodome installed")
+except ImportError:
+    print("✗ pycryptodome not installed")
+    print("Please run: pip install pycryptodome")
+    import sys
+    sys.exit(1)
+
+import argparse
+import bisect
+import json
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+
+from certificates import CERTIFICATE_TYPES, coerce_record, iter_records, unix_date
+from chain import abi_encode
+
+LEAF_FIELDS = ("recipient", "certType", "recipientName", "issuerName", "issueDate", "customMessage", "imageURI")
+LEAF_TYPES = ("address", "uint8", "string", "string", "uint256", "string", "string")
+LEAF_ENCODING = "keccak256(keccak256(abi.encode(" + ", ".join(
+    f"{t} {f}" for t, f in zip(LEAF_TYPES, LEAF_FIELDS)
+) + ")))"
+
+TREE_LAYOUT = "OpenZeppelin StandardMerkleTree (sorted leaves)"
+
+BATCH_FILE = "batch.json"
+PROOFS_FILE = "proofs.jsonl"
+
+_ADDRESS = re.compile(r"0x[0-9a-fA-F]{40}")
+
+
+def keccak256(data):
+    return keccak.new(digest_bits=256, data=data).digest()
+
+
+def hash_pair(a, b):
+    """OpenZeppelin ``Hashes.commutativeKeccak256``: children are sorted before hashing."""
+    return keccak256(a + b if a <= b else b + a)
+
+
+def to_hex(digest):
+    return "0x" + digest.hex()
+
+
+def from_hex(text):
+    data = bytes.fromhex(text.removeprefix("0x"))
+    if len(data) != 32:
+        raise ValueError(f"expected a 32-byte hash, got {text!r}")
+    return data
+
+
+# -- 葉節點 ---------------------------------------------------------------------
+
+def canonical_certificate(value, issue_date=None):
+    """The certData fields that go into the leaf, normalized so every party hashes the same bytes.
+
+    *issue_date* fills records without one. Raises ValueError for a missing or
+    malformed recipient address or issue date.
+    """
+    record = coerce_record(value)
+    if not _ADDRESS.fullmatch(record.recipient or ""):
+        raise ValueError(f"invalid recipient address {record.recipient!r}")
+    when = record.issue_date or issue_date
+    if not when:
+        raise ValueError("issueDate is required (set it on the record or pass --issue-date)")
+    return {
+        "recipient": record.recipient.lower(),
+        "certType": record.cert_type,
+        "recipientName": unicodedata.normalize("NFC", record.recipient_name),
+        "issuerName": unicodedata.normalize("NFC", record.issuer_name),
+        "issueDate": unix_date(when),
+        "customMessage": unicodedata.normalize("NFC", record.custom_message),
+        "imageURI": record.image_uri,
+    }
+
+
+def leaf_hash(certificate):
+    """Leaf of a :func:`canonical_certificate` dict (double hashed against second-preimage attacks)."""
+    return keccak256(keccak256(abi_encode(LEAF_TYPES, [certificate[f] for f in LEAF_FIELDS])))
+
+
+# -- 樹 -------------------------------------------------------------------------
+
+class MerkleTree:
+    """OpenZeppelin ``StandardMerkleTree`` layout: sorted leaf hashes in a flat array, root at index 0.
+
+    With n leaves the array holds 2n - 1 nodes; leaf i (in sorted order) sits
+    at index 2n - 2 - i and node k hashes its children 2k + 1 and 2k + 2, so
+    the root and every proof match ``StandardMerkleTree.of(values, types).dump()``
+    for any leaf count. Sorting makes the root independent of input order, and
+    with commutative pair hashing a proof is just the list of sibling hashes.
+    """
+
+    def __init__(self, leaves):
+        self.leaves = sorted(leaves)
+        if not self.leaves:
+            raise ValueError("cannot build a Merkle tree without leaves")
+        for a, b in zip(self.leaves, self.leaves[1:]):
+            if a == b:
+                raise ValueError(f"duplicate certificate in batch (leaf {to_hex(a)})")
+        n = len(self.leaves)
+        self.tree = [None] * (n - 1) + self.leaves[::-1]
+        for i in range(n - 2, -1, -1):
+            self.tree[i] = hash_pair(self.tree[2 * i + 1], self.tree[2 * i + 2])
+
+    def __len__(self):
+        return len(self.leaves)
+
+    @property
+    def root(self):
+        return self.tree[0]
+
+    @property
+    def depth(self):
+        """Length of the longest proof."""
+        return len(self.tree).bit_length() - 1
+
+    def proof(self, leaf):
+        """Sibling hashes from *leaf* up to the root."""
+        i = bisect.bisect_left(self.leaves, leaf)
+        if i == len(self.leaves) or self.leaves[i] != leaf:
+            raise KeyError(f"leaf {to_hex(leaf)} is not in the tree")
+        index = len(self.tree) - 1 - i
+        path = []
+        while index > 0:
+            path.append(self.tree[index + 1 if index % 2 else index - 1])
+            index = (index - 1) // 2
+        return path
+
+
+def process_proof(leaf, proof):
+    """The root implied by *leaf* and *proof* (``MerkleProof.processProof``)."""
+    node = leaf
+    for sibling in proof:
+        node = hash_pair(node, sibling)
+    return node
+
+
+# -- 批次 -----------------------------------------------------------------------
+
+def build_batch(records, issue_date=None):
+    """``(tree, entries)`` for a batch; entries are ``(certificate, leaf)`` in input order."""
+    entries = []
+    for i, value in enumerate(records, 1):
+        try:
+            certificate = canonical_certificate(value, issue_date)
+        except ValueError as e:
+            raise ValueError(f"第 {i} 筆紀錄: {e}") from None
+        entries.append((certificate, leaf_hash(certificate)))
+    return MerkleTree(leaf for _, leaf in entries), entries
+
+
+def proof_document(tree, certificate, leaf):
+    """What one recipient keeps: the certificate, its leaf, the proof and the batch root."""
+    return {
+        "root": to_hex(tree.root),
+        "leaf": to_hex(leaf),
+        "proof": [to_hex(p) for p in tree.proof(leaf)],
+        "certificate": certificate,
+    }
+
+
+def write_batch(tree, entries, out_dir):
+    """Write ``batch.json`` (root + leaf format) and ``proofs.jsonl`` (one proof per recipient)."""
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, PROOFS_FILE), "w", encoding="utf-8") as f:
+        for certificate, leaf in entries:
+            f.write(json.dumps(proof_document(tree, certificate, leaf), ensure_ascii=False) + "\n")
+    batch = {
+        "root": to_hex(tree.root),
+        "count": len(tree),
+        "depth": tree.depth,
+        "leafEncoding": LEAF_ENCODING,
+        "nodeHash": "keccak256(sorted pair)",
+        "layout": TREE_LAYOUT,
+    }
+    with open(os.path.join(out_dir, BATCH_FILE), "w", encoding="utf-8") as f:
+        json.dump(batch, f, indent=2)
+    return batch
+
+
+def check_proof(document, root=None):
+    """``(ok, reason)`` for one proof document against *root* (default: the root it carries)."""
+    try:
+        certificate = canonical_certificate(document["certificate"])
+        leaf = leaf_hash(certificate)
+        expected = from_hex(root or document["root"])
+        proof = [from_hex(p) for p in document["proof"]]
+    except (KeyError, TypeError, ValueError) as e:
+        return False, f"malformed proof: {e}"
+    if document.get("leaf") and from_hex(document["leaf"]) != leaf:
+        return False, "certificate fields do not match the leaf"
+    if process_proof(leaf, proof) != expected:
+        return False, "proof does not lead to the root"
+    return True, ""
+
+
+# -- 效能測試 -------------------------------------------------------------------
+
+def synthetic_records(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "recipient": "0x" + rng.randbytes(20).hex(),
+            "certType": i % len(CERTIFICATE_TYPES),
+            "recipientName": f"接收者 {i}",
+            "issuerName": "區塊鏈課程",
+            "customMessage": "恭喜完成課程！",
+            "issueDate": 1759536000,
+            "imageURI": f"ipfs://bafybeigdyrzt5sfp7udm7hu76uh7y26nf3efuylqabf3oclgtqy55fbzdi/{i % 4}.svg",
+        }
+        for i in range(count)
+    ]
+
+
+def gas_comparison(records):
+    """``(mint gas per certificate, one-root transaction gas)`` from the default gas model."""
+    from gas_model import CALLDATA_NONZERO_GAS, TX_BASE_GAS, BatchPlanner, GasModel
+
+    sample = records[:500]
+    plan = BatchPlanner(GasModel()).plan(sample)
+    per_certificate = sum(batch["estimatedGas"] for batch in plan) / len(sample)
+    # attestBatch(bytes32)：4 bytes selector + 32 bytes root、寫入一個新 slot、函數分派與事件
+    anchor = TX_BASE_GAS + 36 * CALLDATA_NONZERO_GAS + 22100 + 5000
+    return per_certificate, anchor
+
+
+def run_benchmark(count):
+    records = synthetic_records(count)
+    started = time.perf_counter()
+    tree, entries = build_batch(records)
+    build_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    documents = [proof_document(tree, certificate, leaf) for certificate, leaf in entries]
+    proof_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    failures = sum(not check_proof(d, documents[0]["root"])[0] for d in documents)
+    verify_time = time.perf_counter() - started
+
+    print(f"🌳 {count} 張證書: 葉節點 + 樹 {build_time:.2f}s, 深度 {tree.depth}, root {to_hex(tree.root)}")
+    print(f"📜 產生 proof {proof_time:.2f}s (每份 {len(documents[0]['proof'])} 個雜湊)")
+    print(f"✅ 離線驗證 {count} 份 proof {verify_time:.2f}s ({count / verify_time:,.0f} 份/秒)，失敗 {failures}")
+    per_certificate, anchor = gas_comparison(records)
+    print(f"⛽ 鑄造約 {per_certificate:,.0f} gas/張 × {count} = {per_certificate * count:,.0f} gas；"
+          f"只存 root 約 {anchor:,} gas/批")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merkle-root batch attestation with offline proofs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="build the tree for a batch and write per-recipient proofs")
+    b.add_argument("inputs", nargs="+", help="certData .json / .jsonl (recipient address required)")
+    b.add_argument("-o", "--output", default="attestation", help="output directory")
+    b.add_argument("--issue-date", help="issueDate for records without one (unix seconds or YYYY-MM-DD)")
+
+    v = sub.add_parser("verify", help="verify proof documents offline")
+    v.add_argument("proofs", nargs="+", help="proof .json / .jsonl files")
+    v.add_argument("--root", help="trusted batch root (default: the root inside each proof)")
+
+    r = sub.add_parser("bench", help="build, prove and verify a synthetic batch")
+    r.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        return 1 if run_benchmark(args.count) else 0
+
+    if args.command == "build":
+        try:
+            tree, entries = build_batch(iter_records(args.inputs), args.issue_date)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+        batch = write_batch(tree, entries, args.output)
+        print(f"✅ {batch['count']} 張證書 → root {batch['root']} (深度 {batch['depth']})")
+        print(f"📄 {os.path.join(args.output, BATCH_FILE)}、{os.path.join(args.output, PROOFS_FILE)}")
+        return 0
+
+    if not args.root:
+        print("⚠️  未指定 --root：只檢查 proof 與其內附的 root 一致，請再與鏈上的 root 比對")
+    checked = failed = 0
+    for document in iter_records(args.proofs):
+        checked += 1
+        ok, reason = check_proof(document, args.root)
+        if not ok:
+            failed += 1
+            certificate = document.get("certificate") or {}
+            print(f"❌ #{checked} {certificate.get('recipient', '?')} {certificate.get('recipientName', '')}: {reason}")
+    if failed:
+        print(f"❌ {failed} / {checked} 份 proof 驗證失敗")
+        return 1
+    print(f"✅ {checked} 份 proof 全部通過")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+"""
+批量鏈下 metadata 產生器 - 一次發行的所有 ERC-721 metadata JSON，寫入雜湊分層目錄
+
+    python scripts/metadata_builder.py build recipients.jsonl -o metadata/issued \
+        --issue-date 2025-10-04 --image-base ipfs://<圖片 CID>/ --bundle metadata.jsonl
+    python scripts/metadata_builder.py path 12345                 # 某個 tokenId 的檔案位置
+    python scripts/metadata_builder.py bench --count 100000
+
+取代 enhanced-ipfs-uploader.js createAndUploadMetadata 一次寫一個
+metadata/token-<id>.json (JSON.stringify 縮排、每個 token 各自 new Date()) 的做法：
+
+* 整批共用一個不可變的 BatchContext (發行日期、external_url、圖片位置)，
+  同一批的日期不會因為跨過午夜而不同
+* 輸出為緊湊、決定性的 JSON (固定欄位順序、UTF-8 不跳脫)，同樣的輸入
+  永遠產生同樣的位元組，重跑或比對 CID 都不會有差異
+* 檔案依 tokenId 的 SHA-256 前綴分到 256 (或 65536) 個子目錄，十萬個檔案
+  不會擠在同一個目錄；另可輸出單一 JSONL bundle
+
+欄位與 metadata/blockchain-pioneer-example.json 相同：name、description、image、
+external_url、attributes、properties。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from json.encoder import encode_basestring
+
+from certificates import CERTIFICATE_TYPES, coerce_record, iter_records
+
+DEFAULT_EXTERNAL_URL = "https://eternal-certificate.example.com"
+DEFAULT_SHARD_DEPTH = 1
+MANIFEST_NAME = "manifest.json"
+SCHEMA_VERSION = "1.0"
+
+DESCRIPTION_FOOTER = "此證書已永久記錄於以太坊區塊鏈上，可隨時驗證其真實性。"
+
+# 每種證書類型固定的 attributes / properties (依 metadata/*-example.json)
+TYPE_PROFILES = {
+    0: {"rarity": "Legendary", "level": ("Achievement Level", "Pioneer"), "subcategory": "Blockchain Achievement"},
+    1: {"rarity": "Rare", "level": ("Friendship Level", "Eternal"), "subcategory": "Friendship Token"},
+    2: {"rarity": "Epic", "level": ("Citizenship Level", "Citizen"), "subcategory": "Web3 Identity"},
+    3: {"rarity": "Common", "level": ("Completion Level", "Certified"), "subcategory": "Course Completion"},
+}
+
+# 模板中代表每筆紀錄欄位的佔位字串 (Unicode 私用區字元，不會出現在真實內容裡)
+_SLOTS = ("token_id", "description", "image", "recipient", "issuer", "message")
+_SLOT_PATTERN = re.compile("\ue000(\\w+)\ue000")
+
+
+@dataclass(frozen=True)
+class BatchContext:
+    """Everything that is the same for every token of one issuance run."""
+
+    issue_date: date
+    external_url: str = DEFAULT_EXTERNAL_URL
+    image_base: str = ""          # 沒有 imageURI 的紀錄以 image_base + 檔名 當作圖片
+    language: str = "Traditional Chinese"
+
+    @classmethod
+    def create(cls, issue_date=None, **kwargs):
+        """*issue_date* may be a ``date``, ``YYYY-MM-DD``, a unix timestamp or ``None`` (today, UTC)."""
+        if issue_date is None:
+            issue_date = datetime.now(timezone.utc).date()
+        elif isinstance(issue_date, (int, float)) or (isinstance(issue_date, str) and issue_date.isdigit()):
+            issue_date = datetime.fromtimestamp(int(issue_date), timezone.utc).date()
+        elif isinstance(issue_date, str):
+            issue_date = date.fromisoformat(issue_date)
+        return cls(issue_date, **kwargs)
+
+    @property
+    def iso_date(self):
+        return self.issue_date.isoformat()
+
+    @property
+    def display_date(self):
+        """``toLocaleDateString('zh-TW')`` style, e.g. 2025/10/4."""
+        d = self.issue_date
+        return f"{d.year}/{d.month}/{d.day}"
+
+    def to_json(self):
+        return {"issueDate": self.iso_date, "externalUrl": self.external_url,
+                "imageBase": self.image_base, "language": self.language}
+
+
+def metadata_document(context, cert_type, token_id, recipient_name, issuer_name, custom_message, image):
+    """The metadata dict for one token (reference implementation of the compiled templates)."""
+    t = CERTIFICATE_TYPES[cert_type]
+    profile = TYPE_PROFILES[cert_type]
+    intro = custom_message or f"頒發給 {recipient_name} 的{t.title}"
+    level_trait, level_value = profile["level"]
+    attributes = [
+        {"trait_type": "Certificate Type", "value": t.name_en},
+        {"trait_type": "Certificate Type (Chinese)", "value": t.name_zh},
+        {"trait_type": "Recipient", "value": recipient_name},
+        {"trait_type": "Issuer", "value": issuer_name},
+        {"trait_type": "Issue Date", "value": context.iso_date},
+        {"trait_type": "Rarity", "value": profile["rarity"]},
+        {"trait_type": level_trait, "value": level_value},
+        {"trait_type": "Certificate ID", "value": str(cert_type)},
+    ]
+    if custom_message:
+        attributes.append({"trait_type": "Custom Message", "value": custom_message})
+    return {
+        "name": f"{t.title} #{token_id}",
+        "description": f"{intro}\n\n發行者: {issuer_name}\n發行時間: {context.display_date}\n\n{DESCRIPTION_FOOTER}",
+        "image": image,
+        "external_url": context.external_url,
+        "attributes": attributes,
+        "properties": {
+            "category": "Digital Certificate",
+            "subcategory": profile["subcategory"],
+            "language": context.language,
+            "version": SCHEMA_VERSION,
+        },
+    }
+
+
+def dumps(document):
+    """Compact, deterministic JSON text (the on-disk format)."""
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+
+
+class _CompiledType:
+    """Compact JSON for one certificate type, split into constant runs around the record fields."""
+
+    def __init__(self, context, cert_type, with_message):
+        marks = {slot: f"\ue000{slot}\ue000" for slot in _SLOTS}
+        doc = metadata_document(context, cert_type, marks["token_id"], marks["recipient"], marks["issuer"],
+                                marks["message"] if with_message else "", marks["image"])
+        doc["description"] = marks["description"]
+        pieces = _SLOT_PATTERN.split(dumps(doc))
+        self.fragments = pieces[0::2]
+        self.slots = pieces[1::2]
+
+
+class MetadataBuilder:
+    """Renders compact metadata JSON for many records against one :class:`BatchContext`."""
+
+    def __init__(self, context):
+        self.context = context
+        self._types = {}
+
+    def _compiled(self, cert_type, with_message):
+        key = (cert_type, with_message)
+        compiled = self._types.get(key)
+        if compiled is None:
+            compiled = self._types[key] = _CompiledType(self.context, cert_type, with_message)
+        return compiled
+
+    def image_for(self, record, token_id):
+        if record.image_uri:
+            return record.image_uri
+        if self.context.image_base:
+            return f"{self.context.image_base}certificate-{token_id}.svg"
+        return ""
+
+    def render(self, record, token_id):
+        """Compact JSON text for *record*; equal to ``dumps(metadata_document(...))``."""
+        intro = record.custom_message or f"頒發給 {record.recipient_name} 的{record.type.title}"
+        description = (f"{intro}\n\n發行者: {record.issuer_name}\n發行時間: {self.context.display_date}"
+                       f"\n\n{DESCRIPTION_FOOTER}")
+        values = {
+            # encode_basestring 輸出含引號，模板片段裡的引號由佔位字串位置決定，所以去掉
+            "token_id": str(token_id),
+            "description": encode_basestring(description)[1:-1],
+            "image": encode_basestring(self.image_for(record, token_id))[1:-1],
+            "recipient": encode_basestring(record.recipient_name)[1:-1],
+            "issuer": encode_basestring(record.issuer_name)[1:-1],
+            "message": encode_basestring(record.custom_message)[1:-1],
+        }
+        compiled = self._compiled(record.cert_type, bool(record.custom_message))
+        parts = [compiled.fragments[0]]
+        for slot, fragment in zip(compiled.slots, compiled.fragments[1:]):
+            parts.append(values[slot])
+            parts.append(fragment)
+        return "".join(parts)
+
+    def document(self, record, token_id):
+        """The same metadata as a dict (slow path, for checks)."""
+        return metadata_document(self.context, record.cert_type, token_id, record.recipient_name,
+                                 record.issuer_name, record.custom_message, self.image_for(record, token_id))
+
+
+def shard_dir(token_id, depth=DEFAULT_SHARD_DEPTH):
+    """``ab`` (depth 1) or ``ab/cd`` (depth 2) from the SHA-256 of the decimal tokenId."""
+    digest = hashlib.sha256(str(token_id).encode()).hexdigest()
+    return "/".join(digest[2 * i:2 * i + 2] for i in range(depth))
+
+
+def shard_path(token_id, depth=DEFAULT_SHARD_DEPTH):
+    """Path of a token's metadata file relative to the output root."""
+    if depth == 0:
+        return f"token-{token_id}.json"
+    return f"{shard_dir(token_id, depth)}/token-{token_id}.json"
+
+
+def build(records, out_dir=None, context=None, start_token_id=1, shard_depth=DEFAULT_SHARD_DEPTH,
+          bundle_path=None, progress=None):
+    """Write metadata for *records* and return ``(count, metadata_bytes)``.
+
+    Records without a tokenId are numbered from *start_token_id* in input
+    order; a tokenId seen twice raises ``ValueError``. Files go to ``<out_dir>/<shard>/token-<id>.json`` (skipped when
+    *out_dir* is ``None``); *bundle_path* additionally gets one
+    ``{"tokenId": ..., "metadata": {...}}`` line per token.
+    """
+    context = context or BatchContext.create()
+    builder = MetadataBuilder(context)
+    made_dirs = set()
+    seen = set()
+    bundle = None
+    if bundle_path:
+        os.makedirs(os.path.dirname(os.path.abspath(bundle_path)), exist_ok=True)
+        bundle = open(bundle_path, "w", encoding="utf-8", newline="\n")
+    count = written = 0
+    next_id = start_token_id
+    try:
+        for value in records:
+            record = coerce_record(value)
+            token_id = record.token_id
+            if token_id is None:
+                token_id = next_id
+            next_id = token_id + 1
+            if token_id in seen:
+                raise ValueError(f"tokenId {token_id} appears more than once")
+            seen.add(token_id)
+            text = builder.render(record, token_id)
+            data = text.encode("utf-8")
+
+            if out_dir is not None:
+                relative = shard_path(token_id, shard_depth)
+                directory = os.path.dirname(relative)
+                if directory not in made_dirs:
+                    os.makedirs(os.path.join(out_dir, directory), exist_ok=True)
+                    made_dirs.add(directory)
+                with open(os.path.join(out_dir, relative), "wb") as f:
+                    f.write(data)
+            written += len(data)
+            if bundle:
+                bundle.write(f'{{"tokenId":{token_id},"metadata":{text}}}\n')
+            count += 1
+            if progress and count % 10000 == 0:
+                progress(count)
+    finally:
+        if bundle:
+            bundle.close()
+
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+        manifest = {"count": count, "shardDepth": shard_depth, "layout": "<shard>/token-<tokenId>.json",
+                    "shard": "sha256(decimal tokenId) hex, 2 characters per level", "context": context.to_json()}
+        with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return count, written
+
+
+def synthetic_records(count):
+    names = ["王小明", "李美玲", "陳志豪", "Alice", "Bob \"B\" Chen", "林<佳>穎"]
+    for i in range(count):
+        yield {
+            "certType": i % len(CERTIFICATE_TYPES),
+            "recipientName": f"{names[i % len(names)]} {i:06d}",
+            "issuerName": "國立臺灣大學 區塊鏈課程",
+            "customMessage": "" if i % 3 == 0 else "感謝您在本學期的投入與貢獻！\n繼續加油",
+        }
+
+
+def run_benchmark(count, shard_depth=DEFAULT_SHARD_DEPTH, keep=None):
+    context = BatchContext.create("2025-10-04", image_base="ipfs://bafybeigdyrzt/")
+    builder = MetadataBuilder(context)
+
+    # 先抽查模板輸出與 json.dumps 逐字元相同
+    for i, value in enumerate(synthetic_records(min(count, 600)), 1):
+        record = coerce_record(value)
+        if builder.render(record, i) != dumps(builder.document(record, i)):
+            print(f"❌ token {i}: compiled template differs from json.dumps")
+            return 1
+    print("✅ compiled templates match json.dumps")
+
+    out_dir = keep or tempfile.mkdtemp(prefix="metadata-bench-")
+    started = time.perf_counter()
+    built, written = build(synthetic_records(count), out_dir, context, shard_depth=shard_depth,
+                           bundle_path=os.path.join(out_dir, "bundle.jsonl"))
+    elapsed = time.perf_counter() - started
+    print(f"⏱️  {built} 個 metadata ({written / 1e6:.1f} MB + bundle) 寫入 {out_dir}: "
+          f"{elapsed:.2f}s, {built / elapsed:,.0f} 個/秒")
+
+    pretty = os.path.join(out_dir, "pretty-flat")
+    os.makedirs(pretty)
+    sample = min(count, 20000)
+    started = time.perf_counter()
+    for i, value in enumerate(synthetic_records(sample), 1):
+        document = builder.document(coerce_record(value), i)
+        with open(os.path.join(pretty, f"token-{i}.json"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(document, ensure_ascii=False, indent=2))
+    flat = time.perf_counter() - started
+    print(f"   對照 (JS 作法: 縮排 JSON、單一目錄) {sample} 個: {flat:.2f}s, {sample / flat:,.0f} 個/秒")
+    if not keep:
+        import shutil
+        shutil.rmtree(out_dir)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build off-chain ERC-721 metadata for a whole issuance run")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="write sharded metadata files and/or a JSONL bundle")
+    b.add_argument("inputs", nargs="+", help="records .json / .jsonl (certData objects or metadata documents)")
+    b.add_argument("-o", "--out-dir", default=os.path.join("metadata", "issued"))
+    b.add_argument("--no-files", action="store_true", help="only write --bundle")
+    b.add_argument("--bundle", metavar="JSONL", help="also write every document into one JSON-lines file")
+    b.add_argument("--issue-date", help="YYYY-MM-DD or unix timestamp for the whole batch (default: today, UTC)")
+    b.add_argument("--external-url", default=DEFAULT_EXTERNAL_URL)
+    b.add_argument("--image-base", default="", help="prefix for records without imageURI, e.g. ipfs://<CID>/")
+    b.add_argument("--start-token-id", type=int, default=1, help="first tokenId for records without one")
+    b.add_argument("--shard-depth", type=int, choices=(0, 1, 2), default=DEFAULT_SHARD_DEPTH,
+                   help="0 = flat, 1 = 256 directories, 2 = 65536 directories")
+
+    p = sub.add_parser("path", help="print where a tokenId's metadata file lives")
+    p.add_argument("token_ids", nargs="+", type=int)
+    p.add_argument("--shard-depth", type=int, choices=(0, 1, 2), default=DEFAULT_SHARD_DEPTH)
+
+    bench = sub.add_parser("bench", help="time a synthetic batch against pretty-printed flat files")
+    bench.add_argument("--count", type=int, default=100000)
+    bench.add_argument("--shard-depth", type=int, choices=(0, 1, 2), default=DEFAULT_SHARD_DEPTH)
+    bench.add_argument("--keep", metavar="DIR", help="write into DIR and keep the output")
+    args = parser.parse_args(argv)
+
+    if args.command == "path":
+        for token_id in args.token_ids:
+            print(shard_path(token_id, args.shard_depth))
+        return 0
+    if args.command == "bench":
+        return run_benchmark(args.count, args.shard_depth, args.keep)
+
+    if args.no_files and not args.bundle:
+        print("❌ --no-files 需要搭配 --bundle")
+        return 2
+    try:
+        context = BatchContext.create(args.issue_date, external_url=args.external_url, image_base=args.image_base)
+    except ValueError as e:
+        print(f"❌ 無效的 --issue-date: {e}")
+        return 2
+    out_dir = None if args.no_files else args.out_dir
+    print(f"📝 產生 metadata (發行日期 {context.iso_date})...")
+    started = time.perf_counter()
+    try:
+        count, written = build(iter_records(args.inputs), out_dir, context, args.start_token_id, args.shard_depth,
+                               args.bundle, progress=lambda n: print(f"   {n:,} ..."))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+    where = [w for w in (out_dir, args.bundle) if w]
+    print(f"✅ {count} 個 metadata ({written / 1e6:.1f} MB) 寫入 {' + '.join(where)} ({elapsed:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
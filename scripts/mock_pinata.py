@@ -0,0 +1,194 @@
+"""
+本地 Pinata 替身 - 不需金鑰即可測試上傳流程
+
+    python scripts/mock_pinata.py --port 8650
+    python scripts/mock_pinata.py --rate 3 --burst 10 --latency 0.3   # 模擬 Pinata 配額與延遲
+    PINATA_API_URL=http://127.0.0.1:8650 python scripts/pinning.py images/certificates/*.svg
+
+支援 pinFileToIPFS、pinJSONToIPFS 與 testAuthentication，回傳的 IpfsHash
+以 ipfs_cid 在本地計算 (與真實 Pinata 相同)，並統計實際收到的上傳次數，
+可用來確認快取命中時完全沒有送出請求。
+
+--rate / --burst 以 token bucket 限制每秒請求數，超過時回 429 與
+Retry-After；--latency 為每個上傳加上固定延遲，--error-rate 隨機回 503，
+用來壓測 pin_pipeline.py 的併發、限速與重試。
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ipfs_cid import bytes_cid, json_bytes
+
+DEFAULT_PORT = 8650
+
+
+def parse_multipart(body, content_type):
+    """``{field: (filename, bytes)}`` from a multipart/form-data body."""
+    match = re.search(r"boundary=\"?([^\";]+)\"?", content_type)
+    if not match:
+        raise ValueError("missing multipart boundary")
+    delimiter = b"--" + match.group(1).encode()
+    fields = {}
+    for part in body.split(delimiter)[1:]:
+        if part.startswith(b"--"):
+            break
+        head, _, value = part.partition(b"\r\n\r\n")
+        disposition = head.decode("utf-8", "replace")
+        name = re.search(r'name="([^"]*)"', disposition)
+        filename = re.search(r'filename="([^"]*)"', disposition)
+        if name:
+            fields[name.group(1)] = (filename.group(1) if filename else None, value.removesuffix(b"\r\n"))
+    return fields
+
+
+class Quota:
+    """Token bucket enforced by the mock; ``take()`` returns 0 or the seconds to wait."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class PinStore:
+    """What the mock has pinned, plus counters for tests and benchmarks."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pins = {}
+        self.uploads = 0
+        self.throttled = 0
+        self.failed = 0
+
+    def pin(self, data, cid_version, name):
+        cid = bytes_cid(data, cid_version)
+        with self.lock:
+            self.uploads += 1
+            duplicate = cid in self.pins
+            self.pins.setdefault(cid, {"name": name, "size": len(data)})
+        return {
+            "IpfsHash": cid,
+            "PinSize": len(data),
+            "Timestamp": datetime.now(timezone.utc).isoformat(),
+            "isDuplicate": duplicate,
+        }
+
+
+def _cid_version(options):
+    if isinstance(options, (bytes, str)):
+        options = json.loads(options or "{}")
+    return int((options or {}).get("cidVersion", 0))
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def make_server(store=None, host="127.0.0.1", port=DEFAULT_PORT, rate=None, burst=None, latency=0.0, error_rate=0.0):
+    """Mock server; *rate*/*burst* set the request quota, *latency* delays every pin."""
+    store = store if store is not None else PinStore()
+    quota = Quota(rate, burst) if rate else None
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, payload, headers=()):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            for key, value in headers:
+                self.send_header(key, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/data/testAuthentication":
+                self._reply(200, {"message": "Congratulations! You are communicating with the Pinata API!"})
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            wait = quota.take() if quota else 0.0
+            if wait:
+                with store.lock:
+                    store.throttled += 1
+                self._reply(429, {"error": "rate limit exceeded"}, [("Retry-After", f"{wait:.3f}")])
+                return
+            if latency:
+                time.sleep(latency)
+            if error_rate and random.random() < error_rate:
+                with store.lock:
+                    store.failed += 1
+                self._reply(503, {"error": "service unavailable"})
+                return
+            try:
+                if self.path == "/pinning/pinFileToIPFS":
+                    fields = parse_multipart(body, self.headers.get("Content-Type", ""))
+                    filename, data = fields["file"]
+                    options = fields.get("pinataOptions", (None, b"{}"))[1]
+                    self._reply(200, store.pin(data, _cid_version(options), filename))
+                elif self.path == "/pinning/pinJSONToIPFS":
+                    payload = json.loads(body)
+                    content = payload.get("pinataContent", payload)
+                    name = (payload.get("pinataMetadata") or {}).get("name")
+                    self._reply(200, store.pin(json_bytes(content), _cid_version(payload.get("pinataOptions")), name))
+                else:
+                    self._reply(404, {"error": "not found"})
+            except (KeyError, ValueError) as e:
+                self._reply(400, {"error": str(e)})
+
+    server = _Server((host, port), Handler)
+    server.store = store
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the Pinata pinning API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--rate", type=float, help="requests per second before answering 429")
+    parser.add_argument("--burst", type=float, help="token bucket size (default: rate)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every pin request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of pins answered with 503")
+    args = parser.parse_args(argv)
+
+    server = make_server(host=args.host, port=args.port, rate=args.rate, burst=args.burst,
+                         latency=args.latency, error_rate=args.error_rate)
+    print(f"📌 Mock Pinata: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        store = server.store
+        print(f"\n📤 共收到 {store.uploads} 次上傳，{len(store.pins)} 個不同的 CID"
+              f"，429 {store.throttled} 次，503 {store.failed} 次")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""
+擁有者索引 - 以 CertificateIssued / Transfer 事件建立 owner → tokenId 索引
+
+合約的 getCertificatesByOwner 會從 1 掃描到 _tokenIdCounter，成本隨發行總量
+線性成長；這裡改由事件日誌在鏈下維護索引，查詢只需一次 dict 查找。
+
+    python scripts/owner_index.py build --from-block 0 -o owner-index.json
+    python scripts/owner_index.py query 0xabc... -i owner-index.json
+    python scripts/owner_index.py serve -i owner-index.json --port 8646
+    python scripts/owner_index.py verify -i owner-index.json
+
+serve 在索引檔的 mtime 改變時重新載入 (build 與 event_ingest.py 都以 os.replace
+原子寫入)，所以重建索引不必重啟服務。每個回覆都帶 lastBlock 與合約地址，
+前端用 /contracts/<合約地址>/... 查詢，索引落後鏈上或屬於別的合約時改呼叫合約。
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from chain import (
+    CERTIFICATE_ISSUED_TOPIC,
+    TRANSFER_TOPIC,
+    ZERO_ADDRESS,
+    CertificateContract,
+    block_number,
+    decode_string,
+    decode_uint_array,
+    default_contract_address,
+    default_rpc_url,
+    encode_address,
+    get_logs,
+    word,
+)
+
+DEFAULT_INDEX_PATH = "owner-index.json"
+DEFAULT_PORT = 8646
+LOG_TOPICS = [[TRANSFER_TOPIC, CERTIFICATE_ISSUED_TOPIC]]
+
+
+def topic_address(topic):
+    return "0x" + topic[-40:].lower()
+
+
+class OwnerIndex:
+    """owner → token ids, token id → owner, kept in sync by applying event logs in order."""
+
+    def __init__(self):
+        self.owners = {}    # token id -> owner address (lower case)
+        self.tokens = {}    # owner address -> {token id: None}
+        self.issued = {}    # token id -> {"certType": ..., "recipientName": ...}
+        self.last_block = None
+        self.contract = None
+
+    def tokens_of(self, owner):
+        """Token ids held by *owner*, ascending like ``getCertificatesByOwner``."""
+        return sorted(self.tokens.get(owner.lower(), ()))
+
+    def owner_of(self, token_id):
+        return self.owners.get(int(token_id))
+
+    def move(self, token_id, new_owner):
+        """Record *token_id* as held by *new_owner* (the zero address burns it).
+
+        Returns the previous owner so callers can undo the change.
+        """
+        previous = self.owners.pop(token_id, None)
+        if previous is not None:
+            held = self.tokens[previous]
+            held.pop(token_id, None)
+            if not held:
+                del self.tokens[previous]
+        if new_owner and new_owner != ZERO_ADDRESS:
+            self.owners[token_id] = new_owner
+            self.tokens.setdefault(new_owner, {})[token_id] = None
+        return previous
+
+    def apply_log(self, log):
+        """Apply one raw ``eth_getLogs`` entry; returns an undo record or None."""
+        topics = log["topics"]
+        if topics[0] == TRANSFER_TOPIC:
+            token_id = int(topics[3], 16)
+            previous = self.move(token_id, topic_address(topics[2]))
+            return ("move", token_id, previous)
+        if topics[0] == CERTIFICATE_ISSUED_TOPIC:
+            token_id = int(topics[1], 16)
+            data = bytes.fromhex(log["data"][2:])
+            previous = self.issued.get(token_id)
+            self.issued[token_id] = {"certType": word(data, 0), "recipientName": decode_string(data, word(data, 1))}
+            return ("issued", token_id, previous)
+        return None
+
+    def undo(self, change):
+        kind, token_id, previous = change
+        if kind == "move":
+            self.move(token_id, previous)
+        elif previous is None:
+            self.issued.pop(token_id, None)
+        else:
+            self.issued[token_id] = previous
+
+    def to_dict(self):
+        return {
+            "contract": self.contract,
+            "lastBlock": self.last_block,
+            "owners": {str(t): o for t, o in sorted(self.owners.items())},
+            "issued": {str(t): v for t, v in sorted(self.issued.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls()
+        index.last_block = data.get("lastBlock")
+        index.contract = data.get("contract")
+        for token_id, owner in data.get("owners", {}).items():
+            index.move(int(token_id), owner)
+        index.issued = {int(t): v for t, v in data.get("issued", {}).items()}
+        return index
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def build_index(address, rpc_url=None, from_block=0, to_block=None, chunk_size=5000, index=None):
+    """Scan contract logs from *from_block* to *to_block* (default: latest) into an index."""
+    rpc_url = rpc_url or default_rpc_url()
+    index = index or OwnerIndex()
+    index.contract = address.lower()
+    to_block = block_number(rpc_url) if to_block is None else to_block
+    for start in range(from_block, to_block + 1, chunk_size):
+        end = min(start + chunk_size - 1, to_block)
+        for log in get_logs(rpc_url, address, LOG_TOPICS, start, end):
+            index.apply_log(log)
+        index.last_block = end
+    return index
+
+
+def verify_index(index, contract):
+    """Compare every indexed owner with ``getCertificatesByOwner``; returns mismatches."""
+    owners = sorted(index.tokens)
+    results = contract.call_many("getCertificatesByOwner", [(encode_address(o),) for o in owners])
+    mismatches = []
+    for owner, data in zip(owners, results):
+        expected = decode_uint_array(data)
+        if expected != index.tokens_of(owner):
+            mismatches.append((owner, expected, index.tokens_of(owner)))
+    return mismatches
+
+
+class IndexFile:
+    """An index file that is reloaded whenever its mtime changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._version = None
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            st = os.stat(self.path)
+            version = (st.st_mtime_ns, st.st_ino, st.st_size)   # os.replace 產生新的 inode
+            if version != self._version:
+                self._index = OwnerIndex.load(self.path)
+                self._version = version
+            return self._index
+
+
+class _Handler(BaseHTTPRequestHandler):
+    source = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        index = self.source()
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        if len(parts) >= 2 and parts[0] == "contracts":
+            if index.contract is None or parts[1].lower() != index.contract:
+                return self._send(404, {"error": f"index is for contract {index.contract}"})
+            parts = parts[2:]
+        base = {"contract": index.contract, "lastBlock": index.last_block}
+        if parts == ["status"]:
+            return self._send(200, dict(base, owners=len(index.tokens), tokens=len(index.owners)))
+        if len(parts) == 2 and parts[0] == "owners":
+            owner = parts[1].lower()
+            return self._send(200, dict(base, owner=owner, tokenIds=index.tokens_of(owner)))
+        if len(parts) == 2 and parts[0] == "tokens" and parts[1].isdigit():
+            token_id = int(parts[1])
+            owner = index.owner_of(token_id)
+            if owner is None:
+                return self._send(404, dict(base, error="Token does not exist"))
+            return self._send(200, dict(base, tokenId=token_id, owner=owner, **index.issued.get(token_id, {})))
+        self._send(404, {"error": "not found"})
+
+
+def make_server(index, host="127.0.0.1", port=DEFAULT_PORT):
+    """HTTP query API: ``/owners/<address>``, ``/tokens/<id>`` and ``/status``.
+
+    The same routes are served under ``/contracts/<address>/`` and answer 404
+    for any other contract. *index* is an :class:`OwnerIndex` or an
+    :class:`IndexFile` (reloaded when the file changes).
+    """
+    source = index.get if isinstance(index, IndexFile) else (lambda: index)
+    handler = type("OwnerIndexHandler", (_Handler,), {"source": staticmethod(source)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Off-chain owner → certificate index")
+    parser.add_argument("--contract", help="contract address (default: $CONTRACT_ADDRESS)")
+    parser.add_argument("--rpc", help="JSON-RPC URL (default: $RPC_URL, $SEPOLIA_RPC_URL or localhost)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="scan event logs into an index file")
+    b.add_argument("--from-block", type=int, default=0, help="deployment block")
+    b.add_argument("--to-block", type=int, default=None)
+    b.add_argument("--chunk-size", type=int, default=5000, help="blocks per eth_getLogs call")
+    b.add_argument("-o", "--output", default=DEFAULT_INDEX_PATH)
+
+    q = sub.add_parser("query", help="print the token ids held by an address")
+    q.add_argument("owner")
+    q.add_argument("-i", "--index", default=DEFAULT_INDEX_PATH)
+
+    s = sub.add_parser("serve", help="serve the index over HTTP")
+    s.add_argument("-i", "--index", default=DEFAULT_INDEX_PATH)
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    v = sub.add_parser("verify", help="compare the index with getCertificatesByOwner")
+    v.add_argument("-i", "--index", default=DEFAULT_INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        address = args.contract or default_contract_address()
+        if not address:
+            parser.error("請先設定 CONTRACT_ADDRESS 環境變數或指定 --contract")
+        index = build_index(address, args.rpc, args.from_block, args.to_block, args.chunk_size)
+        index.save(args.output)
+        print(f"✅ 已索引 {len(index.owners)} 張證書 / {len(index.tokens)} 個地址 (至區塊 {index.last_block}) → {args.output}")
+        return 0
+
+    if args.command == "serve":
+        server = make_server(IndexFile(args.index), args.host, args.port)
+        print(f"🌐 Owner index API: http://{args.host}:{args.port}/owners/<address> (索引檔更新時自動重新載入)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    index = OwnerIndex.load(args.index)
+    if args.command == "query":
+        print(json.dumps(index.tokens_of(args.owner)))
+        return 0
+
+    contract = CertificateContract(args.contract or default_contract_address(), args.rpc)
+    mismatches = verify_index(index, contract)
+    for owner, expected, actual in mismatches:
+        print(f"❌ {owner}: 合約 {expected} / 索引 {actual}")
+    if mismatches:
+        return 1
+    print(f"✅ {len(index.tokens)} 個地址的索引與 getCertificatesByOwner 一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""
+串流 PDF 寫入器 - 一頁一頁直接寫到磁碟，記憶體用量不隨頁數增加
+
+ReportLab 的 canvas 會把所有頁面留在記憶體直到 ``save()``，印刷廠用的
+數萬頁合併檔因此改用這個只追加 (append-only) 的寫入器：
+
+* 每個 PDF 物件寫出後只保留它的 xref 紀錄，而且是寫到固定寬度的 sidecar 檔
+* 頁面樹以每 ``group_size`` 頁為一個 /Pages 節點，記憶體中只保留目前這一組
+* 每完成一組就寫 checkpoint，中斷後可從最後一組續寫；checkpoint 記錄輸入的
+  雜湊，輸入換了就重新開始，不會把新名單接在舊名單的頁面後面
+* CID 字型 (UCS2 CMap) 只涵蓋 BMP，emoji 等字元以 □ 代替，不會默默消失
+"""
+
+import json
+import os
+import zlib
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase._cidfontdata import CIDFontInfo, defaultUnicodeEncodings
+
+XREF_ENTRY = 20  # "0000000000 00000 n \n"
+NOT_IN_FONT = "\u25a1"   # □，UCS2 CMap 無法表示的字元以它代替
+
+
+def pdf_value(value):
+    """Serialize a Python value from ReportLab's CID font tables to PDF syntax."""
+    if isinstance(value, dict):
+        items = " ".join(f"/{k} {pdf_value(v)}" for k, v in value.items())
+        return f"<< {items} >>"
+    if isinstance(value, (list, tuple)):
+        return "[" + " ".join(pdf_value(v) for v in value) + "]"
+    if isinstance(value, float):
+        return f"{value:.4f}".rstrip("0").rstrip(".")
+    return str(value)
+
+
+def _pdf_number(value):
+    if isinstance(value, int):
+        return str(value)
+    return f"{value:.3f}".rstrip("0").rstrip(".") or "0"
+
+
+def _literal(text):
+    data = text.encode("cp1252", errors="replace")
+    data = data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"(" + data + b")"
+
+
+def bmp_text(text):
+    """*text* with characters outside the BMP (emoji…) replaced by :data:`NOT_IN_FONT`."""
+    if text.isascii():
+        return text
+    return "".join(ch if ord(ch) <= 0xFFFF else NOT_IN_FONT for ch in text)
+
+
+def _ucs2_hex(text):
+    return b"<" + bmp_text(text).encode("utf-16-be").hex().encode("ascii") + b">"
+
+
+class PageOps:
+    """Records the subset of the ReportLab canvas API used by certificate templates
+    as raw PDF content-stream operators."""
+
+    def __init__(self, fonts):
+        self.fonts = fonts   # font name -> (resource name, encoder)
+        self.ops = []
+        self._font = None
+
+    def _color(self, color, op):
+        self.ops.append(f"{_pdf_number(color.red)} {_pdf_number(color.green)} {_pdf_number(color.blue)} {op}".encode())
+
+    def setFillColor(self, color):
+        self._color(color, "rg")
+
+    def setStrokeColor(self, color):
+        self._color(color, "RG")
+
+    def setLineWidth(self, width):
+        self.ops.append(f"{_pdf_number(width)} w".encode())
+
+    def _paint(self, stroke, fill):
+        return {(1, 1): "B", (1, 0): "S", (0, 1): "f"}.get((int(bool(stroke)), int(bool(fill))), "n")
+
+    def rect(self, x, y, width, height, stroke=1, fill=0):
+        n = _pdf_number
+        self.ops.append(f"{n(x)} {n(y)} {n(width)} {n(height)} re {self._paint(stroke, fill)}".encode())
+
+    def roundRect(self, x, y, width, height, radius, stroke=1, fill=0):
+        n = _pdf_number
+        k = radius * 0.5523  # 以貝茲曲線近似四分之一圓
+        x2, y2 = x + width, y + height
+        self.ops.append(" ".join((
+            f"{n(x + radius)} {n(y)} m",
+            f"{n(x2 - radius)} {n(y)} l",
+            f"{n(x2 - radius + k)} {n(y)} {n(x2)} {n(y + radius - k)} {n(x2)} {n(y + radius)} c",
+            f"{n(x2)} {n(y2 - radius)} l",
+            f"{n(x2)} {n(y2 - radius + k)} {n(x2 - radius + k)} {n(y2)} {n(x2 - radius)} {n(y2)} c",
+            f"{n(x + radius)} {n(y2)} l",
+            f"{n(x + radius - k)} {n(y2)} {n(x)} {n(y2 - radius + k)} {n(x)} {n(y2 - radius)} c",
+            f"{n(x)} {n(y + radius)} l",
+            f"{n(x)} {n(y + radius - k)} {n(x + radius - k)} {n(y)} {n(x + radius)} {n(y)} c",
+            f"h {self._paint(stroke, fill)}",
+        )).encode())
+
+    def line(self, x1, y1, x2, y2):
+        n = _pdf_number
+        self.ops.append(f"{n(x1)} {n(y1)} m {n(x2)} {n(y2)} l S".encode())
+
+    def setFont(self, name, size):
+        self._font = (name, size)
+
+    def drawString(self, x, y, text):
+        name, size = self._font
+        resource, encode = self.fonts[name]
+        self.ops.append(
+            f"BT /{resource} {_pdf_number(size)} Tf {_pdf_number(x)} {_pdf_number(y)} Td ".encode()
+            + encode(text) + b" Tj ET"
+        )
+
+    def drawCentredString(self, x, y, text):
+        name, size = self._font
+        if self.fonts[name][1] is _ucs2_hex:
+            text = bmp_text(text)   # 以實際畫出的字元計算寬度
+        self.drawString(x - pdfmetrics.stringWidth(text, name, size) / 2, y, text)
+
+    def getvalue(self):
+        return b"\n".join(self.ops) + b"\n"
+
+
+class StreamingPdfWriter:
+    """Append-only PDF writer with page-group checkpoints.
+
+    *input_digest* identifies the input the pages come from (e.g. a hash of the
+    record files); a checkpoint is only resumed when it was written for the
+    same digest, and never when no digest is given.
+    """
+
+    CATALOG = 1
+    ROOT_PAGES = 2
+
+    def __init__(self, path, pagesize, compress=False, group_size=1000, input_digest=None):
+        self.path = path
+        self.pagesize = pagesize
+        self.compress = compress
+        self.group_size = group_size
+        self.input_digest = input_digest
+        self.xref_path = path + ".xref"
+        self.checkpoint_path = path + ".checkpoint.json"
+
+        self.next_obj = 3
+        self.pages_done = 0
+        self.groups = []         # [object number, page count] of completed /Pages nodes
+        self.resources = {}      # shared objects written once at the start
+        self._group_obj = None
+        self._group_kids = []
+        self._file = None
+        self._xref = None
+
+    # -- 檔案與 checkpoint ------------------------------------------------
+
+    def _fingerprint(self):
+        return {"pagesize": list(self.pagesize), "compress": self.compress, "group_size": self.group_size,
+                "input": self.input_digest}
+
+    def open(self, resume=True):
+        """Open the output, resuming from a checkpoint when one matches.
+
+        Returns the number of pages already on disk.
+        """
+        state = None
+        if resume and self.input_digest and os.path.exists(self.checkpoint_path) and os.path.exists(self.path):
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("fingerprint") != self._fingerprint():
+                state = None
+
+        if state is None:
+            self._file = open(self.path, "wb")
+            self._xref = open(self.xref_path, "w+b")
+            self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+            self._write_object(self.CATALOG, f"<< /Type /Catalog /Pages {self.ROOT_PAGES} 0 R >>".encode())
+            return 0
+
+        self._file = open(self.path, "r+b")
+        self._file.truncate(state["file_size"])
+        self._file.seek(state["file_size"])
+        self._xref = open(self.xref_path, "r+b")
+        self._xref.truncate((state["next_obj"] - 1) * XREF_ENTRY)
+        self.next_obj = state["next_obj"]
+        self.pages_done = state["pages_done"]
+        self.groups = state["groups"]
+        self.resources = state["resources"]
+        return self.pages_done
+
+    def _checkpoint(self):
+        self._file.flush()
+        self._xref.flush()
+        os.fsync(self._file.fileno())
+        os.fsync(self._xref.fileno())
+        state = {
+            "fingerprint": self._fingerprint(),
+            "pages_done": self.pages_done,
+            "next_obj": self.next_obj,
+            "file_size": self._file.tell(),
+            "groups": self.groups,
+            "resources": self.resources,
+        }
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    # -- 物件 -------------------------------------------------------------
+
+    def allocate(self):
+        num = self.next_obj
+        self.next_obj += 1
+        return num
+
+    def _write_object(self, num, body):
+        offset = self._file.tell()
+        self._xref.seek((num - 1) * XREF_ENTRY)
+        self._xref.write(b"%010d 00000 n \n" % offset)
+        self._file.write(b"%d 0 obj\n" % num + body + b"\nendobj\n")
+
+    def write_object(self, body):
+        num = self.allocate()
+        self._write_object(num, body)
+        return num
+
+    def write_stream(self, data, extra=b""):
+        if self.compress:
+            data = zlib.compress(data)
+            extra += b" /Filter /FlateDecode"
+        return self.write_object(b"<< /Length %d%s >>\nstream\n" % (len(data), extra) + data + b"\nendstream")
+
+    def register_fonts(self, cid_fonts=(), standard_fonts=()):
+        """Write font dictionaries once; returns ``{font name: (resource, encoder)}``."""
+        fonts = self.resources.setdefault("fonts", {})
+        mapping = {}
+        for name in standard_fonts:
+            if name not in fonts:
+                fonts[name] = self.write_object(
+                    f"<< /Type /Font /Subtype /Type1 /BaseFont /{name} /Encoding /WinAnsiEncoding >>".encode()
+                )
+            mapping[name] = (f"F{fonts[name]}", _literal)
+        for name in cid_fonts:
+            if name not in fonts:
+                fonts[name] = self._write_cid_font(name)
+            mapping[name] = (f"F{fonts[name]}", _ucs2_hex)
+        return mapping
+
+    def _write_cid_font(self, name):
+        info = CIDFontInfo[name]
+        descendant = dict(info["DescendantFonts"][0])
+        encoding = defaultUnicodeEncodings[name][1]  # 與 UnicodeCIDFont 相同的 CMap
+        descriptor = self.write_object(pdf_value(descendant.pop("FontDescriptor")).encode())
+        descendant["FontDescriptor"] = f"{descriptor} 0 R"
+        cid = self.write_object(pdf_value(descendant).encode())
+        return self.write_object(
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /{name}-{encoding} "
+            f"/Encoding /{encoding} /DescendantFonts [{cid} 0 R] >>".encode()
+        )
+
+    def write_resources(self, xobjects=None):
+        """Write a shared /Resources dictionary with every registered font."""
+        fonts = " ".join(f"/F{num} {num} 0 R" for num in self.resources.get("fonts", {}).values())
+        xobj = " ".join(f"/{name} {num} 0 R" for name, num in (xobjects or {}).items())
+        return self.write_object(f"<< /ProcSet [/PDF /Text] /Font << {fonts} >> /XObject << {xobj} >> >>".encode())
+
+    def write_form(self, content, resources):
+        w, h = self.pagesize
+        extra = f" /Type /XObject /Subtype /Form /BBox [0 0 {_pdf_number(w)} {_pdf_number(h)}] /Resources {resources} 0 R".encode()
+        return self.write_stream(content, extra)
+
+    # -- 頁面 -------------------------------------------------------------
+
+    def add_page(self, content, resources):
+        if self._group_obj is None:
+            self._group_obj = self.allocate()
+        w, h = self.pagesize
+        contents = self.write_stream(content)
+        page = self.write_object(
+            f"<< /Type /Page /Parent {self._group_obj} 0 R /MediaBox [0 0 {_pdf_number(w)} {_pdf_number(h)}] "
+            f"/Resources {resources} 0 R /Contents {contents} 0 R >>".encode()
+        )
+        self._group_kids.append(page)
+        if len(self._group_kids) >= self.group_size:
+            self._close_group()
+
+    def _close_group(self):
+        if self._group_obj is None:
+            return
+        kids = " ".join(f"{k} 0 R" for k in self._group_kids)
+        self._write_object(
+            self._group_obj,
+            f"<< /Type /Pages /Parent {self.ROOT_PAGES} 0 R /Kids [{kids}] /Count {len(self._group_kids)} >>".encode(),
+        )
+        self.groups.append([self._group_obj, len(self._group_kids)])
+        self.pages_done += len(self._group_kids)
+        self._group_obj = None
+        self._group_kids = []
+        self._checkpoint()
+
+    def close(self):
+        """Finish the page tree, append the xref table and trailer."""
+        self._close_group()
+        kids = " ".join(f"{num} 0 R" for num, _ in self.groups)
+        self._write_object(
+            self.ROOT_PAGES,
+            f"<< /Type /Pages /Kids [{kids}] /Count {self.pages_done} >>".encode(),
+        )
+        xref_offset = self._file.tell()
+        self._file.write(b"xref\n0 %d\n0000000000 65535 f \n" % self.next_obj)
+        self._xref.seek(0)
+        while True:
+            chunk = self._xref.read(1 << 20)
+            if not chunk:
+                break
+            self._file.write(chunk)
+        self._file.write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (self.next_obj, self.CATALOG, xref_offset)
+        )
+        self._file.close()
+        self._xref.close()
+        os.unlink(self.xref_path)
+        if os.path.exists(self.checkpoint_path):
+            os.unlink(self.checkpoint_path)
+        return self.pages_done
@@ -0,0 +1,384 @@
+"""
+併發 Pinata 上傳管線 - 以配額而不是逐筆延遲決定總上傳時間
+
+    python scripts/pin_pipeline.py pin images/certificates/*.svg --json metadata/*.json
+    python scripts/pin_pipeline.py pin images/*.svg --concurrency 32 --rate 3 --burst 10
+    python scripts/pin_pipeline.py bench --count 10000 --latency 0.2 --rate 200
+    python scripts/pin_pipeline.py bench --count 100 --rate 10 --client-rate 40   # 設定高於配額時自動降速
+
+* asyncio + 有上限的 semaphore：同時最多 --concurrency 個上傳
+* token bucket 限速：預設 3 req/s (Pinata 免費方案 180 次/分鐘)，收到 429 時整個桶一起暫停，
+  並把速率減半 (每個暫停期間最多一次)；之後每個成功的請求慢慢加回去，直到 --rate (AIMD)
+* 429 / 5xx / 連線錯誤以 jittered exponential backoff 重試，並遵守 Retry-After
+* multipart 以檔案物件串流送出，不會把整個檔案讀進記憶體
+* 與 pinning.py 共用 CID 去重快取，已釘選的內容不會再上傳
+
+bench 會在本機啟動帶配額與延遲的 mock_pinata，產生 N 張圖片 + N 份 metadata
+實際跑一次管線，並與逐筆 await 的預估時間比較。
+"""
+
+try:
+    import aiohttp
+    print("✓ aiohttp installed")
+except ImportError:
+    print("✗ aiohttp not installed")
+    print("Please run: pip install aiohttp")
+    import sys
+    sys.exit(1)
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+from ipfs_cid import bytes_cid, file_cid, json_bytes
+from pinning import (
+    DEFAULT_API_URL, DEFAULT_CACHE_PATH, PinataError, PinCache,
+    cached_cid, gateway_url, pin_options, pinata_headers, record_pin,
+)
+
+DEFAULT_RATE = 3.0          # Pinata 免費方案：180 requests / minute
+DEFAULT_BURST = 10
+DEFAULT_CONCURRENCY = 16
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+PinJob = namedtuple("PinJob", "kind source name")   # kind: "file" (source = path) | "json" (source = data)
+
+
+def file_job(path, name=None):
+    return PinJob("file", path, name or os.path.basename(path))
+
+
+def json_job(data, name):
+    return PinJob("json", data, name)
+
+
+class TokenBucket:
+    """Async token bucket whose rate adapts to 429s; waiters are served in arrival order."""
+
+    def __init__(self, rate, burst=None, min_rate=None, decrease=0.5):
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min_rate or min(rate, 0.1)
+        self.decrease = decrease
+        self.capacity = max(1.0, burst or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.slowed = 0
+        self._calm_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def penalize(self, seconds):
+        """Drain the bucket so no request is sent for *seconds* (after a 429)."""
+        self._refill()
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+    def throttled(self, seconds):
+        """A 429: pause for *seconds* and cut the rate, once per pause (concurrent 429s share one cut)."""
+        now = time.monotonic()
+        if now >= self._calm_at and self.rate > self.min_rate:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.slowed += 1
+        self.penalize(seconds)
+        # 已送出的請求在這段時間內回來的 429 仍是舊速率造成的
+        self._calm_at = max(self._calm_at, now + seconds + 1 / self.rate)
+
+    def succeeded(self):
+        """Additive increase: about +1 req/s per second of successful requests, up to the configured rate."""
+        if self.rate < self.max_rate:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+
+def _retry_after(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class PinPipeline:
+    """Pins many files / JSON documents concurrently under a request quota."""
+
+    def __init__(self, api_url=None, cache=None, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                 burst=DEFAULT_BURST, retries=6, backoff=0.5, max_backoff=30.0, cid_version=0, timeout=120):
+        self.api_url = (api_url or os.environ.get("PINATA_API_URL") or DEFAULT_API_URL).rstrip("/")
+        self.cache = cache if cache is not None else PinCache()
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.cid_version = cid_version
+        self.timeout = timeout
+        self.uploads = 0
+        self.skipped = 0
+        self.retried = 0
+        self.failed = 0
+        self.slowed = 0
+        self.final_rate = rate
+
+    def _delay(self, attempt):
+        # full jitter：避免所有 worker 在同一時間點一起重試
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def _post(self, session, bucket, endpoint, body_context):
+        """POST with rate limiting and retries; *body_context* builds a fresh body per attempt."""
+        for attempt in range(self.retries + 1):
+            await bucket.acquire()
+            try:
+                with body_context() as body:
+                    async with session.post(self.api_url + endpoint, data=body, headers=pinata_headers()) as resp:
+                        if resp.status == 200:
+                            bucket.succeeded()
+                            return await resp.json(content_type=None)
+                        text = (await resp.text())[:200]
+                        delay = _retry_after(resp.headers.get("Retry-After"))
+                        if resp.status == 429:
+                            delay = delay if delay is not None else self._delay(attempt)
+                            bucket.throttled(delay)
+                        if resp.status not in RETRY_STATUSES or attempt == self.retries:
+                            raise PinataError(f"{endpoint}: HTTP {resp.status} {text}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    raise PinataError(f"{endpoint}: {e!r}") from None
+                delay = None
+            self.retried += 1
+            await asyncio.sleep(delay if delay is not None else self._delay(attempt))
+
+    def _file_body(self, path, name):
+        @contextlib.contextmanager
+        def build():
+            with open(path, "rb") as f:
+                form = aiohttp.FormData()
+                form.add_field("file", f, filename=name, content_type="application/octet-stream")
+                form.add_field("pinataMetadata", json.dumps({"name": name}))
+                form.add_field("pinataOptions", pin_options(self.cid_version))
+                yield form
+        return build
+
+    def _json_body(self, data, name):
+        body = json.dumps({
+            "pinataContent": data,
+            "pinataMetadata": {"name": name},
+            "pinataOptions": {"cidVersion": self.cid_version},
+        }, ensure_ascii=False).encode("utf-8")
+        return lambda: contextlib.nullcontext(aiohttp.BytesPayload(body, content_type="application/json"))
+
+    async def _pin(self, session, bucket, job, inflight):
+        if job.kind == "file":
+            local = await asyncio.to_thread(file_cid, job.source, self.cid_version)
+            size = os.path.getsize(job.source)
+            endpoint, body = "/pinning/pinFileToIPFS", self._file_body(job.source, job.name)
+        else:
+            content = json_bytes(job.source)
+            local, size = bytes_cid(content, self.cid_version), len(content)
+            endpoint, body = "/pinning/pinJSONToIPFS", self._json_body(job.source, job.name)
+
+        pinned = cached_cid(self.cache, local)
+        if pinned:
+            self.skipped += 1
+            return pinned, "cached"
+        if local in inflight:
+            # 同一批裡內容相同的檔案只上傳一次
+            self.skipped += 1
+            return await asyncio.shield(inflight[local]), "cached"
+
+        future = inflight[local] = asyncio.get_running_loop().create_future()
+        try:
+            reply = await self._post(session, bucket, endpoint, body)
+            cid = record_pin(self.cache, local, reply["IpfsHash"], job.name, size)
+            self.uploads += 1
+            future.set_result(cid)
+            return cid, "pinned"
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()   # 已由呼叫端處理，避免 "exception was never retrieved"
+            del inflight[local]
+            raise
+
+    async def run(self, jobs, progress=None):
+        """Pin every job; returns ``[{name, cid, status, error}]`` in job order."""
+        jobs = list(jobs)
+        bucket = TokenBucket(self.rate, self.burst)
+        semaphore = asyncio.BoundedSemaphore(self.concurrency)
+        inflight = {}
+        results = [None] * len(jobs)
+        done = 0
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async def worker(i, job):
+                nonlocal done
+                async with semaphore:
+                    try:
+                        cid, status = await self._pin(session, bucket, job, inflight)
+                        results[i] = {"name": job.name, "cid": cid, "status": status, "error": None}
+                    except Exception as e:
+                        # 任何一筆的意外錯誤 (例如回覆少了 IpfsHash) 都只記為該筆失敗，其餘照常上傳
+                        self.failed += 1
+                        error = str(e) if isinstance(e, (PinataError, OSError)) else f"{type(e).__name__}: {e}"
+                        results[i] = {"name": job.name, "cid": None, "status": "failed", "error": error}
+                done += 1
+                if progress:
+                    progress(done, len(jobs))
+
+            await asyncio.gather(*(worker(i, job) for i, job in enumerate(jobs)))
+        self.slowed, self.final_rate = bucket.slowed, bucket.rate
+        return results
+
+    def pin_all(self, jobs, progress=None):
+        return asyncio.run(self.run(jobs, progress))
+
+
+# -- benchmark ---------------------------------------------------------------
+
+def _sample_svg(i):
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="800" height="600">'
+            f'<rect width="800" height="600" fill="#f8f9fa"/>'
+            f'<text x="400" y="300" text-anchor="middle">Certificate #{i}</text></svg>')
+
+
+def _sample_metadata(i):
+    return {
+        "name": f"永恆數位榮譽證書 #{i}",
+        "image": f"ipfs://sample-{i}",
+        "attributes": [{"trait_type": "Token ID", "value": i}],
+    }
+
+
+def run_benchmark(count, rate, burst, latency, concurrency, error_rate=0.0, port=0, client_rate=None):
+    """Pin *count* images + *count* metadata documents against a throttled local mock.
+
+    *client_rate* (default: *rate*) is the pipeline's starting rate; set it above
+    the mock's quota to exercise the adaptive back-off.
+    """
+    from mock_pinata import make_server
+
+    server = make_server(port=port, rate=rate, burst=burst, latency=latency, error_rate=error_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            jobs = []
+            for i in range(1, count + 1):
+                path = os.path.join(tmp, f"certificate-{i}.svg")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(_sample_svg(i))
+                jobs.append(file_job(path))
+                jobs.append(json_job(_sample_metadata(i), f"token-{i}.json"))
+
+            pipeline = PinPipeline(url, PinCache(os.path.join(tmp, "cache.jsonl")),
+                                   concurrency=concurrency, rate=client_rate or rate, burst=burst)
+            start = time.perf_counter()
+            results = pipeline.pin_all(jobs)
+            elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    store = server.store
+    return {
+        "requests": len(jobs),
+        "elapsed": elapsed,
+        "throughput": len(jobs) / elapsed,
+        "quotaBound": max(0.0, (len(jobs) - (burst or rate)) / rate),
+        "serialBound": len(jobs) * latency,
+        "uploads": pipeline.uploads,
+        "failed": sum(r["status"] == "failed" for r in results),
+        "retries": pipeline.retried,
+        "slowdowns": pipeline.slowed,
+        "finalRate": round(pipeline.final_rate, 2),
+        "throttled": store.throttled,
+        "serverErrors": store.failed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent, rate-limited Pinata pinning")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def tuning(p, rate):
+        p.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+        p.add_argument("--rate", type=float, default=rate, help="requests per second (default: %(default)s)")
+        p.add_argument("--burst", type=float, default=DEFAULT_BURST)
+
+    p = sub.add_parser("pin", help="pin files and metadata JSON")
+    p.add_argument("files", nargs="*", help="files to pin via pinFileToIPFS")
+    p.add_argument("--json", nargs="+", default=[], metavar="FILE", help="JSON files to pin via pinJSONToIPFS")
+    p.add_argument("--cid-version", type=int, choices=(0, 1), default=0)
+    p.add_argument("--cache", default=DEFAULT_CACHE_PATH)
+    p.add_argument("--api-url", help=f"default: $PINATA_API_URL or {DEFAULT_API_URL}")
+    p.add_argument("-o", "--output", help="write results as JSON lines")
+    tuning(p, DEFAULT_RATE)
+
+    b = sub.add_parser("bench", help="throughput against a throttled local mock server")
+    b.add_argument("--count", type=int, default=1000, help="images and metadata documents each")
+    b.add_argument("--latency", type=float, default=0.2, help="mock per-request latency in seconds")
+    b.add_argument("--error-rate", type=float, default=0.0)
+    b.add_argument("--client-rate", type=float, help="pipeline rate when it differs from the mock's quota (--rate)")
+    tuning(b, 200.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        print(f"⏱️  {args.count} 張圖片 + {args.count} 份 metadata，配額 {args.rate:g} req/s，延遲 {args.latency}s")
+        stats = run_benchmark(args.count, args.rate, args.burst, args.latency, args.concurrency, args.error_rate,
+                              client_rate=args.client_rate)
+        print(json.dumps(stats, indent=2))
+        print(f"✅ {stats['throughput']:.1f} req/s，耗時 {stats['elapsed']:.1f}s "
+              f"(配額下限 {stats['quotaBound']:.1f}s，逐筆上傳約 {stats['serialBound']:.0f}s)")
+        return 1 if stats["failed"] else 0
+
+    jobs = [file_job(path) for path in args.files]
+    for path in args.json:
+        with open(path, encoding="utf-8") as f:
+            jobs.append(json_job(json.load(f), os.path.basename(path)))
+    if not jobs:
+        parser.error("nothing to pin")
+
+    pipeline = PinPipeline(args.api_url, PinCache(args.cache), concurrency=args.concurrency,
+                           rate=args.rate, burst=args.burst, cid_version=args.cid_version)
+
+    def progress(done, total):
+        if done % 100 == 0 or done == total:
+            print(f"   {done}/{total}")
+
+    results = pipeline.pin_all(jobs, progress)
+    for result in results:
+        if result["status"] == "failed":
+            print(f"❌ {result['name']}: {result['error']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for result in results:
+                if result["cid"]:
+                    result["url"] = gateway_url(result["cid"])
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    print(f"📤 上傳 {pipeline.uploads} 個，快取略過 {pipeline.skipped} 個，重試 {pipeline.retried} 次，失敗 {pipeline.failed} 個")
+    return 1 if pipeline.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
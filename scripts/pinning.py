@@ -0,0 +1,200 @@
+"""
+Pinata 上傳與去重快取 - 先在本地算 CID，已釘選過的內容不再上傳
+
+    python scripts/pinning.py images/certificates/*.svg
+    python scripts/pinning.py --json metadata/token-*.json
+    python scripts/pinning.py --dry-run images/certificates/*.svg   # 只算 CID，不連網
+
+    PINATA_API_KEY / PINATA_SECRET_API_KEY   Pinata 金鑰 (與 JS 上傳工具相同)
+    PINATA_API_URL                           API 位址 (預設 https://api.pinata.cloud，可指向 mock_pinata.py)
+
+快取是 append-only 的 JSONL 檔 (預設 .pin-cache.jsonl)，以 CID 為鍵記錄
+釘選狀態；相同位元組的 SVG 或 metadata 重新發行時完全不會送出請求，
+tokenURI 也能在上傳前就先以本地 CID 寫好。
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from ipfs_cid import bytes_cid, json_bytes
+
+DEFAULT_API_URL = "https://api.pinata.cloud"
+DEFAULT_CACHE_PATH = ".pin-cache.jsonl"
+IPFS_GATEWAY = "https://ipfs.io/ipfs/"
+
+
+def gateway_url(cid):
+    """The ``https://ipfs.io/ipfs/<cid>`` form the JS uploader stores as imageURI."""
+    return IPFS_GATEWAY + cid
+
+
+class PinCache:
+    """Persistent CID → pin status map backed by an append-only JSON lines file."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["cid"]] = entry
+
+    def __contains__(self, cid):
+        return self.is_pinned(cid)
+
+    def is_pinned(self, cid):
+        entry = self.entries.get(cid)
+        return bool(entry) and entry.get("status") == "pinned"
+
+    def record(self, cid, status="pinned", **info):
+        entry = {"cid": cid, "status": status, "at": int(time.time()), **info}
+        self.entries[cid] = entry
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+
+class PinataError(Exception):
+    """Pinata rejected an upload."""
+
+
+def pinata_headers():
+    return {
+        "pinata_api_key": os.environ.get("PINATA_API_KEY", ""),
+        "pinata_secret_api_key": os.environ.get("PINATA_SECRET_API_KEY", ""),
+    }
+
+
+def pin_options(cid_version):
+    return json.dumps({"cidVersion": cid_version})
+
+
+def record_pin(cache, local_cid, remote_cid, name, size):
+    """Store a finished upload in *cache*; returns the CID Pinata reported."""
+    if remote_cid != local_cid:
+        # 以 Pinata 回傳的為準，同時記下本地 CID 對不上的情況
+        print(f"⚠️  {name}: 本地 CID {local_cid} 與 Pinata {remote_cid} 不同")
+        cache.record(local_cid, status="mismatch", remote=remote_cid, name=name, size=size)
+    cache.record(remote_cid, name=name, size=size)
+    return remote_cid
+
+
+def cached_cid(cache, local_cid):
+    """The pinned CID for *local_cid* (following a recorded mismatch), or None."""
+    if cache.is_pinned(local_cid):
+        return local_cid
+    remote = cache.entries.get(local_cid, {}).get("remote")
+    return remote if remote and cache.is_pinned(remote) else None
+
+
+class PinataClient:
+    """Pins files and JSON, skipping anything whose local CID the cache marks pinned."""
+
+    def __init__(self, cache=None, api_url=None, cid_version=0, timeout=60):
+        self.cache = cache if cache is not None else PinCache()
+        self.api_url = (api_url or os.environ.get("PINATA_API_URL") or DEFAULT_API_URL).rstrip("/")
+        self.cid_version = cid_version
+        self.timeout = timeout
+        self.uploads = 0
+        self.skipped = 0
+
+    def _post(self, endpoint, body, content_type):
+        request = urllib.request.Request(
+            self.api_url + endpoint, data=body,
+            headers={"Content-Type": content_type, **pinata_headers()},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            raise PinataError(f"{endpoint}: HTTP {e.code} {e.read()[:200].decode(errors='replace')}") from None
+
+    def _finish(self, local_cid, reply, name, size):
+        self.uploads += 1
+        return record_pin(self.cache, local_cid, reply["IpfsHash"], name, size)
+
+    def pin_bytes(self, data, name):
+        """Pin raw bytes as a file; returns the CID (without uploading if already pinned)."""
+        cid = bytes_cid(data, self.cid_version)
+        pinned = cached_cid(self.cache, cid)
+        if pinned:
+            self.skipped += 1
+            return pinned
+
+        boundary = uuid.uuid4().hex
+        parts = [
+            (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{name}"\r\n'
+             f'Content-Type: application/octet-stream\r\n\r\n').encode() + data + b"\r\n",
+            (f'--{boundary}\r\nContent-Disposition: form-data; name="pinataMetadata"\r\n\r\n'
+             f'{json.dumps({"name": name})}\r\n').encode(),
+            (f'--{boundary}\r\nContent-Disposition: form-data; name="pinataOptions"\r\n\r\n'
+             f'{pin_options(self.cid_version)}\r\n').encode(),
+            f"--{boundary}--\r\n".encode(),
+        ]
+        reply = self._post("/pinning/pinFileToIPFS", b"".join(parts), f"multipart/form-data; boundary={boundary}")
+        return self._finish(cid, reply, name, len(data))
+
+    def pin_file(self, path, name=None):
+        with open(path, "rb") as f:
+            return self.pin_bytes(f.read(), name or os.path.basename(path))
+
+    def pin_json(self, data, name):
+        content = json_bytes(data)
+        cid = bytes_cid(content, self.cid_version)
+        pinned = cached_cid(self.cache, cid)
+        if pinned:
+            self.skipped += 1
+            return pinned
+        body = json.dumps({
+            "pinataContent": data,
+            "pinataMetadata": {"name": name},
+            "pinataOptions": {"cidVersion": self.cid_version},
+        }, ensure_ascii=False).encode("utf-8")
+        reply = self._post("/pinning/pinJSONToIPFS", body, "application/json")
+        return self._finish(cid, reply, name, len(content))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pin files / JSON to Pinata with a local CID dedup cache")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--json", action="store_true", help="pin each file's parsed JSON via pinJSONToIPFS")
+    parser.add_argument("--cid-version", type=int, choices=(0, 1), default=0)
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH)
+    parser.add_argument("--api-url", help=f"default: $PINATA_API_URL or {DEFAULT_API_URL}")
+    parser.add_argument("--dry-run", action="store_true", help="only print local CIDs and cache status")
+    args = parser.parse_args(argv)
+
+    client = PinataClient(PinCache(args.cache), args.api_url, args.cid_version)
+    for path in args.files:
+        if args.json:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            local = bytes_cid(json_bytes(data), args.cid_version)
+        else:
+            data = None
+            with open(path, "rb") as f:
+                local = bytes_cid(f.read(), args.cid_version)
+
+        if args.dry_run:
+            state = "pinned" if client.cache.is_pinned(local) else "new"
+            print(f"{local}  {state:<6}  {path}")
+            continue
+        name = os.path.basename(path)
+        cid = client.pin_json(data, name) if args.json else client.pin_file(path, name)
+        print(f"✅ {name}: {gateway_url(cid)}")
+
+    if not args.dry_run:
+        print(f"📤 上傳 {client.uploads} 個，快取略過 {client.skipped} 個")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
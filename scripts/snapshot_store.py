@@ -0,0 +1,255 @@
+"""
+證書欄式快照 - 以 NumPy memmap 讀取的欄式 (columnar) 證書資料
+
+    python scripts/snapshot_store.py build certificates.jsonl -o snapshot --owners events-state.json
+    python scripts/snapshot_store.py stats snapshot
+
+快照是一個目錄：定長欄位 (tokenId、certType、issueDate、owner) 各存成一個
+原始二進位檔，字串欄位則是 UTF-8 blob 加上 uint64 offset 陣列。開啟時只讀
+meta.json，所有欄位都以 mmap 對應，統計查詢直接在欄位上做向量化運算，
+不需要把整份資料反序列化成 Python 物件。
+"""
+
+try:
+    import numpy as np
+    print("✓ numpy installed")
+except ImportError:
+    print("✗ numpy not installed")
+    print("Please run: pip install numpy")
+    import sys
+    sys.exit(1)
+
+import argparse
+import json
+import os
+import sys
+
+from certificates import CERTIFICATE_TYPES, CertificateRecord, coerce_record, iter_records, unix_date
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+
+FIXED_COLUMNS = {
+    "token_id": np.dtype("<u8"),
+    "cert_type": np.dtype("u1"),
+    "issue_date": np.dtype("<i8"),
+    "owner": np.dtype("S20"),      # 20-byte address
+}
+STRING_COLUMNS = ("recipient_name", "issuer_name", "custom_message", "image_uri")
+OFFSET_DTYPE = np.dtype("<u8")
+
+
+def _address_bytes(address):
+    return bytes.fromhex(address.removeprefix("0x").rjust(40, "0")) if address else bytes(20)
+
+
+class SnapshotWriter:
+    """Append records column by column; memory use is bounded by *chunk_size*."""
+
+    def __init__(self, path, chunk_size=65536):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.sorted = True
+        self._last_token = -1
+        self._rows = []
+        self._fixed = {name: open(os.path.join(path, f"{name}.bin"), "wb") for name in FIXED_COLUMNS}
+        self._blobs = {name: open(os.path.join(path, f"{name}.blob"), "wb") for name in STRING_COLUMNS}
+        self._offsets = {name: open(os.path.join(path, f"{name}.offsets"), "wb") for name in STRING_COLUMNS}
+        self._blob_size = dict.fromkeys(STRING_COLUMNS, 0)
+        for f in self._offsets.values():
+            f.write(np.zeros(1, OFFSET_DTYPE).tobytes())
+
+    def add(self, record, owner=None):
+        record = coerce_record(record)
+        token_id = record.token_id if record.token_id is not None else self.count + len(self._rows) + 1
+        try:
+            issue_date = unix_date(record.issue_date or 0)   # metadata/*.json 的 Issue Date 是 YYYY-MM-DD
+        except ValueError as e:
+            raise ValueError(f"tokenId {token_id}: {e}") from None
+        if token_id <= self._last_token:
+            self.sorted = False
+        self._last_token = token_id
+        self._rows.append((token_id, record, owner or record.recipient, issue_date))
+        if len(self._rows) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        rows, self._rows = self._rows, []
+        if not rows:
+            return
+        self._fixed["token_id"].write(np.array([r[0] for r in rows], FIXED_COLUMNS["token_id"]).tobytes())
+        self._fixed["cert_type"].write(np.array([r[1].cert_type for r in rows], FIXED_COLUMNS["cert_type"]).tobytes())
+        self._fixed["issue_date"].write(
+            np.array([r[3] for r in rows], FIXED_COLUMNS["issue_date"]).tobytes()
+        )
+        self._fixed["owner"].write(b"".join(_address_bytes(r[2]) for r in rows))
+        for name in STRING_COLUMNS:
+            encoded = [getattr(r[1], name).encode("utf-8") for r in rows]
+            lengths = np.fromiter(map(len, encoded), OFFSET_DTYPE, len(encoded))
+            self._offsets[name].write((np.cumsum(lengths, dtype=OFFSET_DTYPE) + self._blob_size[name]).tobytes())
+            self._blobs[name].write(b"".join(encoded))
+            self._blob_size[name] += int(lengths.sum())
+        self.count += len(rows)
+
+    def close(self):
+        self._flush()
+        for f in (*self._fixed.values(), *self._blobs.values(), *self._offsets.values()):
+            f.close()
+        meta = {
+            "version": FORMAT_VERSION,
+            "count": self.count,
+            "sorted": self.sorted,
+            "fixed": {name: dtype.str for name, dtype in FIXED_COLUMNS.items()},
+            "strings": list(STRING_COLUMNS),
+        }
+        with open(os.path.join(self.path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        return self.count
+
+
+def write_snapshot(records, path, owners=None, chunk_size=65536):
+    """Write *records* to a snapshot directory; *owners* maps token id → address."""
+    writer = SnapshotWriter(path, chunk_size)
+    for value in records:
+        record = coerce_record(value)
+        writer.add(record, owners.get(record.token_id) if owners else None)
+    return writer.close()
+
+
+def _memmap(path, dtype, count):
+    # 長度為 0 的檔案無法 mmap
+    if count == 0 or os.path.getsize(path) == 0:
+        return np.zeros(0, dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class StringColumn:
+    """Lazily decoded view over an offset-indexed UTF-8 blob."""
+
+    def __init__(self, path, name, count):
+        self.offsets = _memmap(os.path.join(path, f"{name}.offsets"), OFFSET_DTYPE, count + 1)
+        blob_path = os.path.join(path, f"{name}.blob")
+        self.blob = _memmap(blob_path, np.dtype("u1"), os.path.getsize(blob_path))
+
+    def __len__(self):
+        return max(len(self.offsets) - 1, 0)
+
+    def __getitem__(self, i):
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.blob[start:end].tobytes().decode("utf-8")
+
+    def take(self, rows):
+        """Decode many rows at once (one memoryview slice per row instead of memmap indexing)."""
+        offsets = np.asarray(self.offsets)
+        rows = np.asarray(rows, np.int64)
+        blob = memoryview(self.blob) if len(self.blob) else b""
+        return [
+            str(blob[start:end], "utf-8")
+            for start, end in zip(offsets[rows].tolist(), offsets[rows + 1].tolist())
+        ]
+
+    def lengths(self):
+        return np.diff(self.offsets)
+
+
+class CertificateSnapshot:
+    """Read-only, memory-mapped certificate snapshot."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"unsupported snapshot version {self.meta['version']}")
+        self.path = path
+        self.count = self.meta["count"]
+        for name, dtype in self.meta["fixed"].items():
+            setattr(self, name, _memmap(os.path.join(path, f"{name}.bin"), np.dtype(dtype), self.count))
+        self.strings = {name: StringColumn(path, name, self.count) for name in self.meta["strings"]}
+
+    def __len__(self):
+        return self.count
+
+    def find(self, token_id):
+        """Row index of *token_id*, or None."""
+        if self.meta["sorted"]:
+            i = int(np.searchsorted(self.token_id, token_id))
+            return i if i < self.count and self.token_id[i] == token_id else None
+        hits = np.flatnonzero(self.token_id == token_id)
+        return int(hits[0]) if len(hits) else None
+
+    def record(self, i):
+        return CertificateRecord(
+            cert_type=int(self.cert_type[i]),
+            recipient_name=self.strings["recipient_name"][i],
+            issuer_name=self.strings["issuer_name"][i],
+            custom_message=self.strings["custom_message"][i],
+            issue_date=int(self.issue_date[i]),
+            image_uri=self.strings["image_uri"][i],
+            token_id=int(self.token_id[i]),
+            recipient="0x" + self.owner[i].ljust(20, b"\0").hex(),
+        )
+
+    def owned_by(self, address):
+        """Row indices held by *address* (vectorized compare on the owner column)."""
+        return np.flatnonzero(self.owner == np.bytes_(_address_bytes(address)))
+
+    # -- 統計 -------------------------------------------------------------
+
+    def count_by_type(self):
+        """``certificateCount`` for every type."""
+        return np.bincount(self.cert_type, minlength=len(CERTIFICATE_TYPES))
+
+    def months(self):
+        """Issue month (UTC) of every row as ``datetime64[M]``."""
+        return self.issue_date.astype("datetime64[s]").astype("datetime64[M]")
+
+    def issuance_by_month(self):
+        """``(months, counts)`` sorted by month."""
+        return np.unique(self.months(), return_counts=True)
+
+    def count_by_type_over_time(self, cumulative=True):
+        """``(months, counts[month, type])``; cumulative counts mirror ``certificateCount``."""
+        months, inverse = np.unique(self.months(), return_inverse=True)
+        n_types = len(CERTIFICATE_TYPES)
+        counts = np.bincount(inverse * n_types + self.cert_type, minlength=len(months) * n_types)
+        counts = counts.reshape(len(months), n_types)
+        return months, (np.cumsum(counts, axis=0) if cumulative else counts)
+
+
+def _load_owners(path):
+    from owner_index import OwnerIndex
+    return OwnerIndex.load(path).owners
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Columnar memory-mapped certificate snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="write a snapshot from certificate records")
+    b.add_argument("inputs", nargs="+", help="records .json / .jsonl (e.g. from chain.py read)")
+    b.add_argument("-o", "--output", default="snapshot")
+    b.add_argument("--owners", help="owner_index / event_ingest state file to fill the owner column")
+
+    s = sub.add_parser("stats", help="per-type and per-month issuance")
+    s.add_argument("snapshot")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        owners = _load_owners(args.owners) if args.owners else None
+        count = write_snapshot(iter_records(args.inputs), args.output, owners)
+        print(f"✅ 已寫入 {count} 張證書到快照 {args.output}")
+        return 0
+
+    snap = CertificateSnapshot(args.snapshot)
+    print(f"📊 {len(snap)} 張證書")
+    for type_id, count in enumerate(snap.count_by_type()):
+        print(f"   {CERTIFICATE_TYPES[type_id].name_zh}: {count}")
+    for month, count in zip(*snap.issuance_by_month()):
+        print(f"   {month}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+證書縮圖 - 把證書 SVG 轉成多種尺寸的 PNG / WebP，並以內容雜湊快取
+
+    python scripts/thumbnails.py images/certificates/*.svg
+    python scripts/thumbnails.py records.jsonl --sizes 128 512 --formats webp --workers 4
+    python scripts/thumbnails.py images/certificates/*.svg --font-family "Microsoft JhengHei"
+
+錢包、Etherscan 預覽與前端畫廊只需要小圖，不必每格都下載完整的向量圖。
+每張 SVG 只光柵化一次 (以最大尺寸)，較小的尺寸由 Pillow 縮小，再各自輸出
+PNG 與 WebP。
+
+快取目錄以 SVG 內容的 SHA-256 分層 (images/thumbnails/ab/abcd.../512.webp)，
+內容相同的證書不會重複渲染 (鍵也包含字型名稱與 --font-dir 內的字型檔清單)；manifest.json 記錄每個來源對應的縮圖路徑，
+metadata 可直接引用。
+"""
+
+try:
+    import resvg_py
+    from PIL import Image
+    print("✓ resvg-py / Pillow installed")
+except ImportError:
+    print("✗ resvg-py / Pillow not installed")
+    print("Please run: pip install resvg-py Pillow")
+    import sys
+    sys.exit(1)
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from certificates import coerce_record, iter_records
+
+SIZES = (128, 512, 1600)
+FORMATS = ("png", "webp")
+RENDER_VERSION = 1          # 改變渲染方式時遞增，讓舊快取失效
+DEFAULT_CACHE_DIR = os.path.join("images", "thumbnails")
+MANIFEST_NAME = "manifest.json"
+WEBP_QUALITY = 85
+IN_FLIGHT_PER_WORKER = 4    # 每個 worker 最多排幾張待渲染，整批 SVG 不會同時留在記憶體
+
+_SVG_SIZE = re.compile(r'<svg\b[^>]*?\bwidth="([\d.]+)"[^>]*?\bheight="([\d.]+)"')
+
+
+def svg_aspect(svg_text):
+    """height / width of the root ``<svg>`` (4:3 when it has no numeric size)."""
+    match = _SVG_SIZE.search(svg_text)
+    return float(match.group(2)) / float(match.group(1)) if match else 0.75
+
+
+def fonts_fingerprint(font_dirs):
+    """Every font file under *font_dirs* (resvg scans them recursively) with its size and mtime."""
+    lines = []
+    for font_dir in font_dirs:
+        lines.append(os.path.abspath(font_dir))
+        for root, dirs, files in os.walk(font_dir):
+            dirs.sort()
+            for name in sorted(files):
+                st = os.stat(os.path.join(root, name))
+                lines.append(f"{os.path.relpath(os.path.join(root, name), font_dir)}\t{st.st_size}\t{st.st_mtime_ns}")
+    return "\n".join(lines)
+
+
+def content_key(svg_bytes, font_family=None, fonts=""):
+    """Cache key: the SVG bytes plus everything else that changes the pixels.
+
+    *fonts* is :func:`fonts_fingerprint` of the ``--font-dir`` directories, so
+    adding or replacing a font re-renders the thumbnails.
+    """
+    h = hashlib.sha256(f"thumbnails-v{RENDER_VERSION}|{font_family or ''}|{fonts}|".encode())
+    h.update(svg_bytes)
+    return h.hexdigest()
+
+
+def rendition_path(key, size, fmt):
+    return os.path.join(key[:2], key, f"{size}.{fmt}")
+
+
+def _save(image, path, fmt):
+    tmp = path + ".tmp"
+    if fmt == "webp":
+        image.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(tmp, "PNG")
+    os.replace(tmp, path)   # 中斷時不會留下被當成快取的半個檔案
+
+
+def svg_text(source):
+    """SVG markup of a source: a path to an .svg file or a certificate record."""
+    if isinstance(source, str):
+        with open(source, encoding="utf-8") as f:
+            return f.read()
+    from certificate_svg import render_svg
+    return render_svg(source)
+
+
+def _render(job):
+    """Worker: rasterize one SVG at the largest missing size and write every missing rendition."""
+    cache_dir, key, source, missing, font_family, font_dirs, fonts = job
+    text = svg_text(source)
+    if content_key(text.encode("utf-8"), font_family, fonts) != key:
+        raise ValueError(f"SVG 在計算快取鍵之後被修改: {key}")
+    largest = max(size for size, _ in missing)
+    aspect = svg_aspect(text)
+    png = resvg_py.svg_to_bytes(
+        svg_string=text, width=largest, height=round(largest * aspect),
+        sans_serif_family=font_family, font_dirs=font_dirs or None,
+    )
+    full = Image.open(io.BytesIO(png))
+    full.load()
+    os.makedirs(os.path.join(cache_dir, key[:2], key), exist_ok=True)
+
+    images = {}
+    for size, fmt in sorted(missing, reverse=True):
+        if size not in images:
+            images[size] = full if size == largest else full.resize((size, round(size * aspect)), Image.LANCZOS)
+        _save(images[size], os.path.join(cache_dir, rendition_path(key, size, fmt)), fmt)
+    return key
+
+
+def _sources(inputs):
+    """Yield ``(name, source)`` for :func:`svg_text`: .svg paths as-is, record files one record at a time."""
+    from certificate_svg import svg_filename
+
+    index = 0
+    for path in inputs:
+        if path.endswith(".svg"):
+            yield os.path.splitext(os.path.basename(path))[0], path
+            continue
+        for value in iter_records([path]):
+            index += 1
+            record = coerce_record(value)
+            yield os.path.splitext(svg_filename(record, index))[0], record
+
+
+class ThumbnailCache:
+    """Content-addressed rendition cache plus the manifest that points into it."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, sizes=SIZES, formats=FORMATS,
+                 font_family=None, font_dirs=(), base_uri=None):
+        self.cache_dir = cache_dir
+        self.sizes = tuple(sorted(sizes))
+        self.formats = tuple(formats)
+        self.font_family = font_family
+        self.font_dirs = list(font_dirs)
+        self.fonts = fonts_fingerprint(self.font_dirs)   # 字型在建構時掃描一次，所有 SVG 共用
+        self.base_uri = base_uri
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        self.manifest = {"version": RENDER_VERSION, "items": {}}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self.rendered = 0
+        self.cached = 0
+
+    def missing(self, key):
+        return [
+            (size, fmt) for size in self.sizes for fmt in self.formats
+            if not os.path.exists(os.path.join(self.cache_dir, rendition_path(key, size, fmt)))
+        ]
+
+    def entry(self, key, aspect):
+        renditions = []
+        for size in self.sizes:
+            for fmt in self.formats:
+                path = rendition_path(key, size, fmt).replace(os.sep, "/")
+                item = {
+                    "size": size,
+                    "width": size,
+                    "height": round(size * aspect),
+                    "format": fmt,
+                    "path": path,
+                    "bytes": os.path.getsize(os.path.join(self.cache_dir, path)),
+                }
+                if self.base_uri:
+                    item["uri"] = self.base_uri.rstrip("/") + "/" + path
+                renditions.append(item)
+        return {"hash": key, "renditions": renditions}
+
+    def _jobs(self, sources, names):
+        """Hash each source once and yield render jobs for keys with missing renditions.
+
+        Only the key and aspect ratio of each source are kept; the SVG itself is
+        re-read (or re-rendered from its record) by the worker.
+        """
+        seen = set()
+        for name, source in sources:
+            text = svg_text(source)
+            key = content_key(text.encode("utf-8"), self.font_family, self.fonts)
+            names[name] = (key, svg_aspect(text))
+            if key in seen:
+                continue
+            seen.add(key)
+            missing = self.missing(key)
+            if missing:
+                yield (self.cache_dir, key, source, missing, self.font_family, self.font_dirs, self.fonts)
+            else:
+                self.cached += 1
+
+    def _rendered(self, progress):
+        self.rendered += 1
+        if progress:
+            progress(self.rendered)
+
+    def build(self, sources, workers=1, progress=None):
+        """Render whatever is missing for *sources* and update the manifest.
+
+        *sources* is consumed lazily and at most ``workers * IN_FLIGHT_PER_WORKER``
+        jobs are queued at a time. *progress* is called with the number rendered so far.
+        """
+        names = {}
+        jobs = self._jobs(sources, names)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if workers <= 1:
+            for job in jobs:
+                _render(job)
+                self._rendered(progress)
+        else:
+            limit = workers * IN_FLIGHT_PER_WORKER
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = set()
+                for job in jobs:
+                    pending.add(pool.submit(_render, job))
+                    if len(pending) >= limit:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                            self._rendered(progress)
+                for future in pending:
+                    future.result()
+                    self._rendered(progress)
+
+        for name, (key, aspect) in names.items():
+            self.manifest["items"][name] = self.entry(key, aspect)
+        self.save_manifest()
+        return self.manifest
+
+    def save_manifest(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rasterize certificate SVGs into cached PNG/WebP thumbnails")
+    parser.add_argument("inputs", nargs="+", help=".svg files or certificate records (.json / .jsonl)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="cache directory (manifest.json lives here)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="widths in pixels")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--font-family", help='sans-serif font for text, e.g. "Noto Sans TC"')
+    parser.add_argument("--font-dir", action="append", default=[], help="extra directory of font files")
+    parser.add_argument("--base-uri", help="prefix for manifest URIs, e.g. https://cdn.example.com/thumbnails")
+    args = parser.parse_args(argv)
+
+    cache = ThumbnailCache(args.cache, args.sizes, args.formats, args.font_family, args.font_dir, args.base_uri)
+
+    def progress(done):
+        if done % 50 == 0:
+            print(f"   已渲染 {done} 張")
+
+    start = time.perf_counter()
+    manifest = cache.build(_sources(args.inputs), args.workers, progress)
+    elapsed = time.perf_counter() - start
+    print(f"✅ 渲染 {cache.rendered} 張，快取命中 {cache.cached} 張 ({elapsed:.1f}s)")
+    print(f"📄 Manifest: {cache.manifest_path} ({len(manifest['items'])} 個來源)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
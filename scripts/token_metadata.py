@@ -0,0 +1,143 @@
+"""
+鏈下 tokenURI 產生器 - 逐位元組重現合約 generateMetadata 的輸出
+
+    python scripts/token_metadata.py records.jsonl -o token-uris.jsonl
+    python scripts/token_metadata.py --check 1-100 --contract 0x...
+
+合約以 abi.encodePacked 直接串接字串 (不做 JSON 跳脫)，再以 Base64 編碼並
+加上 data URI 前綴。這裡以同樣的片段順序組出 UTF-8 位元組，驗證網站可直接
+從鏈下鏡像提供 metadata，只需用 --check 抽查與鏈上 tokenURI 是否一致。
+"""
+
+import argparse
+import base64
+import binascii
+import json
+import sys
+from functools import lru_cache
+
+from certificates import coerce_record, iter_records, type_name
+
+DATA_URI_PREFIX = "data:application/json;base64,"
+DESCRIPTION = (
+    "永恆數位榮譽證書 - 基於區塊鏈的不可竄改數位證書，證明持有者的成就與榮譽。"
+    "此證書具有唯一性、永久性，並可在區塊鏈上公開驗證。"
+)
+
+
+@lru_cache(maxsize=None)
+def _type_parts(cert_type):
+    """Constant byte runs that only depend on the certificate type."""
+    name = type_name(cert_type)
+    head = f'{{"name": "{name} #'.encode()
+    middle = f'", "description": "{DESCRIPTION}", "image": "'.encode()
+    attributes = f'", "attributes": [{{"trait_type": "Certificate Type", "value": "{name}'.encode()
+    return head, middle, attributes
+
+
+def _issue_date(record):
+    value = record.issue_date
+    if isinstance(value, str) and not value.isdigit():
+        raise ValueError(f"issueDate must be a unix timestamp, got {value!r}")
+    return int(value)
+
+
+def metadata_json(record, token_id=None):
+    """The exact JSON bytes the contract Base64-encodes for *record*."""
+    record = coerce_record(record)
+    token_id = record.token_id if token_id is None else token_id
+    if token_id is None:
+        raise ValueError("token_id is required to build tokenURI metadata")
+    head, middle, attributes = _type_parts(record.cert_type)
+    return b"".join((
+        head, str(int(token_id)).encode(),
+        middle, record.image_uri.encode(),
+        attributes,
+        b'"}, {"trait_type": "Recipient", "value": "', record.recipient_name.encode(),
+        b'"}, {"trait_type": "Issuer", "value": "', record.issuer_name.encode(),
+        b'"}, {"trait_type": "Issue Date", "value": "', str(_issue_date(record)).encode(),
+        b'"}, {"trait_type": "Custom Message", "value": "', record.custom_message.encode(),
+        b'"}]}',
+    ))
+
+
+def token_uri(record, token_id=None):
+    """``tokenURI(tokenId)`` as the contract returns it."""
+    return DATA_URI_PREFIX + base64.b64encode(metadata_json(record, token_id)).decode("ascii")
+
+
+def token_uris(records):
+    """Encode a whole collection; returns the tokenURIs in input order.
+
+    Type prefixes are built once per type and the Base64 step runs on the
+    C-level ``binascii`` encoder, so the per-record cost is one bytes join.
+    """
+    encode = binascii.b2a_base64
+    return [
+        DATA_URI_PREFIX + encode(metadata_json(record), newline=False).decode("ascii")
+        for record in records
+    ]
+
+
+def decode_token_uri(uri):
+    """Parse a ``data:application/json;base64,...`` tokenURI back into a dict."""
+    if not uri.startswith(DATA_URI_PREFIX):
+        raise ValueError("not a base64 JSON data URI")
+    return json.loads(base64.b64decode(uri[len(DATA_URI_PREFIX):]))
+
+
+def check_against_chain(contract, token_ids):
+    """Compare the off-chain encoding with ``tokenURI`` for each id.
+
+    Both the struct reads and the tokenURI reads go out as JSON-RPC batches.
+    Returns a list of ``(token_id, expected, actual)`` mismatches.
+    """
+    expected = token_uris(contract.certificates(token_ids))
+    actual = contract.token_uris(token_ids)
+    return [(t, e, a) for t, e, a in zip(token_ids, expected, actual) if e != a]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build contract-identical tokenURIs off chain")
+    parser.add_argument("inputs", nargs="*", help="records .json / .jsonl files (need tokenId)")
+    parser.add_argument("-o", "--output", help="write {tokenId, tokenURI} JSON lines here (default: stdout)")
+    parser.add_argument("--check", metavar="IDS", help="spot-check token ids against chain, e.g. 1-100 or 3,7")
+    parser.add_argument("--contract", help="contract address (default: $CONTRACT_ADDRESS)")
+    parser.add_argument("--rpc", help="JSON-RPC URL (default: $RPC_URL, $SEPOLIA_RPC_URL or localhost)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        from chain import CertificateContract, RpcError, default_contract_address, parse_token_ids
+
+        contract = CertificateContract(args.contract or default_contract_address(), args.rpc)
+        token_ids = parse_token_ids(args.check)
+        print(f"🔍 抽查 {len(token_ids)} 個 token 的 tokenURI...")
+        try:
+            mismatches = check_against_chain(contract, token_ids)
+        except RpcError as e:
+            print(f"❌ RPC 錯誤: {e}")
+            return 1
+        for token_id, expected, actual in mismatches:
+            print(f"❌ #{token_id}: 鏈下 {len(expected)} 字元 / 鏈上 {len(actual)} 字元不一致")
+        if mismatches:
+            return 1
+        print(f"✅ {len(token_ids)} 個 tokenURI 與鏈上完全一致")
+        return 0
+
+    if not args.inputs:
+        parser.error("no input files (or use --check)")
+    records = [coerce_record(r) for r in iter_records(args.inputs)]
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record, uri in zip(records, token_uris(records)):
+            out.write(json.dumps({"tokenId": record.token_id, "tokenURI": uri}) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.output:
+        print(f"✅ 已寫入 {len(records)} 個 tokenURI 到 {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+渲染流程追蹤 - 記錄簡報與證書產生各階段的耗時與計數，輸出 Chrome trace 與摘要表
+
+    python presentation build --formats pptx,pdf --trace deck-trace.json
+    python scripts/certificate_pdf.py records.jsonl --merged out.pdf --trace cert-trace.json
+    python scripts/tracing.py deck-trace.json            # 重新印出某次 trace 的摘要
+
+產生的 JSON 可以直接拖進 chrome://tracing 或 https://ui.perfetto.dev 查看時間軸。
+
+Tracing is opt-in: renderers take ``tracer=None`` and only touch the tracer
+behind an ``if tracer`` check, so untraced builds run the same code as before.
+Each process records into its own :class:`Tracer`; events carry the process
+id and wall-clock based microsecond timestamps, so event lists coming back
+from worker processes can simply be concatenated into one trace.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+# 每張投影片 / 每頁 / 每張證書一個的 span，摘要會另外列出其中最慢的幾個
+PER_ITEM_SPANS = frozenset({
+    "pptx.slide", "pdf.slide", "pdf.page", "html.slide",
+    "cert.draw", "cert.save", "cert.write", "svg.render", "svg.write",
+})
+
+_track_ids = itertools.count(1)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self.args
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add_span(self.name, self.start, end - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """Collects Chrome trace events (complete spans and counters) for one process.
+
+    ``with tracer.span("slide", index=3) as args:`` times the block; values put
+    into ``args`` inside the block (shape counts, bytes written…) end up on
+    the event. ``tracer.count(name, n)`` keeps running totals.
+    """
+
+    def __init__(self, name=None):
+        # 每個 Tracer 是時間軸上的一條 track；同一個 worker 依序建置多個檔案時也分得開
+        self.pid = os.getpid()
+        self.tid = next(_track_ids)
+        self.events = []
+        self.counters = {}
+        # perf_counter 只在單一 process 內有意義，換算成 epoch 微秒讓多個 worker 的事件對得上
+        self._offset = time.time_ns() - time.perf_counter_ns()
+        if name:
+            self.events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": self.tid,
+                                "args": {"name": name}})
+
+    def span(self, name, **args):
+        return _Span(self, name, args)
+
+    def add_span(self, name, start_ns, duration_ns, args=None):
+        """Record a span measured elsewhere (``start_ns`` from ``time.perf_counter_ns()``)."""
+        self.events.append({
+            "name": name, "ph": "X", "pid": self.pid, "tid": self.tid,
+            "ts": (start_ns + self._offset) / 1000, "dur": duration_ns / 1000,
+            "args": args or {},
+        })
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def finish(self):
+        """Return the events, with the counter totals appended as counter events."""
+        if self.counters:
+            ts = (time.perf_counter_ns() + self._offset) / 1000
+            self.events.append({"name": "totals", "ph": "C", "pid": self.pid, "tid": self.tid, "ts": ts,
+                                "args": dict(self.counters)})
+            self.counters = {}
+        return self.events
+
+
+def write_chrome_trace(path, events, metadata=None):
+    """Write *events* as a Chrome trace-event JSON file."""
+    trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+    if metadata:
+        trace["otherData"] = metadata
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(trace, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_chrome_trace(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["traceEvents"] if isinstance(data, dict) else data
+
+
+def summarize(events):
+    """Per-stage rows ``(name, count, total_ms, mean_ms, max_ms, max_args)`` sorted by total time,
+    plus the summed counter totals."""
+    stages = {}
+    totals = {}
+    for event in events:
+        if event["ph"] == "X":
+            row = stages.setdefault(event["name"], [0, 0.0, -1.0, None])
+            row[0] += 1
+            row[1] += event["dur"]
+            if event["dur"] > row[2]:
+                row[2], row[3] = event["dur"], event.get("args")
+        elif event["ph"] == "C":
+            for name, value in event["args"].items():
+                totals[name] = totals.get(name, 0) + value
+    rows = [
+        (name, n, total / 1000, total / n / 1000, worst / 1000, args)
+        for name, (n, total, worst, args) in stages.items()
+    ]
+    rows.sort(key=lambda r: r[2], reverse=True)
+    return rows, totals
+
+
+def slowest(events, top=5, names=None):
+    """The *top* longest individual spans, optionally restricted to *names*."""
+    spans = [e for e in events if e["ph"] == "X" and (names is None or e["name"] in names)]
+    return sorted(spans, key=lambda e: e["dur"], reverse=True)[:top]
+
+
+def _describe(args):
+    if not args:
+        return ""
+    return ", ".join(f"{k}={v}" for k, v in args.items() if not isinstance(v, (dict, list)))[:70]
+
+
+def _size(value):
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+
+
+def print_summary(events, top=5):
+    rows, totals = summarize(events)
+    if not rows:
+        print("⚠️  Trace contains no spans")
+        return
+    print(f"{'stage':<22} {'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}  slowest")
+    for name, n, total, mean, worst, args in rows:
+        print(f"{name:<22} {n:>7} {total:10.1f} {mean:9.2f} {worst:9.2f}  {_describe(args)}")
+    if totals:
+        print("   " + "  ".join(
+            f"{name} {_size(value) if name.endswith('bytes') else value}" for name, value in sorted(totals.items())
+        ))
+
+    # 最慢的單張投影片 / 頁面，通常就是建置突然變慢的原因
+    worst = slowest(events, top, PER_ITEM_SPANS)
+    if len(worst) > 1:
+        tracks = {(e["pid"], e["tid"]): e["args"]["name"] for e in events if e["name"] == "thread_name"}
+        print(f"🐢 Slowest {len(worst)} slides / pages:")
+        for e in worst:
+            track = tracks.get((e["pid"], e["tid"]), "")
+            print(f"   {e['dur'] / 1000:9.2f} ms  {track:<15} {e['name']:<11} {_describe(e.get('args'))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the stage summary of a Chrome trace written with --trace")
+    parser.add_argument("trace", help="trace JSON file")
+    parser.add_argument("--top", type=int, default=5, help="slowest slides / pages to list")
+    args = parser.parse_args(argv)
+    print_summary(load_chrome_trace(args.trace), args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,438 @@
+"""
+證書驗證函式庫 - 解碼後的 tokenURI metadata 與 certificates 結構放在行程內 LRU / TTL 快取
+
+    python scripts/verifier.py show 42 --repeat 100         # 第一次讀鏈，之後 0 次 RPC
+    python scripts/verifier.py watch 1-50                   # 追蹤事件，失效的 token 重新讀取並印出
+    python scripts/verifier.py bench --count 10000
+
+每次 tokenURI 都會讓節點重跑 generateMetadata 與 Base64，客戶端再解一次
+Base64 + JSON。證書一經發行 metadata 就不會再變，所以驗證頁面只需要在
+第一次查看時讀鏈 (tokenURI、certificates、ownerOf 打包成一個 JSON-RPC batch)，
+之後熱門證書直接從快取回應。
+
+* Transfer 事件 (含燒毀) 讓該 token 的快取失效
+* updateCertificateImage 沒有事件，改掃描區塊中呼叫合約的交易；同一類型的快取全部失效
+* 失效由持有快取的 ``CertificateVerifier`` 自己的 ``CacheInvalidator`` 處理 (``follow=``)；
+  讀 latest 時同一個 batch 帶上 eth_blockNumber，比該區塊更新的失效已套用時不寫入快取
+* ``stats()`` 提供 hits / misses / evictions / invalidations 計數
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from chain import (
+    SELECTORS,
+    TRANSFER_TOPIC,
+    CertificateContract,
+    RpcError,
+    block_number,
+    decode_certificate,
+    decode_string,
+    default_contract_address,
+    default_rpc_url,
+    encode_uint256,
+    get_logs,
+    parse_token_ids,
+    record_to_json,
+    shared_client,
+)
+from token_metadata import decode_token_uri
+
+DEFAULT_MAX_SIZE = 10000
+DEFAULT_TTL = 3600.0
+UPDATE_IMAGE_PREFIX = "0x" + SELECTORS["updateCertificateImage"]
+
+
+class CachedCertificate:
+    """One token as the verifier shows it. Shared between callers: treat as read-only."""
+
+    __slots__ = ("token_id", "metadata", "record", "owner", "block", "read_at", "expires")
+
+    def __init__(self, token_id, metadata, record, owner, block=None, expires=None, read_at=None):
+        self.token_id = token_id
+        self.metadata = metadata    # 解碼後的 tokenURI JSON
+        self.record = record        # certificates(tokenId) 的 CertificateRecord
+        self.owner = owner
+        self.block = block          # 讀取時指定的區塊；None 表示當時的 latest
+        self.read_at = block if read_at is None else read_at   # 讀到的狀態不早於這個區塊
+        self.expires = expires
+
+    def to_json(self):
+        return {"tokenId": self.token_id, "owner": self.owner, "block": self.block,
+                "metadata": self.metadata, "certificate": record_to_json(self.record)}
+
+
+class MetadataCache:
+    """Bounded LRU of :class:`CachedCertificate` keyed by (contract, tokenId, block).
+
+    A lookup pinned to block N only hits an entry read at exactly N; owner and
+    image can change between blocks, so nothing read elsewhere is reused. An
+    unpinned lookup hits the latest entry, which invalidation keeps current:
+    a latest read is dropped at ``put`` when the token (or its type) was
+    invalidated for a block newer than ``read_at``, since the read may have
+    raced the event. Pinned entries describe a fixed block and are never
+    invalidated. Entries older than *ttl* seconds count as misses
+    (``ttl=None`` keeps them until evicted or invalidated). Thread-safe.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        # 最近的失效區塊：(contract, tokenId) → 區塊，超過 max_size 時最舊的併入 _invalidated_floor
+        self._invalidated = OrderedDict()
+        self._invalidated_floor = -1
+        self._type_invalidated = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, contract, token_id, block=None):
+        key = (contract.lower(), int(token_id), block)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires is not None and entry.expires <= self.clock():
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _is_stale(self, contract, entry):
+        invalidated = max(
+            self._invalidated.get((contract, entry.token_id), self._invalidated_floor),
+            self._type_invalidated.get((contract, entry.record.cert_type), -1),
+        )
+        # 不知道讀到哪個區塊時，只要有過失效就不採用
+        return invalidated > (-1 if entry.read_at is None else entry.read_at)
+
+    def put(self, contract, entry):
+        """Cache *entry*; a latest read older than an applied invalidation is dropped (returns False)."""
+        if self.ttl is not None:
+            entry.expires = self.clock() + self.ttl
+        contract = contract.lower()
+        with self._lock:
+            if entry.block is None and self._is_stale(contract, entry):
+                self.stale_puts += 1
+                return False
+            self._entries[(contract, entry.token_id, entry.block)] = entry
+            self._entries.move_to_end((contract, entry.token_id, entry.block))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, contract, token_id, block=None):
+        """Drop one token's latest entry; returns True if it was cached.
+
+        *block* is where the change happened: in-flight reads of an older
+        block are refused by :meth:`put` afterwards.
+        """
+        key = (contract.lower(), int(token_id))
+        with self._lock:
+            if block is not None and block > self._invalidated.get(key, -1):
+                self._invalidated[key] = block
+                self._invalidated.move_to_end(key)
+                while len(self._invalidated) > self.max_size:
+                    _, oldest = self._invalidated.popitem(last=False)
+                    self._invalidated_floor = max(self._invalidated_floor, oldest)
+            if self._entries.pop((*key, None), None) is None:
+                return False
+            self.invalidations += 1
+            return True
+
+    def invalidate_type(self, contract, cert_type, block=None):
+        """Drop every cached latest token of *cert_type*; returns their ids."""
+        contract = contract.lower()
+        with self._lock:
+            if block is not None:
+                key = (contract, cert_type)
+                self._type_invalidated[key] = max(self._type_invalidated.get(key, -1), block)
+            keys = [k for k, e in self._entries.items()
+                    if k[0] == contract and k[2] is None and e.record.cert_type == cert_type]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+        return [k[1] for k in keys]
+
+    def apply_log(self, log):
+        """Invalidate from a raw ``eth_getLogs`` entry; returns the affected token ids."""
+        topics = log["topics"]
+        if topics and topics[0] == TRANSFER_TOPIC:
+            token_id = int(topics[3], 16)
+            self.invalidate(log["address"], token_id, int(log["blockNumber"], 16))
+            return [token_id]
+        return []
+
+    def apply_transaction(self, tx):
+        """Invalidate from an ``updateCertificateImage`` transaction; returns the affected token ids.
+
+        The contract copies the type image into each certificate at mint time,
+        so this is conservative: the whole type is re-read on next view.
+        """
+        if not tx.get("to") or not tx.get("input", "").startswith(UPDATE_IMAGE_PREFIX):
+            return []
+        block = int(tx["blockNumber"], 16) if tx.get("blockNumber") else None
+        return self.invalidate_type(tx["to"], int(tx["input"][10:74], 16), block)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stalePuts": self.stale_puts,
+        }
+
+
+class CertificateVerifier:
+    """Cached ``tokenURI`` + ``certificates`` + ``ownerOf`` reads for one contract.
+
+    With ``follow=seconds`` the verifier owns a :class:`CacheInvalidator` on
+    its cache and applies new blocks before a lookup whenever the last poll
+    is older than that; without it latest entries live until TTL or eviction.
+    """
+
+    def __init__(self, contract, cache=None, follow=None, from_block=None):
+        self.contract = contract
+        self.cache = cache if cache is not None else MetadataCache()
+        self.rpc_calls = 0
+        self.follow = follow
+        self.invalidator = None
+        if follow is not None:
+            self.invalidator = CacheInvalidator(self.cache, contract.address, contract.rpc_url, from_block)
+
+    def fetch(self, token_id, block=None):
+        """Read one token from chain (one JSON-RPC batch), bypassing the cache."""
+        arg = (encode_uint256(token_id),)
+        calls = [("tokenURI", arg), ("certificates", arg), ("ownerOf", arg)]
+        if block is None:
+            self.rpc_calls += len(calls) + 1
+            read_at, (uri, struct, owner) = self.contract.call_mixed_at_head(calls)
+        else:
+            self.rpc_calls += len(calls)
+            read_at, (uri, struct, owner) = block, self.contract.call_mixed(calls, block)
+        return CachedCertificate(
+            int(token_id),
+            decode_token_uri(decode_string(uri)),
+            decode_certificate(struct, int(token_id)),
+            "0x" + owner[12:32].hex(),
+            block,
+            read_at=read_at,
+        )
+
+    def lookup(self, token_id, block=None):
+        """The token's decoded metadata, struct and owner; chain reads only on a cache miss.
+
+        Raises :class:`chain.RpcError` for tokens that do not exist (not cached).
+        """
+        if self.invalidator is not None and block is None:
+            self.invalidator.poll_every(self.follow)
+        entry = self.cache.get(self.contract.address, token_id, block)
+        if entry is None:
+            entry = self.fetch(token_id, block)
+            self.cache.put(self.contract.address, entry)
+        return entry
+
+    def metadata(self, token_id, block=None):
+        return self.lookup(token_id, block).metadata
+
+    def stats(self):
+        return dict(self.cache.stats(), rpcCalls=self.rpc_calls)
+
+
+class CacheInvalidator:
+    """Polls new blocks for Transfer logs and ``updateCertificateImage`` transactions."""
+
+    def __init__(self, cache, address, rpc_url=None, from_block=None, chunk_size=500):
+        self.cache = cache
+        self.address = address
+        self.rpc_url = rpc_url or default_rpc_url()
+        self.chunk_size = chunk_size
+        self.last_block = (block_number(self.rpc_url) if from_block is None else from_block) - 1
+        self.transfers = 0
+        self.image_updates = 0
+        self.polled = None
+        self._polling = threading.Lock()
+
+    def _update_transactions(self, start, end):
+        # 沒有事件可查，只能讀區塊內容；整段區塊打包成 batch
+        blocks = shared_client(self.rpc_url).batch(
+            [("eth_getBlockByNumber", [hex(n), True]) for n in range(start, end + 1)]
+        )
+        address = self.address.lower()
+        return [
+            tx for block in blocks if block
+            for tx in block["transactions"]
+            if (tx.get("to") or "").lower() == address and tx["input"].startswith(UPDATE_IMAGE_PREFIX)
+        ]
+
+    def poll(self, to_block=None):
+        """Apply everything up to *to_block* (default: chain head); returns invalidated token ids."""
+        head = block_number(self.rpc_url) if to_block is None else to_block
+        touched = []
+        while self.last_block < head:
+            start = self.last_block + 1
+            end = min(start + self.chunk_size - 1, head)
+            for log in get_logs(self.rpc_url, self.address, [TRANSFER_TOPIC], start, end):
+                if not log.get("removed"):
+                    touched.extend(self.cache.apply_log(log))
+                    self.transfers += 1
+            for tx in self._update_transactions(start, end):
+                touched.extend(self.cache.apply_transaction(tx))
+                self.image_updates += 1
+            self.last_block = end
+        self.polled = time.monotonic()
+        return touched
+
+    def poll_every(self, interval):
+        """:meth:`poll` if the last one is older than *interval* seconds and no other thread is polling."""
+        if self.polled is not None and time.monotonic() - self.polled < interval:
+            return []
+        if not self._polling.acquire(blocking=False):
+            return []
+        try:
+            return self.poll()
+        finally:
+            self._polling.release()
+
+
+def run_benchmark(count=10000, views=100000):
+    """Decode cost of a tokenURI versus a cache hit, on locally encoded tokenURIs (no chain needed)."""
+    import random
+
+    from certificates import CertificateRecord
+    from token_metadata import token_uri
+
+    address = "0x" + "ab" * 20
+    records = [
+        CertificateRecord(i % 4, f"Recipient {i}", "Blockchain Course", "Congratulations!",
+                          1759536000 + i, f"ipfs://bafy{i:040d}/certificate.svg", i)
+        for i in range(1, count + 1)
+    ]
+    uris = [token_uri(record) for record in records]
+    rng = random.Random(0)
+    # 少數熱門證書佔大部分瀏覽 (Zipf 分布)
+    weights = [1 / rank for rank in range(1, count + 1)]
+    views_ids = rng.choices(range(1, count + 1), weights, k=views)
+
+    started = time.perf_counter()
+    for token_id in views_ids:
+        decode_token_uri(uris[token_id - 1])
+    decode_time = time.perf_counter() - started
+
+    cache = MetadataCache(max_size=max(1, count // 10), ttl=None)
+    started = time.perf_counter()
+    for token_id in views_ids:
+        entry = cache.get(address, token_id)
+        if entry is None:
+            metadata = decode_token_uri(uris[token_id - 1])
+            cache.put(address, CachedCertificate(token_id, metadata, records[token_id - 1], None))
+    cached_time = time.perf_counter() - started
+    return decode_time, cached_time, cache.stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cached certificate verification reads")
+    parser.add_argument("--contract", help="contract address (default: $CONTRACT_ADDRESS)")
+    parser.add_argument("--rpc", help="JSON-RPC URL (default: $RPC_URL, $SEPOLIA_RPC_URL or localhost)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("show", help="print decoded metadata, struct and owner of tokens")
+    s.add_argument("ids", help="token ids, e.g. 42 or 1-10")
+    s.add_argument("--block", type=int, help="read at this block instead of latest")
+    s.add_argument("--repeat", type=int, default=1, help="look every id up this many times")
+    s.add_argument("--quiet", action="store_true", help="only print the cache counters")
+    s.add_argument("--follow", type=float, metavar="SECONDS",
+                   help="apply Transfer / updateCertificateImage invalidations at most this often between lookups")
+
+    w = sub.add_parser("watch", help="keep tokens cached, follow Transfer / updateCertificateImage and re-read them")
+    w.add_argument("ids", nargs="?", help="token ids to keep cached and re-read when invalidated, e.g. 1-50")
+    w.add_argument("--from-block", default="latest", help="first block to scan (default: latest)")
+    w.add_argument("--interval", type=float, default=12.0, help="poll interval in seconds")
+
+    b = sub.add_parser("bench", help="decode-per-view vs LRU cache on synthetic tokenURIs")
+    b.add_argument("--count", type=int, default=10000, help="distinct certificates")
+    b.add_argument("--views", type=int, default=100000, help="page views (Zipf-distributed)")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        decode_time, cached_time, stats = run_benchmark(args.count, args.views)
+        print(f"⏱️  每次解碼 tokenURI: {decode_time:.3f}s ({args.views / decode_time:,.0f} views/s)")
+        print(f"⚡ LRU 快取 ({stats['maxSize']} 筆): {cached_time:.3f}s ({args.views / cached_time:,.0f} views/s), "
+              f"命中率 {stats['hitRate']:.1%}, 淘汰 {stats['evictions']}")
+        print(f"📉 對鏈上驗證頁面而言，{stats['hits']:,} 次命中省下 {stats['hits'] * 3:,} 個 eth_call")
+        return 0
+
+    address = args.contract or default_contract_address()
+    if not address:
+        parser.error("請先設定 CONTRACT_ADDRESS 環境變數或指定 --contract")
+    contract = CertificateContract(address, args.rpc)
+
+    if args.command == "show":
+        verifier = CertificateVerifier(contract, follow=args.follow)
+        token_ids = parse_token_ids(args.ids)
+        try:
+            for _ in range(args.repeat):
+                entries = [verifier.lookup(t, args.block) for t in token_ids]
+        except RpcError as e:
+            print(f"❌ RPC 錯誤: {e}")
+            return 1
+        if not args.quiet:
+            for entry in entries:
+                print(json.dumps(entry.to_json(), ensure_ascii=False))
+        print(f"📊 {json.dumps(verifier.stats())}", file=sys.stderr)
+        return 0
+
+    from_block = None if args.from_block == "latest" else int(args.from_block)
+    # 失效與讀取共用同一個快取：watch 自己持有快取並重新讀取失效的 token
+    verifier = CertificateVerifier(contract, follow=args.interval, from_block=from_block)
+    invalidator = verifier.invalidator
+    watched = set(parse_token_ids(args.ids)) if args.ids else set()
+    try:
+        for token_id in sorted(watched):
+            verifier.lookup(token_id)
+    except RpcError as e:
+        print(f"❌ RPC 錯誤: {e}")
+        return 1
+    print(f"👀 快取 {len(watched)} 個 token，從區塊 {invalidator.last_block + 1} 追蹤 Transfer / updateCertificateImage...")
+    while True:
+        transfers, updates = invalidator.transfers, invalidator.image_updates
+        touched = sorted(set(invalidator.poll()))
+        if touched or invalidator.image_updates > updates:
+            print(f"♻️  至區塊 {invalidator.last_block}: {invalidator.transfers - transfers} 筆 Transfer, "
+                  f"{invalidator.image_updates - updates} 筆 updateCertificateImage → token {touched[:20]}")
+        for token_id in watched.intersection(touched):
+            try:
+                print(json.dumps(verifier.lookup(token_id).to_json(), ensure_ascii=False))
+            except RpcError as e:
+                print(f"🔥 token {token_id} 已無法讀取 (燒毀?): {e}")
+        try:
+            time.sleep(args.interval)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+pytest 共用設定 - 本地 hardhat 節點與合約部署
+
+    npx hardhat compile
+    npx hardhat node                    # 另開一個終端機
+    python -m pytest tests
+
+    HARDHAT_RPC_URL   hardhat 節點 (預設 http://127.0.0.1:8545)
+
+需要鏈的測試使用 hardhat fixture：沒有 hardhat 節點或尚未編譯合約時會略過。
+每個測試前後以 evm_snapshot / evm_revert 還原鏈狀態，並恢復自動出塊。
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "presentation"))
+
+from chain import RpcClient  # scripts/ 與 presentation/ 需先加入 sys.path
+
+HARDHAT_RPC_URL = os.environ.get("HARDHAT_RPC_URL", "http://127.0.0.1:8545")
+ARTIFACT = ROOT / "artifacts" / "contracts" / "EternalDigitalHonorCertificate.sol" / "EternalDigitalHonorCertificate.json"
+
+
+class Hardhat:
+    """Helpers over a running ``npx hardhat node``."""
+
+    def __init__(self, client):
+        self.client = client
+        self.url = client.url
+        self.accounts = client.call("eth_accounts", [])
+
+    def call(self, method, *params):
+        return self.client.call(method, list(params))
+
+    def block_number(self):
+        return int(self.call("eth_blockNumber"), 16)
+
+    def mine(self, blocks=1):
+        for _ in range(blocks):
+            self.call("evm_mine")
+
+    def snapshot(self):
+        return self.call("evm_snapshot")
+
+    def revert(self, snapshot_id):
+        assert self.call("evm_revert", snapshot_id)
+
+    def set_automine(self, enabled):
+        self.call("evm_setAutomine", enabled)
+
+    def set_interval_mining(self, interval_ms):
+        self.call("evm_setIntervalMining", interval_ms)
+
+    def send(self, to, data, sender=None, gas=None):
+        tx = {"from": sender or self.accounts[0], "data": data}
+        if to:
+            tx["to"] = to
+        if gas:
+            tx["gas"] = hex(gas)
+        return self.call("eth_sendTransaction", tx)
+
+    def wait(self, tx_hash, timeout=30):
+        deadline = time.time() + timeout
+        while True:
+            receipt = self.call("eth_getTransactionReceipt", tx_hash)
+            if receipt:
+                return receipt
+            if time.time() > deadline:
+                raise TimeoutError(f"{tx_hash} 沒有上鏈")
+            time.sleep(0.05)
+
+    def transact(self, to, data, sender=None):
+        receipt = self.wait(self.send(to, data, sender))
+        assert int(receipt["status"], 16) == 1, receipt
+        return receipt
+
+    def deploy(self):
+        with open(ARTIFACT, encoding="utf-8") as f:
+            bytecode = json.load(f)["bytecode"]
+        return self.wait(self.send(None, bytecode, gas=8_000_000))["contractAddress"]
+
+
+@pytest.fixture(scope="session")
+def hardhat_node():
+    client = RpcClient(HARDHAT_RPC_URL, retries=0, timeout=10)
+    try:
+        version = client.call("web3_clientVersion", [])
+    except Exception as e:
+        pytest.skip(f"沒有 hardhat 節點 ({HARDHAT_RPC_URL}): {e}")
+    if "hardhat" not in version.lower():
+        pytest.skip(f"{HARDHAT_RPC_URL} 不是 hardhat 節點 ({version})")
+    if not ARTIFACT.exists():
+        pytest.skip("找不到合約 artifact，請先執行 npx hardhat compile")
+    return Hardhat(client)
+
+
+@pytest.fixture
+def hardhat(hardhat_node):
+    snapshot = hardhat_node.snapshot()
+    yield hardhat_node
+    hardhat_node.set_interval_mining(0)
+    hardhat_node.set_automine(True)
+    hardhat_node.revert(snapshot)
+
+
+@pytest.fixture
+def contract(hardhat):
+    """Address of a freshly deployed certificate contract, owned by hardhat account #0."""
+    return hardhat.deploy()
@@ -0,0 +1,72 @@
+"""benchmarks.py：合成簡報、案例規劃、基準比較的門檻與雜訊下限，以及子程序實際跑一輪小規模案例"""
+
+import json
+
+import pytest
+
+from benchmarks import CASES, SIZE_LIMITS, compare, main, plan, run_case, synthetic_deck, synthetic_records
+
+
+@pytest.mark.parametrize("lang", ["zh", "en"])
+def test_synthetic_deck_keeps_cover_and_closing(lang):
+    deck = synthetic_deck(lang, 30)
+    assert len(deck.slides) == 30
+    assert deck.slides[0].layout == "cover" and deck.slides[-1].layout == "closing"
+    assert len({slide.title for slide in deck.slides}) == 30
+
+
+def test_synthetic_records_are_deterministic():
+    records = synthetic_records(9)
+    assert records == synthetic_records(9)
+    assert [r.token_id for r in records] == list(range(1, 10))
+    assert {r.cert_type for r in records} == {0, 1, 2, 3}
+
+
+def test_plan_filters_prefixes_and_size_limits():
+    assert plan("quick", ["deck.pdf"]) == [("deck.pdf.zh", 10), ("deck.pdf.zh", 100),
+                                           ("deck.pdf.en", 10), ("deck.pdf.en", 100)]
+    nightly = plan("nightly", ["cert.pdf"])
+    assert ("cert.pdf.files", 100_000) not in nightly and ("cert.pdf.merged", 100_000) in nightly
+    assert max(size for name, size in nightly if name == "cert.pdf.files") == SIZE_LIMITS["cert.pdf.files"]
+    assert len(plan("quick")) == 2 * len(CASES)
+
+
+def result(case, wall, imported=0.1, rss=100.0, size=10):
+    return {"case": case, "size": size, "wall": wall, "stages": {"import": imported}, "peakRssMb": rss}
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"results": [result("a", 1.0), result("b", 1.0), result("c", 0.01), result("d", 1.0, rss=100),
+                            result("e", 1.0, imported=0.5), result("f", 1.0), {"case": "g", "size": 10, "error": "x"}]}
+    current = {"results": [
+        result("a", 1.10),                 # 10%：在門檻內
+        result("b", 1.30),                 # 30%：退步
+        result("c", 0.04),                 # 變成四倍但只差 0.03 秒：雜訊
+        result("d", 1.0, rss=130),         # RSS +30 MB
+        result("e", 1.0, imported=0.7),    # import 變慢
+        {"case": "f", "size": 10, "error": "boom"},
+        result("g", 1.0),                  # 基準是錯誤，不比較
+        result("a", 9.0, size=99),         # 基準沒有這個規模
+    ]}
+    rows, regressions = compare(current, baseline, threshold=0.15)
+    assert [r["case"] for r, _, _ in rows] == ["a", "b", "c", "d", "e"]
+    assert {r["case"]: problems for r, _, problems in regressions} == {"b": ["wall"], "d": ["rss"], "e": ["import"]}
+
+
+def test_cases_run_in_a_subprocess():
+    svg = run_case("cert.svg", 3)
+    assert "error" not in svg, svg
+    assert svg["case"] == "cert.svg" and set(svg["stages"]) == {"import", "records", "render"}
+    deck = run_case("deck.html.en", 10)
+    assert "error" not in deck, deck
+    assert deck["wall"] > 0 and {"deck", "render", "write"} <= set(deck["stages"])
+
+
+def test_cli_run_and_compare(tmp_path, capsys):
+    output = str(tmp_path / "bench.json")
+    assert main(["run", "--only", "cert.metadata", "--sizes", "2", "--repeat", "1", "-o", output]) == 0
+    document = json.loads(open(output, encoding="utf-8").read())
+    assert [(r["case"], r["size"]) for r in document["results"]] == [("cert.metadata", 2)]
+    assert main(["compare", output, output]) == 0
+    assert main(["run", "--only", "nothing"]) == 2
+    assert "沒有超過" in capsys.readouterr().out
@@ -0,0 +1,50 @@
+"""build_cache.py：超過容量時依最近使用時間淘汰片段、命中會更新使用時間、建置後自動淘汰"""
+
+import os
+import time
+
+import build_cache
+from build import build_one
+from build_cache import SlideCache
+
+
+def put(cache, name, size, age):
+    key = cache.key(name)
+    cache.put(key, b"x" * size)
+    when = time.time() - age
+    os.utime(cache._path(key), (when, when))
+    return key
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = SlideCache(str(tmp_path), "html", "salt", max_bytes=250)
+    keys = [put(cache, f"slide {i}", 100, age=100 - i) for i in range(4)]   # slide 0 最舊
+    assert cache.get(keys[0]) is not None                                  # 命中後變成最新
+    assert cache.prune() == 2
+    assert [cache.get(k) is not None for k in keys] == [True, False, False, True]
+    assert cache.stats()["pruned"] == 2
+    assert cache.prune() == 0
+
+
+def test_prune_keeps_fresh_tmp_files_and_drops_stale_ones(tmp_path):
+    cache = SlideCache(str(tmp_path), "html", "salt", max_bytes=0)
+    put(cache, "slide", 10, age=0)
+    fresh, stale = os.path.join(cache.dir, "a.tmp"), os.path.join(cache.dir, "b.tmp")
+    for path in (fresh, stale):
+        open(path, "wb").write(b"partial")
+    old = time.time() - build_cache.STALE_TMP_SECONDS - 60
+    os.utime(stale, (old, old))
+    assert cache.prune() == 1
+    assert os.listdir(cache.dir) == ["a.tmp"]
+
+
+def test_build_prunes_the_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    os.makedirs(cache_dir / "html")
+    for i in range(3):
+        (cache_dir / "html" / f"{i:064x}.bin").write_bytes(b"old" * 1000)
+        os.utime(cache_dir / "html" / f"{i:064x}.bin", (0, 0))
+    monkeypatch.setattr(build_cache, "DEFAULT_MAX_BYTES", 1)
+    result = build_one("html", "en", str(tmp_path), cache_dir=str(cache_dir))
+    assert result.error is None and result.cache_misses > 0
+    assert os.listdir(cache_dir / "html") == []
@@ -0,0 +1,57 @@
+"""build_daemon.py 只接受帶有擁有者 token 的請求"""
+
+import json
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from build_daemon import BuildDaemon, request, token_path
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        address = s.getsockname()
+    server = BuildDaemon(address, jobs=1)
+    server.bind()
+    server.thread = threading.Thread(target=server.serve_forever)
+    server.thread.start()
+    yield server
+    server.stopping = True
+    server.thread.join()
+
+
+def raw_request(address, message):
+    with socket.create_connection(address) as sock:
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            return json.loads(reader.readline())
+
+
+def test_token_file_is_private(daemon):
+    path = token_path(daemon.address)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert request({"command": "ping"}, daemon.address)["pid"] == os.getpid()
+
+
+def test_requests_without_the_token_are_refused(daemon, tmp_path):
+    target = tmp_path / "elsewhere"
+    build = {"command": "build", "formats": ["html"], "langs": ["en"], "out_dir": str(target)}
+    assert raw_request(daemon.address, build) == {"error": "unauthorized"}
+    assert raw_request(daemon.address, dict(build, token="0" * 64)) == {"error": "unauthorized"}
+    assert raw_request(daemon.address, {"command": "stop"}) == {"error": "unauthorized"}
+    assert not target.exists()
+    assert daemon.builds == 0 and not daemon.stopping
+
+
+def test_stop_removes_the_token(daemon):
+    path = token_path(daemon.address)
+    assert request({"command": "stop"}, daemon.address) == {"stopped": True}
+    daemon.thread.join(timeout=10)
+    assert not os.path.exists(path)
+    assert request({"command": "ping"}, daemon.address) is None
@@ -0,0 +1,52 @@
+"""certificate_pdf.py：逐張 PDF 與多程序輸出相同、串流合併檔每頁的文字與 ReportLab 逐張輸出相同"""
+
+import filecmp
+import os
+
+import pytest
+
+from certificate_pdf import certificate_filename, render_certificate, render_certificates, render_merged
+from certificates import CertificateRecord, coerce_record
+
+pypdf = pytest.importorskip("pypdf")
+
+RECORDS = [{"certType": i % 4, "recipientName": f"王小明 {i}", "issuerName": "區塊鏈課程 (Blockchain)",
+            "issueDate": 1759536000 + 86400 * i, "customMessage": "很長的訊息" * 30 if i == 2 else "",
+            "tokenId": i + 1 if i % 2 else None} for i in range(6)]
+
+
+def page_lines(page):
+    return [line.strip() for line in page.extract_text().splitlines() if line.strip()]
+
+
+def test_single_certificate_text(tmp_path):
+    record = CertificateRecord(3, "陳小美", "數位學習平台", "成功完成區塊鏈開發課程", 1759536000, token_id=42)
+    path = render_certificate(record, str(tmp_path / "one.pdf"))
+    reader = pypdf.PdfReader(path, strict=True)
+    assert len(reader.pages) == 1
+    lines = page_lines(reader.pages[0])
+    for text in ("課程完成證明", "Course Completion Certificate", "陳小美", "成功完成區塊鏈開發課程",
+                 "發行者: 數位學習平台", "發行日期: 2025/10/4", "Token ID #42"):
+        assert text in lines
+
+
+def test_filenames_and_pool_output_match_serial(tmp_path):
+    serial = render_certificates(RECORDS, str(tmp_path / "serial"))
+    pooled = render_certificates(RECORDS, str(tmp_path / "pool"), workers=2, chunk_size=2)
+    names = [os.path.basename(p) for p in serial]
+    assert names == [certificate_filename(coerce_record(r), i) for i, r in enumerate(RECORDS)]
+    assert names[:2] == ["certificate-000000.pdf", "certificate-2.pdf"]
+    assert [os.path.basename(p) for p in pooled] == names
+    assert all(filecmp.cmp(a, b, shallow=False) for a, b in zip(serial, pooled))
+
+
+def test_merged_pages_match_single_certificates(tmp_path):
+    singles = render_certificates(RECORDS, str(tmp_path / "files"))
+    merged = str(tmp_path / "merged.pdf")
+    assert render_merged(iter(RECORDS), merged, resume=False, group_size=4) == len(RECORDS)
+
+    reader = pypdf.PdfReader(merged, strict=True)
+    assert len(reader.pages) == len(RECORDS)
+    for page, single in zip(reader.pages, singles):
+        assert page_lines(page) == page_lines(pypdf.PdfReader(single).pages[0])
+    assert not os.path.exists(merged + ".xref") and not os.path.exists(merged + ".checkpoint.json")
@@ -0,0 +1,72 @@
+"""certificate_svg.py 預先編譯的模板對照 JS createCertificateSVG：範例證書逐位元組相同、跳脫與多程序輸出"""
+
+import shutil
+
+import pytest
+
+from certificate_svg import CompiledTemplate, SvgRenderer, render_svg, render_to_dir, verify_against_js
+from conftest import ROOT
+from tracing import Tracer
+
+SAMPLES_DIR = ROOT / "images" / "certificates"
+SAMPLE_DATE = "2025/10/13"   # generate-certificate-images.js 產生範例時的日期
+
+# generate-certificate-images.js 的 sampleData
+SAMPLES = {
+    "blockchain-pioneer-sample.svg": (0, "張小明", "區塊鏈學院", "在區塊鏈技術領域展現卓越的先驅精神"),
+    "eternal-friendship-sample.svg": (1, "李小華", "好友團體", "友誼長存，情深如海，此情不渝"),
+    "web3-citizen-sample.svg": (2, "王小強", "Web3 社群", "積極參與去中心化生態建設"),
+    "course-completion-sample.svg": (3, "陳小美", "數位學習平台", "成功完成區塊鏈開發課程"),
+}
+
+
+def record(cert_type, name, issuer, message, issue_date=SAMPLE_DATE, **extra):
+    return {"certType": cert_type, "recipientName": name, "issuerName": issuer,
+            "customMessage": message, "issueDate": issue_date, **extra}
+
+
+@pytest.mark.parametrize("filename", SAMPLES)
+def test_compiled_template_reproduces_js_samples(filename):
+    expected = (SAMPLES_DIR / filename).read_text(encoding="utf-8")
+    assert render_svg(record(*SAMPLES[filename])) == expected
+
+
+def test_template_placeholders_round_trip():
+    template = (SAMPLES_DIR / "template.svg").read_text(encoding="utf-8")
+    assert render_svg(record(0, "[接收者姓名]", "[發行者姓名]", "[自定義訊息]")) == template
+
+
+def test_template_without_a_slot_is_rejected():
+    template = (SAMPLES_DIR / "template.svg").read_text(encoding="utf-8")
+    with pytest.raises(ValueError, match="recipient_name"):
+        CompiledTemplate.parse(template.replace("[接收者姓名]", "Alice"))
+
+
+def test_escape_only_changes_markup_characters():
+    value = record(2, "Tom & <Jerry>", "A&B", "")
+    escaped, raw = SvgRenderer().render(value), SvgRenderer(escape=False).render(value)
+    assert "Tom &amp; &lt;Jerry&gt;" in escaped and "A&amp;B" in escaped
+    assert "Tom & <Jerry>" in raw
+    assert escaped.replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">") == raw
+    assert "已獲得此項殊榮" in raw   # 空白訊息用 JS 的預設文字
+
+
+def test_pool_and_traced_output_match_serial(tmp_path):
+    values = [record(i % 4, f"接收者 {i}", "區塊鏈課程", "" if i % 3 else "恭喜", 1700000000 + 86400 * i,
+                     tokenId=i + 1) for i in range(25)]
+    render_to_dir(values, str(tmp_path / "serial"), workers=1, chunk_size=7)
+    render_to_dir(values, str(tmp_path / "pool"), workers=2, chunk_size=7)
+    tracer = Tracer("test")
+    assert render_to_dir(values, str(tmp_path / "traced"), tracer=tracer) == len(values)
+    for i, value in enumerate(values, 1):
+        expected = render_svg(value)
+        for variant in ("serial", "pool", "traced"):
+            assert (tmp_path / variant / f"certificate-{i}.svg").read_text(encoding="utf-8") == expected
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_matches_create_certificate_svg_in_node():
+    names = ["Alice", "王小明", "Ünïcode 😀", "  spaced  ", "多行\n訊息", "$ {x} `tick`", "[接收者姓名]"]
+    values = [record(i % 4, name, "區塊鏈課程", "" if i % 2 else f"恭喜 {name}", 1600000000 + 7777777 * i)
+              for i, name in enumerate(names)]
+    assert verify_against_js(values) == []
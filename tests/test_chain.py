@@ -0,0 +1,53 @@
+"""chain.py 的 JSON-RPC batch：缺漏或陌生 id 的回覆、hardhat 上逐筆 eth_call 對照 batch 的基準"""
+
+import pytest
+
+from chain import CertificateContract, RpcClient, RpcError, mint_for_benchmark, run_benchmark
+
+
+class ScriptedClient(RpcClient):
+    """Answers each POST with the next scripted reply function instead of a node."""
+
+    def __init__(self, *replies):
+        super().__init__("http://127.0.0.1:1", retries=2, backoff=0)
+        self.replies = list(replies)
+        self.posts = []
+
+    def _post(self, payload):
+        self.posts.append([item["method"] for item in payload])
+        return self.replies.pop(0)(payload)
+
+
+def answer(payload, skip=(), extra=()):
+    replies = [{"jsonrpc": "2.0", "id": item["id"], "result": item["method"]}
+               for item in payload if item["method"] not in skip]
+    return replies + [{"jsonrpc": "2.0", "id": request_id, "result": "stray"} for request_id in extra]
+
+
+def test_unexpected_ids_are_ignored_and_missing_slots_resent():
+    client = ScriptedClient(lambda p: answer(p, skip={"b"}, extra=[10 ** 9]), answer)
+    assert client.batch([("a", []), ("b", []), ("c", [])]) == ["a", "b", "c"]
+    assert client.posts == [["a", "b", "c"], ["b"]]
+
+
+def test_slot_without_a_reply_after_retries_is_an_error():
+    client = ScriptedClient(*[lambda p: answer(p, skip={"b"})] * 3)
+    results = client.batch([("a", []), ("b", []), ("c", [])], raise_errors=False)
+    assert results[0] == "a" and results[2] == "c"
+    assert isinstance(results[1], RpcError) and "missing reply" in str(results[1])
+    with pytest.raises(RpcError, match="missing reply"):
+        ScriptedClient(*[lambda p: answer(p, skip={"b"})] * 3).batch([("b", [])])
+
+
+def test_null_results_are_answers():
+    client = ScriptedClient(lambda p: [{"jsonrpc": "2.0", "id": item["id"], "result": None} for item in p])
+    assert client.batch([("eth_getTransactionReceipt", ["0x1"])]) == [None]
+    assert len(client.posts) == 1
+
+
+def test_batched_reads_match_one_by_one_on_hardhat(hardhat, contract):
+    reader = CertificateContract(contract, hardhat.url)
+    assert mint_for_benchmark(reader, 120) == 120
+    results = run_benchmark(reader, 120, batch_size=50, concurrency=2)
+    assert results["sequential"]["roundTrips"] == 120
+    assert results["batched"]["roundTrips"] == 3
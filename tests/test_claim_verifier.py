@@ -0,0 +1,77 @@
+"""claim_verifier.py 的結論矩陣：每種結論各一列，快照、快照 + 索引與索引三種資料來源"""
+
+import pytest
+
+from certificates import CertificateRecord
+from claim_verifier import VERDICTS, IndexSource, SnapshotSource, verify_many
+from owner_index import OwnerIndex
+from snapshot_store import CertificateSnapshot, write_snapshot
+
+ALICE = "0x" + "a1" * 20
+BOB = "0x" + "b2" * 20
+CAROL = "0x" + "c3" * 20
+
+# (address, tokenId, recipientName, certType) → 預期結論
+MATRIX = [
+    ((ALICE, 1, "alice  chen", "Blockchain Pioneer Certificate"), "valid"),   # 姓名不分大小寫與空白
+    ((ALICE, 99, "Alice Chen", ""), "not_found"),
+    ((BOB, 1, "Alice Chen", ""), "wrong_owner"),
+    ((ALICE, 1, "Alicia Chen", ""), "name_mismatch"),
+    ((BOB, 2, "Bob Lin", 3), "type_mismatch"),
+    ((ALICE[:-2], 1, "Alice Chen", ""), "bad_address"),
+    ((ALICE, "one", "Alice Chen", ""), "bad_token_id"),
+]
+
+
+@pytest.fixture
+def index():
+    index = OwnerIndex()
+    for token_id, owner, cert_type, name in ((1, ALICE, 0, "Alice Chen"), (2, BOB, 1, "Bob Lin"),
+                                             (3, CAROL, 2, "Carol Wu")):
+        index.move(token_id, owner)
+        index.issued[token_id] = {"certType": cert_type, "recipientName": name}
+    return index
+
+
+@pytest.fixture
+def snapshot(index, tmp_path):
+    records = [CertificateRecord(e["certType"], e["recipientName"], "Issuer", issue_date=1759536000, token_id=t)
+               for t, e in index.issued.items()]
+    path = str(tmp_path / "snapshot")
+    write_snapshot(records, path, index.owners)
+    return CertificateSnapshot(path)
+
+
+@pytest.fixture(params=["snapshot", "snapshot+index", "index"])
+def source(request, snapshot, index):
+    if request.param == "snapshot":
+        return SnapshotSource(snapshot)
+    if request.param == "snapshot+index":
+        return SnapshotSource(snapshot, index.owners)
+    return IndexSource(index)
+
+
+def test_matrix_covers_every_verdict():
+    assert sorted(verdict for _, verdict in MATRIX) == sorted(VERDICTS)
+
+
+def test_verdict_matrix(source):
+    table = verify_many([claim for claim, _ in MATRIX], source)
+    assert table.columns["verdict"].tolist() == [verdict for _, verdict in MATRIX]
+    assert table.counts() == {verdict: 1 for verdict in VERDICTS}
+
+
+def test_token_missing_from_index_is_not_found(snapshot, index):
+    """燒毀 (或回滾) 後索引裡沒有擁有者的 token，即使仍在快照中也不能判成 wrong_owner。"""
+    del index.owners[3]
+    table = verify_many([(CAROL, 3, "Carol Wu", ""), (BOB, 2, "Bob Lin", "")], SnapshotSource(snapshot, index.owners))
+    assert table.columns["verdict"].tolist() == ["not_found", "valid"]
+    assert table.columns["actualOwner"][0] == ""
+
+
+def test_transferred_token_uses_index_owner(snapshot, index):
+    index.move(1, CAROL)
+    claims = [(ALICE, 1, "Alice Chen", ""), (CAROL, 1, "Alice Chen", "")]
+    assert verify_many(claims, SnapshotSource(snapshot)).columns["verdict"].tolist() == ["valid", "wrong_owner"]
+    assert verify_many(claims, SnapshotSource(snapshot, index.owners)).columns["verdict"].tolist() == \
+        ["wrong_owner", "valid"]
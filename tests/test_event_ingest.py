@@ -0,0 +1,104 @@
+"""event_ingest.py 在 hardhat 上以 evm_snapshot / evm_revert 模擬鏈重組；保留範圍與基準區塊的還原規則"""
+
+import json
+
+import pytest
+
+from chain import encode_address, encode_issue_certificate, encode_uint256
+from event_ingest import DeepReorgError, EventIngestor
+
+TRANSFER_FROM = "0x23b872dd"
+
+
+def issue(hardhat, contract, to, name):
+    return hardhat.transact(contract, encode_issue_certificate(to, 0, name, "Issuer", ""))
+
+
+def test_reorg_rolls_back_and_reapplies(hardhat, contract, tmp_path):
+    alice, bob, carol = (a.lower() for a in hardhat.accounts[1:4])
+    state = str(tmp_path / "events-state.json")
+    ingestor = EventIngestor(contract, state, hardhat.url, start_block=0, reorg_depth=12)
+
+    issue(hardhat, contract, alice, "Alice")
+    ingestor.sync()
+    fork_point = ingestor.index.last_block
+    assert ingestor.index.tokens_of(alice) == [1]
+    snapshot = hardhat.snapshot()
+
+    # 之後會被重組掉的分支：#2 發給 Alice，#1 轉給 Bob
+    issue(hardhat, contract, alice, "Alice again")
+    hardhat.transact(contract, TRANSFER_FROM + encode_address(alice) + encode_address(bob) + encode_uint256(1),
+                     sender=alice)
+    hardhat.mine(2)
+    ingestor.sync()
+    orphaned_head = ingestor.index.last_block
+    assert ingestor.index.tokens_of(alice) == [2]
+    assert ingestor.index.tokens_of(bob) == [1]
+    _, end, _, changes = ingestor.recent[-1]
+    assert end == orphaned_head
+    assert [tuple(c) for c in changes] == [("move", 2, None), ("issued", 2, None), ("move", 1, alice)]
+
+    # 重組：回到分叉點，新的分支把 #2 發給 Carol，並且比舊分支更長
+    hardhat.revert(snapshot)
+    issue(hardhat, contract, carol, "Carol")
+    hardhat.mine(orphaned_head - hardhat.block_number() + 3)
+
+    restarted = EventIngestor(contract, state, hardhat.url, reorg_depth=12)   # 從狀態檔載入舊分支
+    assert restarted.rollback() == orphaned_head - fork_point
+    assert restarted.index.last_block == fork_point
+    assert restarted.index.tokens_of(alice) == [1]
+    assert restarted.index.tokens_of(bob) == []
+    assert 2 not in restarted.index.issued
+
+    restarted.sync()
+    assert restarted.index.last_block == hardhat.block_number()
+    assert restarted.index.tokens_of(alice) == [1]
+    assert restarted.index.tokens_of(carol) == [2]
+    assert restarted.index.issued[2]["recipientName"] == "Carol"
+    assert EventIngestor(contract, state, hardhat.url).index.to_dict() == restarted.index.to_dict()
+
+
+def offline_ingestor(tmp_path, canonical, recent, base, last_block):
+    ingestor = EventIngestor("0x" + "ab" * 20, str(tmp_path / "events-state.json"), "http://127.0.0.1:1")
+    ingestor.recent, ingestor.base, ingestor.index.last_block = recent, base, last_block
+    ingestor.block_hash = lambda number: canonical.get(number, "0xnew")
+    return ingestor
+
+
+def test_single_retained_range_is_undone_to_its_start(tmp_path):
+    ingestor = offline_ingestor(tmp_path, {100: "0xbase"}, [[101, 110, "0xold", []]], [100, "0xbase"], 110)
+    assert ingestor.rollback() == 10
+    assert ingestor.index.last_block == 100
+    assert ingestor.recent == []
+
+
+def test_reorg_below_the_retained_window_is_deep(tmp_path):
+    ingestor = offline_ingestor(tmp_path, {}, [[101, 110, "0xold", []]], [100, "0xbase"], 110)
+    with pytest.raises(DeepReorgError, match="block 100"):
+        ingestor.rollback()
+
+
+def test_rollback_stops_at_last_matching_range(tmp_path):
+    recent = [[91, 100, "0xa", []], [101, 105, "0xb", []], [106, 110, "0xc", []]]
+    ingestor = offline_ingestor(tmp_path, {100: "0xa"}, recent, None, 110)
+    assert ingestor.rollback() == 10
+    assert ingestor.index.last_block == 100
+    assert [r[1] for r in ingestor.recent] == [100]
+
+
+def test_prune_moves_final_ranges_into_the_base(tmp_path):
+    recent = [[1, 50, "0xa", []], [51, 95, "0xb", []], [96, 100, "0xc", []]]
+    ingestor = offline_ingestor(tmp_path, {}, recent, None, 100)
+    ingestor.reorg_depth = 5
+    ingestor._prune(100)
+    assert ingestor.base == [95, "0xb"]
+    assert [r[1] for r in ingestor.recent] == [100]
+
+
+def test_legacy_state_keeps_its_oldest_range_as_base(tmp_path):
+    path = tmp_path / "events-state.json"
+    path.write_text(json.dumps({"contract": "0x" + "ab" * 20, "lastBlock": 120,
+                                "recentBlocks": [[100, "0xa", []], [110, "0xb", []], [120, "0xc", []]]}))
+    ingestor = EventIngestor("0x" + "ab" * 20, str(path), "http://127.0.0.1:1")
+    assert ingestor.base == [100, "0xa"]
+    assert ingestor.recent == [[101, 110, "0xb", []], [111, 120, "0xc", []]]
@@ -0,0 +1,129 @@
+"""gas_model.py：calldata 與 storage slot 計算、最小平方法擬合、批次規劃的上限與分組，hardhat 上以 receipt 擬合"""
+
+import random
+
+import pytest
+
+from chain import CertificateContract
+from gas_model import (DEFAULT_COEFFICIENTS, FEATURES, TX_BASE_GAS, Batch, BatchPlanner, GasModel, calldata_gas,
+                       collect_samples, fixed_size_report, sample_from_json, sample_to_json, string_slots)
+
+
+def address(i):
+    return f"0x{i:040x}"
+
+
+def records(count, groups=1, name="接收者"):
+    return [{"recipient": address(i + 1), "certType": (i * groups // count) % 4, "recipientName": f"{name} {i}",
+             "issuerName": "區塊鏈課程", "customMessage": ""} for i in range(count)]
+
+
+def random_batch(rnd):
+    size = rnd.randrange(1, 60)
+    names = ["x" * rnd.choice((3, 31, 32, 70)) for _ in range(size)]
+    return Batch(rnd.randrange(4), "課程" * rnd.randrange(1, 15), "m" * rnd.choice((0, 20, 90)),
+                 [address(i) for i in range(size)], names, "ipfs://image", rnd.randrange(size + 1))
+
+
+def test_calldata_gas_counts_zero_and_nonzero_bytes():
+    assert calldata_gas(b"") == 0
+    assert calldata_gas("0x00ff0001") == 4 + 16 + 4 + 16
+    assert calldata_gas(bytes(10)) == 40
+
+
+@pytest.mark.parametrize("text, slots", [("", 0), ("a" * 31, 1), ("a" * 32, 2), ("a" * 33, 3),
+                                         ("證" * 10, 1), ("證" * 11, 3), ("a" * 64, 3)])
+def test_string_slots(text, slots):
+    assert string_slots(text) == slots
+
+
+def test_fit_recovers_known_coefficients():
+    truth = GasModel({"base": 5000, "items": 90000, "new_holders": 20000, "string_slots": 22000,
+                      "string_bytes": 12, "items_squared": 0.5})
+    rnd = random.Random(1)
+    samples = [(batch, truth.predict(batch)) for batch in (random_batch(rnd) for _ in range(40))]
+    model = GasModel.fit(samples)
+    assert model.source == "fitted" and model.stats["fixed"] == []
+    assert model.stats["maxRelativeError"] < 1e-4   # predict() 取整數
+    for name in FEATURES:
+        assert model.coefficients[name] == pytest.approx(truth.coefficients[name], rel=0.05)
+
+
+def test_features_without_spread_keep_their_default():
+    rnd = random.Random(2)
+    samples = []
+    for _ in range(20):
+        batch = random_batch(rnd)._replace(new_holders=0)
+        samples.append((batch, GasModel().predict(batch)))
+    model = GasModel.fit(samples)
+    assert model.stats["fixed"] == ["new_holders"]
+    assert model.coefficients["new_holders"] == DEFAULT_COEFFICIENTS["new_holders"]
+
+
+def test_model_and_samples_round_trip(tmp_path):
+    model = GasModel({"items": 80000}, source="fitted", stats={"r2": 0.99})
+    path = str(tmp_path / "model.json")
+    model.save(path)
+    loaded = GasModel.load(path)
+    assert loaded.coefficients == model.coefficients and loaded.stats == {"r2": 0.99}
+    batch = random_batch(random.Random(3))
+    assert sample_from_json(sample_to_json(batch, 123456)) == (batch, 123456)
+
+
+def test_optimal_batch_size():
+    assert GasModel().optimal_batch_size() == int(((TX_BASE_GAS + 8000) / 0.44) ** 0.5)
+    assert GasModel({"items_squared": 0}).optimal_batch_size() is None
+
+
+def test_plan_respects_cap_groups_and_order():
+    values = records(300, groups=3)
+    planner = BatchPlanner(GasModel(), max_batch_gas=5_000_000)
+    plan = planner.plan(values)
+    assert all(batch["estimatedGas"] <= 5_000_000 for batch in plan)
+    assert [r for batch in plan for r in batch["recipients"]] == [v["recipient"] for v in values]
+    assert [batch["start"] for batch in plan] == [0] + [sum(len(b["recipients"]) for b in plan[:i + 1])
+                                                        for i in range(len(plan) - 1)]
+    for batch in plan:
+        assert len({values[batch["start"] + i]["certType"] for i in range(len(batch["recipients"]))}) == 1
+    # 同一組內平均分配：最大與最小批次相差不超過一張
+    sizes = [len(b["recipients"]) for b in plan if b["certType"] == 0]
+    assert len(sizes) > 1 and max(sizes) - min(sizes) <= 1
+
+
+def test_existing_holders_lower_the_estimate():
+    values = records(20)
+    fresh = BatchPlanner(GasModel()).plan(values)
+    known = BatchPlanner(GasModel()).plan(values, holders=[v["recipient"] for v in values])
+    assert sum(b["estimatedGas"] for b in fresh) - sum(b["estimatedGas"] for b in known) == \
+        20 * DEFAULT_COEFFICIENTS["new_holders"]
+
+
+def test_cost_cap_and_impossible_records():
+    planner = BatchPlanner(GasModel(), gas_price_gwei=20, max_batch_cost_eth=0.05)
+    plan = planner.plan(records(200))
+    assert all(batch["estimatedCostEth"] <= 0.05 for batch in plan)
+    with pytest.raises(ValueError, match="超過上限"):
+        BatchPlanner(GasModel(), max_batch_gas=50_000).plan(records(1))
+    with pytest.raises(ValueError, match="沒有接收者地址"):
+        BatchPlanner(GasModel()).plan([{"recipientName": "A"}])
+
+
+def test_planned_batches_beat_fixed_size_batches():
+    values = records(400)
+    planner = BatchPlanner(GasModel())
+    plan = planner.plan(values)
+    planned = sum(batch["estimatedGas"] for batch in plan) / len(values)
+    _, over, small = fixed_size_report(GasModel(), values, 20, planner.cap)
+    assert planned < small and over == 0
+    _, over, _ = fixed_size_report(GasModel(), values, 400, planner.cap)
+    assert over == 1
+
+
+def test_fit_against_hardhat_receipts(hardhat, contract):
+    reader = CertificateContract(contract, hardhat.url)
+    samples = list(collect_samples(reader, sizes=(1, 5, 10, 20), name_lengths=(4, 40), rounds=2))
+    model = GasModel.fit(samples)
+    assert model.stats["maxRelativeError"] < 0.02
+    held_out = list(collect_samples(reader, sizes=(15,), name_lengths=(20,), seed=9))
+    for batch, gas_used in held_out:
+        assert model.predict(batch) == pytest.approx(gas_used, rel=0.03)
@@ -0,0 +1,48 @@
+"""gateway.py 的 If-None-Match 壓測：每個連線都要帶上 ETag 並得到 304；HEAD 的錯誤回應沒有 body"""
+
+import json
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+from gateway import _wait_for_port, run_load
+
+
+@pytest.fixture
+def gateway(tmp_path):
+    for i in range(20):
+        (tmp_path / f"certificate-{i}.svg").write_text(f"<svg>{i}</svg>", encoding="utf-8")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = subprocess.Popen([sys.executable, str(ROOT / "scripts" / "gateway.py"), "serve", "--port", str(port),
+                               "--images", str(tmp_path)], stdout=subprocess.DEVNULL)
+    try:
+        assert _wait_for_port("127.0.0.1", port)
+        yield port
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def test_revalidation_gets_304_on_every_connection(gateway):
+    paths = [f"/images/certificate-{i}.svg" for i in range(20)]
+    assert run_load("127.0.0.1", gateway, paths, 200, 8)["statuses"] == {200: 200}
+    summary = run_load("127.0.0.1", gateway, paths, 200, 8, revalidate=True)
+    assert summary["requests"] == 200
+    assert summary["statuses"] == {304: 200}
+
+
+def test_head_error_has_headers_only(gateway):
+    with socket.create_connection(("127.0.0.1", gateway), timeout=5) as sock:
+        sock.sendall(b"HEAD /images/missing.svg HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        reply = b""
+        while chunk := sock.recv(65536):
+            reply += chunk
+    head, _, body = reply.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 404")
+    assert b"Content-Length: " + str(len(json.dumps({"error": "Not Found"}))).encode() in head
+    assert body == b""
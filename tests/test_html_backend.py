@@ -0,0 +1,39 @@
+"""html_backend.py 的技術標籤、數據卡片與長條圖對照原本手寫的 index.html / index_backup.html"""
+
+import re
+
+import pytest
+
+from conftest import ROOT
+from deck import Badges, Bars, Bullets, KeyValue, Stats, load_deck, plain_block
+from html_backend import build_html
+
+BASELINES = {"en": "index.html", "zh": "index_backup.html"}
+
+
+def slides(html):
+    return re.findall(r'<section class="slide[^"]*">.*?</section>', html, re.S)
+
+
+def slide_with(html, marker):
+    return next(s for s in slides(html) if marker in s)
+
+
+@pytest.mark.parametrize("lang", BASELINES)
+def test_architecture_badges_match_baseline(lang):
+    baseline = (ROOT / "presentation" / BASELINES[lang]).read_text(encoding="utf-8")
+    rendered = build_html(load_deck(lang))
+    assert slide_with(rendered, '"architecture"') == slide_with(baseline, '"architecture"')
+
+
+def test_stat_cards_and_bars_match_baseline():
+    baseline = (ROOT / "presentation" / "index.html").read_text(encoding="utf-8")
+    rendered = slide_with(build_html(load_deck("en")), "stats-container")
+    assert rendered == slide_with(baseline, "stats-container")
+    assert rendered.count('class="stat-card"') == 6 and rendered.count('class="tech-bar"') == 4
+
+
+def test_print_backends_get_plain_blocks():
+    assert plain_block(Badges(("React 18",))) == Bullets(("React 18",))
+    assert plain_block(Stats((("6", "證書類型"),), ("6 種證書類型",))) == Bullets(("6 種證書類型",))
+    assert plain_block(Bars((("CSS", 10, "#264de4"),))) == KeyValue((("CSS", "10%"),))
@@ -0,0 +1,192 @@
+"""ipfs_cid.py 與 kubo (ipfs add) 的 CID 比對
+
+小檔案與目錄節點的 CID 是 kubo 實際輸出 (取自 ipfshttpclient 測試資料的 fake_dir)；
+切塊邊界與多層 balanced 樹另以照 go-unixfs balanced.Layout 逐步寫成的參考實作交叉比對，
+有安裝 ipfs 指令時再以 ``ipfs add --only-hash`` 逐一確認。
+"""
+
+import hashlib
+import shutil
+import subprocess
+
+import pytest
+
+from ipfs_cid import (CHUNK_SIZE, DAG_PB, MAX_LINKS, RAW, FileHasher, _bytes_field, _dag_pb, _multihash,
+                      _unixfs_file, _varint, _varint_field, b58encode, bytes_cid, cid_to_string, file_cid)
+from mock_pinata import PinStore
+
+# ipfs add (CIDv0) 的實際輸出
+KUBO_V0 = {
+    b"": "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH",
+    b"hello world\n": "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o",
+    b"dsadsad\n": "QmQcCtMgLVwvMQGu6mvsRYLjwqrZJcYtH4mboM9urWW9vX",
+    b"oooofiopfsdpio\n": "QmYAhvKYu46rh5NcHzeu6Bhc7NG9SqkF9wySj2jvB74Rkv",
+    b"dsdsdsadsdsad\n": "Qmb1NPqPzdHCMvHRfCkk6TWLcnpGJ71KnafacCMm6TKLcD",
+    b"dsdsadjs\n": "QmNuvmuFeeWWpxjCQwLkHshr8iqhGLWXFzSGzafBeawTTZ",
+    b"dsasasd\n": "QmeMbJSHNCesAh7EeopackUdjutTJznum1Fn7knPm873Fe",
+    "😉\n".encode("utf-8"): "QmW8tRcpqy5siMNAU9Lx3GADAxQbVUrx8XJGFDjkd6vqLT",
+}
+# ipfs add --raw-leaves --cid-version=1 對 b"dsadsad\n" 的輸出 (base58btc 表示)
+KUBO_V1_RAW_BASE58 = "zb2rhXxZH5PFgCwBAm7xQMoBa6QWqytN8NPvXK7Qc9McDz9zJ"
+
+BOUNDARY_SIZES = [CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE + 1, 2 * CHUNK_SIZE]
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def b58decode(text):
+    n = 0
+    for ch in text:
+        n = n * 58 + _B58_ALPHABET.index(ch)
+    body = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return b"\0" * (len(text) - len(text.lstrip("1"))) + body
+
+
+def raw_v1(data):
+    return cid_to_string(bytes((1, RAW)) + _multihash(data))
+
+
+def pattern(size):
+    """Deterministic, non-repeating content so every chunk hashes differently."""
+    out = bytearray()
+    counter = 0
+    while len(out) < size:
+        out += hashlib.sha256(counter.to_bytes(8, "big")).digest()
+        counter += 1
+    return bytes(out[:size])
+
+
+class ReferenceLayout:
+    """go-unixfs ``balanced.Layout`` / ``fillNodeRec`` transcribed one-to-one, whole file in memory."""
+
+    def __init__(self, data, cid_version, chunk_size):
+        self.cid_version = cid_version
+        self.chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)] or [b""]
+        self.next = 0
+
+    def done(self):
+        return self.next == len(self.chunks)
+
+    def cid(self, codec, block):
+        if self.cid_version == 0:
+            return _multihash(block)
+        return _varint(1) + _varint(codec) + _multihash(block)
+
+    def leaf(self):
+        chunk = self.chunks[self.next]
+        self.next += 1
+        if self.cid_version == 1:
+            return self.cid(RAW, chunk), len(chunk), len(chunk), []
+        block = _dag_pb((), _unixfs_file(chunk, len(chunk)))
+        return self.cid(DAG_PB, block), len(block), len(chunk), []
+
+    def node(self, children):
+        links = [_bytes_field(1, c[0]) + _bytes_field(2, b"") + _varint_field(3, c[1]) for c in children]
+        filesize = sum(c[2] for c in children)
+        block = _dag_pb(links, _unixfs_file(filesize=filesize, blocksizes=[c[2] for c in children]))
+        return self.cid(DAG_PB, block), len(block) + sum(c[1] for c in children), filesize, children
+
+    def fill(self, children, depth):
+        while len(children) < MAX_LINKS and not self.done():
+            children.append(self.leaf() if depth == 1 else self.fill([], depth - 1))
+        return self.node(children)
+
+    def layout(self):
+        root = self.leaf()
+        depth = 1
+        while not self.done():
+            root = self.fill([root], depth)
+            depth += 1
+        return root
+
+
+def depth(node):
+    return 1 + depth(node[3][0]) if node[3] else 0
+
+
+@pytest.mark.parametrize("data", KUBO_V0, ids=lambda d: f"{len(d)}B")
+def test_small_files_match_kubo_v0(data):
+    assert bytes_cid(data) == KUBO_V0[data]
+
+
+def test_small_file_matches_kubo_v1_raw_leaves():
+    assert b58decode(KUBO_V1_RAW_BASE58[1:]) == b"\x01\x55" + _multihash(b"dsadsad\n")
+    assert bytes_cid(b"dsadsad\n", 1) == cid_to_string(b58decode(KUBO_V1_RAW_BASE58[1:]))
+
+
+@pytest.mark.parametrize("data", KUBO_V0, ids=lambda d: f"{len(d)}B")
+def test_single_chunk_v1_is_the_raw_block(data):
+    assert bytes_cid(data, 1) == raw_v1(data)
+
+
+def test_dag_pb_links_match_kubo_directories():
+    """父節點用的 PBLink 編碼 (Hash, Name, Tsize) 與 kubo 的目錄節點一致。"""
+    directory = _varint_field(1, 1)
+
+    def dir_node(name, child, tsize):
+        link = _bytes_field(1, b58decode(child)) + _bytes_field(2, name) + _varint_field(3, tsize)
+        return b58encode(_multihash(_dag_pb([link], directory)))
+
+    assert b58encode(_multihash(_dag_pb((), directory))) == "QmUNLLsPACCz1vLxQVkXqqLX5R1X345qqfHbsf67hvA3Nn"
+    assert dir_node(b"ppppoooooooooo", KUBO_V0[b"dsasasd\n"], 16) == "QmRphRr6ULDEj7YnXpLdnxhnPiVjv5RDtGX3er94Ec6v4Q"
+    assert dir_node(b"dummy", KUBO_V0["😉\n".encode("utf-8")], 13) == "QmZazHsY4nbhRTHTEp5SUWd4At6aSXia1kxEuywHTicayE"
+
+
+@pytest.mark.parametrize("cid_version", [0, 1])
+@pytest.mark.parametrize("size", BOUNDARY_SIZES)
+def test_chunk_boundaries_match_reference_layout(size, cid_version):
+    data = pattern(size)
+    root = ReferenceLayout(data, cid_version, CHUNK_SIZE).layout()
+    assert bytes_cid(data, cid_version) == cid_to_string(root[0])
+    assert len(root[3]) == (0 if size <= CHUNK_SIZE else -(-size // CHUNK_SIZE))
+    if size == CHUNK_SIZE and cid_version == 1:
+        assert bytes_cid(data, 1) == raw_v1(data)
+
+
+@pytest.mark.parametrize("cid_version", [0, 1])
+@pytest.mark.parametrize("leaves, levels", [
+    (MAX_LINKS, 1),
+    (MAX_LINKS + 1, 2),
+    (2 * MAX_LINKS, 2),
+    (MAX_LINKS * MAX_LINKS, 2),
+    (MAX_LINKS * MAX_LINKS + 1, 3),
+])
+def test_multi_level_balanced_tree(leaves, levels, cid_version):
+    """以 4 位元組切塊讓 174 × 174 個葉節點的樹只需要 120 KiB 資料。"""
+    data = pattern(4 * leaves)
+    root = ReferenceLayout(data, cid_version, 4).layout()
+    assert depth(root) == levels
+
+    hasher = FileHasher(cid_version, chunk_size=4)
+    for i in range(0, len(data), 1000):
+        hasher.update(data[i:i + 1000])
+    assert hasher.digest() == root[0]
+
+
+def test_full_size_two_level_tree(tmp_path):
+    path = tmp_path / "big.bin"
+    data = pattern(MAX_LINKS * CHUNK_SIZE + 1)
+    path.write_bytes(data)
+    for cid_version in (0, 1):
+        root = ReferenceLayout(data, cid_version, CHUNK_SIZE).layout()
+        assert [len(c[3]) for c in root[3]] == [MAX_LINKS, 1]
+        assert file_cid(str(path), cid_version) == cid_to_string(root[0])
+
+
+def test_mock_pinata_returns_kubo_cids():
+    store = PinStore()
+    assert store.pin(b"dsadsad\n", 0, "fsdfgh")["IpfsHash"] == KUBO_V0[b"dsadsad\n"]
+    reply = store.pin(b"dsadsad\n", 1, "fsdfgh")
+    assert reply["IpfsHash"] == cid_to_string(b58decode(KUBO_V1_RAW_BASE58[1:]))
+    assert not reply["isDuplicate"] and store.uploads == 2
+
+
+@pytest.mark.skipif(not shutil.which("ipfs"), reason="沒有安裝 ipfs (kubo)")
+@pytest.mark.parametrize("cid_version", [0, 1])
+@pytest.mark.parametrize("size", [0, 1, *BOUNDARY_SIZES, MAX_LINKS * CHUNK_SIZE, MAX_LINKS * CHUNK_SIZE + 1])
+def test_matches_local_kubo(size, cid_version, tmp_path):
+    path = tmp_path / f"{size}.bin"
+    path.write_bytes(pattern(size))
+    expected = subprocess.run(
+        ["ipfs", "add", "--only-hash", "--quiet", f"--cid-version={cid_version}", str(path)],
+        check=True, capture_output=True, text=True).stdout.strip()
+    assert file_cid(str(path), cid_version) == expected
@@ -0,0 +1,199 @@
+"""issuance_engine.py 在關閉自動出塊的 hardhat 節點上：RPC 錯誤、節點拒收與 nonce 空洞"""
+
+from collections import Counter
+
+import pytest
+
+from chain import CertificateContract, RpcError, encode_issue_certificate
+from issuance_engine import FAILED, MINED, Job, IssuanceEngine
+
+RECIPIENTS = [f"0x{i + 0x1000:040x}" for i in range(6)]
+
+
+def make_jobs():
+    return [
+        Job(f"r{i}", encode_issue_certificate(to, 0, f"Recipient {i}", "Issuer", "Thanks"), [to], [f"Recipient {i}"])
+        for i, to in enumerate(RECIPIENTS)
+    ]
+
+
+def make_engine(hardhat, contract, journal_path):
+    return IssuanceEngine(contract, make_jobs(), journal_path, hardhat.url,
+                          window=32, poll_interval=0.1, stuck_after=60, log=lambda *_: None)
+
+
+@pytest.fixture
+def engine(hardhat, contract, tmp_path):
+    hardhat.set_automine(False)
+    hardhat.set_interval_mining(300)
+    return make_engine(hardhat, contract, str(tmp_path / "issuance.journal"))
+
+
+def minted_per_recipient(engine):
+    contract = CertificateContract(engine.address, client=engine.client)
+    return [len(contract.certificates_by_owner(to)) for to in RECIPIENTS]
+
+
+def reject_broadcasts(engine, job_id, times):
+    """Make the node refuse the first *times* broadcasts of *job_id* without ever seeing them."""
+    broadcast = engine._broadcast
+    rejected = Counter()
+
+    def flaky(raws):
+        kept, errors = [], {}
+        for item_id, raw in raws:
+            if item_id == job_id and rejected[item_id] < times:
+                rejected[item_id] += 1
+                errors[item_id] = RpcError("insufficient funds for gas * price + value")
+            else:
+                kept.append((item_id, raw))
+        errors.update(broadcast(kept))
+        return errors
+
+    engine._broadcast = flaky
+    return rejected
+
+
+def test_receipt_errors_do_not_requeue(engine):
+    """Receipt lookups that error while eth_getTransactionCount succeeds must not look like a reused nonce."""
+    batch = engine.client.batch
+    failing = {"receipts": 6, "blocks": 3}
+
+    def flaky(calls, raise_errors=True):
+        results = batch(calls, raise_errors)
+        methods = [method for method, _ in calls]
+        if "eth_getTransactionReceipt" in methods and failing["receipts"]:
+            failing["receipts"] -= 1
+            results = [RpcError("header not found") if m == "eth_getTransactionReceipt" else r
+                       for m, r in zip(methods, results)]
+        if "eth_getBlockByNumber" in methods and engine.fees and failing["blocks"]:
+            failing["blocks"] -= 1
+            results = [RpcError("upstream timeout") if m == "eth_getBlockByNumber" else r
+                       for m, r in zip(methods, results)]
+        return results
+
+    engine.client.batch = flaky
+    summary = engine.run()
+
+    assert summary[MINED] == len(RECIPIENTS)
+    assert engine.stats["requeued"] == 0
+    assert failing == {"receipts": 0, "blocks": 0}
+    assert minted_per_recipient(engine) == [1] * len(RECIPIENTS)
+
+
+def test_rejected_broadcast_is_resent_on_its_nonce(engine, hardhat):
+    rejected = reject_broadcasts(engine, "r1", times=1)
+    summary = engine.run()
+
+    assert rejected["r1"] == 1
+    assert summary[MINED] == len(RECIPIENTS)
+    assert engine.stats["requeued"] == 1
+    assert engine.stats["gapsFilled"] == 0
+    assert minted_per_recipient(engine) == [1] * len(RECIPIENTS)
+    latest = int(hardhat.call("eth_getTransactionCount", engine.account.address, "latest"), 16)
+    pending = int(hardhat.call("eth_getTransactionCount", engine.account.address, "pending"), 16)
+    assert latest == pending
+
+
+def test_permanent_rejection_fails_job_and_fills_nonce_gap(engine, hardhat):
+    reject_broadcasts(engine, "r1", times=99)
+    summary = engine.run()
+
+    assert summary[MINED] == len(RECIPIENTS) - 1
+    assert summary[FAILED] == 1
+    assert engine.journal.jobs["r1"]["state"] == FAILED
+    assert engine.stats["gapsFilled"] == 1
+    assert engine.stats["bumped"] == 0
+    expected = [1] * len(RECIPIENTS)
+    expected[1] = 0
+    assert minted_per_recipient(engine) == expected
+    pending = int(hardhat.call("eth_getTransactionCount", engine.account.address, "pending"), 16)
+    assert pending == len(RECIPIENTS) + 1   # 部署 1 筆 + 5 筆發行 + 1 筆補洞
+
+
+def test_ambiguous_broadcast_keeps_its_nonce(engine):
+    """The node takes the transaction but the reply is lost: no new nonce, no second mint."""
+    broadcast = engine._broadcast
+    lost = Counter()
+
+    def timeout(raws):
+        errors = broadcast(raws)
+        for item_id, _ in raws:
+            if item_id == "r2" and not lost[item_id]:
+                lost[item_id] += 1
+                errors[item_id] = RpcError("upstream request timeout")
+        return errors
+
+    engine._broadcast = timeout
+    summary = engine.run()
+
+    assert lost["r2"] == 1
+    assert summary[MINED] == len(RECIPIENTS)
+    assert engine.stats["unconfirmedSends"] == 1
+    assert engine.stats["requeued"] == 0
+    assert minted_per_recipient(engine) == [1] * len(RECIPIENTS)
+
+
+def test_lagging_receipts_do_not_requeue(engine):
+    """A backend that reports the nonce as used but still has no receipts must not cause a second mint."""
+    batch = engine.client.batch
+    lagging = {"polls": 12}
+
+    def lag(calls, raise_errors=True):
+        results = batch(calls, raise_errors)
+        methods = [method for method, _ in calls]
+        if "eth_getTransactionCount" in methods and lagging["polls"]:
+            lagging["polls"] -= 1
+            results = [None if m == "eth_getTransactionReceipt" else r for m, r in zip(methods, results)]
+        return results
+
+    engine.client.batch = lag
+    summary = engine.run()
+
+    assert lagging["polls"] == 0
+    assert summary[MINED] == len(RECIPIENTS)
+    assert engine.stats["requeued"] == 0
+    assert minted_per_recipient(engine) == [1] * len(RECIPIENTS)
+
+
+def test_estimate_transport_errors_are_retried(engine):
+    batch = engine.client.batch
+    failing = {"estimates": 2}
+
+    def flaky(calls, raise_errors=True):
+        if calls and calls[0][0] == "eth_estimateGas" and failing["estimates"]:
+            failing["estimates"] -= 1
+            raise RpcError("HTTP 502: upstream connect error or disconnect")
+        return batch(calls, raise_errors)
+
+    engine.client.batch = flaky
+    summary = engine.run()
+
+    assert failing["estimates"] == 0
+    assert summary == {"pending": 0, "sent": 0, "mined": len(RECIPIENTS), "failed": 0}
+    assert engine.stats["estimateRetries"] == 2 * len(RECIPIENTS)
+
+
+def test_resume_refills_nonce_freed_before_crash(engine, hardhat, contract):
+    """r1 is rejected and its nonce freed, then the process dies with later nonces in flight."""
+    reject_broadcasts(engine, "r1", times=1)
+    send_error = engine._send_error
+
+    def crash(job_id, error):
+        send_error(job_id, error)
+        raise KeyboardInterrupt
+
+    engine._send_error = crash
+    with pytest.raises(KeyboardInterrupt):
+        engine.run()
+    engine.journal.close()
+    assert engine.free_nonces
+
+    resumed = make_engine(hardhat, contract, engine.journal.path)
+    summary = resumed.run()
+
+    assert summary[MINED] == len(RECIPIENTS)
+    assert minted_per_recipient(resumed) == [1] * len(RECIPIENTS)
+    latest = int(hardhat.call("eth_getTransactionCount", resumed.account.address, "latest"), 16)
+    pending = int(hardhat.call("eth_getTransactionCount", resumed.account.address, "pending"), 16)
+    assert latest == pending == len(RECIPIENTS) + 1   # 部署 1 筆 + 6 筆發行
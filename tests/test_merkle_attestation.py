@@ -0,0 +1,77 @@
+"""merkle_attestation.py：OpenZeppelin StandardMerkleTree 的排列、build → proof → verify 往返與竄改欄位的拒絕"""
+
+import json
+
+import pytest
+
+from chain import abi_encode
+from merkle_attestation import (BATCH_FILE, PROOFS_FILE, MerkleTree, build_batch, check_proof, hash_pair,
+                                keccak256, main, process_proof, synthetic_records, to_hex, write_batch)
+
+
+def oz_leaf(types, value):
+    return keccak256(keccak256(abi_encode(types, value)))
+
+
+def test_root_matches_openzeppelin_readme_example():
+    # @openzeppelin/merkle-tree README：StandardMerkleTree.of(values, ["address", "uint256"]).root
+    values = [["0x1111111111111111111111111111111111111111", 5000000000000000000],
+              ["0x2222222222222222222222222222222222222222", 2500000000000000000]]
+    tree = MerkleTree(oz_leaf(("address", "uint256"), v) for v in values)
+    assert to_hex(tree.root) == "0xd4dee0beab2d53f2cc83e567171bd2820e49898130a22622b10ead383e90bd77"
+
+
+def test_non_power_of_two_uses_openzeppelin_layout():
+    a, b, c, d, e = sorted(keccak256(bytes([i])) for i in range(5))
+    tree = MerkleTree([e, c, a, d, b])
+    # 陣列 [root, n1, n2, n3, e, d, c, b, a]：n3 = (a, b)、n2 = (c, d)、n1 = (n3, e)
+    n3, n2 = hash_pair(a, b), hash_pair(c, d)
+    n1 = hash_pair(n3, e)
+    assert tree.root == hash_pair(n1, n2)
+    assert tree.proof(a) == [b, e, n2]
+    assert tree.proof(e) == [n3, n2]
+    assert tree.depth == 3
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13, 100])
+def test_every_proof_leads_to_the_root(count):
+    tree, entries = build_batch(synthetic_records(count))
+    assert len(tree) == count
+    for _, leaf in entries:
+        proof = tree.proof(leaf)
+        assert len(proof) <= tree.depth
+        assert process_proof(leaf, proof) == tree.root
+
+
+def test_root_ignores_input_order():
+    records = synthetic_records(7)
+    assert build_batch(records)[0].root == build_batch(records[::-1])[0].root
+
+
+def test_duplicate_certificate_is_rejected():
+    records = synthetic_records(3)
+    with pytest.raises(ValueError, match="duplicate"):
+        build_batch(records + records[:1])
+
+
+def test_round_trip_and_tampered_fields(tmp_path, capsys):
+    tree, entries = build_batch(synthetic_records(6))
+    batch = write_batch(tree, entries, str(tmp_path))
+    assert json.loads((tmp_path / BATCH_FILE).read_text())["root"] == batch["root"] == to_hex(tree.root)
+    documents = [json.loads(line) for line in (tmp_path / PROOFS_FILE).read_text(encoding="utf-8").splitlines()]
+    assert all(check_proof(d, batch["root"]) == (True, "") for d in documents)
+    assert main(["verify", str(tmp_path / PROOFS_FILE), "--root", batch["root"]]) == 0
+
+    tampered = dict(documents[2], certificate=dict(documents[2]["certificate"], recipientName="Mallory"))
+    assert check_proof(tampered, batch["root"]) == (False, "certificate fields do not match the leaf")
+    del tampered["leaf"]
+    assert check_proof(tampered, batch["root"]) == (False, "proof does not lead to the root")
+
+    other_root = to_hex(build_batch(synthetic_records(6, seed=1))[0].root)
+    assert check_proof(documents[0], other_root) == (False, "proof does not lead to the root")
+    assert check_proof(dict(documents[0], proof=["0x12"]))[0] is False
+
+    forged = tmp_path / "forged.jsonl"
+    forged.write_text(json.dumps(tampered, ensure_ascii=False) + "\n", encoding="utf-8")
+    assert main(["verify", str(forged), "--root", batch["root"]]) == 1
+    assert "proof does not lead to the root" in capsys.readouterr().out
@@ -0,0 +1,91 @@
+"""metadata_builder.py 預先編譯的 JSON 模板對照 json.dumps、雜湊分層輸出、bundle 與重複 tokenId"""
+
+import json
+
+import pytest
+
+from certificates import CertificateRecord, coerce_record
+from conftest import ROOT
+from metadata_builder import (MANIFEST_NAME, BatchContext, MetadataBuilder, build, dumps, main, shard_path,
+                              synthetic_records)
+
+TRICKY = ["Bob \"B\" Chen", "back\\slash", "tab\there", "line\u2028sep", "ctrl\x01\x1f", "emoji 😀🎓",
+          "林<佳>穎 & co", "token_id", "{\"json\": 1}", ""]
+
+
+@pytest.fixture
+def context():
+    return BatchContext.create("2025-10-04", image_base="ipfs://bafy/")
+
+
+def test_compiled_render_matches_json_dumps(context):
+    builder = MetadataBuilder(context)
+    token_id = 0
+    for cert_type in range(4):
+        for name in TRICKY:
+            for message in ("", name, "感謝\n繼續加油"):
+                token_id += 1
+                record = CertificateRecord(cert_type, name or "無名", name, message,
+                                           image_uri="ipfs://x/\"q\".svg" if token_id % 5 == 0 else "")
+                text = builder.render(record, token_id)
+                assert text == dumps(builder.document(record, token_id))
+                assert json.loads(text) == builder.document(record, token_id)
+
+
+def test_fields_follow_the_example_metadata(context):
+    example = json.loads((ROOT / "metadata" / "blockchain-pioneer-example.json").read_text(encoding="utf-8"))
+    document = MetadataBuilder(context).document(CertificateRecord(0, "Alice", "Digital Certificate Authority",
+                                                                    "恭喜您成為區塊鏈技術的先驅者！"), 1)
+    assert list(document) == list(example)
+    assert document["name"] == example["name"] and document["properties"] == example["properties"]
+    traits = {a["trait_type"]: a["value"] for a in document["attributes"]}
+    assert all(traits[a["trait_type"]] == a["value"] for a in example["attributes"])
+    assert document["image"] == "ipfs://bafy/certificate-1.svg"
+    assert "發行時間: 2025/10/4" in document["description"]
+
+
+def test_metadata_round_trips_through_the_record_parser(context):
+    builder = MetadataBuilder(context)
+    record = CertificateRecord(3, "陳小美", "數位學習平台", "成功完成區塊鏈開發課程")
+    parsed = coerce_record(json.loads(builder.render(record, 42)))
+    assert (parsed.cert_type, parsed.recipient_name, parsed.issuer_name, parsed.custom_message, parsed.token_id) == \
+        (3, "陳小美", "數位學習平台", "成功完成區塊鏈開發課程", 42)
+
+
+@pytest.mark.parametrize("depth", [0, 1, 2])
+def test_build_writes_shards_bundle_and_manifest(tmp_path, context, depth):
+    records = list(synthetic_records(40))
+    out, bundle = tmp_path / "out", tmp_path / "bundle.jsonl"
+    count, written = build(records, str(out), context, start_token_id=100, shard_depth=depth, bundle_path=str(bundle))
+    assert count == 40
+
+    builder, total = MetadataBuilder(context), 0
+    lines = bundle.read_text(encoding="utf-8").splitlines()
+    for i, (value, line) in enumerate(zip(records, lines)):
+        token_id = 100 + i
+        data = (out / shard_path(token_id, depth)).read_bytes()
+        assert data.decode("utf-8") == builder.render(coerce_record(value), token_id)
+        assert json.loads(line) == {"tokenId": token_id, "metadata": json.loads(data)}
+        total += len(data)
+    assert written == total
+    assert len(shard_path(1, depth).split("/")) == depth + 1
+    manifest = json.loads((out / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert (manifest["count"], manifest["shardDepth"], manifest["context"]["issueDate"]) == (40, depth, "2025-10-04")
+
+
+def test_explicit_token_ids_and_duplicates(tmp_path, context):
+    records = [{"recipientName": "A", "tokenId": 7}, {"recipientName": "B"}, {"recipientName": "C", "tokenId": 3}]
+    assert build(records, None, context, bundle_path=str(tmp_path / "b.jsonl"))[0] == 3
+    ids = [json.loads(line)["tokenId"] for line in (tmp_path / "b.jsonl").read_text().splitlines()]
+    assert ids == [7, 8, 3]
+    with pytest.raises(ValueError, match="tokenId 8 appears more than once"):
+        build(records + [{"recipientName": "D", "tokenId": 8}], None, context)
+
+
+def test_batch_date_is_fixed_for_the_whole_run():
+    assert BatchContext.create(1759536000).iso_date == BatchContext.create("2025-10-04").iso_date == "2025-10-04"
+
+
+def test_cli_rejects_no_files_without_bundle(tmp_path, capsys):
+    assert main(["build", str(tmp_path / "x.jsonl"), "--no-files"]) == 2
+    assert "--bundle" in capsys.readouterr().out
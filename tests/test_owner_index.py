@@ -0,0 +1,94 @@
+"""owner_index.py 查詢 API：索引檔更新時重新載入、回覆 lastBlock、依合約地址分流"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from chain import CertificateContract, encode_address, encode_issue_certificate, encode_uint256
+from owner_index import IndexFile, OwnerIndex, build_index, make_server, verify_index
+
+CONTRACT = "0x" + "ab" * 20
+ALICE = "0x" + "11" * 20
+BOB = "0x" + "22" * 20
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(index):
+        server = make_server(index, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def write_index(path, owners, last_block, contract=CONTRACT):
+    index = OwnerIndex()
+    index.contract = contract
+    index.last_block = last_block
+    for token_id, owner in owners.items():
+        index.move(token_id, owner)
+    index.save(str(path))
+    return index
+
+
+def test_serve_reloads_index_file_and_reports_last_block(tmp_path, serve):
+    path = tmp_path / "owner-index.json"
+    write_index(path, {1: ALICE}, last_block=10)
+    url = serve(IndexFile(str(path))) + f"/contracts/{CONTRACT.upper().replace('0X', '0x')}"
+
+    assert get(f"{url}/owners/{ALICE}") == (200, {"contract": CONTRACT, "lastBlock": 10,
+                                                  "owner": ALICE, "tokenIds": [1]})
+    write_index(path, {1: BOB, 2: ALICE}, last_block=25)
+    status, body = get(f"{url}/owners/{ALICE}")
+    assert (status, body["tokenIds"], body["lastBlock"]) == (200, [2], 25)
+    assert get(f"{url}/tokens/1")[1]["owner"] == BOB
+    assert get(f"{url}/status")[1] == {"contract": CONTRACT, "lastBlock": 25, "owners": 2, "tokens": 2}
+
+
+def test_other_contract_is_not_served(tmp_path, serve):
+    url = serve(write_index(tmp_path / "owner-index.json", {1: ALICE}, last_block=10))
+    status, body = get(f"{url}/contracts/0x{'cd' * 20}/owners/{ALICE}")
+    assert status == 404 and CONTRACT in body["error"]
+    assert get(f"{url}/owners/{ALICE}")[1]["tokenIds"] == [1]   # 未指定合約的舊路徑
+
+
+def test_rebuilt_index_is_served_without_restart(hardhat, contract, tmp_path, serve):
+    alice, bob = hardhat.accounts[1].lower(), hardhat.accounts[2].lower()
+    hardhat.transact(contract, encode_issue_certificate(alice, 0, "Alice", "Issuer", "Thanks"))
+    path = str(tmp_path / "owner-index.json")
+    build_index(contract, hardhat.url).save(path)
+    url = serve(IndexFile(path)) + f"/contracts/{contract}"
+
+    status, body = get(f"{url}/owners/{alice}")
+    assert (status, body["tokenIds"], body["lastBlock"]) == (200, [1], hardhat.block_number())
+
+    hardhat.transact(contract, encode_issue_certificate(alice, 1, "Alice", "Issuer", "Again"))
+    hardhat.transact(contract, "0x23b872dd" + encode_address(alice) + encode_address(bob) + encode_uint256(1),
+                     sender=alice)
+    stale = get(f"{url}/owners/{alice}")[1]
+    assert stale["lastBlock"] < hardhat.block_number()   # 前端據此改呼叫合約
+
+    index = build_index(contract, hardhat.url)
+    index.save(path)
+    body = get(f"{url}/owners/{alice}")[1]
+    assert (body["tokenIds"], body["lastBlock"]) == ([2], hardhat.block_number())
+    assert get(f"{url}/owners/{bob}")[1]["tokenIds"] == [1]
+    assert verify_index(index, CertificateContract(contract, hardhat.url)) == []
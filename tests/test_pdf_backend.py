@@ -0,0 +1,36 @@
+"""pdf_backend.py 不使用片段快取：建置時不會產生或讀取 .deck-cache/pdf；缺少套件時只讓該格式失敗"""
+
+import sys
+
+from build import build_one
+
+
+def test_pdf_build_skips_fragment_cache(tmp_path):
+    cache_dir = tmp_path / "cache"
+    (cache_dir / "pdf").mkdir(parents=True)
+    planted = cache_dir / "pdf" / "planted.bin"
+    planted.write_bytes(b"not a pickle")
+
+    for _ in range(2):
+        result = build_one("pdf", "en", str(tmp_path), str(cache_dir))
+        assert result.error is None
+        assert (result.cache_hits, result.cache_misses) == (0, 0)
+    assert [p.name for p in (cache_dir / "pdf").iterdir()] == ["planted.bin"]
+    assert open(result.path, "rb").read(5) == b"%PDF-"
+
+    html = build_one("html", "en", str(tmp_path), str(cache_dir))
+    assert html.error is None and html.cache_misses > 0
+
+
+def test_missing_library_fails_only_that_format(tmp_path, monkeypatch, capsys):
+    monkeypatch.delitem(sys.modules, "pdf_backend", raising=False)
+    monkeypatch.setitem(sys.modules, "reportlab", None)
+
+    pdf = build_one("pdf", "en", str(tmp_path))
+    html = build_one("html", "en", str(tmp_path))
+
+    assert pdf.path is None
+    assert pdf.error.startswith("ImportError: reportlab not installed")
+    assert "pip install reportlab" in pdf.error
+    assert html.error is None
+    assert "installed" not in capsys.readouterr().out
@@ -0,0 +1,114 @@
+"""pdf_stream.py 串流寫入：xref 與頁面樹、中斷後續寫與整批重跑相同、checkpoint 綁定輸入雜湊、非 BMP 字元印成 □"""
+
+import filecmp
+import json
+import os
+import re
+
+import pytest
+
+from certificate_pdf import files_digest, main, render_certificate, render_merged
+from certificates import CertificateRecord
+from pdf_stream import NOT_IN_FONT, _literal, _ucs2_hex, bmp_text
+
+pypdf = pytest.importorskip("pypdf")
+
+
+def records(count, name="接收者"):
+    return [{"certType": i % 4, "recipientName": f"{name} {i}", "issuerName": "區塊鏈課程",
+             "issueDate": 1759536000, "tokenId": i + 1} for i in range(count)]
+
+
+def crash_after(values, count):
+    for i, value in enumerate(values):
+        if i == count:
+            raise KeyboardInterrupt
+        yield value
+
+
+def names(path):
+    return [line for page in pypdf.PdfReader(path, strict=True).pages
+            for line in page.extract_text().splitlines() if line.startswith(("接收者", "改過", "王"))]
+
+
+def test_xref_offsets_point_at_their_objects(tmp_path):
+    path = str(tmp_path / "out.pdf")
+    render_merged(iter(records(7)), path, resume=False, group_size=3)
+    data = open(path, "rb").read()
+    xref = data.rindex(b"\nxref\n") + 1
+    assert int(data[data.rindex(b"startxref\n") + 10:].split()[0]) == xref
+    size = int(data[xref:].split(b"\n")[1].split()[1])
+    entries = data[xref:].split(b"\n")[3:3 + size - 1]
+    for num, entry in enumerate(entries, 1):
+        offset = int(entry[:10])
+        assert data[offset:].startswith(b"%d 0 obj\n" % num)
+    kids = re.search(rb"2 0 obj\n<< /Type /Pages /Kids \[([^\]]*)\] /Count (\d+)", data)
+    assert kids.group(2) == b"7" and len(kids.group(1).split()) == 3 * 3   # 3 + 3 + 1 頁，三個分組
+
+
+def test_resume_after_a_crash_matches_an_uninterrupted_run(tmp_path):
+    values = records(11)
+    digest = "a" * 64
+    full = str(tmp_path / "full.pdf")
+    render_merged(iter(values), full, resume=False, group_size=4, input_digest=digest)
+
+    path = str(tmp_path / "resumed.pdf")
+    with pytest.raises(KeyboardInterrupt):
+        render_merged(crash_after(values, 9), path, group_size=4, input_digest=digest)
+    checkpoint = json.load(open(path + ".checkpoint.json"))
+    assert checkpoint["pages_done"] == 8 and checkpoint["fingerprint"]["input"] == digest
+
+    assert render_merged(iter(values), path, group_size=4, input_digest=digest) == 11
+    assert filecmp.cmp(full, path, shallow=False)
+    assert not os.path.exists(path + ".checkpoint.json")
+
+
+@pytest.mark.parametrize("digest", ["b" * 64, None])
+def test_checkpoint_for_another_input_is_not_resumed(tmp_path, digest):
+    path = str(tmp_path / "out.pdf")
+    with pytest.raises(KeyboardInterrupt):
+        render_merged(crash_after(records(8), 5), path, group_size=2, input_digest="a" * 64 if digest else None)
+    assert json.load(open(path + ".checkpoint.json"))["pages_done"] == 4
+
+    assert render_merged(iter(records(3, "改過")), path, group_size=2, input_digest=digest) == 3
+    assert names(path) == ["改過 0", "改過 1", "改過 2"]
+
+
+def test_cli_resumes_only_the_same_record_file(tmp_path, capsys):
+    count = 1003   # CLI 的分組為 1000 頁，中斷時已完成一組
+    source, output = tmp_path / "records.jsonl", str(tmp_path / "print.pdf")
+    source.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records(count)), encoding="utf-8")
+
+    def crashed_run():
+        # 中斷的那次寫的是「舊」名單，但 checkpoint 記錄的是 records.jsonl 的雜湊
+        with pytest.raises(KeyboardInterrupt):
+            render_merged(crash_after(records(count, "舊"), 1001), output, input_digest=files_digest([str(source)]))
+
+    def first_and_last(path):
+        reader = pypdf.PdfReader(path)
+        return [next(line for line in page.extract_text().splitlines() if line.startswith(("舊", "接收者", "改過")))
+                for page in (reader.pages[0], reader.pages[-1])]
+
+    crashed_run()
+    assert main([str(source), "--merged", output]) == 0
+    assert first_and_last(output) == ["舊 0", f"接收者 {count - 1}"]   # 同一個檔案：前 1000 頁沿用
+
+    crashed_run()
+    source.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records(count, "改過")),
+                      encoding="utf-8")
+    assert main([str(source), "--merged", output]) == 0
+    assert first_and_last(output) == ["改過 0", f"改過 {count - 1}"]
+    assert f"已輸出 {count} 頁" in capsys.readouterr().out
+
+
+def test_non_bmp_characters_become_a_visible_box(tmp_path):
+    assert bmp_text("Alice") == "Alice"
+    assert bmp_text("王😀明🎓") == f"王{NOT_IN_FONT}明{NOT_IN_FONT}"
+    assert _ucs2_hex("A😀") == b"<004125a1>"
+    assert _literal("a(b)\\") == b"(a\\(b\\)\\\\)"
+
+    path = str(tmp_path / "emoji.pdf")
+    render_merged(iter([{"certType": 0, "recipientName": "王😀明", "issuerName": "I", "issueDate": 1759536000}]),
+                  path, resume=False)
+    single = render_certificate(CertificateRecord(0, "王😀明", "I", issue_date=1759536000), str(tmp_path / "one.pdf"))
+    assert names(path) == names(single) == [f"王{NOT_IN_FONT}明"]
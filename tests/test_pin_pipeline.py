@@ -0,0 +1,72 @@
+"""pin_pipeline.py 對本地 mock_pinata：429 自動降速與單筆錯誤隔離"""
+
+import asyncio
+import os
+import threading
+
+from mock_pinata import make_server
+from pin_pipeline import PinPipeline, TokenBucket, file_job, json_job, run_benchmark
+from pinning import PinCache
+
+
+def test_penalize_never_leaves_more_debt_than_the_pause():
+    async def check():
+        bucket = TokenBucket(rate=10, burst=10)
+        bucket.tokens = -5.0
+        bucket.penalize(1.0)
+        assert -10.5 < bucket.tokens <= -10.0 + 1e-3
+        bucket.tokens = -20.0
+        bucket.penalize(1.0)
+        assert bucket.tokens < -19.5   # 已經欠更多時不再疊加
+
+    asyncio.run(check())
+
+
+def test_concurrent_429s_cut_the_rate_once():
+    async def check():
+        bucket = TokenBucket(rate=40, burst=10)
+        for _ in range(8):
+            bucket.throttled(0.5)
+        assert bucket.slowed == 1
+        assert bucket.rate == 20
+        for _ in range(1000):
+            bucket.succeeded()
+        assert bucket.rate == 40
+
+    asyncio.run(check())
+
+
+def test_over_quota_client_slows_down_instead_of_dropping_jobs():
+    stats = run_benchmark(count=40, rate=20, burst=5, latency=0.02, concurrency=16, client_rate=80)
+    assert stats["failed"] == 0
+    assert stats["slowdowns"] >= 1
+    assert stats["finalRate"] < 80
+
+
+def test_unexpected_reply_fails_only_that_job(tmp_path):
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"certificate-{i}.svg"
+            path.write_text(f"<svg>{i}</svg>", encoding="utf-8")
+            paths.append(str(path))
+        pipeline = PinPipeline(f"http://127.0.0.1:{server.server_address[1]}",
+                               PinCache(str(tmp_path / "cache.jsonl")), rate=100)
+        post = pipeline._post
+
+        async def missing_hash(session, bucket, endpoint, body):
+            reply = await post(session, bucket, endpoint, body)
+            return {} if endpoint.endswith("pinJSONToIPFS") else reply
+
+        pipeline._post = missing_hash
+        results = pipeline.pin_all([file_job(p) for p in paths] + [json_job({"name": "x"}, "token-1.json")])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [r["status"] for r in results] == ["pinned"] * 3 + ["failed"]
+    assert results[-1]["error"].startswith("KeyError")
+    assert pipeline.failed == 1 and pipeline.uploads == 3
+    assert os.path.exists(tmp_path / "cache.jsonl")
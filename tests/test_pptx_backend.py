@@ -0,0 +1,33 @@
+"""pptx_backend.py 快取命中時的投影片內容與追蹤計數"""
+
+from build_cache import SlideCache
+from deck import load_deck
+from pptx_backend import CACHE_SALT, build_presentation
+from tracing import Tracer
+
+
+def slide_spans(tracer):
+    return [(e["args"]["shapes"], e["args"]["paragraphs"], e["args"].get("cached"))
+            for e in tracer.finish() if e["name"] == "pptx.slide"]
+
+
+def shape_text(prs):
+    return [[shape.text_frame.text for shape in slide.shapes if shape.has_text_frame] for slide in prs.slides]
+
+
+def test_cache_hits_report_the_spliced_slide(tmp_path):
+    deck = load_deck("en")
+    plain = Tracer()
+    expected = build_presentation(deck, tracer=plain)
+    counts = [span[:2] for span in slide_spans(plain)]
+    assert len(set(counts)) > 1
+
+    cache = SlideCache(str(tmp_path), "pptx", CACHE_SALT)
+    build_presentation(deck, cache, Tracer())
+    warm = Tracer()
+    prs = build_presentation(deck, cache, warm)
+
+    spans = slide_spans(warm)
+    assert [span[2] for span in spans] == [True] * len(deck.slides)
+    assert [span[:2] for span in spans] == counts
+    assert shape_text(prs) == shape_text(expected)
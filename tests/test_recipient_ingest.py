@@ -0,0 +1,164 @@
+"""recipient_ingest.py：向量化 keccak / EIP-55 對照逐筆計算、(地址, 類型) 去重索引、CSV / JSONL / Parquet 匯入與拒絕原因"""
+
+import csv
+import json
+import random
+
+import numpy as np
+import pytest
+from Crypto.Hash import keccak
+
+from recipient_ingest import (ADDRESS_BAD_CHECKSUM, ADDRESS_MALFORMED, ADDRESS_OK, ADDRESS_ZERO, RecipientIndex,
+                              RecipientIngestor, check_addresses, ingest_to_files, keccak256_hex40, normalize_name,
+                              record_line, row_location, write_sample_csv)
+
+
+def eip55(address):
+    """逐筆計算的 EIP-55 checksum (參考實作)。"""
+    body = address[2:].lower()
+    digest = keccak.new(digest_bits=256, data=body.encode()).hexdigest()
+    return "0x" + "".join(c.upper() if int(h, 16) >= 8 else c for c, h in zip(body, digest))
+
+
+def random_addresses(count, seed=0):
+    rng = random.Random(seed)
+    return ["0x" + rng.randbytes(20).hex() for _ in range(count)]
+
+
+def test_vectorized_keccak_matches_pycryptodome():
+    messages = [a[2:].encode() for a in random_addresses(300)]
+    digests = keccak256_hex40(np.frombuffer(b"".join(messages), np.uint8).reshape(-1, 40))
+    assert [bytes(d) for d in digests] == [keccak.new(digest_bits=256, data=m).digest() for m in messages]
+
+
+def test_checksums_match_eip55():
+    addresses = random_addresses(500, seed=1) + ["0x52908400098527886E0F7030069857D2E4169EE7",
+                                                 "0xde709f2102306220921060314715629080e2fb77"]
+    check = check_addresses(addresses)
+    assert check.checksummed == [eip55(a) for a in addresses]
+    assert check.status.tolist() == [ADDRESS_OK] * len(addresses)
+    assert [bytes(r).hex() for r in check.raw] == [a[2:].lower() for a in addresses]
+
+
+def test_address_statuses():
+    good = eip55(random_addresses(1, seed=2)[0])
+    flipped = good[:2] + good[2:].swapcase()
+    cases = [good, good.lower(), good.upper().replace("0X", "0x"), flipped, good[:-1], "0x" + "g" * 40, "", good + "0",
+             "0x" + "0" * 40]
+    assert check_addresses(cases).status.tolist() == [
+        ADDRESS_OK, ADDRESS_OK, ADDRESS_OK, ADDRESS_BAD_CHECKSUM, ADDRESS_MALFORMED, ADDRESS_MALFORMED,
+        ADDRESS_MALFORMED, ADDRESS_MALFORMED, ADDRESS_ZERO]
+    strict = check_addresses([good, good.lower()], require_checksum=True).status.tolist()
+    assert strict == [ADDRESS_OK, ADDRESS_BAD_CHECKSUM]
+
+
+def test_index_matches_a_python_dict_across_chunks_and_growth():
+    rng = np.random.default_rng(3)
+    pool = rng.integers(0, 256, size=(300, 20), dtype=np.uint8)
+    index, first = RecipientIndex(capacity=8), {}
+    for chunk in range(6):
+        picks = rng.integers(0, len(pool), 200)
+        types = rng.integers(0, 4, 200)
+        ordinals = np.arange(chunk * 200, chunk * 200 + 200, dtype=np.uint64) + (np.uint64(chunk % 2) << np.uint64(40))
+        duplicate_of = index.add(pool[picks], types, ordinals)
+        for pick, cert_type, ordinal, earlier in zip(picks, types, ordinals.tolist(), duplicate_of.tolist()):
+            key = (int(pick), int(cert_type))
+            assert earlier == first.get(key, -1)
+            first.setdefault(key, ordinal)
+    assert len(index) == len(first)
+    assert row_location((1 << 40) | 7) == (1, 7)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("  王小明  ", "王小明"), ("Ann\u200b  Lee", "Ann Lee"), ("e\u0301", "\u00e9"), ("a\tb\nc", "a b c"), (" \u200b ", ""),
+])
+def test_normalize_name(raw, expected):
+    assert normalize_name(raw) == expected
+
+
+ROWS = [
+    # (address, certType, name, 預期拒絕原因)
+    ("A", 0, "王小明", None),
+    ("B", "Web3.0 Citizen Certificate", "Alice", None),
+    ("A", 0, "王小明 (重複)", "duplicate"),
+    ("A", 1, "王小明", None),                  # 同地址不同類型不算重複
+    ("bad", 0, "Bob", "bad_checksum"),
+    ("0x1234", 0, "Carol", "bad_address"),
+    ("", 0, "Dave", "missing_address"),
+    ("C", 9, "Eve", "bad_cert_type"),
+    ("C", 0, " \u200b ", "empty_name"),
+    ("C", 0, "x" * 101, "name_too_long"),
+    ("0x" + "0" * 40, 0, "Zero", "zero_address"),
+]
+
+
+def resolve(rows):
+    a, b, c = (eip55(x) for x in random_addresses(3, seed=4))
+    known = {"A": a.lower(), "B": b, "C": c, "bad": b[:2] + b[2:].swapcase()}
+    return [(known.get(address, address), cert_type, name, reason) for address, cert_type, name, reason in rows]
+
+
+def write_source(tmp_path, fmt, rows):
+    path = tmp_path / f"recipients.{fmt}"
+    if fmt == "csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Wallet Address", "Cert Type", "Student Name"])
+            writer.writerows([address, cert_type, name] for address, cert_type, name, _ in rows)
+    elif fmt == "jsonl":
+        lines = [json.dumps({"recipient": a, "type": t, "name": n}, ensure_ascii=False) for a, t, n, _ in rows]
+        path.write_text("\n".join(lines[:3] + ["", "not json"] + lines[3:]) + "\n", encoding="utf-8")
+    else:
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+        table = pa.table({"address": [r[0] for r in rows], "certType": [str(r[1]) for r in rows],
+                          "recipientName": [r[2] for r in rows]})
+        pq.write_table(table, path, row_group_size=4)
+    return str(path)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl", "parquet"])
+def test_ingest_formats(tmp_path, fmt):
+    rows = resolve(ROWS)
+    ingestor = RecipientIngestor(issuer_name="區塊鏈課程", chunk_size=4)
+    out, rejects = tmp_path / "out.jsonl", tmp_path / "rejects.csv"
+    stats = ingest_to_files(ingestor, [write_source(tmp_path, fmt, rows)], str(out), str(rejects))
+
+    accepted = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    expected = [(eip55(a), n) for a, _, n, reason in rows if reason is None]
+    assert [(r["recipient"], r["recipientName"]) for r in accepted] == expected
+    assert [r["certType"] for r in accepted] == [0, 2, 1]
+    assert all(r["issuerName"] == "區塊鏈課程" for r in accepted)
+
+    with open(rejects, encoding="utf-8", newline="") as f:
+        reasons = [row["reason"] for row in csv.DictReader(f)]
+    wanted = [reason for *_, reason in rows if reason]
+    if fmt == "jsonl":
+        wanted = wanted[:1] + ["bad_json"] + wanted[1:]
+    assert reasons == wanted
+    assert stats["accepted"] == 3 and stats["rows"] == len(rows) + (fmt == "jsonl")
+
+
+def test_duplicates_across_files_point_at_the_first_source(tmp_path):
+    rows = resolve(ROWS[:2])
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    paths = [write_source(tmp_path / "a", "csv", rows), write_source(tmp_path / "b", "jsonl", rows)]
+    chunks = list(RecipientIngestor(issuer_name="X").ingest(paths))
+    assert len(chunks[0].records) == 2 and not chunks[1].records
+    assert chunks[1].rejects[0]["detail"] == f"same address and certType as {paths[0]} row 2"
+
+
+def test_record_line_is_json_dumps():
+    record = {"recipient": eip55(random_addresses(1)[0]), "certType": 3, "recipientName": "Bob \"B\" 陳 ",
+              "issuerName": "A\\B", "customMessage": "多行\n訊息 😀"}
+    assert record_line(record) == json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def test_sample_export_defects_are_all_caught(tmp_path):
+    source = str(tmp_path / "export.csv")
+    write_sample_csv(source, 3000, chunk_size=1000)
+    stats = ingest_to_files(RecipientIngestor(issuer_name="U", chunk_size=700), [source], str(tmp_path / "out.jsonl"))
+    assert stats["rows"] == 3000
+    assert stats["accepted"] + sum(v for k, v in stats.items() if k not in ("rows", "accepted")) == 3000
+    assert {"duplicate", "bad_checksum", "bad_address", "empty_name"} <= set(stats)
@@ -0,0 +1,36 @@
+"""snapshot_store.py 寫入與讀回"""
+
+import glob
+
+import pytest
+
+from certificates import CertificateRecord, coerce_record, iter_records, unix_date
+from conftest import ROOT
+from snapshot_store import CertificateSnapshot, write_snapshot
+
+
+def test_records_without_token_id_are_numbered_in_order(tmp_path):
+    records = [CertificateRecord(i % 4, f"Name {i}", "Issuer", "", 1700000000 + i) for i in range(10)]
+    assert write_snapshot(records, str(tmp_path), chunk_size=3) == 10
+
+    snapshot = CertificateSnapshot(str(tmp_path))
+    assert snapshot.meta["sorted"]
+    assert list(snapshot.token_id) == list(range(1, 11))
+    assert snapshot.record(snapshot.find(7)).recipient_name == "Name 6"
+
+
+def test_iso_issue_dates_from_metadata_examples(tmp_path):
+    paths = sorted(glob.glob(str(ROOT / "metadata" / "*.json")))
+    records = [coerce_record(value) for value in iter_records(paths)]
+    assert records and all(isinstance(r.issue_date, str) for r in records)
+    write_snapshot(records, str(tmp_path))
+
+    snapshot = CertificateSnapshot(str(tmp_path))
+    assert [int(d) for d in snapshot.issue_date] == [unix_date(r.issue_date) for r in records]
+    assert unix_date("2025-10-04") == 1759536000
+
+
+def test_malformed_issue_date_names_the_token(tmp_path):
+    record = CertificateRecord(0, "Alice", "Issuer", "", "4 Oct 2025", token_id=5)
+    with pytest.raises(ValueError, match="tokenId 5: issueDate '4 Oct 2025'"):
+        write_snapshot([record], str(tmp_path))
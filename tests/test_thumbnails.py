@@ -0,0 +1,71 @@
+"""thumbnails.py 分批渲染：worker 收到的是來源路徑或紀錄，待渲染的工作數有上限"""
+
+import glob
+import json
+
+import thumbnails
+from certificates import CertificateRecord
+from conftest import ROOT
+from thumbnails import IN_FLIGHT_PER_WORKER, ThumbnailCache
+
+SAMPLES = sorted(glob.glob(str(ROOT / "images" / "certificates" / "*-sample.svg")))
+
+
+def sources(count, consumed):
+    for i in range(count):
+        consumed.append(i)
+        yield f"cert-{i}", CertificateRecord(i % 4, f"Recipient {i}", "Issuer", "", 1700000000 + i, token_id=i + 1)
+
+
+def test_jobs_carry_sources_not_svg_text(tmp_path, monkeypatch):
+    jobs = []
+    render = thumbnails._render
+    monkeypatch.setattr(thumbnails, "_render", lambda job: jobs.append(job) or render(job))
+
+    cache = ThumbnailCache(str(tmp_path), sizes=(64,), formats=("png",))
+    sample_sources = [(f"s{i}", path) for i, path in enumerate(SAMPLES)]
+    manifest = cache.build(sample_sources + [("dup", SAMPLES[0])])
+
+    assert [job[2] for job in jobs] == SAMPLES
+    assert cache.rendered == len(SAMPLES)
+    assert manifest["items"]["dup"] == manifest["items"]["s0"]
+
+    again = ThumbnailCache(str(tmp_path), sizes=(64,), formats=("png",))
+    again.build(sample_sources)
+    assert (again.rendered, again.cached) == (0, len(SAMPLES))
+
+
+def test_pool_build_is_bounded_and_matches_serial(tmp_path):
+    count, workers = 40, 2
+    consumed, ahead = [], []
+    pooled = ThumbnailCache(str(tmp_path / "pool"), sizes=(32, 64), formats=("png", "webp"))
+    pooled.build(sources(count, consumed), workers, progress=lambda done: ahead.append(len(consumed) - done))
+
+    assert pooled.rendered == count
+    assert max(ahead) <= workers * IN_FLIGHT_PER_WORKER
+
+    serial = ThumbnailCache(str(tmp_path / "serial"), sizes=(32, 64), formats=("png", "webp"))
+    serial.build(sources(count, []))
+    with open(pooled.manifest_path, encoding="utf-8") as a, open(serial.manifest_path, encoding="utf-8") as b:
+        assert json.load(a) == json.load(b)
+
+
+def test_font_dirs_are_part_of_the_cache_key(tmp_path):
+    fonts = tmp_path / "fonts"
+    (fonts / "cjk").mkdir(parents=True)
+    (fonts / "cjk" / "a.ttf").write_bytes(b"font a")
+
+    def key(**options):
+        cache = ThumbnailCache(str(tmp_path / "cache"), sizes=(64,), formats=("png",), **options)
+        names = {}
+        list(cache._jobs([("s", SAMPLES[0])], names))
+        return names["s"][0]
+
+    plain = key()
+    with_fonts = key(font_dirs=[str(fonts)])
+    assert plain != with_fonts and key(font_dirs=[str(fonts)]) == with_fonts
+
+    (fonts / "cjk" / "b.ttf").write_bytes(b"font b")     # 新增字型
+    added = key(font_dirs=[str(fonts)])
+    (fonts / "cjk" / "b.ttf").write_bytes(b"font b v2")  # 替換字型
+    assert len({with_fonts, added, key(font_dirs=[str(fonts)])}) == 3
@@ -0,0 +1,74 @@
+"""token_metadata.py 與合約 generateMetadata 的 tokenURI 逐字比對
+
+fixtures/token_uris.json 每一筆是一張證書的欄位與合約應回傳的 tokenURI。
+對 hardhat 節點執行時，測試會在新部署的合約上依序發行這些證書 (以
+evm_setNextBlockTimestamp 固定 issueDate) 並比對鏈上 tokenURI；設定
+UPDATE_TOKEN_URI_FIXTURES=1 則改以鏈上結果重寫 fixture。
+"""
+
+import json
+import os
+
+import pytest
+
+from certificates import coerce_record
+from chain import SELECTORS, CertificateContract, abi_encode, encode_issue_certificate
+from conftest import ROOT
+from token_metadata import check_against_chain, decode_token_uri, token_uri, token_uris
+
+FIXTURE_PATH = ROOT / "tests" / "fixtures" / "token_uris.json"
+with open(FIXTURE_PATH, encoding="utf-8") as f:
+    FIXTURES = json.load(f)
+
+
+def fixture_id(case):
+    return f"{case['tokenId']}-type{case['certType']}"
+
+
+@pytest.mark.parametrize("case", FIXTURES, ids=fixture_id)
+def test_token_uri_matches_fixture(case):
+    assert token_uri(coerce_record(case)) == case["tokenURI"]
+
+
+def test_fixtures_cover_every_type_and_message_shape():
+    assert {case["certType"] for case in FIXTURES} == {0, 1, 2, 3}
+    messages = [case["customMessage"] for case in FIXTURES]
+    assert "" in messages
+    assert any('"' in m and "\\" in m for m in messages)
+    assert any(not m.isascii() for m in messages)
+
+
+def test_batch_encoding_matches_single():
+    assert token_uris([coerce_record(case) for case in FIXTURES]) == [case["tokenURI"] for case in FIXTURES]
+
+
+def test_contract_does_not_escape_json():
+    by_name = {case["recipientName"]: case for case in FIXTURES}
+    with pytest.raises(ValueError):
+        decode_token_uri(by_name['Eve "the" \\ Hacker']["tokenURI"])
+    injected = decode_token_uri(by_name["Mallory"]["tokenURI"])
+    assert {"trait_type": "Rarity", "value": "Legendary"} in injected["attributes"]
+
+
+def test_fixtures_match_hardhat(hardhat, contract):
+    owner = hardhat.accounts[0]
+    for case in FIXTURES:
+        if case.get("updateImage"):
+            args = abi_encode(["uint8", "string"], [case["certType"], case["imageURI"]])
+            hardhat.transact(contract, "0x" + SELECTORS["updateCertificateImage"] + args.hex())
+        hardhat.call("evm_setNextBlockTimestamp", case["issueDate"])
+        receipt = hardhat.transact(contract, encode_issue_certificate(
+            hardhat.accounts[1], case["certType"], case["recipientName"], case["issuerName"], case["customMessage"]))
+        assert receipt["from"].lower() == owner.lower()
+
+    chain = CertificateContract(contract, hardhat.url)
+    token_ids = [case["tokenId"] for case in FIXTURES]
+    actual = chain.token_uris(token_ids)
+    if os.environ.get("UPDATE_TOKEN_URI_FIXTURES"):
+        for case, uri in zip(FIXTURES, actual):
+            case["tokenURI"] = uri
+        with open(FIXTURE_PATH, "w", encoding="utf-8") as f:
+            json.dump(FIXTURES, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    assert actual == [case["tokenURI"] for case in FIXTURES]
+    assert check_against_chain(chain, token_ids) == []
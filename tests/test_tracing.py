@@ -0,0 +1,96 @@
+"""tracing.py 的 span / 計數 / Chrome trace 與摘要；開啟 --trace 時簡報與證書的輸出與未追蹤時相同"""
+
+import filecmp
+import os
+
+import pytest
+
+from build import build_one
+from certificate_pdf import render_certificates, render_merged
+from tracing import (PER_ITEM_SPANS, Tracer, load_chrome_trace, main, print_summary, slowest, summarize,
+                     write_chrome_trace)
+
+RECORDS = [{"certType": i % 4, "recipientName": f"接收者 {i}", "issuerName": "區塊鏈課程", "issueDate": 1759536000,
+            "tokenId": i + 1} for i in range(6)]
+
+
+def spans(events, name=None):
+    return [e for e in events if e["ph"] == "X" and (name is None or e["name"] == name)]
+
+
+def test_span_records_args_errors_and_counters():
+    tracer = Tracer("worker")
+    with tracer.span("pdf.slide", index=1) as info:
+        info["shapes"] = 4
+    with pytest.raises(KeyError):
+        with tracer.span("pdf.slide", index=2):
+            raise KeyError("boom")
+    tracer.count("write.bytes", 100)
+    tracer.count("write.bytes", 28)
+    tracer.count("certificates")
+    events = tracer.finish()
+
+    assert events[0] == {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tracer.tid,
+                         "args": {"name": "worker"}}
+    first, second = spans(events)
+    assert first["args"] == {"index": 1, "shapes": 4} and second["args"] == {"index": 2, "error": "KeyError"}
+    assert first["dur"] >= 0 and second["ts"] >= first["ts"] + first["dur"]
+    assert events[-1]["ph"] == "C" and events[-1]["args"] == {"write.bytes": 128, "certificates": 1}
+    assert tracer.finish() == events   # 計數只附加一次
+
+
+def test_trace_file_round_trip_and_summary(tmp_path, capsys):
+    a, b = Tracer("pptx en"), Tracer("pdf en")
+    for i, dur in enumerate((5, 1, 3)):
+        a.add_span("pptx.slide", 0, dur * 1_000_000, {"index": i})
+    b.add_span("pdf.build", 0, 20_000_000)
+    a.count("write.bytes", 2048)
+    b.count("write.bytes", 1024)
+    events = a.finish() + b.finish()
+    assert a.tid != b.tid
+
+    path = str(tmp_path / "trace.json")
+    write_chrome_trace(path, events, {"formats": ["pptx", "pdf"]})
+    assert load_chrome_trace(path) == events
+
+    rows, totals = summarize(events)
+    assert [(name, n) for name, n, *_ in rows] == [("pdf.build", 1), ("pptx.slide", 3)]
+    assert rows[1][2:5] == pytest.approx((9.0, 3.0, 5.0)) and rows[1][5] == {"index": 0}
+    assert totals == {"write.bytes": 3072}
+    assert [e["args"]["index"] for e in slowest(events, 2, PER_ITEM_SPANS)] == [0, 2]
+
+    assert main([path, "--top", "2"]) == 0
+    out = capsys.readouterr().out
+    assert "pdf.build" in out and "write.bytes 3.0KB" in out and "Slowest 2" in out
+    print_summary([])
+    assert "no spans" in capsys.readouterr().out
+
+
+def test_traced_deck_build_writes_the_same_html(tmp_path):
+    (tmp_path / "plain").mkdir()
+    (tmp_path / "traced").mkdir()
+    plain = build_one("html", "en", str(tmp_path / "plain"))
+    traced = build_one("html", "en", str(tmp_path / "traced"), trace=True)
+    assert plain.trace is None and traced.error is None
+    assert filecmp.cmp(plain.path, traced.path, shallow=False)
+    names = {e["name"] for e in spans(traced.trace)}
+    assert {"import", "deck.load", "render", "html.slide", "write"} <= names
+    slides = spans(traced.trace, "render")[0]["args"]["slides"]
+    assert len(spans(traced.trace, "html.slide")) == slides
+
+
+def test_traced_certificates_match_untraced(tmp_path):
+    render_merged(iter(RECORDS), str(tmp_path / "plain.pdf"), resume=False)
+    tracer = Tracer("certificates")
+    render_merged(iter(RECORDS), str(tmp_path / "traced.pdf"), resume=False, tracer=tracer)
+    assert filecmp.cmp(tmp_path / "plain.pdf", tmp_path / "traced.pdf", shallow=False)
+
+    render_certificates(RECORDS, str(tmp_path / "files"))
+    render_certificates(RECORDS, str(tmp_path / "traced-files"), tracer=tracer)
+    names = sorted(os.listdir(tmp_path / "files"))
+    assert names == sorted(os.listdir(tmp_path / "traced-files")) and len(names) == len(RECORDS)
+    assert all(filecmp.cmp(tmp_path / "files" / n, tmp_path / "traced-files" / n, shallow=False) for n in names)
+
+    events = tracer.finish()
+    assert len(spans(events, "cert.draw")) == 2 * len(RECORDS)
+    assert events[-1]["args"]["certificates"] == 2 * len(RECORDS)
@@ -0,0 +1,82 @@
+"""verifier.py 的 MetadataCache：區塊釘選、TTL 與失效；CertificateVerifier 追蹤自己快取的失效"""
+
+from certificates import CertificateRecord
+from chain import CertificateContract, encode_address, encode_issue_certificate, encode_uint256
+from verifier import CachedCertificate, CertificateVerifier, MetadataCache
+
+CONTRACT = "0x" + "ab" * 20
+
+
+def entry(token_id, block=None, owner="0x" + "11" * 20, read_at=None):
+    record = CertificateRecord(0, "Alice", "Issuer", "", 1700000000, token_id=token_id)
+    return CachedCertificate(token_id, {"name": f"#{token_id}"}, record, owner, block, read_at=read_at)
+
+
+def test_pinned_lookup_only_hits_its_own_block():
+    cache = MetadataCache()
+    cache.put(CONTRACT, entry(1, block=100))
+    assert cache.get(CONTRACT, 1) is None
+    assert cache.get(CONTRACT, 1, block=100).block == 100
+    assert cache.get(CONTRACT, 1, block=150) is None   # 100 到 150 之間可能轉移過
+    assert cache.get(CONTRACT, 1, block=99) is None
+
+
+def test_latest_and_pinned_entries_are_kept_apart():
+    cache = MetadataCache()
+    latest = entry(1, owner="0x" + "22" * 20, read_at=120)
+    cache.put(CONTRACT, latest)
+    cache.put(CONTRACT, entry(1, block=100))
+    assert cache.get(CONTRACT, 1) is latest
+    assert cache.get(CONTRACT, 1, block=100).owner == "0x" + "11" * 20
+    assert cache.invalidate(CONTRACT, 1, block=130)
+    assert cache.get(CONTRACT, 1) is None
+    assert cache.get(CONTRACT, 1, block=100) is not None   # 固定區塊的內容不會變
+
+
+def test_read_older_than_applied_invalidation_is_not_cached():
+    cache = MetadataCache()
+    cache.invalidate(CONTRACT, 1, block=10)
+    assert not cache.put(CONTRACT, entry(1, read_at=9))    # 與 block 10 的 Transfer 賽跑輸了
+    assert cache.get(CONTRACT, 1) is None
+    assert cache.put(CONTRACT, entry(1, read_at=10))
+    assert cache.get(CONTRACT, 1).read_at == 10
+
+    assert cache.invalidate_type(CONTRACT, 0, block=20) == [1]
+    assert not cache.put(CONTRACT, entry(2, read_at=19))
+    assert cache.put(CONTRACT, entry(2, read_at=20))
+    assert cache.put(CONTRACT, entry(3, block=5))           # 固定區塊的讀取不受失效影響
+    assert cache.stats()["stalePuts"] == 2
+
+
+def test_invalidation_history_is_bounded():
+    cache = MetadataCache(max_size=2)
+    for token_id, block in ((1, 10), (2, 11), (3, 12)):
+        cache.invalidate(CONTRACT, token_id, block)
+    assert len(cache._invalidated) == 2
+    assert not cache.put(CONTRACT, entry(9, read_at=9))    # 被擠出的紀錄以最舊區塊為下限
+    assert cache.put(CONTRACT, entry(9, read_at=10))
+
+
+def test_ttl_and_invalidation():
+    now = [0.0]
+    cache = MetadataCache(ttl=10, clock=lambda: now[0])
+    cache.put(CONTRACT, entry(1))
+    cache.put(CONTRACT, entry(2))
+    assert cache.invalidate(CONTRACT.upper(), 2)
+    assert cache.get(CONTRACT, 2) is None
+    now[0] = 11
+    assert cache.get(CONTRACT, 1) is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_verifier_applies_transfers_to_its_own_cache(hardhat, contract):
+    alice, bob = hardhat.accounts[1], hardhat.accounts[2]
+    minted = hardhat.transact(contract, encode_issue_certificate(alice, 0, "Alice", "Issuer", ""))
+    verifier = CertificateVerifier(CertificateContract(contract, hardhat.url), follow=0)
+    assert verifier.lookup(1).owner == alice.lower()
+
+    transfer_from = "0x23b872dd" + encode_address(alice) + encode_address(bob) + encode_uint256(1)
+    hardhat.transact(contract, transfer_from, sender=alice)
+    assert verifier.lookup(1).owner == bob.lower()
+    assert verifier.lookup(1, int(minted["blockNumber"], 16)).owner == alice.lower()
+    assert verifier.stats()["invalidations"] == 1